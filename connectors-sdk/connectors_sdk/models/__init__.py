@@ -1,40 +1,48 @@
-"""Offer models."""
+"""Offer models.
 
-from connectors_sdk.models.administrative_area import AdministrativeArea
-from connectors_sdk.models.associated_file import AssociatedFile
-from connectors_sdk.models.attack_pattern import AttackPattern
-from connectors_sdk.models.autonomous_system import AutonomousSystem
-from connectors_sdk.models.base_author_entity import BaseAuthorEntity
-from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
-from connectors_sdk.models.base_identified_object import BaseIdentifiedObject
-from connectors_sdk.models.base_object import BaseObject
-from connectors_sdk.models.base_observable_entity import BaseObservableEntity
-from connectors_sdk.models.city import City
-from connectors_sdk.models.country import Country
-from connectors_sdk.models.domain_name import DomainName
-from connectors_sdk.models.external_reference import ExternalReference
-from connectors_sdk.models.file import File
-from connectors_sdk.models.hostname import Hostname
-from connectors_sdk.models.indicator import Indicator
-from connectors_sdk.models.individual import Individual
-from connectors_sdk.models.intrusion_set import IntrusionSet
-from connectors_sdk.models.ipv4_address import IPV4Address
-from connectors_sdk.models.ipv6_address import IPV6Address
-from connectors_sdk.models.kill_chain_phase import KillChainPhase
-from connectors_sdk.models.malware import Malware
-from connectors_sdk.models.note import Note
-from connectors_sdk.models.organization import Organization
-from connectors_sdk.models.organization_author import OrganizationAuthor
-from connectors_sdk.models.region import Region
-from connectors_sdk.models.relationship import Relationship
-from connectors_sdk.models.report import Report
-from connectors_sdk.models.sector import Sector
-from connectors_sdk.models.software import Software
-from connectors_sdk.models.threat_actor_group import ThreatActorGroup
-from connectors_sdk.models.tlp_marking import TLPMarking
-from connectors_sdk.models.url import URL
-from connectors_sdk.models.vulnerability import Vulnerability
-from connectors_sdk.models.x509_certificate import X509Certificate
+The models are imported on first access (PEP 562), so that importing the package
+does not load the models dependencies (e.g. stix2, pycti) until they are needed.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover # Only for the type checkers
+    from connectors_sdk.models.administrative_area import AdministrativeArea
+    from connectors_sdk.models.associated_file import AssociatedFile
+    from connectors_sdk.models.attack_pattern import AttackPattern
+    from connectors_sdk.models.autonomous_system import AutonomousSystem
+    from connectors_sdk.models.base_author_entity import BaseAuthorEntity
+    from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
+    from connectors_sdk.models.base_identified_object import BaseIdentifiedObject
+    from connectors_sdk.models.base_object import BaseObject
+    from connectors_sdk.models.base_observable_entity import BaseObservableEntity
+    from connectors_sdk.models.city import City
+    from connectors_sdk.models.country import Country
+    from connectors_sdk.models.domain_name import DomainName
+    from connectors_sdk.models.external_reference import ExternalReference
+    from connectors_sdk.models.file import File
+    from connectors_sdk.models.hostname import Hostname
+    from connectors_sdk.models.indicator import Indicator
+    from connectors_sdk.models.individual import Individual
+    from connectors_sdk.models.intrusion_set import IntrusionSet
+    from connectors_sdk.models.ipv4_address import IPV4Address
+    from connectors_sdk.models.ipv6_address import IPV6Address
+    from connectors_sdk.models.kill_chain_phase import KillChainPhase
+    from connectors_sdk.models.malware import Malware
+    from connectors_sdk.models.note import Note
+    from connectors_sdk.models.organization import Organization
+    from connectors_sdk.models.organization_author import OrganizationAuthor
+    from connectors_sdk.models.region import Region
+    from connectors_sdk.models.relationship import Relationship
+    from connectors_sdk.models.report import Report
+    from connectors_sdk.models.sector import Sector
+    from connectors_sdk.models.software import Software
+    from connectors_sdk.models.threat_actor_group import ThreatActorGroup
+    from connectors_sdk.models.tlp_marking import TLPMarking
+    from connectors_sdk.models.url import URL
+    from connectors_sdk.models.vulnerability import Vulnerability
+    from connectors_sdk.models.x509_certificate import X509Certificate
 
 __all__ = [
     # Typing purpose
@@ -75,3 +83,56 @@ __all__ = [
     "Vulnerability",
     "X509Certificate",
 ]
+
+_MODULES = {
+    "AdministrativeArea": "connectors_sdk.models.administrative_area",
+    "AssociatedFile": "connectors_sdk.models.associated_file",
+    "AttackPattern": "connectors_sdk.models.attack_pattern",
+    "AutonomousSystem": "connectors_sdk.models.autonomous_system",
+    "BaseAuthorEntity": "connectors_sdk.models.base_author_entity",
+    "BaseIdentifiedEntity": "connectors_sdk.models.base_identified_entity",
+    "BaseIdentifiedObject": "connectors_sdk.models.base_identified_object",
+    "BaseObject": "connectors_sdk.models.base_object",
+    "BaseObservableEntity": "connectors_sdk.models.base_observable_entity",
+    "City": "connectors_sdk.models.city",
+    "Country": "connectors_sdk.models.country",
+    "DomainName": "connectors_sdk.models.domain_name",
+    "ExternalReference": "connectors_sdk.models.external_reference",
+    "File": "connectors_sdk.models.file",
+    "Hostname": "connectors_sdk.models.hostname",
+    "Indicator": "connectors_sdk.models.indicator",
+    "Individual": "connectors_sdk.models.individual",
+    "IntrusionSet": "connectors_sdk.models.intrusion_set",
+    "IPV4Address": "connectors_sdk.models.ipv4_address",
+    "IPV6Address": "connectors_sdk.models.ipv6_address",
+    "KillChainPhase": "connectors_sdk.models.kill_chain_phase",
+    "Malware": "connectors_sdk.models.malware",
+    "Note": "connectors_sdk.models.note",
+    "Organization": "connectors_sdk.models.organization",
+    "OrganizationAuthor": "connectors_sdk.models.organization_author",
+    "Region": "connectors_sdk.models.region",
+    "Relationship": "connectors_sdk.models.relationship",
+    "Report": "connectors_sdk.models.report",
+    "Sector": "connectors_sdk.models.sector",
+    "Software": "connectors_sdk.models.software",
+    "ThreatActorGroup": "connectors_sdk.models.threat_actor_group",
+    "TLPMarking": "connectors_sdk.models.tlp_marking",
+    "URL": "connectors_sdk.models.url",
+    "Vulnerability": "connectors_sdk.models.vulnerability",
+    "X509Certificate": "connectors_sdk.models.x509_certificate",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a model on first access."""
+    module_name = _MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # Next accesses do not go through __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the module attributes, including the models not imported yet."""
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,123 @@
+"""Build STIX 2.1 dicts the way the stix2 library builds its objects, without validating them."""
+
+import datetime
+import uuid
+from functools import cache
+from typing import Any
+
+import stix2.properties
+from stix2.base import (
+    SCO_DET_ID_NAMESPACE,
+    _choose_one_hash,
+    _make_json_serializable,
+    _STIXBase,
+)
+from stix2.canonicalization.Canonicalize import canonicalize
+from stix2.utils import NOW, format_datetime, get_timestamp, parse_into_datetime
+from stix2.v21 import _Observable as _Stix2Observable
+
+
+@cache
+def _defaulted_optional_properties(
+    stix2_class: type[_STIXBase],
+) -> tuple[tuple[str, stix2.properties.Property], ...]:
+    """Return the optional properties of a stix2 class left out of its JSON when set to their default."""
+    return tuple(
+        (name, prop)
+        for name, prop in stix2_class._properties.items()
+        if hasattr(prop, "default")
+        and not prop.required
+        and not hasattr(prop, "_fixed_value")
+    )
+
+
+def _clean(prop: stix2.properties.Property, value: Any) -> Any:
+    """Apply the stix2 normalizations changing the serialized value of a trusted property."""
+    if isinstance(prop, stix2.properties.TimestampProperty):
+        return parse_into_datetime(value, prop.precision, prop.precision_constraint)
+    if isinstance(prop, stix2.properties.HashesProperty):
+        return prop.clean(value, True)[0]
+    if isinstance(prop, stix2.properties.IntegerProperty):
+        return int(value)
+    if isinstance(prop, stix2.properties.FloatProperty):
+        return float(value)
+    return value
+
+
+def _to_json(value: Any) -> Any:
+    """Convert a property value to its JSON serializable form, as the stix2 JSON encoder."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return format_datetime(value)
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    return value
+
+
+def _observable_id(
+    stix2_class: type[_STIXBase], properties: dict[str, Any]
+) -> str | None:
+    """Generate the deterministic id of an observable, as `stix2.v21._Observable`."""
+    json_serializable_object = {}
+    for key in stix2_class._id_contributing_properties:
+        if key in properties:
+            if key == "hashes":
+                json_serializable_object[key] = _choose_one_hash(properties[key])
+            else:
+                json_serializable_object[key] = _make_json_serializable(properties[key])
+    if not json_serializable_object:
+        return None
+    data = canonicalize(json_serializable_object, utf8=False)
+    return f"{stix2_class._type}--{uuid.uuid5(SCO_DET_ID_NAMESPACE, data)}"
+
+
+def make_stix_dict(
+    stix2_class: type[_STIXBase], properties: dict[str, Any]
+) -> dict[str, Any]:
+    """Make the JSON serializable dict of a stix object from trusted properties.
+
+    The dict is the one `stix2_class(**properties).serialize()` would output: same
+    properties order, defaults, generated ids and timestamps format. But the
+    properties are not validated, they must already be (e.g. by a pydantic model).
+
+    Args:
+        stix2_class (type[_STIXBase]): The stix2 class of the object.
+        properties (dict[str, Any]): The keyword arguments of the stix2 class,
+            nested objects being already converted to dicts.
+
+    Returns:
+        (dict[str, Any]): The stix object as a dict.
+
+    """
+    properties = {
+        name: value
+        for name, value in properties.items()
+        if name != "allow_custom" and value is not None and value != []
+    }
+    now = None
+    stix_dict: dict[str, Any] = {}
+    for name, prop in stix2_class._properties.items():
+        if name in properties:
+            value = properties[name]
+        elif hasattr(prop, "default"):
+            value = prop.default()
+            if value is NOW:
+                # Use the same timestamp for any auto-generated datetimes
+                now = now or get_timestamp()
+                value = now
+        else:
+            continue
+        stix_dict[name] = _clean(prop, value)
+
+    if issubclass(stix2_class, _Stix2Observable) and "id" not in properties:
+        stix_dict["id"] = _observable_id(stix2_class, stix_dict) or stix_dict["id"]
+
+    for name, prop in _defaulted_optional_properties(stix2_class):  # type: ignore[arg-type]
+        if name in stix_dict and prop.default() == stix_dict[name]:
+            del stix_dict[name]
+
+    for name in sorted(properties.keys() - stix2_class._properties.keys()):
+        stix_dict[name] = properties[name]
+
+    return {name: _to_json(value) for name, value in stix_dict.items()}
@@ -1,5 +1,7 @@
 """AdministrativeArea."""
 
+from typing import Any
+
 from connectors_sdk.models._location import Location
 from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
 from connectors_sdk.models.enums import LocationType
@@ -27,16 +29,11 @@ class AdministrativeArea(BaseIdentifiedEntity):
         description="The longitude of the AdministrativeArea in decimal degrees.",
     )
 
-    def to_stix2_object(self) -> Stix2Location:
-        """Make stix object.
-
-        Notes:
-            - OpenCTI maps STIX Location SDO to OCTI AdministrativeArea entity based on `x_opencti_location_type`.
-            - To create a AdministrativeArea entity on OpenCTI, `x_opencti_location_type` MUST be 'AdministrativeArea'.
-        """
+    def _stix2_arguments(self) -> tuple[type[Location], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
         location_type = LocationType.ADMINISTRATIVE_AREA.value
 
-        return Location(
+        return Location, dict(  # noqa: C408 # No literal dict for maintainability
             id=PyctiLocation.generate_id(
                 name=self.name,
                 x_opencti_location_type=location_type,
@@ -50,5 +47,14 @@ class AdministrativeArea(BaseIdentifiedEntity):
             longitude=self.longitude,
             allow_custom=True,
             x_opencti_location_type=location_type,
-            **self._common_stix2_properties()
+            **self._common_stix2_properties(),
         )
+
+    def to_stix2_object(self) -> Stix2Location:
+        """Make stix object.
+
+        Notes:
+            - OpenCTI maps STIX Location SDO to OCTI AdministrativeArea entity based on `x_opencti_location_type`.
+            - To create a AdministrativeArea entity on OpenCTI, `x_opencti_location_type` MUST be 'AdministrativeArea'.
+        """
+        return self._make_stix2_object()
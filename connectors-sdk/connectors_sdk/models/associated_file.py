@@ -1,7 +1,7 @@
 """AssociatedFile."""
 
 import codecs
-from typing import OrderedDict
+from typing import Any, OrderedDict
 
 import stix2.properties
 from connectors_sdk.models.base_object import BaseObject
@@ -84,6 +84,28 @@ class AssociatedFile(BaseObject):
         description="Version of the file.",
     )
 
+    def _stix2_arguments(self) -> tuple[type[AssociatedFileStix], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return (
+            AssociatedFileStix,
+            dict(  # noqa: C408 # No literal dict for maintainability
+                name=self.name,
+                description=self.description,
+                data=(
+                    codecs.encode(self.content, "base64").decode("utf-8")
+                    if self.content
+                    else None
+                ),
+                mime_type=self.mime_type,
+                object_marking_refs=(
+                    [marking._stix2_id for marking in self.markings]
+                    if self.markings
+                    else None
+                ),
+                version=self.version,
+            ),
+        )
+
     def to_stix2_object(self) -> AssociatedFileStix:
         """Make stix-like object (not defined in stix spec nor lib).
 
@@ -91,17 +113,5 @@ class AssociatedFile(BaseObject):
             (AssociatedFileStix): A stix like object, defigning a file to upload into the OCTI platform
 
         """
-        return AssociatedFileStix(
-            name=self.name,
-            description=self.description,
-            data=(
-                codecs.encode(self.content, "base64").decode("utf-8")
-                if self.content
-                else None
-            ),
-            mime_type=self.mime_type,
-            object_marking_refs=(
-                [marking.id for marking in self.markings] if self.markings else None
-            ),
-            version=self.version,
-        )
+        stix_object: AssociatedFileStix = self._make_stix2_object()
+        return stix_object
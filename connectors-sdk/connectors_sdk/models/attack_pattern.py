@@ -1,5 +1,7 @@
 """AttackPattern."""
 
+from typing import Any
+
 from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
 from connectors_sdk.models.enums import Permission, Platform
 from connectors_sdk.models.kill_chain_phase import KillChainPhase
@@ -48,25 +50,29 @@ class AttackPattern(BaseIdentifiedEntity):
         description="MITRE ATT&CK required permissions of the attack pattern.",
     )
 
-    def to_stix2_object(self) -> Stix2AttackPattern:
-        """Make AttackPattern STIX2.1 object."""
-        return Stix2AttackPattern(
-            id=PyctiAttackPattern.generate_id(
+    def _stix2_arguments(self) -> tuple[type[Stix2AttackPattern], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return (
+            Stix2AttackPattern,
+            dict(  # noqa: C408 # No literal dict for maintainability
+                id=PyctiAttackPattern.generate_id(
+                    name=self.name,
+                    x_mitre_id=self.mitre_id,
+                ),
                 name=self.name,
+                description=self.description,
+                labels=self.labels,
+                aliases=self.aliases,
+                kill_chain_phases=self.kill_chain_phases or [],
+                allow_custom=True,
                 x_mitre_id=self.mitre_id,
+                x_mitre_detection=self.mitre_detection,
+                x_mitre_platforms=self.mitre_platforms,
+                x_mitre_permissions_required=self.mitre_required_permissions,
+                **self._common_stix2_properties(),
             ),
-            name=self.name,
-            description=self.description,
-            labels=self.labels,
-            aliases=self.aliases,
-            kill_chain_phases=[
-                kill_chain_phase.to_stix2_object()
-                for kill_chain_phase in self.kill_chain_phases or []
-            ],
-            allow_custom=True,
-            x_mitre_id=self.mitre_id,
-            x_mitre_detection=self.mitre_detection,
-            x_mitre_platforms=self.mitre_platforms,
-            x_mitre_permissions_required=self.mitre_required_permissions,
-            **self._common_stix2_properties()
         )
+
+    def to_stix2_object(self) -> Stix2AttackPattern:
+        """Make AttackPattern STIX2.1 object."""
+        return self._make_stix2_object()
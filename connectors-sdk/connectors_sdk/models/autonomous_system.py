@@ -1,5 +1,7 @@
 """Define the OpenCTI Observable."""
 
+from typing import Any
+
 import stix2
 from connectors_sdk.models.base_observable_entity import BaseObservableEntity
 from pydantic import Field
@@ -20,6 +22,18 @@ class AutonomousSystem(BaseObservableEntity):
         default=None,
     )
 
+    def _stix2_arguments(self) -> tuple[type[stix2.AutonomousSystem], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return (
+            stix2.AutonomousSystem,
+            dict(  # noqa: C408 # No literal dict for maintainability
+                number=self.number,
+                name=self.name,
+                rir=self.rir,
+                **self._common_stix2_properties(),
+            ),
+        )
+
     def to_stix2_object(self) -> stix2.v21.AutonomousSystem:
         """Make the stix2 autonomous system object.
 
@@ -27,9 +41,4 @@ class AutonomousSystem(BaseObservableEntity):
             (stix2.v21.AutonomousSystem): The stix2 autonomous system object.
 
         """
-        return stix2.AutonomousSystem(
-            number=self.number,
-            name=self.name,
-            rir=self.rir,
-            **self._common_stix2_properties(),
-        )
+        return self._make_stix2_object()
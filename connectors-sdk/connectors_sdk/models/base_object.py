@@ -1,12 +1,25 @@
 """BaseObject."""
 
+import json
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from operator import methodcaller
 from typing import Any
 
 import stix2.properties
+from connectors_sdk.models._stix_dict import make_stix_dict
 from pydantic import BaseModel, ConfigDict
 
 
+def _convert_nested_objects(value: Any, convert: Callable[["BaseObject"], Any]) -> Any:
+    """Convert the models nested in a stix property value (e.g. external references)."""
+    if isinstance(value, BaseObject):
+        return convert(value)
+    if isinstance(value, list):
+        return [_convert_nested_objects(item, convert) for item in value]
+    return value
+
+
 class BaseObject(BaseModel, ABC):
     """Represent Base Entity for OpenCTI models."""
 
@@ -45,3 +58,61 @@ class BaseObject(BaseModel, ABC):
     @abstractmethod
     def to_stix2_object(self) -> stix2.v21._STIXBase21:
         """Make stix object (usually from stix2 python lib objects)."""
+
+    def _stix2_arguments(
+        self,
+    ) -> tuple[type[stix2.v21._STIXBase21], dict[str, Any]] | None:
+        """Return the stix2 class of the stix object and its keyword arguments.
+
+        Nested models (external references, kill chain phases, files...) are kept as
+        models, they are converted to stix objects or to dicts depending on the output.
+
+        Notes:
+            Models implementing this method should build their stix object with
+            `_make_stix2_object`, and get a fast `to_stix_dict` path for free.
+            Models without this fast path (e.g. `TLPMarking`) return None.
+
+        """
+        return None
+
+    def _make_stix2_object(self) -> stix2.v21._STIXBase21:
+        """Make stix object from `_stix2_arguments`."""
+        arguments = self._stix2_arguments()
+        if arguments is None:
+            raise TypeError(
+                f"{type(self).__name__} does not implement `_stix2_arguments`."
+            )
+        stix2_class, properties = arguments
+        return stix2_class(
+            **{
+                name: _convert_nested_objects(value, methodcaller("to_stix2_object"))
+                for name, value in properties.items()
+            }
+        )
+
+    def to_stix_dict(self) -> dict[str, Any]:
+        """Make the JSON serializable dict of the stix object.
+
+        The dict is the JSON of `to_stix2_object()`, with the same deterministic id,
+        but it is built without the stix2 library validation, the model being
+        already validated by pydantic. Models not implementing `_stix2_arguments`
+        serialize their stix object instead.
+
+        Examples:
+            >>> kill_chain_phase = KillChainPhase(chain_name="foo", phase_name="pre-attack")
+            >>> kill_chain_phase.to_stix_dict()
+            {'kill_chain_name': 'foo', 'phase_name': 'pre-attack'}
+
+        """
+        arguments = self._stix2_arguments()
+        if arguments is None:
+            stix_dict: dict[str, Any] = json.loads(self.to_stix2_object().serialize())
+            return stix_dict
+        stix2_class, properties = arguments
+        return make_stix_dict(
+            stix2_class,
+            {
+                name: _convert_nested_objects(value, methodcaller("to_stix_dict"))
+                for name, value in properties.items()
+            },
+        )
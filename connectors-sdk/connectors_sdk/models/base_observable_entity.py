@@ -45,21 +45,16 @@ class BaseObservableEntity(BaseIdentifiedEntity, ABC):
         return dict(  # noqa: C408 # No literal dict for maintainability
             allow_custom=True,
             object_marking_refs=(
-                [marking.id for marking in self.markings]
+                [marking._stix2_id for marking in self.markings]
                 if self.markings is not None
                 else None
             ),
             x_opencti_score=self.score,
             x_opencti_description=self.description,
             x_opencti_labels=self.labels,
-            x_opencti_external_references=[
-                external_ref.to_stix2_object()
-                for external_ref in self.external_references or []
-            ],
-            x_opencti_created_by_ref=self.author.id if self.author else None,
-            x_opencti_files=[
-                file.to_stix2_object() for file in self.associated_files or []
-            ],
+            x_opencti_external_references=self.external_references or [],
+            x_opencti_created_by_ref=self.author._stix2_id if self.author else None,
+            x_opencti_files=self.associated_files or [],
             x_opencti_create_indicator=self.create_indicator,
         )
 
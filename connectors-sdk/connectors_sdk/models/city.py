@@ -1,5 +1,7 @@
 """City."""
 
+from typing import Any
+
 from connectors_sdk.models._location import Location
 from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
 from connectors_sdk.models.enums import LocationType
@@ -27,16 +29,11 @@ class City(BaseIdentifiedEntity):
         description="The longitude of the City in decimal degrees.",
     )
 
-    def to_stix2_object(self) -> Stix2Location:
-        """Make stix object.
-
-        Notes:
-            - OpenCTI maps STIX Location SDO to OCTI City entity based on `x_opencti_location_type`.
-            - To create a City entity on OpenCTI, `x_opencti_location_type` MUST be 'City'.
-        """
+    def _stix2_arguments(self) -> tuple[type[Location], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
         location_type = LocationType.CITY.value
 
-        return Location(
+        return Location, dict(  # noqa: C408 # No literal dict for maintainability
             id=PyctiLocation.generate_id(
                 name=self.name,
                 x_opencti_location_type=location_type,
@@ -50,5 +47,14 @@ class City(BaseIdentifiedEntity):
             longitude=self.longitude,
             allow_custom=True,
             x_opencti_location_type=location_type,
-            **self._common_stix2_properties()
+            **self._common_stix2_properties(),
         )
+
+    def to_stix2_object(self) -> Stix2Location:
+        """Make stix object.
+
+        Notes:
+            - OpenCTI maps STIX Location SDO to OCTI City entity based on `x_opencti_location_type`.
+            - To create a City entity on OpenCTI, `x_opencti_location_type` MUST be 'City'.
+        """
+        return self._make_stix2_object()
@@ -1,5 +1,7 @@
 """DomainName."""
 
+from typing import Any
+
 from connectors_sdk.models.base_observable_entity import BaseObservableEntity
 from pydantic import Field
 from stix2.v21 import DomainName as Stix2DomainName
@@ -19,9 +21,16 @@ class DomainName(BaseObservableEntity):
         min_length=1,
     )
 
+    def _stix2_arguments(self) -> tuple[type[Stix2DomainName], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return (
+            Stix2DomainName,
+            dict(  # noqa: C408 # No literal dict for maintainability
+                value=self.value,
+                **self._common_stix2_properties(),
+            ),
+        )
+
     def to_stix2_object(self) -> Stix2DomainName:
         """Make stix object."""
-        return Stix2DomainName(
-            value=self.value,
-            **self._common_stix2_properties(),
-        )
+        return self._make_stix2_object()
@@ -1,5 +1,7 @@
 """ExternalReference."""
 
+from typing import Any
+
 import stix2
 from connectors_sdk.models.base_object import BaseObject
 from pydantic import Field
@@ -24,11 +26,18 @@ class ExternalReference(BaseObject):
         description="An identifier for the external reference content.",
     )
 
+    def _stix2_arguments(self) -> tuple[type[stix2.ExternalReference], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return (
+            stix2.ExternalReference,
+            dict(  # noqa: C408 # No literal dict for maintainability
+                source_name=self.source_name,
+                description=self.description,
+                url=self.url,
+                external_id=self.external_id,
+            ),
+        )
+
     def to_stix2_object(self) -> stix2.v21.ExternalReference:
         """Make stix object."""
-        return stix2.ExternalReference(
-            source_name=self.source_name,
-            description=self.description,
-            url=self.url,
-            external_id=self.external_id,
-        )
+        return self._make_stix2_object()
@@ -84,9 +84,9 @@ class File(BaseObservableEntity):
 
         return data
 
-    def to_stix2_object(self) -> Stix2File:
-        """Make stix object."""
-        return Stix2File(
+    def _stix2_arguments(self) -> tuple[type[Stix2File], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return Stix2File, dict(  # noqa: C408 # No literal dict for maintainability
             hashes=self.hashes,
             size=self.size,
             name=self.name,
@@ -97,5 +97,9 @@ class File(BaseObservableEntity):
             mtime=self.mtime,
             atime=self.atime,
             x_opencti_additional_names=self.additional_names,
-            **self._common_stix2_properties()
+            **self._common_stix2_properties(),
         )
+
+    def to_stix2_object(self) -> Stix2File:
+        """Make stix object."""
+        return self._make_stix2_object()
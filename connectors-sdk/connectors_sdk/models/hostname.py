@@ -1,5 +1,7 @@
 """Hostname."""
 
+from typing import Any
+
 from connectors_sdk.models.base_observable_entity import BaseObservableEntity
 from pycti import CustomObservableHostname
 from pydantic import Field
@@ -20,9 +22,16 @@ class Hostname(BaseObservableEntity):
         min_length=1,
     )
 
+    def _stix2_arguments(self) -> tuple[type[CustomObservableHostname], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return (
+            CustomObservableHostname,
+            dict(  # noqa: C408 # No literal dict for maintainability
+                value=self.value,
+                **self._common_stix2_properties(),
+            ),
+        )
+
     def to_stix2_object(self) -> CustomObservableHostname:
         """Make stix object."""
-        return CustomObservableHostname(
-            value=self.value,
-            **self._common_stix2_properties(),
-        )
+        return self._make_stix2_object()
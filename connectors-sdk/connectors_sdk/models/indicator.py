@@ -1,6 +1,6 @@
 """Indicator."""
 
-from typing import Literal
+from typing import Any, Literal
 
 from connectors_sdk.models.associated_file import AssociatedFile
 from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
@@ -128,28 +128,29 @@ class Indicator(BaseIdentifiedEntity):
         "and use BasedOnRelationship for more granularity.",
     )
 
-    def to_stix2_object(self) -> Stix2Indicator:
-        """Make stix object."""
-        return Stix2Indicator(
+    def _stix2_arguments(self) -> tuple[type[Stix2Indicator], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return Stix2Indicator, dict(  # noqa: C408 # No literal dict for maintainability
             id=PyctiIndicator.generate_id(pattern=self.pattern),
             name=self.name,
             description=self.description,
             indicator_types=self.indicator_types,
             pattern_type=self.pattern_type,
             pattern=self.pattern,
+            # Set by the stix2 Indicator constructor for stix patterns, not by `make_stix_dict`
+            pattern_version="2.1" if self.pattern_type == "stix" else None,
             valid_from=self.valid_from,
             valid_until=self.valid_until,
-            kill_chain_phases=[
-                kill_chain_phase.to_stix2_object()
-                for kill_chain_phase in self.kill_chain_phases or []
-            ],
+            kill_chain_phases=self.kill_chain_phases or [],
             allow_custom=True,
             x_opencti_score=self.score,
             x_mitre_platforms=self.platforms,
             x_opencti_main_observable_type=self.main_observable_type,
             x_opencti_create_observables=self.create_observables,
-            x_opencti_files=[
-                file.to_stix2_object() for file in self.associated_files or []
-            ],
-            **self._common_stix2_properties()
+            x_opencti_files=self.associated_files or [],
+            **self._common_stix2_properties(),
         )
+
+    def to_stix2_object(self) -> Stix2Indicator:
+        """Make stix object."""
+        return self._make_stix2_object()
@@ -1,10 +1,9 @@
 """IntrusionSet."""
 
+from typing import Any
+
 from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
-from connectors_sdk.models.enums import (
-    AttackMotivation,
-    AttackResourceLevel,
-)
+from connectors_sdk.models.enums import AttackMotivation, AttackResourceLevel
 from pycti import IntrusionSet as PyctiIntrusionSet
 from pydantic import AwareDatetime, Field
 from stix2.v21 import IntrusionSet as Stix2IntrusionSet
@@ -50,18 +49,25 @@ class IntrusionSet(BaseIdentifiedEntity):
         description="The secondary reasons, motivations, or purposes behind this Intrusion Set.",
     )
 
+    def _stix2_arguments(self) -> tuple[type[Stix2IntrusionSet], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return (
+            Stix2IntrusionSet,
+            dict(  # noqa: C408 # No literal dict for maintainability
+                id=PyctiIntrusionSet.generate_id(name=self.name),
+                name=self.name,
+                description=self.description,
+                aliases=self.aliases,
+                first_seen=self.first_seen,
+                last_seen=self.last_seen,
+                goals=self.goals,
+                resource_level=self.resource_level,
+                primary_motivation=self.primary_motivation,
+                secondary_motivations=self.secondary_motivations,
+                **self._common_stix2_properties(),
+            ),
+        )
+
     def to_stix2_object(self) -> Stix2IntrusionSet:
         """Make stix object."""
-        return Stix2IntrusionSet(
-            id=PyctiIntrusionSet.generate_id(name=self.name),
-            name=self.name,
-            description=self.description,
-            aliases=self.aliases,
-            first_seen=self.first_seen,
-            last_seen=self.last_seen,
-            goals=self.goals,
-            resource_level=self.resource_level,
-            primary_motivation=self.primary_motivation,
-            secondary_motivations=self.secondary_motivations,
-            **self._common_stix2_properties()
-        )
+        return self._make_stix2_object()
@@ -1,6 +1,7 @@
 """IpV4."""
 
 import ipaddress
+from typing import Any
 
 from connectors_sdk.models.base_observable_entity import BaseObservableEntity
 from pydantic import Field, field_validator
@@ -41,9 +42,16 @@ class IPV4Address(BaseObservableEntity):
             raise ValueError(f"Invalid IP V4 address {value}") from None
         return value
 
+    def _stix2_arguments(self) -> tuple[type[Stix2IPv4Address], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return (
+            Stix2IPv4Address,
+            dict(  # noqa: C408 # No literal dict for maintainability
+                value=self.value,
+                **self._common_stix2_properties(),
+            ),
+        )
+
     def to_stix2_object(self) -> Stix2IPv4Address:
         """Make stix object."""
-        return Stix2IPv4Address(
-            value=self.value,
-            **self._common_stix2_properties(),
-        )
+        return self._make_stix2_object()
@@ -1,6 +1,7 @@
 """IPV6Address."""
 
 import ipaddress
+from typing import Any
 
 from connectors_sdk.models.base_observable_entity import BaseObservableEntity
 from pydantic import Field, field_validator
@@ -41,9 +42,16 @@ class IPV6Address(BaseObservableEntity):
             raise ValueError(f"Invalid IP V6 address {value}") from None
         return value
 
+    def _stix2_arguments(self) -> tuple[type[Stix2IPv6Address], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return (
+            Stix2IPv6Address,
+            dict(  # noqa: C408 # No literal dict for maintainability
+                value=self.value,
+                **self._common_stix2_properties(),
+            ),
+        )
+
     def to_stix2_object(self) -> Stix2IPv6Address:
         """Make stix object."""
-        return Stix2IPv6Address(
-            value=self.value,
-            **self._common_stix2_properties(),
-        )
+        return self._make_stix2_object()
@@ -1,5 +1,7 @@
 """KillChainPhase."""
 
+from typing import Any
+
 import stix2
 from connectors_sdk.models.base_object import BaseObject
 from pydantic import Field
@@ -16,9 +18,16 @@ class KillChainPhase(BaseObject):
     chain_name: str = Field(description="Name of the kill chain.")
     phase_name: str = Field(description="Name of the kill chain phase.")
 
+    def _stix2_arguments(self) -> tuple[type[stix2.KillChainPhase], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return (
+            stix2.KillChainPhase,
+            dict(  # noqa: C408 # No literal dict for maintainability
+                kill_chain_name=self.chain_name,
+                phase_name=self.phase_name,
+            ),
+        )
+
     def to_stix2_object(self) -> stix2.v21.KillChainPhase:
         """Make stix object."""
-        return stix2.KillChainPhase(
-            kill_chain_name=self.chain_name,
-            phase_name=self.phase_name,
-        )
+        return self._make_stix2_object()
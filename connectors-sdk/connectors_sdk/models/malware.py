@@ -1,5 +1,7 @@
 """Malware."""
 
+from typing import Any
+
 from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
 from connectors_sdk.models.enums import (
     ImplementationLanguage,
@@ -60,9 +62,9 @@ class Malware(BaseIdentifiedEntity):
         description="Any of the capabilities identified for the malware instance or family.",
     )
 
-    def to_stix2_object(self) -> Stix2Malware:
-        """Make stix object."""
-        return Stix2Malware(
+    def _stix2_arguments(self) -> tuple[type[Stix2Malware], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return Stix2Malware, dict(  # noqa: C408 # No literal dict for maintainability
             id=PyctiMalware.generate_id(name=self.name),
             name=self.name,
             is_family=self.is_family,
@@ -73,12 +75,13 @@ class Malware(BaseIdentifiedEntity):
             last_seen=self.last_seen,
             architecture_execution_envs=self.architecture_execution_envs,
             implementation_languages=self.implementation_languages,
-            kill_chain_phases=[
-                kill_chain_phase.to_stix2_object()
-                for kill_chain_phase in self.kill_chain_phases or []
-            ],
+            kill_chain_phases=self.kill_chain_phases or [],
             capabilities=self.capabilities,
             operating_system_refs=None,  # not implemented on OpenCTI
             sample_refs=None,  # not implemented on OpenCTI
-            **self._common_stix2_properties()
+            **self._common_stix2_properties(),
         )
+
+    def to_stix2_object(self) -> Stix2Malware:
+        """Make stix object."""
+        return self._make_stix2_object()
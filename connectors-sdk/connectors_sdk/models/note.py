@@ -1,6 +1,7 @@
 """Note."""
 
 from collections import OrderedDict
+from typing import Any
 
 import stix2.properties
 from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
@@ -55,9 +56,9 @@ class Note(BaseIdentifiedEntity):
         description="OCTI objects this note applies to.",
     )
 
-    def to_stix2_object(self) -> Stix2Note:
-        """Make stix object."""
-        return NoteStix(
+    def _stix2_arguments(self) -> tuple[type[NoteStix], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return NoteStix, dict(  # noqa: C408 # No literal dict for maintainability
             id=PyctiNote.generate_id(
                 content=self.content,
                 created=self.publication_date,
@@ -66,9 +67,13 @@ class Note(BaseIdentifiedEntity):
             content=self.content,
             labels=self.labels,
             authors=self.authors,
-            object_refs=[obj.id for obj in self.objects or []],
+            object_refs=[obj._stix2_id for obj in self.objects or []],
             created=self.publication_date,  # usually set by stix2 lib but here it MUST be equal to the datetime used for note's id.
             allow_custom=True,
             note_types=self.note_types,
-            **self._common_stix2_properties()
+            **self._common_stix2_properties(),
         )
+
+    def to_stix2_object(self) -> Stix2Note:
+        """Make stix object."""
+        return self._make_stix2_object()
@@ -1,10 +1,9 @@
 """Organization."""
 
+from typing import Any
+
 from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
-from connectors_sdk.models.enums import (
-    OrganizationType,
-    Reliability,
-)
+from connectors_sdk.models.enums import OrganizationType, Reliability
 from pycti import Identity as PyctiIdentity
 from pydantic import Field
 from stix2.v21 import Identity as Stix2Identity
@@ -43,16 +42,11 @@ class Organization(BaseIdentifiedEntity):
         description="Aliases of the organization.",
     )
 
-    def to_stix2_object(self) -> Stix2Identity:
-        """Make stix object.
-
-        Notes:
-            - OpenCTI maps STIX Identity SDO to OCTI Organization entity based on `identity_class`.
-            - To create an Organization entity on OpenCTI, `identity_class` MUST be 'organization'.
-        """
+    def _stix2_arguments(self) -> tuple[type[Stix2Identity], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
         identity_class = "organization"
 
-        return Stix2Identity(
+        return Stix2Identity, dict(  # noqa: C408 # No literal dict for maintainability
             id=PyctiIdentity.generate_id(
                 identity_class=identity_class,
                 name=self.name,
@@ -65,5 +59,14 @@ class Organization(BaseIdentifiedEntity):
             x_opencti_organization_type=self.organization_type,
             x_opencti_reliability=self.reliability,
             x_opencti_aliases=self.aliases,
-            **self._common_stix2_properties()
+            **self._common_stix2_properties(),
         )
+
+    def to_stix2_object(self) -> Stix2Identity:
+        """Make stix object.
+
+        Notes:
+            - OpenCTI maps STIX Identity SDO to OCTI Organization entity based on `identity_class`.
+            - To create an Organization entity on OpenCTI, `identity_class` MUST be 'organization'.
+        """
+        return self._make_stix2_object()
@@ -1,5 +1,7 @@
 """Region."""
 
+from typing import Any
+
 from connectors_sdk.models import BaseIdentifiedEntity
 from connectors_sdk.models._location import Location
 from connectors_sdk.models.enums import LocationType
@@ -24,11 +26,11 @@ class Region(BaseIdentifiedEntity):
         description="A textual description of the Region.",
     )
 
-    def to_stix2_object(self) -> Stix2Location:
-        """Make stix object."""
+    def _stix2_arguments(self) -> tuple[type[Location], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
         location_type = LocationType.REGION.value
 
-        return Location(
+        return Location, dict(  # noqa: C408 # No literal dict for maintainability
             id=PyctiLocation.generate_id(
                 name=self.name,
                 x_opencti_location_type=location_type,
@@ -38,5 +40,9 @@ class Region(BaseIdentifiedEntity):
             description=self.description,
             allow_custom=True,
             x_opencti_location_type=location_type,
-            **self._common_stix2_properties()
+            **self._common_stix2_properties(),
         )
+
+    def to_stix2_object(self) -> Stix2Location:
+        """Make stix object."""
+        return self._make_stix2_object()
@@ -1,5 +1,8 @@
 """Relationship."""
 
+import builtins
+from typing import Any
+
 from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
 from connectors_sdk.models.enums import RelationshipType
 from pycti import StixCoreRelationship as PyctiStixCoreRelationship
@@ -32,21 +35,31 @@ class Relationship(BaseIdentifiedEntity):
         description="End time of the relationship in ISO 8601 format.",
     )
 
-    def to_stix2_object(self) -> Stix2Relationship:
-        """Make stix object."""
-        return Stix2Relationship(
-            id=PyctiStixCoreRelationship.generate_id(
+    # builtins.type as `type` is shadowed by the field of the model
+    def _stix2_arguments(
+        self,
+    ) -> tuple[builtins.type[Stix2Relationship], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return (
+            Stix2Relationship,
+            dict(  # noqa: C408 # No literal dict for maintainability
+                id=PyctiStixCoreRelationship.generate_id(
+                    relationship_type=self.type,
+                    source_ref=self.source._stix2_id,
+                    target_ref=self.target._stix2_id,
+                    start_time=self.start_time,
+                    stop_time=self.stop_time,
+                ),
                 relationship_type=self.type,
-                source_ref=self.source.id,
-                target_ref=self.target.id,
+                source_ref=self.source._stix2_id,
+                target_ref=self.target._stix2_id,
+                description=self.description,
                 start_time=self.start_time,
                 stop_time=self.stop_time,
+                **self._common_stix2_properties(),
             ),
-            relationship_type=self.type,
-            source_ref=self.source.id,
-            target_ref=self.target.id,
-            description=self.description,
-            start_time=self.start_time,
-            stop_time=self.stop_time,
-            **self._common_stix2_properties()
         )
+
+    def to_stix2_object(self) -> Stix2Relationship:
+        """Make stix object."""
+        return self._make_stix2_object()
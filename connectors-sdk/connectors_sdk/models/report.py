@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from collections import OrderedDict
+from typing import Any
 
 import stix2.properties
 from connectors_sdk.models.associated_file import AssociatedFile
@@ -67,9 +68,9 @@ class Report(BaseIdentifiedEntity):
         description="Files to upload with the report, e.g. report as a PDF.",
     )
 
-    def to_stix2_object(self) -> Stix2Report:
-        """Make stix object."""
-        return ReportStix(
+    def _stix2_arguments(self) -> tuple[type[ReportStix], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return ReportStix, dict(  # noqa: C408 # No literal dict for maintainability
             id=PyctiReport.generate_id(
                 name=self.name,
                 published=self.publication_date,
@@ -79,9 +80,13 @@ class Report(BaseIdentifiedEntity):
             description=self.description,
             report_types=self.report_types,
             labels=self.labels,
-            object_refs=[obj.id for obj in self.objects or []],
+            object_refs=[obj._stix2_id for obj in self.objects or []],
             allow_custom=True,
             x_opencti_reliability=self.reliability,
-            x_opencti_files=[file.to_stix2_object() for file in self.files or []],
+            x_opencti_files=self.files or [],
             **self._common_stix2_properties(),
         )
+
+    def to_stix2_object(self) -> Stix2Report:
+        """Make stix object."""
+        return self._make_stix2_object()
@@ -1,10 +1,9 @@
 """Offer OpenCTI entities."""
 
+from typing import Any
+
 from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
-from connectors_sdk.models.enums import (
-    IndustrySector,
-    Reliability,
-)
+from connectors_sdk.models.enums import IndustrySector, Reliability
 from pycti import Identity as PyctiIdentity
 from pydantic import Field
 from stix2.v21 import Identity as Stix2Identity
@@ -34,16 +33,11 @@ class Sector(BaseIdentifiedEntity):
         description="Aliases of the sector.",
     )
 
-    def to_stix2_object(self) -> Stix2Identity:
-        """Make stix object.
-
-        Notes:
-            - OpenCTI maps STIX Identity SDO to OCTI Sector entity based on `identity_class`.
-            - To create a Sector entity on OpenCTI, `identity_class` MUST be 'class'.
-        """
+    def _stix2_arguments(self) -> tuple[type[Stix2Identity], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
         identity_class = "class"
 
-        return Stix2Identity(
+        return Stix2Identity, dict(  # noqa: C408 # No literal dict for maintainability
             id=PyctiIdentity.generate_id(identity_class=identity_class, name=self.name),
             identity_class=identity_class,
             name=self.name,
@@ -52,5 +46,14 @@ class Sector(BaseIdentifiedEntity):
             allow_custom=True,
             x_opencti_reliability=self.reliability,
             x_opencti_aliases=self.aliases,
-            **self._common_stix2_properties()
+            **self._common_stix2_properties(),
         )
+
+    def to_stix2_object(self) -> Stix2Identity:
+        """Make stix object.
+
+        Notes:
+            - OpenCTI maps STIX Identity SDO to OCTI Sector entity based on `identity_class`.
+            - To create a Sector entity on OpenCTI, `identity_class` MUST be 'class'.
+        """
+        return self._make_stix2_object()
@@ -1,5 +1,7 @@
 """Software."""
 
+from typing import Any
+
 from connectors_sdk.models.base_observable_entity import BaseObservableEntity
 from pydantic import Field
 from stix2.v21 import Software as Stix2Software
@@ -33,14 +35,18 @@ class Software(BaseObservableEntity):
         description="Languages of the software.",
     )
 
-    def to_stix2_object(self) -> Stix2Software:
-        """Make Software STIX2.1 object."""
-        return Stix2Software(
+    def _stix2_arguments(self) -> tuple[type[Stix2Software], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return Stix2Software, dict(  # noqa: C408 # No literal dict for maintainability
             name=self.name,
             version=self.version,
             vendor=self.vendor,
             swid=self.swid,
             cpe=self.cpe,
             languages=self.languages,
-            **self._common_stix2_properties()
+            **self._common_stix2_properties(),
         )
+
+    def to_stix2_object(self) -> Stix2Software:
+        """Make Software STIX2.1 object."""
+        return self._make_stix2_object()
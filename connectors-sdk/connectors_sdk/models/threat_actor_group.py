@@ -1,5 +1,7 @@
 """ThreatActorGroup."""
 
+from typing import Any
+
 from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
 from connectors_sdk.models.enums import (
     AttackMotivation,
@@ -69,6 +71,27 @@ class ThreatActorGroup(BaseIdentifiedEntity):
         description="The personal reasons, motivations, or purposes of the Threat Actor regardless of organizational goals.",
     )
 
+    def _stix2_arguments(self) -> tuple[type[Stix2ThreatActor], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return (
+            Stix2ThreatActor,
+            dict(  # noqa: C408 # No literal dict for maintainability
+                id=PyctiThreatActorGroup.generate_id(name=self.name),
+                name=self.name,
+                description=self.description,
+                aliases=self.aliases,
+                first_seen=self.first_seen,
+                last_seen=self.last_seen,
+                goals=self.goals,
+                sophistication=self.sophistication,
+                resource_level=self.resource_level,
+                primary_motivation=self.primary_motivation,
+                secondary_motivations=self.secondary_motivations,
+                personal_motivations=self.personal_motivations,
+                **self._common_stix2_properties(),
+            ),
+        )
+
     def to_stix2_object(self) -> Stix2ThreatActor:
         """Make stix object.
 
@@ -76,18 +99,4 @@ class ThreatActorGroup(BaseIdentifiedEntity):
             - OpenCTI maps STIX Threat Actor SDO to OCTI Threat Actor Group entity based on its `id`.
             - To create an Threat Actor Group on OpenCTI, `id` MUST be generated thanks to `PyctiThreatActorGroup.generate_id` method.
         """
-        return Stix2ThreatActor(
-            id=PyctiThreatActorGroup.generate_id(name=self.name),
-            name=self.name,
-            description=self.description,
-            aliases=self.aliases,
-            first_seen=self.first_seen,
-            last_seen=self.last_seen,
-            goals=self.goals,
-            sophistication=self.sophistication,
-            resource_level=self.resource_level,
-            primary_motivation=self.primary_motivation,
-            secondary_motivations=self.secondary_motivations,
-            personal_motivations=self.personal_motivations,
-            **self._common_stix2_properties()
-        )
+        return self._make_stix2_object()
@@ -1,5 +1,7 @@
 """URL."""
 
+from typing import Any
+
 from connectors_sdk.models.base_observable_entity import BaseObservableEntity
 from pydantic import Field
 from stix2.v21 import URL as Stix2URL  # noqa: N811 # URL is not a constant but a class
@@ -13,9 +15,13 @@ class URL(BaseObservableEntity):
         min_length=1,
     )
 
-    def to_stix2_object(self) -> Stix2URL:
-        """Make stix object."""
-        return Stix2URL(
+    def _stix2_arguments(self) -> tuple[type[Stix2URL], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return Stix2URL, dict(  # noqa: C408 # No literal dict for maintainability
             value=self.value,
             **self._common_stix2_properties(),
         )
+
+    def to_stix2_object(self) -> Stix2URL:
+        """Make stix object."""
+        return self._make_stix2_object()
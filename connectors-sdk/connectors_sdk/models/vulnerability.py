@@ -1,5 +1,7 @@
 """Vulnerability."""
 
+from typing import Any
+
 from connectors_sdk.models.base_identified_entity import BaseIdentifiedEntity
 from connectors_sdk.models.enums import CvssSeverity
 from pycti import Vulnerability as PyctiVulnerability
@@ -211,9 +213,9 @@ class Vulnerability(BaseIdentifiedEntity):
         "exploit techniques, exploit code availability, or active, “in-the-wild” exploitation. Abbreviation: E",
     )
 
-    def to_stix2_object(self) -> Stix2Vulnerability:
-        """Make Vulnerability STIX2.1 object."""
-        return Stix2Vulnerability(
+    def _stix2_arguments(self) -> tuple[type[Stix2Vulnerability], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return Stix2Vulnerability, dict(  # noqa: C408 # No literal dict for maintainability
             id=PyctiVulnerability.generate_id(name=self.name),
             name=self.name,
             description=self.description,
@@ -262,5 +264,9 @@ class Vulnerability(BaseIdentifiedEntity):
             x_opencti_cvss_v4_availability_impact_v=self.cvss_v4_vs_availability_impact,
             x_opencti_cvss_v4_availability_impact_s=self.cvss_v4_ss_availability_impact,
             x_opencti_cvss_v4_exploit_maturity=self.cvss_v4_exploit_maturity,
-            **self._common_stix2_properties()
+            **self._common_stix2_properties(),
         )
+
+    def to_stix2_object(self) -> Stix2Vulnerability:
+        """Make Vulnerability STIX2.1 object."""
+        return self._make_stix2_object()
@@ -1,5 +1,7 @@
 """X509Certificate."""
 
+from typing import Any
+
 from connectors_sdk.models.base_observable_entity import BaseObservableEntity
 from connectors_sdk.models.enums import HashAlgorithm
 from pydantic import AwareDatetime, Field
@@ -129,35 +131,42 @@ class X509Certificate(BaseObservableEntity):
         description="The policy mappings extension of the certificate.",
     )
 
+    def _stix2_arguments(self) -> tuple[type[Stix2X509Certificate], dict[str, Any]]:
+        """Return the stix2 class and the keyword arguments of the stix object."""
+        return (
+            Stix2X509Certificate,
+            dict(  # noqa: C408 # No literal dict for maintainability
+                is_self_signed=self.is_self_signed,
+                hashes={k.value: v for k, v in (self.hashes or {}).items()},
+                serial_number=self.serial_number,
+                signature_algorithm=self.signature_algorithm,
+                issuer=self.issuer,
+                validity_not_before=self.validity_not_before,
+                validity_not_after=self.validity_not_after,
+                subject=self.subject,
+                subject_public_key_algorithm=self.subject_public_key_algorithm,
+                subject_public_key_modulus=self.subject_public_key_modulus,
+                subject_public_key_exponent=self.subject_public_key_exponent,
+                basic_constraints=self.basic_constraints,
+                name_constraints=self.name_constraints,
+                policy_constraints=self.policy_constraints,
+                key_usage=self.key_usage,
+                extended_key_usage=self.extended_key_usage,
+                subject_key_identifier=self.subject_key_identifier,
+                authority_key_identifier=self.authority_key_identifier,
+                subject_alternative_name=self.subject_alternative_name,
+                issuer_alternative_name=self.issuer_alternative_name,
+                subject_directory_attributes=self.subject_directory_attributes,
+                crl_distribution_points=self.crl_distribution_points,
+                inhibit_any_policy=self.inhibit_any_policy,
+                private_key_usage_period_not_before=self.private_key_usage_period_not_before,
+                private_key_usage_period_not_after=self.private_key_usage_period_not_after,
+                certificate_policies=self.certificate_policies,
+                policy_mappings=self.policy_mappings,
+                **self._common_stix2_properties(),
+            ),
+        )
+
     def to_stix2_object(self) -> Stix2X509Certificate:
         """Make stix object."""
-        return Stix2X509Certificate(
-            is_self_signed=self.is_self_signed,
-            hashes={k.value: v for k, v in (self.hashes or {}).items()},
-            serial_number=self.serial_number,
-            signature_algorithm=self.signature_algorithm,
-            issuer=self.issuer,
-            validity_not_before=self.validity_not_before,
-            validity_not_after=self.validity_not_after,
-            subject=self.subject,
-            subject_public_key_algorithm=self.subject_public_key_algorithm,
-            subject_public_key_modulus=self.subject_public_key_modulus,
-            subject_public_key_exponent=self.subject_public_key_exponent,
-            basic_constraints=self.basic_constraints,
-            name_constraints=self.name_constraints,
-            policy_constraints=self.policy_constraints,
-            key_usage=self.key_usage,
-            extended_key_usage=self.extended_key_usage,
-            subject_key_identifier=self.subject_key_identifier,
-            authority_key_identifier=self.authority_key_identifier,
-            subject_alternative_name=self.subject_alternative_name,
-            issuer_alternative_name=self.issuer_alternative_name,
-            subject_directory_attributes=self.subject_directory_attributes,
-            crl_distribution_points=self.crl_distribution_points,
-            inhibit_any_policy=self.inhibit_any_policy,
-            private_key_usage_period_not_before=self.private_key_usage_period_not_before,
-            private_key_usage_period_not_after=self.private_key_usage_period_not_after,
-            certificate_policies=self.certificate_policies,
-            policy_mappings=self.policy_mappings,
-            **self._common_stix2_properties(),
-        )
+        return self._make_stix2_object()
@@ -7,6 +7,7 @@ These models can be extended to create specific configurations for different typ
 """
 
 import os
+import weakref
 from abc import ABC
 from copy import deepcopy
 from datetime import timedelta
@@ -111,23 +112,26 @@ class _SettingsLoader(BaseSettings):
         """
         _main_path = os.path.dirname(os.path.abspath(__main__.__file__))
 
-        settings_cls.model_config["env_file"] = f"{_main_path}/../.env"
+        # The paths are passed to the sources rather than set in `model_config`, as
+        # the settings loader classes are cached (see `build_loader_from_model`)
+        env_file = f"{_main_path}/../.env"
 
-        if not settings_cls.model_config["yaml_file"]:
+        yaml_file = settings_cls.model_config.get("yaml_file")
+        if not yaml_file:
             if Path(f"{_main_path}/config.yml").is_file():
-                settings_cls.model_config["yaml_file"] = f"{_main_path}/config.yml"
+                yaml_file = f"{_main_path}/config.yml"
             if Path(f"{_main_path}/../config.yml").is_file():
-                settings_cls.model_config["yaml_file"] = f"{_main_path}/../config.yml"
+                yaml_file = f"{_main_path}/../config.yml"
 
-        if Path(settings_cls.model_config["yaml_file"] or "").is_file():  # type: ignore
+        if Path(yaml_file or "").is_file():  # type: ignore
             return (
                 env_settings,
-                YamlConfigSettingsSource(settings_cls),
+                YamlConfigSettingsSource(settings_cls, yaml_file=yaml_file),
             )
-        if Path(settings_cls.model_config["env_file"] or "").is_file():  # type: ignore
+        if Path(env_file).is_file():
             return (
                 env_settings,
-                DotEnvSettingsSource(settings_cls),
+                DotEnvSettingsSource(settings_cls, env_file=env_file),
             )
         return (env_settings,)
 
@@ -153,7 +157,23 @@ class _SettingsLoader(BaseSettings):
         Returns:
             type[_SettingsLoader]: A dynamically generated subclass of `_SettingsLoader`
                 where all fields accept raw, unvalidated input.
+
+        Notes:
+            The generated class is cached per settings class, as building its schema
+            is costly. It holds no configuration values: environment variables and
+            config files are read each time it is instantiated.
         """
+        settings_loader = _settings_loaders.get(connector_settings)
+        if settings_loader is None:
+            settings_loader = cls._build_loader_from_model(connector_settings)
+            _settings_loaders[connector_settings] = settings_loader
+        return settings_loader
+
+    @classmethod
+    def _build_loader_from_model(
+        cls, connector_settings: type["BaseConnectorSettings"]
+    ) -> type["_SettingsLoader"]:
+        """Build the `_SettingsLoader` subclass of `build_loader_from_model`."""
 
         class SettingsLoader(_SettingsLoader): ...
 
@@ -176,6 +196,12 @@ class _SettingsLoader(BaseSettings):
         return SettingsLoader
 
 
+# Settings loaders built by `_SettingsLoader.build_loader_from_model`, per settings class
+_settings_loaders: weakref.WeakKeyDictionary[
+    type["BaseConnectorSettings"], type[_SettingsLoader]
+] = weakref.WeakKeyDictionary()
+
+
 class BaseConnectorSettings(BaseConfigModel, ABC):
     """Interface class for managing and loading the global configuration for connectors.
 
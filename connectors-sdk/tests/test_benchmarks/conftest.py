@@ -0,0 +1,239 @@
+"""Provide the benchmark fixture and the fake graphs of the benchmark suite.
+
+Each benchmark measures the wall time of an operation, then its peak of allocated
+memory (in a second run, as tracemalloc slows the traced code down). The results
+are printed in the pytest terminal summary.
+
+Environment variables:
+    CONNECTORS_SDK_BENCHMARK_SCALE: Multiply the size of the fake graphs (default 1).
+    CONNECTORS_SDK_BENCHMARK_PROFILE: Directory where to write, for each benchmark,
+        the cProfile stats (`<name>.prof`, readable with `python -m pstats`) and the
+        tracemalloc top allocations (`<name>.tracemalloc.txt`). Profiling is off
+        when unset.
+"""
+
+import cProfile
+import os
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import pytest
+from connectors_sdk.models import (
+    BaseObject,
+    ExternalReference,
+    Indicator,
+    IPV4Address,
+    KillChainPhase,
+    OrganizationAuthor,
+    Relationship,
+    Report,
+    TLPMarking,
+)
+
+SCALE = int(os.environ.get("CONNECTORS_SDK_BENCHMARK_SCALE", "1"))
+PROFILE_DIRECTORY = os.environ.get("CONNECTORS_SDK_BENCHMARK_PROFILE")
+
+RESULTS: list["BenchmarkResult"] = []
+
+
+@dataclass
+class BenchmarkResult:
+    """Measures of a benchmarked operation."""
+
+    name: str
+    count: int
+    seconds: float
+    peak_memory: int
+
+    @property
+    def per_second(self) -> float:
+        """Return the number of items processed per second."""
+        return self.count / self.seconds if self.seconds else float("inf")
+
+
+@dataclass
+class FakeGraph:
+    """Realistic set of models, as built by an external import connector."""
+
+    author: OrganizationAuthor
+    markings: list[TLPMarking]
+    observables: list[IPV4Address] = field(default_factory=list)
+    indicators: list[Indicator] = field(default_factory=list)
+    relationships: list[Relationship] = field(default_factory=list)
+    reports: list[Report] = field(default_factory=list)
+
+    @property
+    def objects(self) -> list[BaseObject]:
+        """Return all the models of the graph."""
+        return [
+            self.author,
+            *self.markings,
+            *self.observables,
+            *self.indicators,
+            *self.relationships,
+            *self.reports,
+        ]
+
+
+def build_graph(size: int, objects_per_report: int = 10) -> FakeGraph:
+    """Build a graph of `size` observables and indicators, their relationships and reports.
+
+    Reports reference `objects_per_report` observables, with their indicators
+    and relationships, in their object_refs.
+    """
+    author = OrganizationAuthor(name="Benchmark Corp")
+    markings = [TLPMarking(level="amber+strict"), TLPMarking(level="green")]
+    kill_chain_phases = [
+        KillChainPhase(chain_name="mitre-attack", phase_name="command-and-control")
+    ]
+    graph = FakeGraph(author=author, markings=markings)
+    for i in range(size):
+        value = f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"
+        external_references = [
+            ExternalReference(
+                source_name="Benchmark Feed",
+                url=f"https://feed.example.com/ip/{value}",
+                external_id=str(i),
+            )
+        ]
+        observable = IPV4Address(
+            value=value,
+            score=50,
+            labels=["c2", "benchmark"],
+            author=author,
+            markings=markings,
+            external_references=external_references,
+        )
+        indicator = Indicator(
+            name=value,
+            pattern=f"[ipv4-addr:value = '{value}']",
+            pattern_type="stix",
+            main_observable_type="IPv4-Addr",
+            valid_from="2024-01-01T00:00:00Z",
+            kill_chain_phases=kill_chain_phases,
+            score=50,
+            author=author,
+            markings=markings,
+            external_references=external_references,
+        )
+        graph.observables.append(observable)
+        graph.indicators.append(indicator)
+        graph.relationships.append(
+            Relationship(
+                type="based-on",
+                source=indicator,
+                target=observable,
+                author=author,
+                markings=markings,
+            )
+        )
+    for start in range(0, size, objects_per_report):
+        end = start + objects_per_report
+        graph.reports.append(
+            Report(
+                name=f"Benchmark report {start // objects_per_report}",
+                publication_date="2024-01-01T00:00:00Z",
+                objects=[
+                    *graph.observables[start:end],
+                    *graph.indicators[start:end],
+                    *graph.relationships[start:end],
+                ],
+                author=author,
+                markings=markings,
+            )
+        )
+    return graph
+
+
+@pytest.fixture(scope="session")
+def graph_size() -> int:
+    """Return the number of observables (and indicators) of the fake graphs."""
+    return 10 * SCALE
+
+
+@pytest.fixture(scope="session")
+def build_fake_graph() -> Callable[..., FakeGraph]:
+    """Fixture to build new fake graphs, e.g. to benchmark the models construction."""
+    return build_graph
+
+
+@pytest.fixture(scope="session")
+def fake_graph(graph_size) -> FakeGraph:
+    """Fixture to build a fake graph once for all the read-only benchmarks."""
+    return build_graph(graph_size)
+
+
+def _profile(name: str, operation: Callable[[], Any]) -> None:
+    """Write the cProfile stats and the tracemalloc top allocations of an operation."""
+    directory = Path(PROFILE_DIRECTORY)  # type: ignore[arg-type]
+    directory.mkdir(parents=True, exist_ok=True)
+
+    profiler = cProfile.Profile()
+    profiler.runcall(operation)
+    profiler.dump_stats(directory / f"{name}.prof")
+
+    tracemalloc.start()
+    try:
+        _ = operation()  # Keep the result alive in the snapshot
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    with open(directory / f"{name}.tracemalloc.txt", "w") as file:
+        file.writelines(
+            f"{statistic}\n" for statistic in snapshot.statistics("lineno")[:30]
+        )
+
+
+@pytest.fixture
+def benchmark() -> Callable[..., BenchmarkResult]:
+    """Fixture to measure the time and peak memory of an operation on `count` items.
+
+    The operation is called three times: once timed, once traced by tracemalloc,
+    and once more profiled when CONNECTORS_SDK_BENCHMARK_PROFILE is set. It must
+    therefore give the same result when repeated.
+    """
+
+    def _benchmark(
+        name: str, operation: Callable[[], Any], count: int
+    ) -> BenchmarkResult:
+        start = time.perf_counter()
+        operation()
+        seconds = time.perf_counter() - start
+
+        tracemalloc.start()
+        try:
+            operation()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        if PROFILE_DIRECTORY:
+            _profile(name, operation)
+
+        result = BenchmarkResult(
+            name=name, count=count, seconds=seconds, peak_memory=peak_memory
+        )
+        RESULTS.append(result)
+        return result
+
+    return _benchmark
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Print the results of the benchmarks run in the session."""
+    _ = exitstatus, config  # Unused parameters, but required by pytest
+    if not RESULTS:
+        return
+    terminalreporter.section("connectors-sdk benchmarks")
+    terminalreporter.write_line(
+        f"{'operation':<40} {'items':>8} {'seconds':>10} {'items/s':>10} {'peak KiB':>10}"
+    )
+    for result in RESULTS:
+        terminalreporter.write_line(
+            f"{result.name:<40} {result.count:>8} {result.seconds:>10.3f} "
+            f"{result.per_second:>10.0f} {result.peak_memory / 1024:>10.0f}"
+        )
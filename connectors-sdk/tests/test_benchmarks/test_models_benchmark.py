@@ -0,0 +1,114 @@
+"""Benchmark the models operations on a realistic graph.
+
+The budgets are an order of magnitude above the measured times: they catch
+performance regressions (e.g. an operation becoming quadratic), not noise.
+"""
+
+import json
+
+# Maximum number of seconds per item
+CONSTRUCTION_BUDGET = 0.5
+VALIDATE_ASSIGNMENT_BUDGET = 0.03
+ID_BUDGET = 0.1
+TO_STIX2_OBJECT_BUDGET = 0.1
+TO_STIX_DICT_BUDGET = 0.1
+HASH_BUDGET = 0.15
+# Minimum speedup of `to_stix_dict` over the stix2 serialization
+TO_STIX_DICT_SPEEDUP_BUDGET = 1.5
+
+
+def test_benchmark_model_construction(benchmark, build_fake_graph, graph_size):
+    """Benchmark the construction of the models of a graph."""
+    # Given the number of observables of a graph
+    # When building the graph
+    result = benchmark(
+        "model_construction", lambda: build_fake_graph(graph_size), count=graph_size * 3
+    )
+    # Then it should be built within the budget
+    assert result.seconds / result.count < CONSTRUCTION_BUDGET
+
+
+def test_benchmark_validate_assignment(benchmark, build_fake_graph, graph_size):
+    """Benchmark the re-validation of the models when a field is set."""
+    # Given the indicators of a graph
+    indicators = build_fake_graph(graph_size).indicators
+
+    # When setting one of their fields
+    def set_descriptions():
+        for indicator in indicators:
+            indicator.description = "Updated description"
+
+    result = benchmark("validate_assignment", set_descriptions, count=len(indicators))
+    # Then the models should be re-validated within the budget
+    assert indicators[0].description == "Updated description"
+    assert result.seconds / result.count < VALIDATE_ASSIGNMENT_BUDGET
+
+
+def test_benchmark_computed_id(benchmark, fake_graph):
+    """Benchmark the computation of the id of the models."""
+    # Given the models of a graph
+    objects = [obj for obj in fake_graph.objects if hasattr(obj, "id")]
+    # When computing their ids
+    result = benchmark(
+        "computed_id", lambda: [obj.id for obj in objects], count=len(objects)
+    )
+    # Then they should be computed within the budget
+    assert result.seconds / result.count < ID_BUDGET
+
+
+def test_benchmark_to_stix2_object(benchmark, fake_graph):
+    """Benchmark the conversion of the models to stix2 objects."""
+    # Given the models of a graph
+    objects = fake_graph.objects
+    # When converting them to stix2 objects
+    result = benchmark(
+        "to_stix2_object",
+        lambda: [obj.to_stix2_object() for obj in objects],
+        count=len(objects),
+    )
+    # Then they should be converted within the budget
+    assert result.seconds / result.count < TO_STIX2_OBJECT_BUDGET
+
+
+def test_benchmark_to_stix_dict(benchmark, fake_graph):
+    """Benchmark the conversion of the models to stix dicts."""
+    # Given the models of a graph
+    objects = fake_graph.objects
+    # When converting them to stix dicts
+    result = benchmark(
+        "to_stix_dict",
+        lambda: [obj.to_stix_dict() for obj in objects],
+        count=len(objects),
+    )
+    # Then they should be converted within the budget
+    assert result.seconds / result.count < TO_STIX_DICT_BUDGET
+
+
+def test_benchmark_to_stix_dict_speedup(benchmark, fake_graph):
+    """Benchmark the conversion to stix dicts against the stix2 serialization."""
+    # Given the models of a graph
+    objects = fake_graph.objects
+    # When converting them with the stix2 serialization and with the fast path
+    stix2_result = benchmark(
+        "stix2_serialization",
+        lambda: [json.loads(obj.to_stix2_object().serialize()) for obj in objects],
+        count=len(objects),
+    )
+    stix_dict_result = benchmark(
+        "to_stix_dict_fast_path",
+        lambda: [obj.to_stix_dict() for obj in objects],
+        count=len(objects),
+    )
+    # Then the fast path should be faster, within the budget
+    speedup = stix2_result.seconds / stix_dict_result.seconds
+    assert speedup > TO_STIX_DICT_SPEEDUP_BUDGET
+
+
+def test_benchmark_hash(benchmark, fake_graph):
+    """Benchmark the hash of the models, used to deduplicate them in sets."""
+    # Given the models of a graph
+    objects = fake_graph.objects
+    # When deduplicating them in a set
+    result = benchmark("hash", lambda: set(objects), count=len(objects))
+    # Then they should be hashed within the budget
+    assert result.seconds / result.count < HASH_BUDGET
@@ -0,0 +1,37 @@
+"""Benchmark the loading of the connectors settings.
+
+The budget is an order of magnitude above the measured time: it catches
+performance regressions, not noise.
+"""
+
+import pytest
+from connectors_sdk.settings.base_settings import BaseConnectorSettings
+
+# Maximum number of seconds per settings loading
+SETTINGS_LOADING_BUDGET = 0.025
+
+LOADINGS = 50
+
+
+@pytest.fixture
+def mock_connector_environment(monkeypatch):
+    """Fixture to set the environment variables of a connector."""
+    monkeypatch.setenv("OPENCTI_URL", "http://localhost:8080")
+    monkeypatch.setenv("OPENCTI_TOKEN", "changeme")
+    monkeypatch.setenv("CONNECTOR_ID", "connector-poc--uid")
+    monkeypatch.setenv("CONNECTOR_NAME", "Test Connector")
+    monkeypatch.setenv("CONNECTOR_SCOPE", "test")
+    monkeypatch.setenv("CONNECTOR_LOG_LEVEL", "error")
+
+
+def test_benchmark_settings_loading(benchmark, mock_connector_environment):
+    """Benchmark the loading of BaseConnectorSettings from the environment."""
+    # Given the environment variables of a connector
+    # When loading its settings repeatedly
+    result = benchmark(
+        "settings_loading",
+        lambda: [BaseConnectorSettings() for _ in range(LOADINGS)],
+        count=LOADINGS,
+    )
+    # Then they should be loaded within the budget
+    assert result.seconds / result.count < SETTINGS_LOADING_BUDGET
@@ -0,0 +1,70 @@
+"""Offer tests for the lazy import of the models."""
+
+import subprocess
+import sys
+
+import connectors_sdk.models
+import pytest
+
+
+def _imported_modules(code: str) -> set[str]:
+    """Return the modules imported by running `code` in a new interpreter."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # stderr lines look like "import time:       123 |        456 |   module.name"
+    return {
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+def test_models_package_import_should_not_load_stix2_nor_pycti():
+    """Test that importing connectors_sdk.models does not import stix2 nor pycti."""
+    # Given a new interpreter
+    # When importing the models package only
+    modules = _imported_modules("import connectors_sdk.models")
+    # Then stix2 and pycti should not be imported
+    assert "connectors_sdk.models" in modules
+    assert not {
+        module for module in modules if module.split(".")[0] in {"stix2", "pycti"}
+    }
+
+
+def test_models_should_be_imported_on_first_access():
+    """Test that accessing a model imports its module."""
+    # Given a new interpreter where the models package is imported
+    # When accessing a model
+    # Then its module should be imported
+    code = (
+        "import sys, connectors_sdk.models\n"
+        "assert 'connectors_sdk.models.kill_chain_phase' not in sys.modules\n"
+        "connectors_sdk.models.KillChainPhase\n"
+        "assert 'connectors_sdk.models.kill_chain_phase' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+
+
+@pytest.mark.parametrize("name", connectors_sdk.models.__all__)
+def test_models_public_names_should_be_resolved(name):
+    """Test that every public name of the package is resolved and listed."""
+    # Given a public name of the models package
+    # When accessing it
+    value = getattr(connectors_sdk.models, name)
+    # Then it should be the class defined in the models modules
+    assert value.__name__ == name
+    assert value.__module__.startswith("connectors_sdk.models.")
+    assert name in dir(connectors_sdk.models)
+
+
+def test_models_unknown_name_should_raise_attribute_error():
+    """Test that an unknown name raises an AttributeError."""
+    # Given the models package
+    # When accessing an unknown name
+    # Then an AttributeError should be raised
+    with pytest.raises(AttributeError, match="has no attribute 'Unknown'"):
+        _ = connectors_sdk.models.Unknown
@@ -0,0 +1,278 @@
+"""Offer tests for the `to_stix_dict` path of the models."""
+
+import datetime
+import json
+from unittest import mock
+
+import pytest
+import stix2.utils
+from connectors_sdk.models import (
+    URL,
+    AdministrativeArea,
+    AssociatedFile,
+    AttackPattern,
+    AutonomousSystem,
+    City,
+    Country,
+    DomainName,
+    File,
+    Hostname,
+    Indicator,
+    Individual,
+    IntrusionSet,
+    IPV4Address,
+    IPV6Address,
+    KillChainPhase,
+    Malware,
+    Note,
+    Organization,
+    OrganizationAuthor,
+    Region,
+    Relationship,
+    Report,
+    Sector,
+    Software,
+    ThreatActorGroup,
+    TLPMarking,
+    Vulnerability,
+    X509Certificate,
+)
+from connectors_sdk.models._stix_dict import make_stix_dict
+from connectors_sdk.models.base_object import BaseObject
+
+FIXED_TIMESTAMP = stix2.utils.STIXdatetime(
+    2024, 1, 2, 3, 4, 5, 678900, tzinfo=datetime.timezone.utc
+)
+
+
+@pytest.fixture
+def fixed_timestamp():
+    """Fixture to generate the same timestamps in the stix2 and stix dict paths."""
+    with (
+        mock.patch("stix2.base.get_timestamp", return_value=FIXED_TIMESTAMP),
+        mock.patch(
+            "connectors_sdk.models._stix_dict.get_timestamp",
+            return_value=FIXED_TIMESTAMP,
+        ),
+    ):
+        yield
+
+
+def _fake_models(
+    author, markings, external_references, associated_files
+) -> list[BaseObject]:
+    """Build one instance of every model, with most of their properties set."""
+    common = dict(  # noqa: C408 # No literal dict for readability
+        author=author, markings=markings, external_references=external_references
+    )
+    kill_chain_phases = [KillChainPhase(chain_name="mitre", phase_name="execution")]
+    ipv4 = IPV4Address(
+        value="1.2.3.4",
+        score=50,
+        description="An IPv4",
+        labels=["label"],
+        associated_files=associated_files,
+        create_indicator=True,
+        **common,
+    )
+    indicator = Indicator(
+        name="Indicator",
+        pattern="[ipv4-addr:value = '1.2.3.4']",
+        pattern_type="stix",
+        main_observable_type="IPv4-Addr",
+        valid_from="2023-01-01T00:00:00+06:00",
+        kill_chain_phases=kill_chain_phases,
+        score=40,
+        associated_files=associated_files,
+        **common,
+    )
+    return [
+        author,
+        *markings,
+        *external_references,
+        *kill_chain_phases,
+        *associated_files,
+        ipv4,
+        indicator,
+        Indicator(name="Sigma", pattern="title: x", pattern_type="sigma", **common),
+        IPV6Address(value="::1", **common),
+        DomainName(value="example.com", **common),
+        URL(value="http://example.com", **common),
+        Hostname(value="host", **common),
+        File(name="a.exe", hashes={"SHA-256": "a" * 64, "MD5": "b" * 32}, **common),
+        File(name="b.exe", size=3, **common),
+        AutonomousSystem(number=12, name="AS", **common),
+        Software(name="Software", version="1", cpe="cpe:2.3:a:x", **common),
+        Malware(
+            name="Malware",
+            is_family=True,
+            kill_chain_phases=kill_chain_phases,
+            first_seen="2023-01-01T00:00:00Z",
+            **common,
+        ),
+        IntrusionSet(name="Intrusion Set", aliases=["alias"], **common),
+        ThreatActorGroup(name="Threat Actor Group", **common),
+        AttackPattern(
+            name="Attack Pattern",
+            mitre_id="T1000",
+            kill_chain_phases=kill_chain_phases,
+            **common,
+        ),
+        Vulnerability(name="CVE-2020-1", cvss_v3_base_score=5.0, **common),
+        Country(name="France", **common),
+        City(name="Paris", latitude=1, longitude=2.5, **common),
+        Region(name="Europe", **common),
+        AdministrativeArea(name="Ile-de-France", **common),
+        Sector(name="Energy", **common),
+        Individual(name="Individual", **common),
+        Organization(name="Organization", **common),
+        Report(
+            name="Report",
+            publication_date="2024-01-01T00:00:00Z",
+            objects=[ipv4, indicator],
+            files=associated_files,
+            **common,
+        ),
+        Note(
+            content="Note",
+            publication_date="2024-01-01T00:00:00Z",
+            objects=[ipv4],
+            **common,
+        ),
+        Relationship(
+            type="related-to",
+            source=ipv4,
+            target=indicator,
+            start_time="2024-01-01T00:00:00.5Z",
+            **common,
+        ),
+        X509Certificate(
+            serial_number="1",
+            is_self_signed=False,
+            hashes={"SHA-256": "c" * 64},
+            validity_not_before="2024-01-01T00:00:00Z",
+            **common,
+        ),
+    ]
+
+
+@pytest.fixture
+def fake_models(
+    fake_valid_organization_author,
+    fake_valid_tlp_markings,
+    fake_valid_external_references,
+) -> list[BaseObject]:
+    """Fixture to create one instance of every model."""
+    return _fake_models(
+        fake_valid_organization_author,
+        [*fake_valid_tlp_markings, TLPMarking(level="white")],
+        fake_valid_external_references,
+        [
+            AssociatedFile(
+                name="example_file.txt",
+                content=b"content",
+                mime_type="text/plain",
+                markings=[TLPMarking(level="white")],
+                version="1.0.0",
+            )
+        ],
+    )
+
+
+def test_to_stix_dict_should_be_identical_to_stix2_object_serialization(
+    fixed_timestamp, fake_models
+):
+    """Test that to_stix_dict and to_stix2_object produce the same JSON."""
+    # Given an instance of every model
+    for model in fake_models:
+        # When converting it with both paths
+        stix2_json = model.to_stix2_object().serialize()
+        stix_dict_json = json.dumps(model.to_stix_dict())
+        # Then the JSON should be identical, properties order included
+        assert stix_dict_json == stix2_json, type(model).__name__
+
+
+def test_make_stix_dict_should_generate_observable_id_from_contributing_properties():
+    """Test that make_stix_dict generates the deterministic id of observables."""
+    # Given the properties of an observable without id
+    properties = {"value": "example.com"}
+    # When making its stix dict
+    stix_dict = make_stix_dict(stix2.DomainName, properties)
+    # Then the id should be the one generated by stix2
+    assert stix_dict["id"] == stix2.DomainName(**properties).id
+
+
+def test_make_stix_dict_should_keep_random_id_without_contributing_properties():
+    """Test that make_stix_dict keeps a random id when no property contributes to it."""
+    # Given the properties of an observable without id contributing property
+    properties = {"size": 3}
+    # When making its stix dict
+    stix_dict = make_stix_dict(stix2.File, properties)
+    # Then a random id should be set
+    assert stix_dict["id"].startswith("file--")
+
+
+def test_to_stix_dict_should_fall_back_on_stix2_without_fast_path():
+    """Test that models without `_stix2_arguments` serialize their stix2 object."""
+    # Given a model without fast path
+    marking = TLPMarking(level="amber")
+    # When making its stix dict
+    stix_dict = marking.to_stix_dict()
+    # Then it should be the JSON of its stix2 object
+    assert marking._stix2_arguments() is None
+    assert stix_dict == json.loads(marking.to_stix2_object().serialize())
+
+
+def test_to_stix_dict_should_not_build_the_stix2_objects_of_references(
+    fake_valid_organization_author, fake_valid_tlp_markings
+):
+    """Test that the ids of the author and markings are not recomputed."""
+    # Given an indicator with an author and markings
+    indicator = Indicator(
+        name="Indicator",
+        pattern="[ipv4-addr:value = '1.2.3.4']",
+        pattern_type="stix",
+        author=fake_valid_organization_author,
+        markings=fake_valid_tlp_markings,
+    )
+    # When making its stix dict
+    with (
+        mock.patch.object(
+            OrganizationAuthor, "to_stix2_object", side_effect=AssertionError
+        ),
+        mock.patch.object(TLPMarking, "to_stix2_object", side_effect=AssertionError),
+    ):
+        stix_dict = indicator.to_stix_dict()
+    # Then the references should be the cached ids
+    assert stix_dict["created_by_ref"] == fake_valid_organization_author.id
+    assert stix_dict["object_marking_refs"] == [
+        marking.id for marking in fake_valid_tlp_markings
+    ]
+
+
+def test_references_should_follow_the_updated_ids(fake_valid_organization_author):
+    """Test that an updated reference changes the ids it is referenced by."""
+    # Given an organization referenced as the author of an indicator
+    indicator = Indicator(
+        name="Indicator",
+        pattern="[ipv4-addr:value = '1.2.3.4']",
+        pattern_type="stix",
+        author=fake_valid_organization_author,
+    )
+    # When renaming the author
+    with pytest.warns(UserWarning):
+        fake_valid_organization_author.name = "Renamed author"
+    # Then the indicator should reference its new id
+    assert indicator.to_stix_dict()["created_by_ref"] == (
+        fake_valid_organization_author.to_stix2_object().id
+    )
+
+
+def test_make_stix2_object_should_require_the_fast_path():
+    """Test that `_make_stix2_object` is only usable with `_stix2_arguments`."""
+    # Given a model without fast path
+    marking = TLPMarking(level="amber")
+    # When making its stix object from its arguments
+    # Then an error should be raised
+    with pytest.raises(TypeError):
+        marking._make_stix2_object()
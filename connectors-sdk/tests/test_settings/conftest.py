@@ -34,7 +34,7 @@ def mock_env_file_presence(monkeypatch):
 
 @pytest.fixture
 def mock_yaml_config_settings_read_files(monkeypatch):
-    def read_files(_, __):
+    def read_files(_, __, **___):
         return {
             "connector": {
                 "duration_period": "PT5M",
@@ -1,7 +1,7 @@
 import pytest
 from connectors_sdk.settings.base_settings import BaseConnectorSettings, _SettingsLoader
 from connectors_sdk.settings.exceptions import ConfigValidationError
-from pydantic import HttpUrl
+from pydantic import HttpUrl, create_model
 
 
 def test_should_create_bare_settings_loader(mock_basic_environment):
@@ -103,3 +103,53 @@ def test_should_load_settings_from_env_file(
     assert settings.connector.name == "Test Connector"
     assert settings.connector.scope == ["test"]
     assert settings.connector.log_level == "error"
+
+
+def test_should_build_settings_loader_once_per_settings_class(
+    mock_basic_environment, monkeypatch
+):
+    class ConnectorSettings(BaseConnectorSettings): ...
+
+    create_model_calls = []
+
+    def spy_create_model(*args, **kwargs):
+        create_model_calls.append(args[0])
+        return create_model(*args, **kwargs)
+
+    monkeypatch.setattr(
+        "connectors_sdk.settings.base_settings.create_model", spy_create_model
+    )
+
+    first_settings = ConnectorSettings()
+    first_calls = len(create_model_calls)
+
+    monkeypatch.setenv("CONNECTOR_NAME", "Other Test Connector")
+    second_settings = ConnectorSettings()
+
+    # The untyped models are only created for the first instantiation
+    assert first_calls > 0
+    assert len(create_model_calls) == first_calls
+    # But the configuration values are read again
+    assert first_settings.connector.name == "Test Connector"
+    assert second_settings.connector.name == "Other Test Connector"
+
+
+def test_should_look_for_config_files_at_each_instantiation(
+    mock_basic_environment, mock_yaml_config_settings_read_files, monkeypatch
+):
+    class ConnectorSettings(BaseConnectorSettings): ...
+
+    monkeypatch.setenv("CONNECTOR_NAME", "Env Test Connector")
+    monkeypatch.setattr("pathlib.Path.is_file", lambda self: self.name == "config.yml")
+    yaml_settings = ConnectorSettings()
+
+    monkeypatch.delenv("CONNECTOR_NAME")
+    monkeypatch.setattr("pathlib.Path.is_file", lambda self: False)
+    with pytest.raises(ConfigValidationError):
+        # The config.yml file found by the first instantiation is not reused
+        ConnectorSettings()
+
+    settings_loader = _SettingsLoader.build_loader_from_model(ConnectorSettings)
+    assert yaml_settings.connector.name == "Env Test Connector"
+    assert not settings_loader.model_config.get("yaml_file")
+    assert not settings_loader.model_config.get("env_file")
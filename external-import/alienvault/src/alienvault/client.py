@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List
+from typing import Iterator, List
 
 from alienvault.models import Pulse
-from OTXv2 import OTXv2
+from alienvault.prefetch import prefetch_pages
+from OTXv2 import SUBSCRIBED, OTXv2
 from pydantic.v1 import parse_obj_as
 
 __all__ = [
@@ -42,3 +43,31 @@ class AlienVaultClient:
         pulses = parse_obj_as(List[Pulse], pulse_data)
 
         return pulses
+
+    def iter_pulses_subscribed_pages(
+        self,
+        modified_since: datetime,
+        limit: int = 20,
+        prefetch: int = 2,
+    ) -> Iterator[List[Pulse]]:
+        """
+        Iterate over the pages of subscribed pulses, in the order of the API.
+
+        Pages are fetched by a background thread, up to `prefetch` pages ahead
+        of the consumer, so that only a bounded number of pages is in memory.
+        :param modified_since: Filter by results modified since this date.
+        :param limit: Number of pulses per page.
+        :param prefetch: Number of pages fetched ahead.
+        :return: An iterator over the pages of pulses.
+        """
+
+        def _fetch_pages() -> Iterator[List[Pulse]]:
+            url = self.otx.create_url(
+                SUBSCRIBED, limit=limit, modified_since=modified_since.isoformat()
+            )
+            while url:
+                data = self.otx.get(url)
+                yield parse_obj_as(List[Pulse], data["results"])
+                url = data.get("next")
+
+        yield from prefetch_pages(_fetch_pages, prefetch)
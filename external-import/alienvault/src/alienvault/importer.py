@@ -2,7 +2,17 @@
 
 import re
 from datetime import datetime
-from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Set
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
 import stix2
 from alienvault.builder import PulseBundleBuilder, PulseBundleBuilderConfig
@@ -111,40 +121,57 @@ class PulseImporter:
 
         latest_pulse_datetime = self._get_latest_pulse_datetime_from_state(state)
 
-        self._info("Fetching subscribed pulses...")
-        pulses = self._fetch_subscribed_pulses(latest_pulse_datetime)
-        pulse_count = len(pulses)
+        self._info("Fetching subscribed pulses since {0}...", latest_pulse_datetime)
 
-        self._info("{0} pulse(s) since {1}...", pulse_count, latest_pulse_datetime)
+        pulse_count = 0
+        failed = 0
+        total_remaining = 0
+        total_filtered = 0
+        new_state = state.copy()
+        latest_pulse_modified_datetime = latest_pulse_datetime
 
-        if self.filter_indicators:
-            """
-            If filtering is enabled, go over each "pulse".
-            Remove any indicators older than latest_pulse_datetime which is stored in connector state.
-            Keep track of how many were removed and how many are left.
-            Log details after each pulse and give a summary at the end.
-            Use case: Ensuring only recent indicators are processed
-            """
-            total_remaining = 0
-            total_filtered = 0
-            for i, pulse in enumerate(pulses, start=1):
-                before_count = len(pulse.indicators)
-                pulse.indicators = [
-                    ind
-                    for ind in pulse.indicators
-                    if ind.created >= latest_pulse_datetime
-                ]
-                after_count = len(pulse.indicators)
-                total_remaining += after_count
-                total_filtered += before_count - after_count
-                self._info(
-                    "({3}/{4}) Filtered {0} indicators past {1} from {2}",
-                    total_filtered,
-                    latest_pulse_datetime,
-                    pulse.name,
-                    i,
-                    pulse_count,
+        # Pulses are streamed page by page. The state is only stored during the
+        # run while the pulses come by increasing modification date, once a
+        # newer pulse confirms that every older pulse has been sent.
+        in_order = True
+        checkpoint_datetime = latest_pulse_datetime
+        sent_since_checkpoint = 0
+
+        for pulses in self._fetch_subscribed_pulses(latest_pulse_datetime):
+            if self.filter_indicators:
+                remaining, filtered = self._filter_indicators(
+                    pulses, latest_pulse_datetime
                 )
+                total_remaining += remaining
+                total_filtered += filtered
+
+            for pulse in pulses:
+                pulse_modified_datetime = pulse.modified
+                if pulse_modified_datetime < latest_pulse_modified_datetime:
+                    in_order = False
+                elif (
+                    in_order
+                    and pulse_modified_datetime > latest_pulse_modified_datetime
+                    and sent_since_checkpoint >= self._STATE_UPDATE_INTERVAL_COUNT
+                ):
+                    checkpoint_datetime = latest_pulse_modified_datetime
+                    sent_since_checkpoint = 0
+                    self._info(
+                        "Store state: {0}: {1}", pulse_count, checkpoint_datetime
+                    )
+                    new_state.update(self._create_pulse_state(checkpoint_datetime))
+                    self._set_state(new_state)
+
+                pulse_count += 1
+                result = self._process_pulse(pulse)
+                if not result:
+                    failed += 1
+                sent_since_checkpoint += 1
+
+                if pulse_modified_datetime > latest_pulse_modified_datetime:
+                    latest_pulse_modified_datetime = pulse_modified_datetime
+
+        if self.filter_indicators:
             if total_filtered > 0:
                 self._info(
                     "Filtered {0} total indicators past {1} ({2} remaining)",
@@ -155,28 +182,6 @@ class PulseImporter:
             else:
                 self._info("No indicators to filter")
 
-        failed = 0
-        new_state = state.copy()
-        latest_pulse_modified_datetime = latest_pulse_datetime
-
-        for count, pulse in enumerate(pulses, start=1):
-            result = self._process_pulse(pulse)
-            if not result:
-                failed += 1
-
-            pulse_modified_datetime = pulse.modified
-            if pulse_modified_datetime > latest_pulse_modified_datetime:
-                latest_pulse_modified_datetime = pulse_modified_datetime
-
-            if count % self._STATE_UPDATE_INTERVAL_COUNT == 0:  # noqa: S001
-                self._info(
-                    "Store state: {0}: {1}", count, latest_pulse_modified_datetime
-                )
-                new_state.update(
-                    self._create_pulse_state(latest_pulse_modified_datetime)
-                )
-                self._set_state(new_state)
-
         imported = pulse_count - failed
 
         self._info(
@@ -189,6 +194,33 @@ class PulseImporter:
 
         return self._create_pulse_state(latest_pulse_modified_datetime)
 
+    def _filter_indicators(
+        self, pulses: List[Pulse], latest_pulse_datetime: datetime
+    ) -> Tuple[int, int]:
+        """
+        Remove the indicators older than latest_pulse_datetime, stored in connector state.
+
+        Use case: Ensuring only recent indicators are processed.
+        :return: The number of remaining and filtered indicators.
+        """
+        total_remaining = 0
+        total_filtered = 0
+        for pulse in pulses:
+            before_count = len(pulse.indicators)
+            pulse.indicators = [
+                ind for ind in pulse.indicators if ind.created >= latest_pulse_datetime
+            ]
+            after_count = len(pulse.indicators)
+            total_remaining += after_count
+            total_filtered += before_count - after_count
+            self._info(
+                "Filtered {0} indicators past {1} from {2}",
+                before_count - after_count,
+                latest_pulse_datetime,
+                pulse.name,
+            )
+        return total_remaining, total_filtered
+
     def _create_pulse_state(self, latest_pulse_timestamp: datetime) -> Dict[str, Any]:
         return {self._LATEST_PULSE_TIMESTAMP: latest_pulse_timestamp.isoformat()}
 
@@ -209,16 +241,10 @@ class PulseImporter:
         fmt_msg = msg.format(*args)
         self.helper.log_error(fmt_msg)
 
-    def _fetch_subscribed_pulses(self, modified_since: datetime) -> List[Pulse]:
-        pulses = self.client.get_pulses_subscribed(modified_since)
-        return self._sort_pulses(pulses)
-
-    @staticmethod
-    def _sort_pulses(pulses: List[Pulse]) -> List[Pulse]:
-        def _key_func(pulse: Pulse) -> datetime:
-            return pulse.modified
-
-        return sorted(pulses, key=_key_func)
+    def _fetch_subscribed_pulses(
+        self, modified_since: datetime
+    ) -> Iterator[List[Pulse]]:
+        return self.client.iter_pulses_subscribed_pages(modified_since)
 
     def _process_pulse(self, pulse: Pulse) -> bool:
         self._info(
@@ -0,0 +1,60 @@
+"""Prefetch the pages of a paginated API in a background thread."""
+
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, TypeVar
+
+__all__ = [
+    "prefetch_pages",
+]
+
+Page = TypeVar("Page")
+
+
+def prefetch_pages(
+    fetch_pages: Callable[[], Iterable[Page]], prefetch: int = 1
+) -> Iterator[Page]:
+    """
+    Iterate over the pages of `fetch_pages`, fetched by a background thread.
+
+    The thread fetches up to `prefetch` pages ahead of the consumer, so that the
+    next page is downloaded while the current one is processed, and only a bounded
+    number of pages is in memory. An error raised while fetching the pages is
+    raised to the consumer, and the thread stops once the consumer stops iterating.
+    :param fetch_pages: Function returning an iterable over the pages.
+    :param prefetch: Number of pages fetched ahead.
+    :return: An iterator over the pages.
+    """
+    pages: queue.Queue = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    end = object()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fetch_pages() -> None:
+        try:
+            for page in fetch_pages():
+                if not _put(page):
+                    return
+            _put(end)
+        except Exception as e:  # noqa: BLE001
+            _put(e)
+
+    threading.Thread(target=_fetch_pages, daemon=True).start()
+    try:
+        while True:
+            page = pages.get()
+            if page is end:
+                return
+            if isinstance(page, Exception):
+                raise page
+            yield page
+    finally:
+        stop.set()
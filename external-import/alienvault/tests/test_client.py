@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from alienvault.client import AlienVaultClient
+
+
+def test_subscribed_pulses_pages_follow_the_next_url():
+    client = AlienVaultClient("https://otx.alienvault.com/", "api-key")
+    client.otx = MagicMock()
+    client.otx.create_url.return_value = "page-1"
+    responses = {
+        "page-1": {"results": [], "next": "page-2"},
+        "page-2": {"results": [], "next": None},
+    }
+    client.otx.get.side_effect = responses.__getitem__
+
+    pages = list(
+        client.iter_pulses_subscribed_pages(
+            datetime(2024, 1, 1, tzinfo=timezone.utc), limit=10
+        )
+    )
+
+    assert pages == [[], []]
+    assert client.otx.create_url.call_args.kwargs == {
+        "limit": 10,
+        "modified_since": "2024-01-01T00:00:00+00:00",
+    }
+    assert [c.args[0] for c in client.otx.get.call_args_list] == ["page-1", "page-2"]
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """OpenCTI CrowdStrike indicator importer module."""
 
+from datetime import datetime
 from typing import Any, Dict, List, NamedTuple, Optional, Set
 
 from crowdstrike_feeds_services.client.indicators import IndicatorsAPI
@@ -8,6 +9,7 @@ from crowdstrike_feeds_services.utils import (
     datetime_to_timestamp,
     timestamp_to_datetime,
 )
+from crowdstrike_feeds_services.utils.bundle_accumulator import BundleAccumulator
 from crowdstrike_feeds_services.utils.report_fetcher import FetchedReport, ReportFetcher
 from pycti.connector.opencti_connector_helper import (  # type: ignore  # noqa: E501
     OpenCTIConnectorHelper,
@@ -48,6 +50,9 @@ class IndicatorImporter(BaseImporter):
 
     _LATEST_INDICATOR_TIMESTAMP = "latest_indicator_timestamp"
 
+    _BUNDLE_MAX_OBJECTS = 1000
+    _BUNDLE_MAX_BYTES = 5_000_000
+
     def __init__(self, config: IndicatorImporterConfig) -> None:
         """Initialize CrowdStrike indicator importer."""
         super().__init__(
@@ -84,8 +89,6 @@ class IndicatorImporter(BaseImporter):
         """Run importer."""
         self._info("Running indicator importer with state: {0}...", state)
 
-        self._clear_report_fetcher_cache()
-
         fetch_timestamp = state.get(
             self._LATEST_INDICATOR_TIMESTAMP, self.default_latest_timestamp
         )
@@ -94,7 +97,9 @@ class IndicatorImporter(BaseImporter):
 
         indicator_batch = self._fetch_indicators(fetch_timestamp)
         if indicator_batch:
-            latest_batch_updated_datetime = self._process_indicators(indicator_batch)
+            latest_batch_updated_datetime = self._process_indicators(
+                indicator_batch, state.copy()
+            )
 
             if latest_batch_updated_datetime is not None and (
                 latest_indicator_updated_datetime is None
@@ -116,9 +121,6 @@ class IndicatorImporter(BaseImporter):
 
         return {self._LATEST_INDICATOR_TIMESTAMP: latest_indicator_updated_timestamp}
 
-    def _clear_report_fetcher_cache(self) -> None:
-        self.report_fetcher.clear_cache()
-
     def _fetch_indicators(self, fetch_timestamp: int) -> [List, None, None]:
         limit = 1000
         sort = "last_updated|asc"
@@ -167,24 +169,52 @@ class IndicatorImporter(BaseImporter):
 
         return resources
 
-    def _process_indicators(self, indicators: List) -> Optional[int]:
+    def _process_indicators(
+        self, indicators: List, state: Dict[str, Any]
+    ) -> Optional[datetime]:
         indicator_count = len(indicators)
         self._info("Processing {0} indicators...", indicator_count)
 
+        # Latest update of the indicators already sent, and of the ones still
+        # waiting in the accumulator. The state only moves past sent indicators.
         latest_updated_datetime = None
+        pending_updated_datetime = None
+
+        accumulator = BundleAccumulator(
+            self._send_bundle,
+            max_objects=self._BUNDLE_MAX_OBJECTS,
+            max_bytes=self._BUNDLE_MAX_BYTES,
+        )
+
+        def _checkpoint() -> None:
+            nonlocal latest_updated_datetime
+            if pending_updated_datetime is None:
+                return
+            latest_updated_datetime = pending_updated_datetime
+            state[self._LATEST_INDICATOR_TIMESTAMP] = datetime_to_timestamp(
+                latest_updated_datetime
+            )
+            self._set_state(state)
 
         failed = 0
         for indicator in indicators:
-            result = self._process_indicator(indicator)
-            if not result:
-                failed += 1
-
             updated_date = timestamp_to_datetime(indicator["last_updated"])
             if (
-                latest_updated_datetime is None
-                or updated_date > latest_updated_datetime
+                pending_updated_datetime is None
+                or updated_date > pending_updated_datetime
             ):
-                latest_updated_datetime = updated_date
+                pending_updated_datetime = updated_date
+
+            indicator_bundle = self._process_indicator(indicator)
+            if indicator_bundle is None:
+                failed += 1
+                continue
+
+            if accumulator.add(indicator_bundle):
+                _checkpoint()
+
+        accumulator.flush()
+        _checkpoint()
 
         imported = indicator_count - failed
         total = imported + failed
@@ -199,20 +229,18 @@ class IndicatorImporter(BaseImporter):
 
         return latest_updated_datetime
 
-    def _process_indicator(self, indicator: dict) -> bool:
+    def _process_indicator(self, indicator: dict) -> Optional[Bundle]:
         self._info("Processing indicator {0}...", indicator["id"])
 
         indicator_bundle = self._create_indicator_bundle(indicator)
         if indicator_bundle is None:
             self._warning("Discarding indicator {0} bundle", indicator["id"])
-            return False
+            return None
 
         # with open(f"indicator_bundle_{indicator_bundle['id']}.json", "w") as f:
         #     f.write(indicator_bundle.serialize(pretty=True))
 
-        self._send_bundle(indicator_bundle)
-
-        return True
+        return indicator_bundle
 
     def _get_reports_by_code(self, codes: List[str]) -> List[FetchedReport]:
         return self.report_fetcher.get_by_codes(codes)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""OpenCTI CrowdStrike bundle accumulator module."""
+
+from typing import Any, Callable, Dict
+
+from stix2 import Bundle  # type: ignore
+
+
+class BundleAccumulator:
+    """
+    Merge many small bundles into size-bounded bundles.
+
+    Objects shared by the merged bundles (author, marking, malware, actors,
+    reports, ...) are deduplicated by id. The accumulated bundle is passed to
+    `send_bundle` as soon as it holds `max_objects` objects or `max_bytes`
+    bytes of serialized objects.
+    """
+
+    def __init__(
+        self,
+        send_bundle: Callable[[Bundle], None],
+        max_objects: int = 1000,
+        max_bytes: int = 5_000_000,
+    ) -> None:
+        """Initialize CrowdStrike bundle accumulator."""
+        self.send_bundle = send_bundle
+        self.max_objects = max_objects
+        self.max_bytes = max_bytes
+
+        self.objects: Dict[str, Any] = {}
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def add(self, bundle: Bundle) -> bool:
+        """Add the objects of a bundle, return True if the accumulator was flushed."""
+        for stix_object in bundle.objects:
+            if stix_object["id"] in self.objects:
+                continue
+            self.objects[stix_object["id"]] = stix_object
+            self.size += len(stix_object.serialize())
+
+        if len(self.objects) >= self.max_objects or self.size >= self.max_bytes:
+            self.flush()
+            return True
+        return False
+
+    def flush(self) -> bool:
+        """Send the accumulated objects, return False if there was nothing to send."""
+        if not self.objects:
+            return False
+
+        bundle = Bundle(objects=list(self.objects.values()), allow_custom=True)
+        self.send_bundle(bundle)
+
+        self.objects = {}
+        self.size = 0
+        return True
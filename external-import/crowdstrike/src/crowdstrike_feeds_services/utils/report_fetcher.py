@@ -2,7 +2,8 @@
 """OpenCTI CrowdStrike report fetcher module."""
 
 import logging
-from typing import Any, Dict, List, Mapping, Optional, Union
+from collections import OrderedDict
+from typing import Any, List, Mapping, Optional, Union
 
 from crowdstrike_feeds_services.client.reports import ReportsAPI
 from pydantic.v1 import BaseModel
@@ -20,17 +21,27 @@ class FetchedReport(BaseModel):
 
 
 class ReportFetcher:
-    """CrowdStrike report fetcher."""
+    """
+    CrowdStrike report fetcher.
+
+    Fetched reports are kept in a bounded LRU cache, shared by the runs of the
+    importer owning the fetcher.
+    """
 
     _NOT_FOUND = object()
 
-    def __init__(self, helper, no_file_trigger_import: bool) -> None:
+    def __init__(
+        self, helper, no_file_trigger_import: bool, cache_size: int = 1000
+    ) -> None:
         """Initialize CrowdStrike report fetcher."""
         self.helper = helper
         self.reports_api_cs = ReportsAPI(helper)
         self.no_file_trigger_import = no_file_trigger_import
+        self.cache_size = cache_size
 
-        self.fetched_report_cache: Dict[str, Union[FetchedReport, object]] = {}
+        self.fetched_report_cache: "OrderedDict[str, Union[FetchedReport, object]]" = (
+            OrderedDict()
+        )
 
     def _info(self, msg: str, *args: Any) -> None:
         fmt_msg = msg.format(*args)
@@ -45,12 +56,18 @@ class ReportFetcher:
         self.fetched_report_cache.clear()
 
     def _get_cache(self, report_code: str) -> Optional[Union[FetchedReport, object]]:
-        return self.fetched_report_cache.get(report_code)
+        fetched_report = self.fetched_report_cache.get(report_code)
+        if fetched_report is not None:
+            self.fetched_report_cache.move_to_end(report_code)
+        return fetched_report
 
     def _put_cache(
         self, report_code: str, fetched_report: Union[FetchedReport, object]
     ) -> None:
         self.fetched_report_cache[report_code] = fetched_report
+        self.fetched_report_cache.move_to_end(report_code)
+        while len(self.fetched_report_cache) > self.cache_size:
+            self.fetched_report_cache.popitem(last=False)
 
     def get_by_codes(self, codes: List[str]) -> List[FetchedReport]:
         """Get reports by their codes."""
@@ -0,0 +1,95 @@
+from collections import OrderedDict
+from unittest.mock import MagicMock
+
+import pytest
+from crowdstrike_feeds_connector.indicator.importer import IndicatorImporter
+from crowdstrike_feeds_services.utils.bundle_accumulator import BundleAccumulator
+from crowdstrike_feeds_services.utils.report_fetcher import ReportFetcher
+from stix2 import TLP_AMBER, Bundle, Identity, Indicator
+
+AUTHOR = Identity(name="CrowdStrike", identity_class="organization")
+
+
+def _indicator_bundle(value: str) -> Bundle:
+    indicator = Indicator(
+        name=value,
+        pattern=f"[domain-name:value = '{value}']",
+        pattern_type="stix",
+        created_by_ref=AUTHOR.id,
+        object_marking_refs=[TLP_AMBER.id],
+    )
+    return Bundle(objects=[AUTHOR, TLP_AMBER, indicator], allow_custom=True)
+
+
+def test_accumulator_deduplicates_shared_objects():
+    sent = []
+    accumulator = BundleAccumulator(sent.append, max_objects=100)
+
+    for i in range(10):
+        assert not accumulator.add(_indicator_bundle(f"example{i}.com"))
+    assert accumulator.flush()
+
+    assert len(sent) == 1
+    # Author and marking are only sent once
+    assert len(sent[0].objects) == 12
+
+
+def test_accumulator_flushes_on_object_count_and_size():
+    sent = []
+    accumulator = BundleAccumulator(sent.append, max_objects=5)
+    flushes = [accumulator.add(_indicator_bundle(f"example{i}.com")) for i in range(6)]
+    accumulator.flush()
+
+    assert flushes == [False, False, True, False, False, True]
+    assert [len(bundle.objects) for bundle in sent] == [5, 5]
+
+    sent = []
+    accumulator = BundleAccumulator(sent.append, max_bytes=1)
+    assert accumulator.add(_indicator_bundle("example.com"))
+    assert not accumulator.flush()
+    assert len(sent) == 1
+
+
+def _importer(send_bundle) -> IndicatorImporter:
+    importer = IndicatorImporter.__new__(IndicatorImporter)
+    importer.helper = MagicMock()
+    importer._BUNDLE_MAX_OBJECTS = 6
+    importer._send_bundle = send_bundle
+    importer._create_indicator_bundle = lambda indicator: _indicator_bundle(
+        indicator["indicator"]
+    )
+    return importer
+
+
+def test_checkpoint_only_advances_after_a_flush_succeeds():
+    indicators = [
+        {"id": str(i), "indicator": f"example{i}.com", "last_updated": 1000 + i}
+        for i in range(5)
+    ]
+    sent = []
+
+    def send_bundle(bundle):
+        if len(sent) == 1:
+            raise RuntimeError("queue unavailable")
+        sent.append(bundle)
+
+    importer = _importer(send_bundle)
+
+    with pytest.raises(RuntimeError):
+        importer._process_indicators(indicators, {})
+
+    # Only the indicators of the first bundle have been checkpointed
+    states = [call.args[0] for call in importer.helper.set_state.call_args_list]
+    assert [state["latest_indicator_timestamp"] for state in states] == [1003]
+
+
+def test_report_fetcher_cache_is_a_bounded_lru():
+    fetcher = ReportFetcher.__new__(ReportFetcher)
+    fetcher.cache_size = 2
+    fetcher.fetched_report_cache = OrderedDict()
+    fetcher._put_cache("A", "report A")
+    fetcher._put_cache("B", "report B")
+    fetcher._get_cache("A")
+    fetcher._put_cache("C", "report C")
+
+    assert list(fetcher.fetched_report_cache) == ["A", "C"]
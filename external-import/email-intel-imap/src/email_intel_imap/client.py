@@ -1,68 +1,133 @@
 import datetime
 import json
 from abc import ABC, abstractmethod
-from typing import Generator
+from typing import Generator, NamedTuple
 
 from base_connector import BaseClient
 from google.auth.credentials import TokenState
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from imap_tools.mailbox import MailBox
+from imap_tools.mailbox import BaseMailBox, MailBox
 from imap_tools.message import MailMessage
-from imap_tools.query import AND
+from imap_tools.query import AND, U
 from pydantic import PrivateAttr
 
 
+class MessageBatch(NamedTuple):
+    """A batch of new email messages and the mailbox position they lead to."""
+
+    uid_validity: int
+    last_uid: int
+    messages: list[MailMessage]
+
+
 class BaseConnectorClient(BaseClient, ABC):
     """
     Base class for connector clients. This class defines the interface for fetching email messages.
-    Subclasses should implement the `fetch_from_relative_import_start_date` method.
+    Subclasses should implement the `_login` method.
     """
 
+    mailbox: str
+
     @abstractmethod
-    def fetch_from_relative_import_start_date(
-        self, since_date: datetime.date
-    ) -> Generator[MailMessage, None, None]:
+    def _login(self) -> BaseMailBox:
         """
-        Abstract method to fetch email messages since a given date.
+        Abstract method to open an authenticated connection to the IMAP server.
 
-        Args:
-            since_date (datetime.date): The date from which to begin retrieving emails.
+        Returns:
+            BaseMailBox: A mailbox logged in, with `mailbox` as current folder,
+                to be used as a context manager.
+        """
 
-        Yields:
-            MailMessage: A parsed email message object representing one received email.
+    def fetch_new_messages(
+        self,
+        since: datetime.datetime,
+        uid_validity: int | None = None,
+        last_uid: int | None = None,
+        batch_size: int = 50,
+    ) -> Generator[MessageBatch, None, None]:
         """
+        Retrieve the email messages not fetched yet, in batches.
 
+        When `uid_validity` matches the UIDVALIDITY of the mailbox, only the messages
+        with a UID greater than `last_uid` are new. Otherwise (first run or mailbox
+        recreated), the messages received after `since` are new.
 
-class ConnectorClient(BaseConnectorClient):
-    host: str
-    port: int
-    username: str
-    password: str
-    mailbox: str
-
-    def fetch_from_relative_import_start_date(
-        self, since_date: datetime.date
-    ) -> Generator[MailMessage, None, None]:
-        """
-        Retrieve email messages received since a given date.
+        The headers of the candidate messages are fetched first, then the full
+        messages (body and attachments) are fetched only for the new ones, by
+        batches of `batch_size` messages in a single FETCH command.
 
         To understand the AND argument of the fetch method, refer to the imap-tools documentation:
         https://pypi.org/project/imap-tools/#search-criteria
 
         Args:
-            since_date (datetime.date): The date from which to begin retrieving emails.
-                Only messages received on or after this date will be yielded.
+            since (datetime.datetime): The date from which to begin retrieving emails
+                when the UIDs can't be used.
+            uid_validity (int | None): The UIDVALIDITY of the mailbox at the last sync.
+            last_uid (int | None): The UID of the last message fetched at the last sync.
+            batch_size (int): The number of messages per batch.
 
         Yields:
-            MailMessage: A parsed email message object representing one received email.
+            MessageBatch: The new messages, in UID order, with the UIDVALIDITY of the
+                mailbox and the UID of the last message of the batch.
         """
-        with MailBox(host=self.host, port=self.port).login(  # type: ignore
+        with self._login() as mailbox:
+            current_uid_validity = mailbox.folder.status(self.mailbox, ["UIDVALIDITY"])[
+                "UIDVALIDITY"
+            ]
+            if uid_validity != current_uid_validity:
+                last_uid = None
+
+            if last_uid is not None:
+                # Note that `UID n:*` always matches the last message of the mailbox
+                criteria = AND(uid=U(last_uid + 1, "*"))
+            else:
+                # The IMAP search has a day granularity, headers are used to filter by time
+                criteria = AND(date_gte=since.date())
+
+            new_uids = sorted(
+                int(message.uid)
+                for message in mailbox.fetch(
+                    criteria=criteria, mark_seen=False, headers_only=True, bulk=True
+                )
+                if message.uid
+                and (
+                    int(message.uid) > last_uid
+                    if last_uid is not None
+                    else message.date > since
+                )
+            )
+
+            for start in range(0, len(new_uids), batch_size):
+                uids = new_uids[start : start + batch_size]
+                messages = sorted(
+                    mailbox.fetch(
+                        criteria=AND(uid=[str(uid) for uid in uids]),
+                        mark_seen=False,
+                        bulk=True,
+                    ),
+                    key=lambda message: int(message.uid),
+                )
+                yield MessageBatch(
+                    uid_validity=current_uid_validity,
+                    last_uid=uids[-1],
+                    messages=messages,
+                )
+
+
+class ConnectorClient(BaseConnectorClient):
+    host: str
+    port: int
+    username: str
+    password: str
+
+    def _login(self) -> BaseMailBox:
+        """Implement _login method for password authentication."""
+        return MailBox(host=self.host, port=self.port).login(  # type: ignore
             username=self.username,
             password=self.password,
             initial_folder=self.mailbox,
-        ) as mailbox:
-            yield from mailbox.fetch(criteria=AND(date_gte=since_date))
+        )
 
 
 class GoogleOAuthClient(BaseConnectorClient):
@@ -70,7 +135,6 @@ class GoogleOAuthClient(BaseConnectorClient):
     port: int
     username: str
     token_json: str
-    mailbox: str
 
     _credentials: Credentials | None = PrivateAttr(default=None)
 
@@ -84,18 +148,15 @@ class GoogleOAuthClient(BaseConnectorClient):
         if self._credentials.token_state != TokenState.FRESH:
             self._credentials.refresh(Request())  # type: ignore[no-untyped-call]
 
-    def fetch_from_relative_import_start_date(
-        self, since_date: datetime.date
-    ) -> Generator[MailMessage, None, None]:
-        """Implement fetch_from_relative_import_start_date method for Google OAuth2 authentication."""
+    def _login(self) -> BaseMailBox:
+        """Implement _login method for Google OAuth2 authentication."""
 
         # always try to refresh the credentials before using them
         self._refresh_credentials()
 
-        with MailBox(self.host, self.port).xoauth2(  # type: ignore[no-untyped-call]
+        return MailBox(self.host, self.port).xoauth2(  # type: ignore[no-untyped-call]
             username=self.username,
             # self._credentials should exist as refresh_credentials is called before
             access_token=str(self._credentials.token),  # type: ignore[union-attr]
             initial_folder=self.mailbox,
-        ) as mailbox:
-            yield from mailbox.fetch(criteria=AND(date_gte=since_date))
+        )
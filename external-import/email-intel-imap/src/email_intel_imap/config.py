@@ -71,6 +71,11 @@ class _EmailIntelConfig(BaseModel):
         default=["application/pdf", "text/csv", "text/plain"],
         description="List of attachment MIME types to process (comma-separated)",
     )
+    batch_size: int = Field(
+        default=50,
+        gt=0,
+        description="Number of emails fetched in a single IMAP command and sent in a single bundle.",
+    )
 
     @model_validator(mode="before")
     def check_auth(cls, values: dict[str, Any]) -> dict[str, Any]:
@@ -1,4 +1,5 @@
 import datetime
+from typing import Generator
 
 import stix2
 from base_connector.connector import BaseConnector
@@ -25,21 +26,50 @@ class Connector(BaseConnector):
         self.helper.connector_logger.info("Connector last email ingestion until: Never")
         return None
 
-    def process_data(self) -> list[stix2.Report]:
+    def iter_batches(
+        self,
+    ) -> Generator[tuple[list[stix2.v21._STIXBase21], dict[str, int]], None, None]:
+        """
+        Convert the new emails to STIX objects, batch by batch.
+
+        Yields:
+            A tuple (STIX objects of the batch, state to store once the batch is sent).
+        """
         since_date = self.get_last_email_ingestion() or (
             datetime.datetime.now(tz=datetime.UTC)
             - self.config.email_intel_imap.relative_import_start_date
         )
+        for batch in self.client.fetch_new_messages(
+            since=since_date,
+            uid_validity=self.state.get("uid_validity"),
+            last_uid=self.state.get("last_uid"),
+            batch_size=self.config.email_intel_imap.batch_size,
+        ):
+            stix_objects = [
+                stix_object
+                for email in batch.messages
+                for stix_object in self.converter.to_stix_objects(email)
+            ]
+            yield stix_objects, {
+                "uid_validity": batch.uid_validity,
+                "last_uid": batch.last_uid,
+            }
+
+    def process_data(self) -> list[stix2.Report]:
         return [
             stix_object
-            for email in self.client.fetch_from_relative_import_start_date(
-                since_date.date()
-            )
-            # As the IMAP library filters by date, we need to add this to filter also by time
-            if email.date > since_date
-            for stix_object in self.converter.to_stix_objects(email)
+            for stix_objects, _ in self.iter_batches()
+            for stix_object in stix_objects
         ]
 
+    def process_message(self) -> None:
+        work_id = self.initiate_work()
+        for stix_objects, batch_state in self.iter_batches():
+            self.create_and_send_bundles(work_id, stix_objects)
+            # Only the emails of the bundles sent are skipped by the next runs
+            self.update_state(**batch_state)
+        self.finalize_work(work_id, "Connector successfully run")
+
     def initiate_work(self) -> str:
         self.start_time = datetime.datetime.now(tz=datetime.UTC)
         return super().initiate_work()
@@ -69,6 +69,18 @@ def fixture_mocked_mail_box(mocker: MockerFixture) -> MagicMock:
     mocked_mail_box.return_value.login.return_value.__enter__.return_value = (
         mocked_mail_box_instance
     )
+    mocked_mail_box_instance.folder.status.return_value = {"UIDVALIDITY": 1}
+
+    def fetch(criteria: Any = "ALL", **kwargs: Any) -> list[Mock]:
+        # Messages fetched by UIDs (e.g. "(UID 1,2)") are filtered from the return value
+        messages = mocked_mail_box_instance.fetch.return_value
+        criteria = str(criteria)
+        if criteria.startswith("(UID ") and ":" not in criteria:
+            uids = criteria.removeprefix("(UID ").removesuffix(")").split(",")
+            messages = [message for message in messages if message.uid in uids]
+        return messages
+
+    mocked_mail_box_instance.fetch.side_effect = fetch
     return mocked_mail_box_instance
 
 
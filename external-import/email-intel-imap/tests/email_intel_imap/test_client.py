@@ -1,9 +1,11 @@
 import datetime
-from unittest.mock import Mock
+from unittest.mock import Mock, call
 
 import pytest
 from email_intel_imap.client import ConnectorClient
 
+SINCE = datetime.datetime(2023, 10, 1, 12, tzinfo=datetime.UTC)
+
 
 @pytest.fixture(name="client")
 def fixture_client() -> ConnectorClient:
@@ -16,13 +18,67 @@ def fixture_client() -> ConnectorClient:
     )
 
 
-def test_client_fetch_from_relative_import_start_date(
+def _email(uid: int, date: datetime.datetime = SINCE) -> Mock:
+    return Mock(uid=str(uid), date=date + datetime.timedelta(minutes=uid))
+
+
+def test_client_fetch_new_messages_since_date(
     client: ConnectorClient, mocked_mail_box: Mock
 ) -> None:
-    since_date = datetime.date(2023, 10, 1)
+    early_email = _email(1, date=SINCE - datetime.timedelta(hours=2))
+    mocked_mail_box.fetch.return_value = [early_email, _email(2), _email(3)]
 
-    result = client.fetch_from_relative_import_start_date(since_date=since_date)
+    result = client.fetch_new_messages(since=SINCE)
     mocked_mail_box.fetch.assert_not_called()  # Make sure we have a Generator
-    list(result)  # Consume the generator
+    [batch] = list(result)  # Consume the generator
+
+    assert batch.uid_validity == 1
+    assert batch.last_uid == 3
+    assert [email.uid for email in batch.messages] == ["2", "3"]
+    assert mocked_mail_box.fetch.call_args_list == [
+        # The IMAP search has a day granularity, the time is filtered on the headers
+        call(
+            criteria="(SINCE 1-Oct-2023)", mark_seen=False, headers_only=True, bulk=True
+        ),
+        call(criteria="(UID 2,3)", mark_seen=False, bulk=True),
+    ]
+
 
-    mocked_mail_box.fetch.assert_called_once_with(criteria="(SINCE 1-Oct-2023)")
+def test_client_fetch_new_messages_since_last_uid(
+    client: ConnectorClient, mocked_mail_box: Mock
+) -> None:
+    # "UID 11:*" always matches the last message, even if already fetched
+    mocked_mail_box.fetch.return_value = [_email(10)]
+    assert list(client.fetch_new_messages(SINCE, uid_validity=1, last_uid=10)) == []
+
+    mocked_mail_box.fetch.reset_mock()
+    mocked_mail_box.fetch.return_value = [_email(uid) for uid in range(11, 16)]
+    batches = list(
+        client.fetch_new_messages(SINCE, uid_validity=1, last_uid=10, batch_size=2)
+    )
+
+    assert [batch.last_uid for batch in batches] == [12, 14, 15]
+    assert [len(batch.messages) for batch in batches] == [2, 2, 1]
+    assert [c.kwargs["criteria"] for c in mocked_mail_box.fetch.call_args_list] == [
+        "(UID 11:*)",
+        "(UID 11,12)",
+        "(UID 13,14)",
+        "(UID 15)",
+    ]
+
+
+def test_client_fetch_new_messages_uid_validity_changed(
+    client: ConnectorClient, mocked_mail_box: Mock
+) -> None:
+    mocked_mail_box.folder.status.return_value = {"UIDVALIDITY": 2}
+    mocked_mail_box.fetch.return_value = [_email(1)]
+
+    [batch] = list(client.fetch_new_messages(SINCE, uid_validity=1, last_uid=10))
+
+    # The UIDs of the previous sync are meaningless, the date is used instead
+    assert batch.uid_validity == 2
+    assert batch.last_uid == 1
+    mocked_mail_box.folder.status.assert_called_once_with("mailbox", ["UIDVALIDITY"])
+    assert mocked_mail_box.fetch.call_args_list[0].kwargs["criteria"] == (
+        "(SINCE 1-Oct-2023)"
+    )
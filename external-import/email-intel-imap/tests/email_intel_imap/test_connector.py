@@ -43,6 +43,7 @@ def test_connector_process_data_empty(connector: Connector) -> None:
 def test_connector_process_data(connector: Connector, mocked_mail_box: Mock) -> None:
     now = datetime.datetime.now(tz=datetime.UTC)
     email1 = Mock(
+        uid="1",
         subject="email 1",
         date=now,
         html="email body 1",
@@ -50,6 +51,7 @@ def test_connector_process_data(connector: Connector, mocked_mail_box: Mock) ->
         from_="em1@il.com",
     )
     email2 = Mock(
+        uid="2",
         subject="email 2",
         date=now,
         html="email body 2",
@@ -100,8 +102,10 @@ def test_connector_process_data_since_relative_from_date(
     two_months_ago = datetime.datetime.fromisoformat("2025-02-22T12:00:00Z")
     today = datetime.datetime.fromisoformat("2025-04-22T12:00:00Z")
 
-    email1 = Mock(subject="1", html="body 1", attachments=[], date=two_months_ago)
-    email2 = Mock(subject="2", html="body 2", attachments=[], date=today)
+    email1 = Mock(
+        uid="1", subject="1", html="body 1", attachments=[], date=two_months_ago
+    )
+    email2 = Mock(uid="2", subject="2", html="body 2", attachments=[], date=today)
 
     assert (
         connector.config.email_intel_imap.relative_import_start_date
@@ -122,9 +126,13 @@ def test_connector_process_data_since_last_email_ingestion(
     two_days_ago = datetime.datetime.fromisoformat("2025-04-20T12:00:00Z")
     today = datetime.datetime.fromisoformat("2025-04-22T12:00:00Z")
 
-    email1 = Mock(subject="1", html="body 1", attachments=[], date=two_months_ago)
-    email2 = Mock(subject="2", html="body 2", attachments=[], date=two_days_ago)
-    email3 = Mock(subject="3", html="body 3", attachments=[], date=today)
+    email1 = Mock(
+        uid="1", subject="1", html="body 1", attachments=[], date=two_months_ago
+    )
+    email2 = Mock(
+        uid="2", subject="2", html="body 2", attachments=[], date=two_days_ago
+    )
+    email3 = Mock(uid="3", subject="3", html="body 3", attachments=[], date=today)
 
     assert (
         connector.config.email_intel_imap.relative_import_start_date
@@ -147,7 +155,7 @@ def test_connector_known_warning(connector: Connector, mocked_mail_box: Mock) ->
     connector.helper.get_state.return_value = {
         "last_email_ingestion": "1970-01-01T00:00:00Z"
     }
-    mocked_mail_box.fetch.return_value = [Mock(date=today)]
+    mocked_mail_box.fetch.return_value = [Mock(uid="1", date=today)]
 
     assert (
         connector.process()
@@ -168,3 +176,22 @@ def test_connector_unknown_error(connector: Connector) -> None:
     connector.helper.get_state.side_effect = ValueError("Unknown error")
 
     assert connector.process() == "Unexpected error. See connector logs for details."
+
+
+def test_connector_process_message_sends_a_bundle_per_batch(
+    connector: Connector, mocked_mail_box: Mock
+) -> None:
+    today = datetime.datetime.now(tz=datetime.UTC)
+    connector.config.email_intel_imap.batch_size = 2
+    connector.helper.get_state.return_value = {"uid_validity": 1, "last_uid": 10}
+    mocked_mail_box.fetch.return_value = [
+        Mock(uid=str(uid), subject=str(uid), html="body", attachments=[], date=today)
+        for uid in range(10, 15)
+    ]
+
+    connector.process_message()
+
+    assert connector.helper.send_stix2_bundle.call_count == 2
+    states = [c.kwargs["state"] for c in connector.helper.set_state.call_args_list]
+    assert [state.get("last_uid") for state in states[:2]] == [12, 14]
+    assert all(state.get("uid_validity") == 1 for state in states)
@@ -17,9 +17,13 @@ from pycti import (
 )
 
 from .config_loader import ConfigLoader
+from .prefetch import prefetch_pages
 
 
 class GreyNoiseFeedConnector:
+    # Maximum number of STIX objects per bundle
+    BUNDLE_SIZE = 50000
+
     def __init__(self, config: ConfigLoader, helper: OpenCTIConnectorHelper):
         self.config = config
         self.helper = helper
@@ -35,8 +39,10 @@ class GreyNoiseFeedConnector:
             },
         )
 
-        # Cache for label
+        # Caches for labels and worm malwares, kept across runs so that the same
+        # tags don't trigger label creations on every run
         self.labels_cache = {}
+        self.malwares_cache = {}
 
     def get_feed_query(self, feed_type: str):
         query = ""
@@ -73,12 +79,12 @@ class GreyNoiseFeedConnector:
 
         return query
 
-    def _process_labels(self, data: dict, data_tags: dict) -> tuple:
+    def _process_labels(self, data: dict, tags_by_name: dict) -> tuple:
         """
         This method allows you to start the process of creating labels and recovering associated malware.
 
         :param data: A parameter that contains all the data about the IPv4 that was searched for in GreyNoise.
-        :param data_tags: A parameter that contains all the data relating to the existing tags in GreyNoise
+        :param tags_by_name: A parameter that contains all the data relating to the existing tags in GreyNoise, by tag name
         :return: A tuple (all labels, all malwares)
         """
 
@@ -118,10 +124,8 @@ class GreyNoiseFeedConnector:
 
         # Create all Labels in entity_tags
         for tag in entity_tags:
-            tag_details_matching = self._get_match(data_tags["metadata"], "name", tag)
-            if tag_details_matching is not None:
-                tag_details = tag_details_matching
-            else:
+            tag_details = tags_by_name.get(tag)
+            if tag_details is None:
                 self.all_labels.append(tag)
                 continue
 
@@ -133,12 +137,13 @@ class GreyNoiseFeedConnector:
 
             # If category is worm, prepare malware object
             elif tag_details["category"] == "worm":
-                malware_worm = {
-                    "name": f"{tag}",
-                    "description": f"{tag_details['description']}",
-                    "type": "worm",
-                }
-                all_malwares.append(malware_worm)
+                if tag not in self.malwares_cache:
+                    self.malwares_cache[tag] = {
+                        "name": f"{tag}",
+                        "description": f"{tag_details['description']}",
+                        "type": "worm",
+                    }
+                all_malwares.append(self.malwares_cache[tag])
                 self.all_labels.append(tag)
 
             elif tag_details["intention"] == "benign":
@@ -178,10 +183,6 @@ class GreyNoiseFeedConnector:
                 self.labels_cache[name_label] = new_custom_label
                 self.all_labels.append(new_custom_label["value"])
 
-    @staticmethod
-    def _get_match(data, key, value):
-        return next((x for x in data if x[key] == value), None)
-
     def _get_indicator_score(self, classification):
         if classification == "malicious":
             score = self.config.greynoise_feed.indicator_score_malicious
@@ -192,347 +193,403 @@ class GreyNoiseFeedConnector:
 
         return score
 
-    def _process_data(self, work_id, session, ips_list):
-        bundle_entities = []
-        bundle_relationships = []
-        json_data_tags = session.metadata()
-        self.helper.log_info("Building Indicator Bundles")
-        for ip in ips_list:
-            if "ip" not in ip or "classification" not in ip:
-                continue
+    def _convert_ip(self, ip: dict, tags_by_name: dict) -> tuple:
+        """
+        Convert an IP of the GNQL query results to STIX objects.
 
-            description = (
-                "Internet Scanning IP detected by GreyNoise with classification `"
-                + ip["classification"]
-                + "`."
-            )
-            pattern = "[ipv4-addr:value = '" + ip["ip"] + "']"
+        :param ip: A parameter that contains all the data about the IPv4 returned by GreyNoise.
+        :param tags_by_name: A parameter that contains the GreyNoise tags metadata, by tag name.
+        :return: A tuple (entities, relationships)
+        """
+        entities = []
+        relationships = []
 
-            labels, malwares = self._process_labels(ip, json_data_tags)
+        description = (
+            "Internet Scanning IP detected by GreyNoise with classification `"
+            + ip["classification"]
+            + "`."
+        )
+        pattern = "[ipv4-addr:value = '" + ip["ip"] + "']"
 
-            if "first_seen" in ip and ip["first_seen"]:
-                first_seen = parse(ip["first_seen"]).strftime("%Y-%m-%dT%H:%M:%SZ")
-                last_seen = parse(ip["last_seen"]).strftime("%Y-%m-%dT%H:%M:%SZ")
-            else:
-                first_seen = parse(ip["last_seen"]).strftime("%Y-%m-%dT%H:%M:%SZ")
-                last_seen = datetime.strptime(ip["last_seen"], "%Y-%m-%d") + timedelta(
-                    hours=23
-                )
-                last_seen = last_seen.strftime("%Y-%m-%dT%H:%M:%SZ")
+        labels, malwares = self._process_labels(ip, tags_by_name)
 
-            # Generate ExternalReference
-            external_reference = stix2.ExternalReference(
-                source_name="GreyNoise Feed",
-                url="https://viz.greynoise.io/ip/" + ip["ip"],
+        if "first_seen" in ip and ip["first_seen"]:
+            first_seen = parse(ip["first_seen"]).strftime("%Y-%m-%dT%H:%M:%SZ")
+            last_seen = parse(ip["last_seen"]).strftime("%Y-%m-%dT%H:%M:%SZ")
+        else:
+            first_seen = parse(ip["last_seen"]).strftime("%Y-%m-%dT%H:%M:%SZ")
+            last_seen = datetime.strptime(ip["last_seen"], "%Y-%m-%d") + timedelta(
+                hours=23
             )
+            last_seen = last_seen.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-            # Generate Indicator
-            stix_indicator = stix2.Indicator(
-                id=Indicator.generate_id(pattern),
-                name=ip["ip"],
-                description=description,
-                created_by_ref=self.identity["standard_id"],
-                pattern_type="stix",
-                pattern=pattern,
-                external_references=[external_reference],
-                object_marking_refs=[stix2.TLP_GREEN],
-                labels=labels,
+        # Generate ExternalReference
+        external_reference = stix2.ExternalReference(
+            source_name="GreyNoise Feed",
+            url="https://viz.greynoise.io/ip/" + ip["ip"],
+        )
+
+        # Generate Indicator
+        stix_indicator = stix2.Indicator(
+            id=Indicator.generate_id(pattern),
+            name=ip["ip"],
+            description=description,
+            created_by_ref=self.identity["standard_id"],
+            pattern_type="stix",
+            pattern=pattern,
+            external_references=[external_reference],
+            object_marking_refs=[stix2.TLP_GREEN],
+            labels=labels,
+            created=first_seen,
+            custom_properties={
+                "x_opencti_score": (self._get_indicator_score(ip["classification"])),
+                "x_opencti_main_observable_type": "IPv4-Addr",
+            },
+        )
+        entities.append(stix_indicator)
+
+        # Generate Observable
+        stix_observable = stix2.IPv4Address(
+            type="ipv4-addr",
+            value=ip["ip"],
+            object_marking_refs=[stix2.TLP_GREEN],
+            custom_properties={
+                "x_opencti_description": description,
+                "x_opencti_score": (self._get_indicator_score(ip["classification"])),
+                "created_by_ref": self.identity["standard_id"],
+                "labels": labels,
+                "external_references": [external_reference],
+            },
+        )
+        entities.append(stix_observable)
+
+        # Generate relationship Indicator => Observable
+        stix_relationship = stix2.Relationship(
+            id=StixCoreRelationship.generate_id(
+                "based-on", stix_indicator.id, stix_observable.id
+            ),
+            relationship_type="based-on",
+            source_ref=stix_indicator.id,
+            target_ref=stix_observable.id,
+            created_by_ref=self.identity["standard_id"],
+            object_marking_refs=[stix2.TLP_GREEN],
+        )
+        relationships.append(stix_relationship)
+
+        # Malwares
+        stix_malwares = []
+        for malware in malwares:
+            stix_malware = stix2.Malware(
+                id=Malware.generate_id(malware["name"]),
+                name=malware["name"],
+                description=malware["description"],
+                is_family=False,
+                malware_types=(malware["type"] if malware["type"] == "worm" else None),
                 created=first_seen,
-                custom_properties={
-                    "x_opencti_score": (
-                        self._get_indicator_score(ip["classification"])
-                    ),
-                    "x_opencti_main_observable_type": "IPv4-Addr",
-                },
+                created_by_ref=self.identity["standard_id"],
+                object_marking_refs=[stix2.TLP_WHITE],
             )
-            bundle_entities.append(stix_indicator)
-
-            # Generate Observable
-            stix_observable = stix2.IPv4Address(
-                type="ipv4-addr",
-                value=ip["ip"],
-                object_marking_refs=[stix2.TLP_GREEN],
-                custom_properties={
-                    "x_opencti_description": description,
-                    "x_opencti_score": (
-                        self._get_indicator_score(ip["classification"])
-                    ),
-                    "created_by_ref": self.identity["standard_id"],
-                    "labels": labels,
-                    "external_references": [external_reference],
-                },
+            stix_malwares.append(stix_malware)
+            entities.append(stix_malware)
+
+            stix_relationship_observable_malware = stix2.Relationship(
+                id=StixCoreRelationship.generate_id(
+                    "related-to", stix_observable.id, stix_malware.id
+                ),
+                relationship_type="related-to",
+                source_ref=stix_observable.id,
+                target_ref=stix_malware.id,
+                created_by_ref=self.identity["standard_id"],
+                object_marking_refs=[stix2.TLP_WHITE],
             )
-            bundle_entities.append(stix_observable)
+            relationships.append(stix_relationship_observable_malware)
 
-            # Generate relationship Indicator => Observable
-            stix_relationship = stix2.Relationship(
+            stix_relationship_indicator_malware = stix2.Relationship(
                 id=StixCoreRelationship.generate_id(
-                    "based-on", stix_indicator.id, stix_observable.id
+                    "indicates", stix_indicator.id, stix_malware.id
                 ),
-                relationship_type="based-on",
+                relationship_type="indicates",
                 source_ref=stix_indicator.id,
-                target_ref=stix_observable.id,
+                target_ref=stix_malware.id,
                 created_by_ref=self.identity["standard_id"],
-                object_marking_refs=[stix2.TLP_GREEN],
+                object_marking_refs=[stix2.TLP_WHITE],
             )
-            bundle_relationships.append(stix_relationship)
-
-            # Malwares
-            stix_malwares = []
-            for malware in malwares:
-                stix_malware = stix2.Malware(
-                    id=Malware.generate_id(malware["name"]),
-                    name=malware["name"],
-                    description=malware["description"],
-                    is_family=False,
-                    malware_types=(
-                        malware["type"] if malware["type"] == "worm" else None
-                    ),
-                    created=first_seen,
+            relationships.append(stix_relationship_indicator_malware)
+
+        # CVE
+        if "cve" in ip and ip["cve"]:
+            for cve in ip["cve"]:
+                stix_vulnerability = stix2.Vulnerability(
+                    id=Vulnerability.generate_id(cve),
+                    name=cve,
                     created_by_ref=self.identity["standard_id"],
                     object_marking_refs=[stix2.TLP_WHITE],
                 )
-                stix_malwares.append(stix_malware)
-                bundle_entities.append(stix_malware)
+                entities.append(stix_vulnerability)
 
-                stix_relationship_observable_malware = stix2.Relationship(
+                stix_relationship_observable_vulnerability = stix2.Relationship(
                     id=StixCoreRelationship.generate_id(
-                        "related-to", stix_observable.id, stix_malware.id
+                        "related-to",
+                        stix_observable.id,
+                        stix_vulnerability.id,
                     ),
                     relationship_type="related-to",
                     source_ref=stix_observable.id,
-                    target_ref=stix_malware.id,
+                    target_ref=stix_vulnerability.id,
                     created_by_ref=self.identity["standard_id"],
                     object_marking_refs=[stix2.TLP_WHITE],
                 )
-                bundle_relationships.append(stix_relationship_observable_malware)
+                relationships.append(stix_relationship_observable_vulnerability)
+
+        # Metadata
+        if self.config.greynoise_feed.import_metadata:
+            if "metadata" in ip:
+                metadata = ip["metadata"]
+                stix_as = None
+                if "asn" in metadata:
+                    try:
+                        stix_as = stix2.AutonomousSystem(
+                            name=metadata["asn"],
+                            number=int(metadata["asn"].replace("AS", "")),
+                            object_marking_refs=[stix2.TLP_WHITE],
+                            custom_properties={
+                                "created_by_ref": self.identity["standard_id"],
+                            },
+                        )
+                        entities.append(stix_as)
 
-                stix_relationship_indicator_malware = stix2.Relationship(
-                    id=StixCoreRelationship.generate_id(
-                        "indicates", stix_indicator.id, stix_malware.id
-                    ),
-                    relationship_type="indicates",
-                    source_ref=stix_indicator.id,
-                    target_ref=stix_malware.id,
-                    created_by_ref=self.identity["standard_id"],
-                    object_marking_refs=[stix2.TLP_WHITE],
-                )
-                bundle_relationships.append(stix_relationship_indicator_malware)
-
-            # CVE
-            if "cve" in ip and ip["cve"]:
-                for cve in ip["cve"]:
-                    stix_vulnerability = stix2.Vulnerability(
-                        id=Vulnerability.generate_id(cve),
-                        name=cve,
-                        created_by_ref=self.identity["standard_id"],
-                        object_marking_refs=[stix2.TLP_WHITE],
+                        stix_relationship_observable_as = stix2.Relationship(
+                            id=StixCoreRelationship.generate_id(
+                                "belongs-to", stix_observable.id, stix_as.id
+                            ),
+                            relationship_type="belongs-to",
+                            source_ref=stix_observable.id,
+                            target_ref=stix_as.id,
+                            created_by_ref=self.identity["standard_id"],
+                            object_marking_refs=[stix2.TLP_WHITE],
+                        )
+                        relationships.append(stix_relationship_observable_as)
+                    except:
+                        pass
+                if "organization" in metadata:
+                    stix_organization = stix2.Identity(
+                        id=Identity.generate_id(
+                            metadata["organization"], "organization"
+                        ),
+                        name=metadata["organization"],
+                        identity_class="organization",
                     )
-                    bundle_entities.append(stix_vulnerability)
+                    entities.append(stix_organization)
 
-                    stix_relationship_observable_vulnerability = stix2.Relationship(
+                    stix_relationship_observable_organization = stix2.Relationship(
                         id=StixCoreRelationship.generate_id(
-                            "related-to",
-                            stix_observable.id,
-                            stix_vulnerability.id,
+                            "belongs-to", stix_observable.id, stix_organization.id
                         ),
-                        relationship_type="related-to",
+                        relationship_type="belongs-to",
                         source_ref=stix_observable.id,
-                        target_ref=stix_vulnerability.id,
+                        target_ref=stix_organization.id,
                         created_by_ref=self.identity["standard_id"],
                         object_marking_refs=[stix2.TLP_WHITE],
                     )
-                    bundle_relationships.append(
-                        stix_relationship_observable_vulnerability
-                    )
+                    relationships.append(stix_relationship_observable_organization)
 
-            # Metadata
-            if self.config.greynoise_feed.import_metadata:
-                if "metadata" in ip:
-                    metadata = ip["metadata"]
-                    stix_as = None
-                    if "asn" in metadata:
-                        try:
-                            stix_as = stix2.AutonomousSystem(
-                                name=metadata["asn"],
-                                number=int(metadata["asn"].replace("AS", "")),
-                                object_marking_refs=[stix2.TLP_WHITE],
-                                custom_properties={
-                                    "created_by_ref": self.identity["standard_id"],
-                                },
-                            )
-                            bundle_entities.append(stix_as)
-
-                            stix_relationship_observable_as = stix2.Relationship(
-                                id=StixCoreRelationship.generate_id(
-                                    "belongs-to", stix_observable.id, stix_as.id
-                                ),
-                                relationship_type="belongs-to",
-                                source_ref=stix_observable.id,
-                                target_ref=stix_as.id,
-                                created_by_ref=self.identity["standard_id"],
-                                object_marking_refs=[stix2.TLP_WHITE],
-                            )
-                            bundle_relationships.append(stix_relationship_observable_as)
-                        except:
-                            pass
-                    if "organization" in metadata:
-                        stix_organization = stix2.Identity(
-                            id=Identity.generate_id(
-                                metadata["organization"], "organization"
-                            ),
-                            name=metadata["organization"],
-                            identity_class="organization",
-                        )
-                        bundle_entities.append(stix_organization)
-
-                        stix_relationship_observable_organization = stix2.Relationship(
+                    if stix_as is not None:
+                        stix_relationship_as_organization = stix2.Relationship(
                             id=StixCoreRelationship.generate_id(
-                                "belongs-to", stix_observable.id, stix_organization.id
+                                "related-to", stix_as.id, stix_organization.id
                             ),
-                            relationship_type="belongs-to",
-                            source_ref=stix_observable.id,
+                            relationship_type="related-to",
+                            source_ref=stix_as.id,
                             target_ref=stix_organization.id,
                             created_by_ref=self.identity["standard_id"],
                             object_marking_refs=[stix2.TLP_WHITE],
                         )
-                        bundle_relationships.append(
-                            stix_relationship_observable_organization
-                        )
+                        relationships.append(stix_relationship_as_organization)
+                stix_city = None
+                if "city" in metadata:
+                    stix_city = stix2.Location(
+                        id=Location.generate_id(metadata["city"], "City"),
+                        name=metadata["city"],
+                        country="N/A",
+                        created_by_ref=self.identity["standard_id"],
+                        object_marking_refs=[stix2.TLP_WHITE],
+                        custom_properties={"x_opencti_location_type": "City"},
+                    )
+                    entities.append(stix_city)
 
-                        if stix_as is not None:
-                            stix_relationship_as_organization = stix2.Relationship(
-                                id=StixCoreRelationship.generate_id(
-                                    "related-to", stix_as.id, stix_organization.id
-                                ),
-                                relationship_type="related-to",
-                                source_ref=stix_as.id,
-                                target_ref=stix_organization.id,
-                                created_by_ref=self.identity["standard_id"],
-                                object_marking_refs=[stix2.TLP_WHITE],
-                            )
-                            bundle_relationships.append(
-                                stix_relationship_as_organization
-                            )
-                    stix_city = None
-                    if "city" in metadata:
-                        stix_city = stix2.Location(
-                            id=Location.generate_id(metadata["city"], "City"),
-                            name=metadata["city"],
-                            country="N/A",
-                            created_by_ref=self.identity["standard_id"],
-                            object_marking_refs=[stix2.TLP_WHITE],
-                            custom_properties={"x_opencti_location_type": "City"},
-                        )
-                        bundle_entities.append(stix_city)
+                    stix_relationship_observable_city = stix2.Relationship(
+                        id=StixCoreRelationship.generate_id(
+                            "located-at", stix_observable.id, stix_city.id
+                        ),
+                        relationship_type="located-at",
+                        source_ref=stix_observable.id,
+                        target_ref=stix_city.id,
+                        created_by_ref=self.identity["standard_id"],
+                        object_marking_refs=[stix2.TLP_WHITE],
+                    )
+                    relationships.append(stix_relationship_observable_city)
+
+                if "country" in metadata:
+                    stix_country = stix2.Location(
+                        id=Location.generate_id(metadata["country"], "Country"),
+                        name=metadata["country"],
+                        country=metadata["country"],
+                        created_by_ref=self.identity["standard_id"],
+                        object_marking_refs=[stix2.TLP_WHITE],
+                        custom_properties={"x_opencti_location_type": "Country"},
+                    )
+                    entities.append(stix_country)
 
+                    if stix_city is None:
                         stix_relationship_observable_city = stix2.Relationship(
                             id=StixCoreRelationship.generate_id(
-                                "located-at", stix_observable.id, stix_city.id
+                                "located-at", stix_observable.id, stix_country.id
                             ),
                             relationship_type="located-at",
                             source_ref=stix_observable.id,
-                            target_ref=stix_city.id,
+                            target_ref=stix_country.id,
                             created_by_ref=self.identity["standard_id"],
                             object_marking_refs=[stix2.TLP_WHITE],
                         )
-                        bundle_relationships.append(stix_relationship_observable_city)
-
-                    if "country" in metadata:
-                        stix_country = stix2.Location(
-                            id=Location.generate_id(metadata["country"], "Country"),
-                            name=metadata["country"],
-                            country=metadata["country"],
+                        relationships.append(stix_relationship_observable_city)
+                    else:
+                        stix_relationship_city_country = stix2.Relationship(
+                            id=StixCoreRelationship.generate_id(
+                                "located-at", stix_city.id, stix_country.id
+                            ),
+                            relationship_type="located-at",
+                            source_ref=stix_city.id,
+                            target_ref=stix_country.id,
+                            created_by_ref=self.identity["standard_id"],
+                            object_marking_refs=[stix2.TLP_WHITE],
+                        )
+                        relationships.append(stix_relationship_city_country)
+                if (
+                    self.config.greynoise_feed.import_destination_sightings
+                    and "destination_countries" in metadata
+                ):
+                    for country in metadata["destination_countries"]:
+                        stix_country_destination = stix2.Location(
+                            id=Location.generate_id(country, "Country"),
+                            name=country,
+                            country=country,
                             created_by_ref=self.identity["standard_id"],
                             object_marking_refs=[stix2.TLP_WHITE],
                             custom_properties={"x_opencti_location_type": "Country"},
                         )
-                        bundle_entities.append(stix_country)
-
-                        if stix_city is None:
-                            stix_relationship_observable_city = stix2.Relationship(
-                                id=StixCoreRelationship.generate_id(
-                                    "located-at", stix_observable.id, stix_country.id
-                                ),
-                                relationship_type="located-at",
-                                source_ref=stix_observable.id,
-                                target_ref=stix_country.id,
-                                created_by_ref=self.identity["standard_id"],
-                                object_marking_refs=[stix2.TLP_WHITE],
-                            )
-                            bundle_relationships.append(
-                                stix_relationship_observable_city
-                            )
-                        else:
-                            stix_relationship_city_country = stix2.Relationship(
-                                id=StixCoreRelationship.generate_id(
-                                    "located-at", stix_city.id, stix_country.id
-                                ),
-                                relationship_type="located-at",
-                                source_ref=stix_city.id,
-                                target_ref=stix_country.id,
-                                created_by_ref=self.identity["standard_id"],
-                                object_marking_refs=[stix2.TLP_WHITE],
-                            )
-                            bundle_relationships.append(stix_relationship_city_country)
-                    if (
-                        self.config.greynoise_feed.import_destination_sightings
-                        and "destination_countries" in metadata
-                    ):
-                        for country in metadata["destination_countries"]:
-                            stix_country_destination = stix2.Location(
-                                id=Location.generate_id(country, "Country"),
-                                name=country,
-                                country=country,
-                                created_by_ref=self.identity["standard_id"],
-                                object_marking_refs=[stix2.TLP_WHITE],
-                                custom_properties={
-                                    "x_opencti_location_type": "Country"
-                                },
-                            )
-                            bundle_entities.append(stix_country_destination)
-
-                            stix_sighting_indicator = stix2.Sighting(
-                                id=StixSightingRelationship.generate_id(
-                                    stix_indicator.id,
-                                    stix_country_destination.id,
-                                    first_seen,
-                                    last_seen,
-                                ),
-                                sighting_of_ref=stix_indicator.id,
-                                where_sighted_refs=[stix_country_destination.id],
-                                count=1,
-                                first_seen=first_seen,
-                                last_seen=last_seen,
-                                created_by_ref=self.identity["standard_id"],
-                                object_marking_refs=[stix2.TLP_GREEN],
-                            )
-                            bundle_relationships.append(stix_sighting_indicator)
-
-        # Creating the bundle from the list
+                        entities.append(stix_country_destination)
+
+                        stix_sighting_indicator = stix2.Sighting(
+                            id=StixSightingRelationship.generate_id(
+                                stix_indicator.id,
+                                stix_country_destination.id,
+                                first_seen,
+                                last_seen,
+                            ),
+                            sighting_of_ref=stix_indicator.id,
+                            where_sighted_refs=[stix_country_destination.id],
+                            count=1,
+                            first_seen=first_seen,
+                            last_seen=last_seen,
+                            created_by_ref=self.identity["standard_id"],
+                            object_marking_refs=[stix2.TLP_GREEN],
+                        )
+                        relationships.append(stix_sighting_indicator)
+
+        return entities, relationships
+
+    def _send_bundle(self, work_id, entities: dict, relationships: dict):
+        relationships = list(relationships.values())
+        shuffle(relationships)
+        self.helper.log_info(
+            "Submitting Bundle ("
+            + str(len(entities) + len(relationships))
+            + " objects)"
+        )
+        bundle = self.helper.stix2_create_bundle(
+            list(entities.values()) + relationships
+        )
+        self.helper.send_stix2_bundle(
+            bundle,
+            work_id=work_id,
+        )
+
+    def _process_data(self, work_id, session, ips_pages) -> int:
+        """
+        Convert the IPs page by page and send them in bundles of at most `BUNDLE_SIZE` objects.
+
+        :return: The number of IPs processed
+        """
+        tags_by_name = {tag["name"]: tag for tag in session.metadata()["metadata"]}
+        bundle_entities = {}
+        bundle_relationships = {}
+        ips_count = 0
+        self.helper.log_info("Building Indicator Bundles")
+        for ips_list in ips_pages:
+            for ip in ips_list:
+                if "ip" not in ip or "classification" not in ip:
+                    continue
+
+                entities, relationships = self._convert_ip(ip, tags_by_name)
+                ips_count += 1
+                # Objects shared by several IPs (locations, malwares, ...) are sent once per bundle
+                for stix_object in entities:
+                    bundle_entities[stix_object.id] = stix_object
+                for stix_object in relationships:
+                    bundle_relationships[stix_object.id] = stix_object
+
+                if len(bundle_entities) + len(bundle_relationships) >= self.BUNDLE_SIZE:
+                    self._send_bundle(work_id, bundle_entities, bundle_relationships)
+                    bundle_entities = {}
+                    bundle_relationships = {}
+
         if len(bundle_entities) > 0:
-            shuffle(bundle_relationships)
-            bundle_objects = bundle_entities + bundle_relationships
-            batch_count = 0
-            bundle_objects_len = len(bundle_objects)
-            batch_size = 50000
-            for i in range(batch_count, bundle_objects_len, batch_size):
-                self.helper.log_info("Batch: " + str(int(i) / int(batch_size)))
-                x = i
-                self.helper.log_info("Creating Bundles")
-                bundle = self.helper.stix2_create_bundle(
-                    bundle_objects[x : x + batch_size]
-                )
-                self.helper.log_info("Submitting Bundles")
-                self.helper.send_stix2_bundle(
-                    bundle,
-                    work_id=work_id,
-                )
+            self._send_bundle(work_id, bundle_entities, bundle_relationships)
+        return ips_count
+
+    def _iter_ips_pages(self, session, query: str, prefetch: int = 1):
+        """
+        Iterate over the scroll pages of a GNQL query, up to the configured limit of IPs.
+
+        Pages are fetched by a background thread, up to `prefetch` pages ahead of the
+        consumer, so that the next page is downloaded while the current one is converted.
+        """
+
+        def _fetch_pages():
+            limit = self.config.greynoise_feed.limit
+            ips_count = 0
+            scroll = None
+            complete = False
+            while not complete:
+                if scroll is None:
+                    self.helper.log_info(
+                        "Querying GreyNoise API - First Results Page (" + query + ")"
+                    )
+                    response = session.query(query=query, exclude_raw=True)
+                else:
+                    self.helper.log_info(
+                        "Query GreyNoise API - Next Results Page (" + query + ")"
+                    )
+                    response = session.query(
+                        query=query, scroll=scroll, exclude_raw=True
+                    )
+                complete = response.get("complete", True)
+                scroll = response.get("scroll", "")
+
+                ips_list = response.get("data") or []
+                if ips_count + len(ips_list) >= limit:
+                    complete = True
+                    ips_list = ips_list[0 : limit - ips_count]
+                ips_count += len(ips_list)
+                if ips_list:
+                    yield ips_list
+            self.helper.log_info("Query GreyNoise API - Completed")
+
+        yield from prefetch_pages(_fetch_pages, prefetch)
 
     def process(self):
         self.helper.log_info("GreyNoise feed - Initialization...")
 
-        self.labels_cache = {}
         try:
             # Get the current timestamp and check
             now = datetime.now(pytz.UTC)
@@ -548,61 +605,26 @@ class GreyNoiseFeedConnector:
             )
 
             try:
-                ips_list = []
                 session = GreyNoise(
                     api_key=self.config.greynoise_feed.api_key.get_secret_value(),
                     integration_name="opencti-feed-v2.4",
                 )
 
                 query = self.get_feed_query(self.config.greynoise_feed.feed_type)
-                self.helper.log_info(
-                    "Querying GreyNoise API - First Results Page (" + query + ")"
-                )
-                response = session.query(query=query, exclude_raw=True)
-                complete = response.get("complete", True)
-                scroll = response.get("scroll", "")
 
                 # Process
-                if "data" in response and len(response["data"]) > 0:
-                    for ip in response["data"]:
-                        ips_list.append(ip)
-
-                if len(ips_list) >= self.config.greynoise_feed.limit:
-                    complete = True
-                    ips_list = ips_list[0 : self.config.greynoise_feed.limit]
-
-                while not complete:
-                    self.helper.log_info(
-                        "Query GreyNoise API - Next Results Page (" + query + ")"
-                    )
-                    response = session.query(
-                        query=query, scroll=scroll, exclude_raw=True
-                    )
-                    complete = response.get("complete", True)
-                    scroll = response.get("scroll", "")
-
-                    # Process
-                    if "data" in response and len(response["data"]) > 0:
-                        for ip in response["data"]:
-                            ips_list.append(ip)
-
-                        if len(ips_list) >= self.config.greynoise_feed.limit:
-                            complete = True
-                            ips_list = ips_list[0 : self.config.greynoise_feed.limit]
-
-                self.helper.log_info("Query GreyNoise API - Completed")
-                self.helper.log_info("GreyNoise Indicator Count: " + str(len(ips_list)))
-
-                # Process
-                friendly_name = (
-                    "GreyNoise Feed connector run (" + str(len(ips_list)) + " IPs)"
-                )
+                friendly_name = "GreyNoise Feed connector run"
                 work_id = self.helper.api.work.initiate_work(
                     self.helper.connect_id, friendly_name
                 )
-                self._process_data(work_id, session, ips_list)
+                ips_count = self._process_data(
+                    work_id, session, self._iter_ips_pages(session, query)
+                )
+                self.helper.log_info("GreyNoise Indicator Count: " + str(ips_count))
                 message = (
-                    "Connector successfully run, storing last_run_timestamp as "
+                    "Connector successfully run ("
+                    + str(ips_count)
+                    + " IPs), storing last_run_timestamp as "
                     + now.astimezone(pytz.UTC).isoformat()
                 )
                 self.helper.api.work.to_processed(work_id, message)
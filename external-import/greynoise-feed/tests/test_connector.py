@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from connector.connector import GreyNoiseFeedConnector
+
+
+def make_connector(limit):
+    connector = GreyNoiseFeedConnector.__new__(GreyNoiseFeedConnector)
+    connector.config = SimpleNamespace(greynoise_feed=SimpleNamespace(limit=limit))
+    connector.helper = MagicMock()
+    return connector
+
+
+def make_session():
+    session = MagicMock()
+    session.query.side_effect = [
+        {
+            "data": [{"ip": "1.1.1.1"}, {"ip": "2.2.2.2"}],
+            "scroll": "s1",
+            "complete": False,
+        },
+        {"data": [{"ip": "3.3.3.3"}], "scroll": "s2", "complete": False},
+        {"data": [{"ip": "4.4.4.4"}], "scroll": "", "complete": True},
+    ]
+    return session
+
+
+def test_ips_pages_follow_the_scroll():
+    session = make_session()
+
+    pages = list(make_connector(limit=10)._iter_ips_pages(session, "tags:test"))
+
+    assert [[ip["ip"] for ip in page] for page in pages] == [
+        ["1.1.1.1", "2.2.2.2"],
+        ["3.3.3.3"],
+        ["4.4.4.4"],
+    ]
+    scrolls = [c.kwargs.get("scroll") for c in session.query.call_args_list]
+    assert scrolls == [None, "s1", "s2"]
+
+
+def test_ips_pages_stop_at_the_limit():
+    session = make_session()
+
+    pages = list(make_connector(limit=3)._iter_ips_pages(session, "tags:test"))
+
+    assert sum(len(page) for page in pages) == 3
+    assert session.query.call_count == 2
@@ -0,0 +1,46 @@
+import itertools
+import threading
+
+import pytest
+from connector.prefetch import prefetch_pages
+
+
+def test_pages_are_yielded_in_order():
+    assert list(prefetch_pages(lambda: iter([[1, 2], [3], [4, 5]]))) == [
+        [1, 2],
+        [3],
+        [4, 5],
+    ]
+
+
+def test_fetch_error_is_raised_to_the_consumer():
+    def fetch_pages():
+        yield [1]
+        raise ConnectionError("API unavailable")
+
+    pages = prefetch_pages(fetch_pages)
+
+    assert next(pages) == [1]
+    with pytest.raises(ConnectionError):
+        next(pages)
+
+
+def test_fetching_stops_with_the_consumer():
+    fetched = []
+    stopped = threading.Event()
+
+    def fetch_pages():
+        try:
+            for page in itertools.count():
+                fetched.append(page)
+                yield page
+        finally:
+            stopped.set()
+
+    pages = prefetch_pages(fetch_pages, prefetch=2)
+    assert next(pages) == 0
+    pages.close()
+
+    assert stopped.wait(timeout=5)
+    # The consumed page, the prefetched pages and the page waiting to be queued
+    assert len(fetched) <= 4
@@ -1,19 +1,46 @@
+import threading
 import time
-from datetime import datetime, timedelta
-from typing import Dict, Iterable, List, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Union
 from urllib.parse import urljoin
 
 import requests
 from pycti import OpenCTIConnectorHelper
+from requests.adapters import HTTPAdapter
 
 OFFSET_PAGINATION = 100
 
 
+class TokenBucket:
+    """Allow `rate` acquisitions per second, with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
 class MandiantAPI:
     api_url: str = "https://api.intelligence.mandiant.com"
     token_format: str = "Bearer {token}"
     max_retries: int = 3
-    last_query_time = None
     endpoints: Dict[str, str] = {
         "token": "/token",
         "reports": "v4/reports",
@@ -38,23 +65,29 @@ class MandiantAPI:
         "stix": "application/stix+json;version=2.1",
     }
 
-    def __init__(self, helper: OpenCTIConnectorHelper, key_id: str, key_secret: str):
+    def __init__(
+        self,
+        helper: OpenCTIConnectorHelper,
+        key_id: str,
+        key_secret: str,
+        requests_per_second: float = 1,
+        max_concurrent_requests: int = 1,
+    ):
         self.helper = helper
         self.auth = requests.auth.HTTPBasicAuth(key_id, key_secret)
-        self._authenticate()
-
-    def _set_last_query_time(self):
-        self.last_query_time = datetime.now()
-
-    def _wait_before_next_query(self):
-        if not self.last_query_time:
-            return
-
-        while True:
-            if datetime.now() - self.last_query_time > timedelta(seconds=1):
-                break
+        self.max_concurrent_requests = max_concurrent_requests
+
+        # Requests are started at `requests_per_second` at most, and up to
+        # `max_concurrent_requests` of them can be in flight at the same time
+        self.rate_limiter = TokenBucket(requests_per_second)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent_requests)
+        self.session = requests.Session()
+        self.session.mount(
+            "https://", HTTPAdapter(pool_maxsize=max_concurrent_requests)
+        )
+        self.token_lock = threading.Lock()
 
-            time.sleep(0.1)
+        self._authenticate()
 
     def _get_endpoint(self, name: str, item_id: str = None, **kwargs) -> str:
         request = requests.models.PreparedRequest()
@@ -68,7 +101,7 @@ class MandiantAPI:
         return request.url
 
     def _authenticate(self) -> None:
-        response = requests.post(
+        response = self.session.post(
             url=self._get_endpoint("token"),
             auth=self.auth,
             data={"grant_type": "client_credentials"},
@@ -91,17 +124,16 @@ class MandiantAPI:
             if self.max_retries == retries:
                 return None
 
+            token = self.token
             headers = {
                 "accept": accept,
                 "x-app-name": "opencti-connector",
-                "authorization": self.token_format.format(token=self.token),
+                "authorization": self.token_format.format(token=token),
             }
 
-            self._wait_before_next_query()
+            self.rate_limiter.acquire()
 
-            response = requests.get(url, headers=headers)
-
-            self._set_last_query_time()
+            response = self.session.get(url, headers=headers)
 
             if 200 <= response.status_code < 300:
                 return response
@@ -114,9 +146,12 @@ class MandiantAPI:
                 continue
 
             if response.status_code in [401, 403]:
-                self.helper.connector_logger.debug("Refreshing token ...")
                 retries += 1
-                self._authenticate()
+                with self.token_lock:
+                    # The token may have been refreshed by a concurrent request
+                    if self.token == token:
+                        self.helper.connector_logger.debug("Refreshing token ...")
+                        self._authenticate()
                 continue
 
             meta = {
@@ -171,6 +206,10 @@ class MandiantAPI:
                 **required_parameters,
             )
 
+    def submit(self, function: Callable, *args, **kwargs) -> Future:
+        """Run an API call in the background, sharing the rate limit of the client."""
+        return self.executor.submit(function, *args, **kwargs)
+
     def indicators(
         self,
         start_epoch: int,
@@ -1,9 +1,9 @@
 import importlib
-import json
 import sys
 import time
+from collections import deque
 from datetime import timedelta
-from typing import Any
+from typing import Any, Iterator
 
 from pycti import OpenCTIConnectorHelper
 
@@ -19,7 +19,7 @@ from .constants import (
 )
 from .errors import StateError
 from .models.configs.config_loader import ConfigLoader
-from .utils import Timestamp
+from .utils import Timestamp, stix_to_dict
 
 
 class Mandiant:
@@ -275,6 +275,8 @@ class Mandiant:
             self.helper,
             self.mandiant_api_v4_key_id,
             self.mandiant_api_v4_key_secret,
+            requests_per_second=self.config.mandiant.requests_per_second,
+            max_concurrent_requests=self.config.mandiant.max_concurrent_requests,
         )
 
         self._init_state()
@@ -543,6 +545,26 @@ class Mandiant:
                 else:
                     obj["object_marking_refs"] = new_markings
 
+    def _prefetch_reports(
+        self, module: Any, reports: list[Any]
+    ) -> Iterator[tuple[Any, Any]]:
+        """
+        Yield the reports with the sub-resources of the next ones being fetched.
+
+        Args:
+            module (module): The reports collection module.
+            reports (list): The reports of the collection.
+
+        Returns:
+            Iterator of the reports and their prefetched sub-resources, in order.
+        """
+        pending = deque()
+        for report in reports:
+            pending.append((report, module.prefetch(self, report)))
+            if len(pending) > self.api.max_concurrent_requests:
+                yield pending.popleft()
+        yield from pending
+
     def _process_batch_reports(
         self, new_batch_reports: list[Any], info_reports: dict[str, Any]
     ) -> None:
@@ -605,9 +627,7 @@ class Mandiant:
                 {obj["id"]: obj for obj in bundles_objects}.values()
             )
             # Transform objects to dicts
-            uniq_bundles_objects = [
-                json.loads(obj.serialize()) for obj in uniq_bundles_objects
-            ]
+            uniq_bundles_objects = [stix_to_dict(obj) for obj in uniq_bundles_objects]
             if self.mandiant_remove_statement_marking:
                 uniq_bundles_objects = list(
                     filter(
@@ -778,8 +798,8 @@ class Mandiant:
                     "bundles_objects": [],
                 }
 
-                for item in data:
-                    report_bundle = module.process(self, item)
+                for item, prefetched in self._prefetch_reports(module, data):
+                    report_bundle = module.process(self, item, prefetched)
                     if report_bundle:
                         new_batch_reports.append(report_bundle["objects"])
 
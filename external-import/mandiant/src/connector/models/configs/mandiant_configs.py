@@ -8,6 +8,7 @@ from pydantic import (
     Field,
     HttpUrl,
     PlainSerializer,
+    PositiveFloat,
     PositiveInt,
     SecretStr,
 )
@@ -53,6 +54,14 @@ class ConfigLoaderMandiant(ConfigBaseSettings):
     api_v4_key_secret: SecretStr = Field(
         description="Mandiant API v4 Key Secret for authentication.",
     )
+    requests_per_second: PositiveFloat = Field(
+        default=1.0,
+        description="Maximum number of requests started per second on the Mandiant API, according to the licensed quota.",
+    )
+    max_concurrent_requests: PositiveInt = Field(
+        default=4,
+        description="Maximum number of requests in flight at the same time on the Mandiant API.",
+    )
 
     marking: TLPToLower = Field(
         default="amber+strict",
@@ -9,7 +9,25 @@ from . import utils
 from .common import create_stix_relationship
 
 
-def process(connector, report):
+def prefetch(connector, report):
+    """
+    Start fetching the details, STIX bundle and PDF of a report in the background.
+
+    Returns the futures of the sub-resources to give to `process`, or None if the
+    report type is not imported.
+    """
+    report_id = report.get("report_id", report.get("reportId", None))
+    report_type = report.get("report_type", report.get("reportType", None))
+    if report_type not in connector.mandiant_report_types:
+        return None
+    return {
+        "details": connector.api.submit(connector.api.report, report_id, "json"),
+        "bundle": connector.api.submit(connector.api.report, report_id, mode="stix"),
+        "pdf": connector.api.submit(connector.api.report, report_id, mode="pdf"),
+    }
+
+
+def process(connector, report, prefetched=None):
     report_id = report.get("report_id", report.get("reportId", None))
     try:
         report_type = report.get("report_type", report.get("reportType", None))
@@ -32,9 +50,14 @@ def process(connector, report):
                 "report_title": report_title,
             },
         )
-        report_details = connector.api.report(report_id, "json")
-        report_bundle = connector.api.report(report_id, mode="stix")
-        report_pdf = connector.api.report(report_id, mode="pdf")
+        if prefetched is not None:
+            report_details = prefetched["details"].result()
+            report_bundle = prefetched["bundle"].result()
+            report_pdf = prefetched["pdf"].result()
+        else:
+            report_details = connector.api.report(report_id, "json")
+            report_bundle = connector.api.report(report_id, mode="stix")
+            report_pdf = connector.api.report(report_id, mode="pdf")
         bundle_objects = report_bundle["objects"]
         report_bundle["objects"] = list(
             filter(lambda item: not item["id"].startswith("x-"), bundle_objects)
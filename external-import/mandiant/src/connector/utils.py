@@ -1,5 +1,9 @@
 import re
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Mapping
+
+from stix2.base import _STIXBase
+from stix2.utils import format_datetime
 
 
 class Timestamp:
@@ -106,3 +110,23 @@ ATTRIBUTION_SCOPES = {
 
 def get_confidence(attribution_scope):
     return ATTRIBUTION_SCOPES.get(attribution_scope, 25)
+
+
+def stix_to_dict(stix_object: Any) -> Any:
+    """
+    Convert a STIX object to a dictionary as `json.loads(stix_object.serialize())`
+    would, without serializing it to JSON.
+    """
+    if isinstance(stix_object, _STIXBase):
+        return {
+            key: stix_to_dict(value)
+            for key, value in stix_object.items()
+            if key not in stix_object._defaulted_optional_properties
+        }
+    if isinstance(stix_object, Mapping):
+        return {key: stix_to_dict(value) for key, value in stix_object.items()}
+    if isinstance(stix_object, (list, tuple)):
+        return [stix_to_dict(value) for value in stix_object]
+    if isinstance(stix_object, (date, datetime)):
+        return format_datetime(stix_object)
+    return stix_object
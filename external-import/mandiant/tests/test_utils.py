@@ -0,0 +1,107 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+import stix2
+from connector.common import create_stix_industry, create_stix_relationship
+from connector.constants import TLP_MARKING_DEFINITION_MAPPING
+from connector.indicators import create_indicator
+from connector.utils import stix_to_dict
+
+IDENTITY_ID = "identity--1d0ab6a9-9a3a-5b8b-a1be-8a32e27f9d43"
+REPORT_ID = "report--7a5a4b7e-0d64-4a0f-9d0a-3b9c1cb7f1c2"
+FILE_ID = "file--0a2b9b6b-4f5e-5a1e-9b4c-5b3c6e2e5d1f"
+
+connector = SimpleNamespace(
+    identity={"standard_id": IDENTITY_ID},
+    mandiant_marking=[TLP_MARKING_DEFINITION_MAPPING["amber+strict"]["id"]],
+)
+
+
+def parse_report_bundle():
+    """Parse a report bundle as received from Mandiant."""
+    bundle = {
+        "type": "bundle",
+        "id": "bundle--5c5f1ec5-79ba-4d67-8a58-4cf1a0d8b3f7",
+        "objects": [
+            {
+                "type": "report",
+                "spec_version": "2.1",
+                "id": REPORT_ID,
+                "created": "2024-01-01T00:00:00.000Z",
+                "modified": "2024-01-02T00:00:00.000Z",
+                "name": "Report",
+                "published": "2024-01-01T00:00:00Z",
+                "report_types": ["threat-report"],
+                "object_refs": [FILE_ID],
+                "created_by_ref": IDENTITY_ID,
+                "x_mandiant_com_metadata": {"report_type": "Actor Profile"},
+            },
+            {
+                "type": "file",
+                "spec_version": "2.1",
+                "id": FILE_ID,
+                "name": "report.pdf",
+                "hashes": {"MD5": "d41d8cd98f00b204e9800998ecf8427e"},
+                "x_opencti_files": [{"name": "report.pdf", "data": "AA=="}],
+            },
+        ],
+    }
+    return stix2.parse(bundle, allow_custom=True).objects
+
+
+def make_objects():
+    report, file = parse_report_bundle()
+    indicator = create_indicator(
+        connector,
+        {
+            "value": "evil.example.com",
+            "type": "fqdn",
+            "mscore": 80,
+            "first_seen": "2024-01-01T00:00:00.000Z",
+            "last_updated": "2024-01-02T00:00:00.000Z",
+        },
+    )
+    identity, industry_relationship = create_stix_industry(
+        connector,
+        report,
+        {
+            "id": "identity--4f8a8b4c-5b5e-4b7e-9a0a-0d9d6b3b4c1a",
+            "name": "Finance",
+            "attribution_scope": "confirmed",
+        },
+    )
+    relationship = create_stix_relationship(
+        connector,
+        "indicates",
+        indicator["id"],
+        REPORT_ID,
+        "suspected",
+        "2024-01-01T00:00:00.000Z",
+        "2024-01-01T00:00:00.000Z",
+    )
+    return {
+        "indicator": indicator,
+        "report": report,
+        "identity": identity,
+        "marking": TLP_MARKING_DEFINITION_MAPPING["amber+strict"],
+        "tlp-marking": TLP_MARKING_DEFINITION_MAPPING["amber"],
+        "relationship": relationship,
+        "industry-relationship": industry_relationship,
+        "file": file,
+    }
+
+
+@pytest.mark.parametrize("name", make_objects().keys())
+def test_stix_to_dict_matches_serialization(name):
+    stix_object = make_objects()[name]
+
+    assert stix_to_dict(stix_object) == json.loads(stix_object.serialize())
+
+
+def test_stix_to_dict_converts_nested_objects():
+    stix_objects = list(make_objects().values())
+
+    assert stix_to_dict(stix_objects) == [
+        json.loads(stix_object.serialize()) for stix_object in stix_objects
+    ]
@@ -268,6 +268,10 @@ class _MISPConfig(_ConfigBaseModel):
         default=False,
         alias="guess_threat_from_tags",  # backward compatibility with mispelled env var
     )
+    guess_threats_api_fallback: bool = Field(
+        description="Whether to query OpenCTI for the MISP tags not found in the index of known threats or not.",
+        default=False,
+    )
     # ! Not documented in README
     author_from_tags: bool = Field(
         description="Whether to create Authors from MISP tags or not.",
@@ -1,18 +1,164 @@
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from pycti import OpenCTIApiClient
 
+THREAT_TYPES = ["Intrusion-Set", "Malware", "Tool", "Attack-Pattern"]
+
+# Only the fields needed to index and convert threats
+THREAT_ATTRIBUTES = """
+    id
+    entity_type
+    updated_at
+    ... on IntrusionSet {
+        name
+        aliases
+    }
+    ... on Malware {
+        name
+        aliases
+    }
+    ... on Tool {
+        name
+        aliases
+    }
+    ... on AttackPattern {
+        name
+        aliases
+        x_mitre_id
+    }
+"""
+
+
+def normalize_name(value: str) -> str:
+    """Normalize a threat name or alias to be used as index key."""
+    return " ".join(value.split()).lower()
+
 
 class ThreatsGuesser:
-    """Provide Intrusion Set, Malware, Tool, or Attack Pattern data from OpenCTI platform."""
+    """Provide Intrusion Set, Malware, Tool, or Attack Pattern data from OpenCTI platform.
+
+    Names, aliases and MITRE ids of the threats are indexed in memory, so that
+    guessing threats from MISP tags doesn't query OpenCTI for each tag. The index
+    is fully loaded on the first call to `refresh`, then only the threats updated
+    since the previous refresh are fetched. As deleted or merged threats are not
+    returned by these incremental loads, the index is rebuilt from scratch once
+    `full_refresh_interval` has elapsed.
+    """
+
+    def __init__(
+        self,
+        api_client: OpenCTIApiClient,
+        api_fallback: bool = False,
+        full_refresh_interval: timedelta = timedelta(days=1),
+    ):
+        """Initialize the Threats Guesser.
 
-    def __init__(self, api_client: OpenCTIApiClient):
-        """Initialize the Geocoding Adapter."""
+        :param api_client: OpenCTI API client
+        :param api_fallback: whether to query OpenCTI when a value is not in the index
+        :param full_refresh_interval: delay after which the index is fully rebuilt
+        """
         self._api_client = api_client
+        self._api_fallback = api_fallback
+        self._full_refresh_interval = full_refresh_interval
+        self._last_full_refresh_at: datetime | None = None
+
+        self._threats: dict[str, dict[str, Any]] = {}
+        self._names: dict[str, list[str]] = {}
+        self._aliases: dict[str, list[str]] = {}
+        self._last_updated_at: str | None = None
+
+    def refresh(self) -> int:
+        """Load the threats created or updated since the last refresh in the index.
+
+        :return: number of threats (re)indexed
+        """
+        now = datetime.now(timezone.utc)
+        full_refresh = (
+            self._last_full_refresh_at is None
+            or now - self._last_full_refresh_at >= self._full_refresh_interval
+        )
+        if full_refresh:
+            # Evict the threats deleted or merged since the last full refresh
+            self._threats = {}
+            self._names = {}
+            self._aliases = {}
+            self._last_updated_at = None
+
+        filters = None
+        if self._last_updated_at is not None:
+            filters = {
+                "mode": "and",
+                "filters": [
+                    {
+                        "key": "updated_at",
+                        "values": [self._last_updated_at],
+                        "operator": "gte",
+                    }
+                ],
+                "filterGroups": [],
+            }
+        threats = self._api_client.stix_domain_object.list(
+            types=THREAT_TYPES,
+            filters=filters,
+            customAttributes=THREAT_ATTRIBUTES,
+            orderBy="updated_at",
+            orderMode="asc",
+            getAll=True,
+        )
+        for threat in threats:
+            self._index(threat)
+            if (
+                self._last_updated_at is None
+                or threat["updated_at"] > self._last_updated_at
+            ):
+                self._last_updated_at = threat["updated_at"]
+        if full_refresh:
+            self._last_full_refresh_at = now
+        return len(threats)
+
+    def _index(self, threat: dict[str, Any]) -> None:
+        # Remove the previous names of an updated threat
+        if threat["id"] in self._threats:
+            self._unindex(self._threats[threat["id"]])
+        self._threats[threat["id"]] = threat
+
+        names = [threat["name"]]
+        if threat.get("x_mitre_id"):
+            names.append(threat["x_mitre_id"])
+        for name in names:
+            self._names.setdefault(normalize_name(name), []).append(threat["id"])
+        for alias in threat.get("aliases") or []:
+            self._aliases.setdefault(normalize_name(alias), []).append(threat["id"])
+
+    def _unindex(self, threat: dict[str, Any]) -> None:
+        keys = [
+            (self._names, threat["name"]),
+            (self._names, threat.get("x_mitre_id")),
+            *[(self._aliases, alias) for alias in threat.get("aliases") or []],
+        ]
+        for index, name in keys:
+            if not name:
+                continue
+            ids = index.get(normalize_name(name), [])
+            if threat["id"] in ids:
+                ids.remove(threat["id"])
+            if not ids:
+                index.pop(normalize_name(name), None)
 
     def search_by_name_or_id(self, value: str) -> list[dict[str, Any]]:
+        key = normalize_name(value)
+        # Threats matching by name come before the ones matching by alias
+        threat_ids = dict.fromkeys(
+            self._names.get(key, []) + self._aliases.get(key, [])
+        )
+        if threat_ids:
+            return [self._threats[threat_id] for threat_id in threat_ids]
+        if not self._api_fallback:
+            return []
+
         threats = self._api_client.stix_domain_object.list(
-            types=["Intrusion-Set", "Malware", "Tool", "Attack-Pattern"],
+            types=THREAT_TYPES,
             filters={
                 "mode": "and",
                 "filters": [
@@ -28,5 +174,8 @@ class ThreatsGuesser:
                 ],
                 "filterGroups": [],
             },
+            customAttributes=THREAT_ATTRIBUTES,
         )
+        for threat in threats:
+            self._index(threat)
         return threats
@@ -21,6 +21,14 @@ class Misp:
             verify_ssl=self.config.misp.ssl_verify,
             certificate=self.config.misp.client_cert,
         )
+        self.threats_guesser = (
+            ThreatsGuesser(
+                self.helper.api,
+                api_fallback=self.config.misp.guess_threats_api_fallback,
+            )
+            if self.config.misp.guess_threats_from_tags
+            else None
+        )
         self.converter = EventConverter(
             report_type=self.config.misp.report_type,
             report_description_attribute_filters=self.config.misp.report_description_attribute_filters,
@@ -41,11 +49,7 @@ class Misp:
             original_tags_to_keep_as_labels=self.config.misp.keep_original_tags_as_label,
             default_attribute_score=self.config.misp.import_to_ids_no_score,
             guess_threats_from_tags=self.config.misp.guess_threats_from_tags,
-            threats_guesser=(
-                ThreatsGuesser(self.helper.api)
-                if self.config.misp.guess_threats_from_tags
-                else None
-            ),
+            threats_guesser=self.threats_guesser,
         )
 
     def process_event(self, event: EventRestSearchListItem):
@@ -164,6 +168,13 @@ class Misp:
                     last_event = now
                 self.helper.connector_logger.info("Connector has never run")
 
+            if self.threats_guesser:
+                indexed_threats_count = self.threats_guesser.refresh()
+                self.helper.connector_logger.info(
+                    "Threats index refreshed",
+                    {"indexed_threats_count": indexed_threats_count},
+                )
+
             # Put the date
             next_event_date = last_event + timedelta(seconds=1)
 
@@ -0,0 +1,95 @@
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from connector.threats_guesser import ThreatsGuesser
+
+
+def make_threat(threat_id, name, updated_at, aliases=None):
+    return {
+        "id": threat_id,
+        "entity_type": "Intrusion-Set",
+        "name": name,
+        "aliases": aliases or [],
+        "updated_at": updated_at,
+    }
+
+
+@pytest.fixture
+def api_client():
+    return MagicMock()
+
+
+def test_refresh_indexes_names_and_aliases(api_client):
+    apt28 = make_threat("id-1", "APT28", "2024-01-01T00:00:00Z", ["Fancy Bear"])
+    api_client.stix_domain_object.list.return_value = [apt28]
+    threats_guesser = ThreatsGuesser(api_client)
+
+    assert threats_guesser.refresh() == 1
+
+    assert threats_guesser.search_by_name_or_id("apt28") == [apt28]
+    assert threats_guesser.search_by_name_or_id("Fancy  Bear") == [apt28]
+    assert threats_guesser.search_by_name_or_id("APT29") == []
+    api_client.stix_domain_object.list.assert_called_once()
+    assert api_client.stix_domain_object.list.call_args.kwargs["filters"] is None
+
+
+def test_refresh_only_fetches_updated_threats(api_client):
+    api_client.stix_domain_object.list.return_value = [
+        make_threat("id-1", "APT28", "2024-01-01T00:00:00Z"),
+        make_threat("id-2", "APT29", "2024-01-02T00:00:00Z"),
+    ]
+    threats_guesser = ThreatsGuesser(api_client)
+    threats_guesser.refresh()
+
+    renamed = make_threat("id-1", "Sofacy", "2024-01-03T00:00:00Z")
+    api_client.stix_domain_object.list.return_value = [renamed]
+    assert threats_guesser.refresh() == 1
+
+    filters = api_client.stix_domain_object.list.call_args.kwargs["filters"]
+    assert filters["filters"][0]["key"] == "updated_at"
+    assert filters["filters"][0]["values"] == ["2024-01-02T00:00:00Z"]
+    assert threats_guesser.search_by_name_or_id("APT28") == []
+    assert threats_guesser.search_by_name_or_id("Sofacy") == [renamed]
+    assert threats_guesser.search_by_name_or_id("APT29")
+
+
+def test_full_refresh_evicts_deleted_threats(api_client):
+    api_client.stix_domain_object.list.return_value = [
+        make_threat("id-1", "APT28", "2024-01-01T00:00:00Z"),
+        make_threat("id-2", "APT29", "2024-01-02T00:00:00Z"),
+    ]
+    threats_guesser = ThreatsGuesser(api_client, full_refresh_interval=timedelta(0))
+    threats_guesser.refresh()
+
+    # APT28 has been deleted or merged into APT29
+    apt29 = make_threat("id-2", "APT29", "2024-01-02T00:00:00Z", ["APT28"])
+    api_client.stix_domain_object.list.return_value = [apt29]
+    assert threats_guesser.refresh() == 1
+
+    assert api_client.stix_domain_object.list.call_args.kwargs["filters"] is None
+    assert threats_guesser.search_by_name_or_id("APT28") == [apt29]
+    assert threats_guesser.search_by_name_or_id("APT29") == [apt29]
+
+
+def test_failed_full_refresh_is_retried(api_client):
+    api_client.stix_domain_object.list.side_effect = ConnectionError()
+    threats_guesser = ThreatsGuesser(api_client)
+    with pytest.raises(ConnectionError):
+        threats_guesser.refresh()
+
+    api_client.stix_domain_object.list.side_effect = None
+    api_client.stix_domain_object.list.return_value = []
+    threats_guesser.refresh()
+
+    assert api_client.stix_domain_object.list.call_args.kwargs["filters"] is None
+
+
+def test_api_fallback_indexes_found_threats(api_client):
+    apt28 = make_threat("id-1", "APT28", "2024-01-01T00:00:00Z")
+    api_client.stix_domain_object.list.return_value = [apt28]
+    threats_guesser = ThreatsGuesser(api_client, api_fallback=True)
+
+    assert threats_guesser.search_by_name_or_id("APT28") == [apt28]
+    assert threats_guesser.search_by_name_or_id("APT28") == [apt28]
+    api_client.stix_domain_object.list.assert_called_once()
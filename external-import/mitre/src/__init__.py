@@ -1,3 +1,4 @@
 from src.models import ConfigLoader
+from src.snapshot_store import SnapshotStore
 
-__all__ = ["ConfigLoader"]
+__all__ = ["ConfigLoader", "SnapshotStore"]
@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional
 
 from pycti import OpenCTIConnectorHelper
-from src import ConfigLoader
+from src import ConfigLoader, SnapshotStore
 
 MITRE_ENTERPRISE_FILE_URL = "https://raw.githubusercontent.com/mitre-attack/attack-stix-data/master/enterprise-attack/enterprise-attack.json"
 MITRE_MOBILE_ATTACK_FILE_URL = "https://raw.githubusercontent.com/mitre-attack/attack-stix-data/master/mobile-attack/mobile-attack.json"
@@ -76,6 +76,9 @@ class Mitre:
             filter(lambda url: url is not None and url.lower() != "false", urls)
         )
         self.interval = days_to_seconds(self.mitre_interval)
+        self.snapshot_store = SnapshotStore(
+            self.helper.get_state, file_path=self.config.mitre.snapshot_path
+        )
 
     def retrieve_data(self, url: str) -> Optional[dict]:
         """
@@ -112,7 +115,7 @@ class Mitre:
                     stix_objects,
                 )
             )
-            revoked_ids = list(map(lambda stix: stix["id"], revoked_objects))
+            revoked_ids = {stix["id"] for stix in revoked_objects}
             # Filter every revoked MITRE elements
             not_revoked_objects = list(
                 filter(
@@ -167,6 +170,10 @@ class Mitre:
         self.helper.metric.inc("run_count")
         self.helper.metric.state("running")
 
+        # Always start from the persisted snapshots, so that a state reset from the
+        # platform sends everything again
+        self.snapshot_store.load()
+
         friendly_name = f"MITRE run @ {time_now}"
         work_id = self.helper.api.work.initiate_work(
             self.helper.connect_id, friendly_name
@@ -180,16 +187,26 @@ class Mitre:
             if not data:
                 continue
 
-            self.helper.send_stix2_bundle(
-                json.dumps(data),
-                entities_types=self.helper.connect_scope,
-                work_id=work_id,
+            # Only send objects that are new or changed since the last run
+            objects, snapshot = self.snapshot_store.diff(url, data["objects"])
+            self.helper.log_info(
+                f"{len(objects)} new or changed objects out of {len(data['objects'])} for {url}"
             )
-            self.helper.metric.inc("record_send", len(data["objects"]))
+            if objects:
+                data["objects"] = objects
+                self.helper.send_stix2_bundle(
+                    json.dumps(data),
+                    entities_types=self.helper.connect_scope,
+                    work_id=work_id,
+                )
+                self.helper.metric.inc("record_send", len(objects))
+            self.snapshot_store.commit(url, snapshot)
 
         message = f"Connector successfully run, storing last_run as {time_now}"
         self.helper.log_info(message)
-        self.helper.set_state({"last_run": unixtime_now})
+        self.helper.set_state(
+            {"last_run": unixtime_now, **self.snapshot_store.to_state()}
+        )
         self.helper.api.work.to_processed(work_id, message)
 
     def run(self):
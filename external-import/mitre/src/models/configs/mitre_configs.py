@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import (
     Field,
     PositiveInt,
@@ -59,3 +61,12 @@ class _ConfigLoaderMitre(ConfigBaseSettings):
             "Provides a comprehensive dictionary of known attack patterns used by adversaries."
         ),
     )
+    snapshot_path: Optional[str] = Field(
+        default=None,
+        description=(
+            "Path to a local file storing the content hash of every sent object, "
+            "used to only send new or changed objects on each run. "
+            "If not set, only a digest per dataset is stored in the connector state "
+            "and a changed dataset is sent entirely."
+        ),
+    )
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+from typing import Callable, Iterable, Optional, Union
+
+STATE_SNAPSHOTS_KEY = "snapshots"
+
+
+def _iter_refs(stix: dict) -> Iterable[str]:
+    """Yield every STIX id referenced by a top-level `*_ref` or `*_refs` property."""
+    for key, value in stix.items():
+        if key.endswith("_ref") and isinstance(value, str):
+            yield value
+        elif key.endswith("_refs") and isinstance(value, list):
+            for ref in value:
+                if isinstance(ref, str):
+                    yield ref
+
+
+def compute_stix_hash(stix: dict) -> str:
+    """
+    Compute a stable content hash of a STIX object.
+
+    Parameters
+    ----------
+    stix : dict
+        STIX object as a python dictionary.
+
+    Returns
+    -------
+    str
+        Hex digest of the canonical JSON serialization of the object.
+    """
+    serialized = json.dumps(stix, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def compute_snapshot_digest(snapshot: dict[str, str]) -> str:
+    """
+    Compute a single digest of a snapshot, independent of the objects ordering.
+
+    Parameters
+    ----------
+    snapshot : dict
+        Content hash of every object, by STIX id.
+
+    Returns
+    -------
+    str
+        Hex digest of the sorted (id, hash) pairs.
+    """
+    serialized = json.dumps(sorted(snapshot.items()), separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class SnapshotStore:
+    """
+    Store of content hashes used to only send new or changed objects.
+
+    Snapshots are grouped by source (e.g. the URL of a dataset):
+    - if `file_path` is provided, the hash of every object is kept in a local JSON
+      file and only new or changed objects are sent;
+    - otherwise, only one digest per source is kept in the connector state, to keep
+      the state small, and a source is sent entirely as soon as its digest changes.
+
+    A missing or empty connector state (first run, state reset from the platform)
+    means that every object is sent again.
+    """
+
+    def __init__(
+        self,
+        get_state: Callable[[], Optional[dict]],
+        file_path: Optional[str] = None,
+    ):
+        self.get_state = get_state
+        self.file_path = file_path
+        self.snapshots: dict[str, Union[dict[str, str], str]] = {}
+
+    def load(self) -> None:
+        """Reload the snapshots, to be called at the beginning of every run."""
+        current_state = self.get_state() or {}
+        if not current_state:
+            self.snapshots = {}
+        elif self.file_path:
+            if os.path.exists(self.file_path):
+                with open(self.file_path, encoding="utf-8") as snapshot_file:
+                    self.snapshots = json.load(snapshot_file)
+            else:
+                self.snapshots = {}
+        else:
+            self.snapshots = current_state.get(STATE_SNAPSHOTS_KEY, {})
+
+    def diff(
+        self, source: str, stix_objects: list[dict]
+    ) -> tuple[list, Union[dict[str, str], str]]:
+        """
+        Select the objects of a source that are new or changed since the last snapshot.
+
+        In file mode, objects referenced by a selected object (`created_by_ref`, `object_marking_refs`,
+        `source_ref`, `target_ref`, ...) are selected as well, so that every sent object
+        comes with its dependencies. In state mode, either every object or none is
+        selected, depending on the digest of the source.
+
+        Parameters
+        ----------
+        source : str
+            Identifier of the snapshot (e.g. the dataset URL).
+        stix_objects : list
+            Full list of STIX objects currently published by the source.
+
+        Returns
+        -------
+        tuple
+            The list of objects to send and the new snapshot of the source, to be
+            given to `commit` once the objects have been successfully sent.
+        """
+        objects_by_id = {stix["id"]: stix for stix in stix_objects}
+        new_snapshot = {
+            stix_id: compute_stix_hash(stix) for stix_id, stix in objects_by_id.items()
+        }
+        if not self.file_path:
+            digest = compute_snapshot_digest(new_snapshot)
+            if self.snapshots.get(source) == digest:
+                return [], digest
+            return list(stix_objects), digest
+
+        previous_snapshot = self.snapshots.get(source)
+        if not isinstance(previous_snapshot, dict):
+            previous_snapshot = {}
+
+        pending = [
+            stix_id
+            for stix_id, stix_hash in new_snapshot.items()
+            if previous_snapshot.get(stix_id) != stix_hash
+        ]
+        selected_ids = set()
+        while pending:
+            stix_id = pending.pop()
+            if stix_id in selected_ids or stix_id not in objects_by_id:
+                continue
+            selected_ids.add(stix_id)
+            pending.extend(_iter_refs(objects_by_id[stix_id]))
+
+        # Keep the original ordering of the source
+        selected_objects = [stix for stix in stix_objects if stix["id"] in selected_ids]
+        return selected_objects, new_snapshot
+
+    def commit(self, source: str, snapshot: Union[dict[str, str], str]) -> None:
+        """
+        Record the snapshot of a source once its objects have been sent.
+
+        When the snapshots are kept in the connector state, the caller is in charge
+        of persisting `snapshots` with the rest of the state.
+        """
+        self.snapshots[source] = snapshot
+        if self.file_path:
+            tmp_path = f"{self.file_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as snapshot_file:
+                json.dump(self.snapshots, snapshot_file)
+            os.replace(tmp_path, self.file_path)
+
+    def to_state(self) -> dict:
+        """Return the state entries to persist alongside the connector state."""
+        if self.file_path:
+            return {}
+        return {STATE_SNAPSHOTS_KEY: self.snapshots}
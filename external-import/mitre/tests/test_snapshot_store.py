@@ -0,0 +1,112 @@
+import json
+
+from src.snapshot_store import STATE_SNAPSHOTS_KEY, SnapshotStore
+
+SOURCE = "https://example.com/enterprise-attack.json"
+
+
+def make_objects():
+    return [
+        {"id": "identity--1", "type": "identity", "name": "MITRE"},
+        {
+            "id": "attack-pattern--1",
+            "type": "attack-pattern",
+            "name": "Phishing",
+            "created_by_ref": "identity--1",
+        },
+        {"id": "attack-pattern--2", "type": "attack-pattern", "name": "Exploit"},
+    ]
+
+
+def run(store, stix_objects):
+    """Simulate a connector run, returning the ids of the sent objects."""
+    store.load()
+    objects, snapshot = store.diff(SOURCE, stix_objects)
+    store.commit(SOURCE, snapshot)
+    return [stix["id"] for stix in objects]
+
+
+def test_file_mode_only_sends_changed_objects_and_dependencies(tmp_path):
+    state = {"last_run": 1}
+    store = SnapshotStore(lambda: state, file_path=str(tmp_path / "snapshot.json"))
+    stix_objects = make_objects()
+
+    assert run(store, stix_objects) == [
+        "identity--1",
+        "attack-pattern--1",
+        "attack-pattern--2",
+    ]
+    assert run(store, stix_objects) == []
+
+    stix_objects[1]["name"] = "Spearphishing"
+    assert run(store, stix_objects) == ["identity--1", "attack-pattern--1"]
+
+
+def test_file_mode_snapshots_survive_a_restart(tmp_path):
+    state = {"last_run": 1}
+    file_path = str(tmp_path / "snapshot.json")
+    run(SnapshotStore(lambda: state, file_path=file_path), make_objects())
+
+    assert run(SnapshotStore(lambda: state, file_path=file_path), make_objects()) == []
+
+
+def test_empty_state_sends_everything(tmp_path):
+    state = {"last_run": 1}
+    store = SnapshotStore(lambda: state, file_path=str(tmp_path / "snapshot.json"))
+    run(store, make_objects())
+
+    # State reset from the platform
+    state.clear()
+
+    assert len(run(store, make_objects())) == 3
+
+
+def test_missing_state_sends_everything():
+    store = SnapshotStore(lambda: None)
+
+    assert len(run(store, make_objects())) == 3
+
+
+def test_state_mode_keeps_one_digest_per_source():
+    state = {}
+    store = SnapshotStore(lambda: state)
+
+    assert len(run(store, make_objects())) == 3
+    state.update({"last_run": 1, **store.to_state()})
+
+    snapshots = state[STATE_SNAPSHOTS_KEY]
+    assert list(snapshots) == [SOURCE]
+    assert isinstance(snapshots[SOURCE], str)
+    # Unchanged dataset, in another order
+    assert run(store, list(reversed(make_objects()))) == []
+
+    changed_objects = make_objects()
+    changed_objects[2]["name"] = "Exploitation"
+    assert len(run(store, changed_objects)) == 3
+
+
+def test_state_mode_reloads_snapshots_from_state():
+    state = {}
+    store = SnapshotStore(lambda: state)
+    run(store, make_objects())
+    state.update({"last_run": 1, **store.to_state()})
+
+    # Snapshots persisted by another instance of the connector
+    other_store = SnapshotStore(lambda: state)
+    assert run(other_store, make_objects()) == []
+
+    state.clear()
+    assert len(run(other_store, make_objects())) == 3
+
+
+def test_file_mode_does_not_store_snapshots_in_state(tmp_path):
+    file_path = tmp_path / "snapshot.json"
+    store = SnapshotStore(lambda: {"last_run": 1}, file_path=str(file_path))
+    run(store, make_objects())
+
+    assert store.to_state() == {}
+    assert set(json.loads(file_path.read_text())[SOURCE]) == {
+        "identity--1",
+        "attack-pattern--1",
+        "attack-pattern--2",
+    }
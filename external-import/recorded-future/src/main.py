@@ -40,6 +40,10 @@ class BaseRFConnector:
         self.rf_pull_signatures = self.config.recorded_future.pull_signatures
         self.rf_pull_risk_list = self.config.recorded_future.pull_risk_list
         self.rf_riskrules_as_label = self.config.recorded_future.riskrules_as_label
+        self.risk_list_snapshot_path = (
+            self.config.recorded_future.risk_list_snapshot_path
+        )
+        self.risk_list_bundle_size = self.config.recorded_future.risk_list_bundle_size
         self.rf_insikt_only = self.config.recorded_future.insikt_only
 
         # Handle topics - convert list to comma-separated string if needed
@@ -159,6 +163,8 @@ class RFConnector:
                 self.RF.risk_list_threshold,
                 self.RF.risklist_related_entities,
                 self.RF.rf_riskrules_as_label,
+                self.RF.risk_list_snapshot_path,
+                self.RF.risk_list_bundle_size,
             )
             self.risk_list.start()
         else:
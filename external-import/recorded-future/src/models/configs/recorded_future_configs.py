@@ -101,6 +101,17 @@ class _ConfigLoaderRecordedFuture(ConfigBaseSettings):
             "Available choices: Malware, Hash, URL, Threat Actor, MitreAttackIdentifier."
         ),
     )
+    risk_list_snapshot_path: Optional[str] = Field(
+        default=None,
+        description=(
+            "Path of the file storing the fingerprints of the imported risk list rows. "
+            "When set, only new and changed rows are sent and dropped rows are revoked."
+        ),
+    )
+    risk_list_bundle_size: PositiveInt = Field(
+        default=1000,
+        description="Maximum number of STIX objects sent per risk list bundle.",
+    )
 
     # Threat Maps configuration
     pull_threat_maps: bool = Field(
@@ -26,6 +26,8 @@ RISK_RULES_MAPPER = [
     {"rule_score": 4, "severity": "Very Malicious", "risk_score": "90-99"},
 ]
 
+RISK_RULES_BY_SCORE = {rule["rule_score"]: rule for rule in RISK_RULES_MAPPER}
+
 TLP_MAP = {
     "white": stix2.TLP_WHITE,
     "green": stix2.TLP_GREEN,
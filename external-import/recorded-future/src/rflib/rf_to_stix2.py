@@ -95,6 +95,7 @@ class Indicator(RFStixEntity):
         self.description = None
         self.first_seen = first_seen
         self.labels = []
+        self.revoked = False
 
     def to_stix_objects(self):
         """Returns a list of STIX objects"""
@@ -122,6 +123,7 @@ class Indicator(RFStixEntity):
             pattern_type="stix",
             valid_from=self.first_seen,
             pattern=self._create_pattern(),
+            revoked=self.revoked,
             created_by_ref=self.author.id,
             object_marking_refs=self.tlp,
             custom_properties={
@@ -131,6 +133,12 @@ class Indicator(RFStixEntity):
         )
         pass
 
+    def to_revoked_stix_objects(self):
+        """Returns the revoked indicator, for entities dropped from a risk list"""
+        self.revoked = True
+        self.stix_indicator = self._create_indicator()
+        return [self.stix_indicator]
+
     def add_description(self, description):
         self.description = description
 
@@ -1,9 +1,43 @@
 import csv
+import hashlib
+import json
+import os
 import re
 import threading
 from datetime import datetime, timezone
 
-from .constants import RISK_LIST_TYPE_MAPPER, RISK_RULES_MAPPER
+import stix2
+
+from .constants import RISK_LIST_TYPE_MAPPER, RISK_RULES_BY_SCORE
+
+
+def row_fingerprint(row):
+    """Fingerprint of the fields of a risk list row converted to STIX"""
+    fields = [row["Name"], row["Risk"], row["RiskRules"], row["RuleCriticality"]]
+    serialized = json.dumps(fields, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:16]
+
+
+class RiskListSnapshot:
+    """Fingerprints of the rows imported from each risk list, stored in a local file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.fingerprints = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as snapshot_file:
+                self.fingerprints = json.load(snapshot_file)
+
+    def get(self, risk_list):
+        return self.fingerprints.get(risk_list, {})
+
+    def commit(self, risk_list, fingerprints):
+        """Record the fingerprints of a risk list once all its rows have been sent"""
+        self.fingerprints[risk_list] = fingerprints
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as snapshot_file:
+            json.dump(self.fingerprints, snapshot_file)
+        os.replace(tmp_path, self.path)
 
 
 class RiskList(threading.Thread):
@@ -15,6 +49,8 @@ class RiskList(threading.Thread):
         risk_list_threshold,
         risklist_related_entities,
         riskrules_as_label,
+        snapshot_path=None,
+        bundle_size=1000,
     ):
         threading.Thread.__init__(self)
         self.helper = helper
@@ -23,6 +59,76 @@ class RiskList(threading.Thread):
         self.risk_list_threshold = risk_list_threshold
         self.risklist_related_entities = risklist_related_entities
         self.riskrules_as_label = riskrules_as_label
+        self.snapshot = RiskListSnapshot(snapshot_path) if snapshot_path else None
+        self.bundle_size = bundle_size
+
+    def _create_indicator(self, row, key, risk_list_type):
+        """Convert a risk list row into an indicator and its related entities"""
+        first_seen = row["FirstSeen"] if row["FirstSeen"] else None
+        indicator = risk_list_type["class"](
+            row["Name"], key, tlp=self.tlp, first_seen=first_seen
+        )
+
+        rule_criticality_list = row["RuleCriticality"].strip("][").split(",")
+        risk_rules_list_str = row["RiskRules"].strip("][")
+        risk_rules_list = re.sub(r"\"", "", risk_rules_list_str).split(",")
+        description = (
+            "Triggered risk rules:"
+            + "\n\n"
+            + "|Rule|Risk Rule Severity|Risk Score Severity|"
+            + "\n"
+            + "|--|--|--|"
+            + "\n"
+        )
+        labels = []
+
+        for index, criticality in enumerate(rule_criticality_list):
+            # If criticality comes with empty string, replace value at 0
+            if not criticality:
+                criticality = 0
+
+            corresponding_rule = RISK_RULES_BY_SCORE.get(int(criticality))
+            if corresponding_rule is not None:
+                description += (
+                    "|"
+                    + risk_rules_list[index]
+                    + "|"
+                    + corresponding_rule["severity"]
+                    + "|"
+                    + corresponding_rule["risk_score"]
+                    + "|"
+                    + "\n"
+                )
+                labels.append(risk_rules_list[index])
+
+        indicator.add_description(description)
+        if self.riskrules_as_label:
+            indicator.add_labels(labels)
+        indicator.map_data(row, self.tlp, self.risklist_related_entities)
+        indicator.build_bundle(indicator)
+        return indicator
+
+    def _add_objects(self, stix_objects, new_objects, work_id):
+        """Add objects to the pending bundle, deduplicated by id, and send it once full"""
+        for stix_object in new_objects:
+            stix_objects[stix_object["id"]] = stix_object
+        if len(stix_objects) >= self.bundle_size:
+            self._send_objects(stix_objects, work_id)
+
+    def _send_objects(self, stix_objects, work_id):
+        if not stix_objects:
+            return
+        bundle = stix2.Bundle(objects=list(stix_objects.values()), allow_custom=True)
+        self.helper.connector_logger.info(
+            "[RISK LISTS] Sending Bundle to server with "
+            + str(len(bundle.objects))
+            + " objects"
+        )
+        self.helper.send_stix2_bundle(
+            bundle.serialize(),
+            work_id=work_id,
+        )
+        stix_objects.clear()
 
     def run(self):
         try:
@@ -59,6 +165,13 @@ class RiskList(threading.Thread):
                     friendly_name,
                 )
 
+                previous_fingerprints = (
+                    self.snapshot.get(key) if self.snapshot is not None else {}
+                )
+                fingerprints = {}
+                stix_objects = {}
+                changed_count = 0
+
                 reader = csv.DictReader(csv_file)
                 for row in reader:
                     # Filtered by score with a threshold
@@ -74,64 +187,47 @@ class RiskList(threading.Thread):
                                 f"[RISK LIST] Ignoring indicator '{row_name}' as its risk score ({row_risk_score}) is lower than the defined risk list threshold ({self.risk_list_threshold})"
                             )
                             continue
-                    # Convert into stix object
-                    first_seen = row["FirstSeen"] if row["FirstSeen"] else None
-                    indicator = risk_list_type["class"](
-                        row["Name"], key, tlp=self.tlp, first_seen=first_seen
-                    )
-
-                    rule_criticality_list = (
-                        row["RuleCriticality"].strip("][").split(",")
-                    )
-                    risk_rules_list_str = row["RiskRules"].strip("][")
-                    risk_rules_list = re.sub(r"\"", "", risk_rules_list_str).split(",")
-                    description = (
-                        "Triggered risk rules:"
-                        + "\n\n"
-                        + "|Rule|Risk Rule Severity|Risk Score Severity|"
-                        + "\n"
-                        + "|--|--|--|"
-                        + "\n"
-                    )
-                    labels = []
-
-                    for index, criticality in enumerate(rule_criticality_list):
-                        # If criticality comes with empty string, replace value at 0
-                        if not criticality:
-                            criticality = 0
-
-                        criticality_score = int(criticality)
-
-                        for corresponding_rule in RISK_RULES_MAPPER:
-                            if criticality_score == corresponding_rule["rule_score"]:
-                                description += (
-                                    "|"
-                                    + risk_rules_list[index]
-                                    + "|"
-                                    + corresponding_rule["severity"]
-                                    + "|"
-                                    + corresponding_rule["risk_score"]
-                                    + "|"
-                                    + "\n"
-                                )
-                                labels.append(risk_rules_list[index])
-
-                    indicator.add_description(description)
-                    if self.riskrules_as_label:
-                        indicator.add_labels(labels)
-                    indicator.map_data(row, self.tlp, self.risklist_related_entities)
-                    indicator.build_bundle(indicator)
-                    # Create bundle
-                    bundle = indicator.to_stix_bundle()
-                    self.helper.connector_logger.info(
-                        "[RISK LISTS] Sending Bundle to server with "
-                        + str(len(bundle.objects))
-                        + " objects"
-                    )
-                    self.helper.send_stix2_bundle(
-                        bundle.serialize(),
-                        work_id=work_id,
-                    )
+
+                    fingerprint = row_fingerprint(row)
+                    fingerprints[row["Name"]] = fingerprint
+                    if previous_fingerprints.get(row["Name"]) == fingerprint:
+                        continue
+
+                    changed_count += 1
+                    indicator = self._create_indicator(row, key, risk_list_type)
+                    self._add_objects(stix_objects, indicator.objects, work_id)
+
+                # Rows which are no longer in the risk list, or under the threshold
+                dropped_names = (
+                    previous_fingerprints.keys() - fingerprints.keys()
+                    if self.snapshot is not None
+                    else set()
+                )
+                for name in dropped_names:
+                    try:
+                        indicator = risk_list_type["class"](name, key, tlp=self.tlp)
+                        self._add_objects(
+                            stix_objects, indicator.to_revoked_stix_objects(), work_id
+                        )
+                    except Exception as err:
+                        self.helper.connector_logger.warning(
+                            "[RISK LISTS] Unable to revoke dropped indicator",
+                            {"name": name, "error": str(err)},
+                        )
+
+                self._send_objects(stix_objects, work_id)
+
+                if self.snapshot is not None:
+                    self.snapshot.commit(key, fingerprints)
+
+                self.helper.connector_logger.info(
+                    f"[RISK LISTS] {key} risk list synchronized",
+                    {
+                        "rows": len(fingerprints),
+                        "new_or_changed": changed_count,
+                        "dropped": len(dropped_names),
+                    },
+                )
 
                 message = f"{self.helper.connect_name} connector successfully run for Risk List {key}."
 
@@ -0,0 +1,135 @@
+import csv
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from rflib.constants import RISK_LIST_TYPE_MAPPER
+from rflib.rf_to_stix2 import IPAddress
+from rflib.risk_list import RiskList, RiskListSnapshot, row_fingerprint
+
+FIELDS = ["Name", "Risk", "RiskString", "FirstSeen", "RiskRules", "RuleCriticality"]
+IP_PATH = RISK_LIST_TYPE_MAPPER["IpAddress"]["path"]
+
+
+def make_row(name, risk="90"):
+    return {
+        "Name": name,
+        "Risk": risk,
+        "RiskString": "1/10",
+        "FirstSeen": "2024-01-01T00:00:00.000Z",
+        "RiskRules": '["Recent C&C Server"]',
+        "RuleCriticality": "[4]",
+        "Links": json.dumps({"hits": []}),
+    }
+
+
+def make_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS + ["Links"])
+    writer.writeheader()
+    writer.writerows(rows)
+    buffer.seek(0)
+    return buffer
+
+
+def run_risk_list(snapshot_path, rows):
+    """Run the risk lists import, returning the sent indicators by name."""
+    helper = MagicMock()
+    helper.get_state.return_value = {}
+    rfapi = MagicMock()
+    rfapi.get_risk_list_CSV.side_effect = lambda path: make_csv(
+        rows if path == IP_PATH else []
+    )
+    RiskList(
+        helper,
+        rfapi,
+        tlp="amber",
+        risk_list_threshold=None,
+        risklist_related_entities=[],
+        riskrules_as_label=False,
+        snapshot_path=snapshot_path,
+    ).run()
+    helper.connector_logger.error.assert_not_called()
+    return {
+        stix_object["name"]: stix_object
+        for call in helper.send_stix2_bundle.call_args_list
+        for stix_object in json.loads(call.args[0])["objects"]
+        if stix_object["type"] == "indicator"
+    }
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "risk_lists.json")
+
+
+def test_snapshot_is_persisted(snapshot_path):
+    RiskListSnapshot(snapshot_path).commit("IpAddress", {"1.1.1.1": "abc"})
+
+    assert RiskListSnapshot(snapshot_path).get("IpAddress") == {"1.1.1.1": "abc"}
+    assert RiskListSnapshot(snapshot_path).get("URL") == {}
+
+
+def test_first_run_sends_every_row(snapshot_path):
+    indicators = run_risk_list(
+        snapshot_path, [make_row("1.1.1.1"), make_row("2.2.2.2")]
+    )
+
+    assert sorted(indicators) == ["1.1.1.1", "2.2.2.2"]
+    assert not any(indicator.get("revoked") for indicator in indicators.values())
+    assert RiskListSnapshot(snapshot_path).get("IpAddress") == {
+        "1.1.1.1": row_fingerprint(make_row("1.1.1.1")),
+        "2.2.2.2": row_fingerprint(make_row("2.2.2.2")),
+    }
+
+
+def test_only_added_changed_and_removed_rows_are_sent(snapshot_path):
+    run_risk_list(
+        snapshot_path,
+        [make_row("1.1.1.1"), make_row("2.2.2.2"), make_row("3.3.3.3")],
+    )
+
+    indicators = run_risk_list(
+        snapshot_path,
+        [
+            make_row("1.1.1.1"),  # unchanged
+            make_row("2.2.2.2", risk="75"),  # changed
+            make_row("4.4.4.4"),  # added
+        ],
+    )
+
+    assert sorted(indicators) == ["2.2.2.2", "3.3.3.3", "4.4.4.4"]
+    assert indicators["2.2.2.2"]["x_opencti_score"] == 75
+    assert not indicators["4.4.4.4"].get("revoked")
+    # Removed from the risk list
+    assert indicators["3.3.3.3"]["revoked"] is True
+    assert set(RiskListSnapshot(snapshot_path).get("IpAddress")) == {
+        "1.1.1.1",
+        "2.2.2.2",
+        "4.4.4.4",
+    }
+
+
+def test_unchanged_risk_list_sends_nothing(snapshot_path):
+    rows = [make_row("1.1.1.1")]
+    run_risk_list(snapshot_path, rows)
+
+    assert run_risk_list(snapshot_path, rows) == {}
+
+
+def test_revoked_indicator_keeps_the_indicator_id():
+    indicator = IPAddress("1.1.1.1", "IpAddress", tlp="amber")
+    indicator.create_stix_objects()
+    active = indicator.stix_indicator
+
+    revoked_objects = IPAddress(
+        "1.1.1.1", "IpAddress", tlp="amber"
+    ).to_revoked_stix_objects()
+
+    assert len(revoked_objects) == 1
+    revoked = revoked_objects[0]
+    assert revoked.id == active.id
+    assert revoked.revoked is True
+    assert revoked.pattern == active.pattern
+    assert revoked.created_by_ref == active.created_by_ref
@@ -1,14 +1,18 @@
 import datetime
 import json
+import multiprocessing
 import os
 import sys
 import time
 import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import boto3
 import pytz
 import stix2
 import yaml
+from botocore.config import Config
 from dateutil import parser
 from pycti import (
     CourseOfAction,
@@ -109,6 +113,21 @@ class S3Connector:
             "S3_CUTOFF", ["s3", "cutoff"], config, isNumber=True, default=360
         )
 
+        self.s3_download_workers = get_config_variable(
+            "S3_DOWNLOAD_WORKERS",
+            ["s3", "download_workers"],
+            config,
+            isNumber=True,
+            default=8,
+        )
+        self.s3_parse_workers = get_config_variable(
+            "S3_PARSE_WORKERS",
+            ["s3", "parse_workers"],
+            config,
+            isNumber=True,
+            default=os.cpu_count(),
+        )
+
         bucket_prefixes = get_config_variable(
             "S3_BUCKET_PREFIXES",
             ["s3", "bucket_prefixes"],
@@ -131,6 +150,7 @@ class S3Connector:
             aws_secret_access_key=self.s3_secret_access_key,
             endpoint_url=self.s3_endpoint_url,
             region_name=self.s3_region,
+            config=Config(max_pool_connections=self.s3_download_workers),
         )
 
     def set_state_value(self, s3_prefix: str, value: str):
@@ -219,15 +239,32 @@ class S3Connector:
         return objects
 
     def fix_bundle(self, bundle):
-        included_entities = []
+        fixed_bundle, logs = self._fix_bundle(
+            bundle,
+            self.identity["standard_id"] if self.identity is not None else None,
+            self.s3_marking["id"],
+        )
+        self._log(logs)
+        return fixed_bundle
+
+    @staticmethod
+    def _fix_bundle(bundle, author_id=None, marking_id=stix2.TLP_GREEN["id"]):
+        """
+        Map the custom properties of a bundle file to OpenCTI and remove the orphan
+        relationships.
+
+        Runs in worker processes, so the messages to log are returned with the bundle.
+        """
+        logs = []
+        included_entities = set()
         new_bundle = []
         new_bundle_objects = []
         try:
             data = json.loads(bundle)
         except:
-            return new_bundle
+            return new_bundle, logs
         for obj in data["objects"]:
-            included_entities.append(obj["id"])
+            included_entities.add(obj["id"])
         for obj in data["objects"]:
             for key in obj:
                 if (
@@ -235,13 +272,13 @@ class S3Connector:
                     and key not in mapped_keys
                     and key not in ignored_keys
                 ):
-                    self.helper.log_error("Found non-mapped custom key: " + key)
+                    logs.append(("error", "Found non-mapped custom key: " + key))
 
             # Ensure author and marking
-            if self.identity is not None and "created_by_ref" not in obj:
-                obj["created_by_ref"] = self.identity["standard_id"]
+            if author_id is not None and "created_by_ref" not in obj:
+                obj["created_by_ref"] = author_id
             if "object_marking_refs" not in obj:
-                obj["object_marking_refs"] = [self.s3_marking["id"]]
+                obj["object_marking_refs"] = [marking_id]
 
             if "x_severity" in obj:
                 # handle mapping of "x_severity" on Vulnerability object
@@ -315,12 +352,8 @@ class S3Connector:
                     abstract=note_abstract,
                     content=obj.get("x_title"),
                     object_refs=[obj["id"]],
-                    object_marking_refs=[self.s3_marking["id"]],
-                    created_by_ref=(
-                        self.identity["standard_id"]
-                        if self.identity is not None
-                        else None
-                    ),
+                    object_marking_refs=[marking_id],
+                    created_by_ref=author_id,
                 )
                 new_bundle_objects.append(note)
 
@@ -335,12 +368,8 @@ class S3Connector:
                     abstract=note_abstract,
                     content=obj["x_analysis"],
                     object_refs=[obj["id"]],
-                    object_marking_refs=[self.s3_marking["id"]],
-                    created_by_ref=(
-                        self.identity["standard_id"]
-                        if self.identity is not None
-                        else None
-                    ),
+                    object_marking_refs=[marking_id],
+                    created_by_ref=author_id,
                 )
                 new_bundle_objects.append(note)
 
@@ -358,12 +387,8 @@ class S3Connector:
                     abstract=abstract,
                     content=note_content,
                     object_refs=[obj["id"]],
-                    object_marking_refs=[self.s3_marking["id"]],
-                    created_by_ref=(
-                        self.identity["standard_id"]
-                        if self.identity is not None
-                        else None
-                    ),
+                    object_marking_refs=[marking_id],
+                    created_by_ref=author_id,
                 )
                 new_bundle_objects.append(note)
 
@@ -413,7 +438,7 @@ class S3Connector:
                     ),
                     name=obj["x_credit"],
                     identity_class="individual",
-                    object_marking_refs=[self.s3_marking["id"]],
+                    object_marking_refs=[marking_id],
                 )
                 credit_relationship = stix2.Relationship(
                     id=StixCoreRelationship.generate_id(
@@ -422,12 +447,8 @@ class S3Connector:
                     relationship_type="related-to",
                     source_ref=obj["id"],
                     target_ref=individual_credit.id,
-                    object_marking_refs=[self.s3_marking["id"]],
-                    created_by_ref=(
-                        self.identity["standard_id"]
-                        if self.identity is not None
-                        else None
-                    ),
+                    object_marking_refs=[marking_id],
+                    created_by_ref=author_id,
                 )
                 new_bundle_objects.append(json.loads(individual_credit.serialize()))
                 new_bundle_objects.append(json.loads(credit_relationship.serialize()))
@@ -461,28 +482,97 @@ class S3Connector:
                 obj["type"] == "relationship"
                 and obj["source_ref"] not in included_entities
             ):
-                self.helper.log_warning(
-                    "Removing relationship from "
-                    + obj["source_ref"]
-                    + " because object if not in bundle"
+                logs.append(
+                    (
+                        "warning",
+                        "Removing relationship from "
+                        + obj["source_ref"]
+                        + " because object if not in bundle",
+                    )
                 )
                 continue
             if (
                 obj["type"] == "relationship"
                 and obj["target_ref"] not in included_entities
             ):
-                self.helper.log_warning(
-                    "Removing relationship to "
-                    + obj["target_ref"]
-                    + " because object if not in bundle"
+                logs.append(
+                    (
+                        "warning",
+                        "Removing relationship to "
+                        + obj["target_ref"]
+                        + " because object if not in bundle",
+                    )
                 )
                 continue
             new_bundle_objects.append(obj)
 
         if len(new_bundle_objects) > 0:
-            rewritten_bundle_objects = self.rewrite_stix_ids(new_bundle_objects)
-            new_bundle = self.helper.stix2_create_bundle(rewritten_bundle_objects)
-        return new_bundle
+            rewritten_bundle_objects = S3Connector.rewrite_stix_ids(new_bundle_objects)
+            new_bundle = OpenCTIConnectorHelper.stix2_create_bundle(
+                rewritten_bundle_objects
+            )
+        return new_bundle, logs
+
+    def _log(self, logs):
+        for level, message in logs:
+            if level == "error":
+                self.helper.log_error(message)
+            else:
+                self.helper.log_warning(message)
+
+    def _list_objects(self, prefix):
+        """List all the objects of a prefix, following the continuation tokens."""
+        parameters = {"Bucket": self.s3_bucket_name, "Prefix": prefix}
+        while True:
+            response = self.s3_client.list_objects_v2(**parameters)
+            yield from response.get("Contents", [])
+            if not response.get("IsTruncated"):
+                return
+            parameters["ContinuationToken"] = response["NextContinuationToken"]
+
+    def _download_and_fix(self, key, parse_pool):
+        data = self.s3_client.get_object(Bucket=self.s3_bucket_name, Key=key)
+        content = data["Body"].read()
+        return parse_pool.submit(
+            self._fix_bundle,
+            content,
+            self.identity["standard_id"] if self.identity is not None else None,
+            self.s3_marking["id"],
+        ).result()
+
+    def _fixed_bundles(self, objects, download_pool, parse_pool):
+        """
+        Download and fix the files in parallel, yielding them in the listing order.
+
+        At most twice as many files as download workers are in flight at once.
+        """
+        pending = deque()
+        for o in objects:
+            pending.append(
+                (o, download_pool.submit(self._download_and_fix, o["Key"], parse_pool))
+            )
+            if len(pending) >= 2 * self.s3_download_workers:
+                yield pending.popleft()
+        yield from pending
+
+    def _delete_if_expired(self, o, cutoff):
+        last_modified = o.get("LastModified")
+        if self.s3_delete_after_import and last_modified < cutoff:
+            self.helper.log_info(
+                "Deleting file "
+                + o.get("Key")
+                + "(2 days ago="
+                + str(cutoff)
+                + ", modified="
+                + str(last_modified)
+                + ")"
+            )
+            try:
+                self.s3_client.delete_object(
+                    Bucket=self.s3_bucket_name, Key=o.get("Key")
+                )
+            except:
+                pass
 
     def process(self):
 
@@ -505,38 +595,48 @@ class S3Connector:
             # We always re-send 2 days of data before deleting to handle multi instances consuming, we are good with this approach
             # OpenCTI will de-duplicate / upsert if necessary
             cutoff = now - datetime.timedelta(minutes=self.s3_cutoff)
-            objects = self.s3_client.list_objects(
-                Bucket=self.s3_bucket_name, Prefix=prefix
-            )
+            objects = list(self._list_objects(prefix))
             self.helper.log_info(
-                f"{len(objects.get('Contents', []))} files listed in S3 Prefix: '{prefix}'"
+                f"{len(objects)} files listed in S3 Prefix: '{prefix}'"
             )
-            if (
-                objects.get("Contents", None) is not None
-                and len(objects.get("Contents")) > 0
-            ):
+            if len(objects) > 0:
                 friendly_name = (
                     f"S3/{prefix} run @ " + now.astimezone(pytz.UTC).isoformat()
                 )
                 work_id = self.helper.api.work.initiate_work(
                     self.helper.connect_id, friendly_name
                 )
+                new_objects = []
+                for o in objects:
+                    if (
+                        prefix_state_date is None
+                        or o["LastModified"] > prefix_state_date
+                    ):
+                        new_objects.append(o)
+                    else:
+                        self._delete_if_expired(o, cutoff)
+                # The state is a watermark on the modification date, so files are
+                # sent from the oldest to the newest
+                new_objects.sort(key=lambda o: o["LastModified"])
+
                 updated_files = 0
-                for o in objects.get("Contents"):
-                    try:
+                with ThreadPoolExecutor(
+                    max_workers=self.s3_download_workers
+                ) as download_pool, ProcessPoolExecutor(
+                    max_workers=self.s3_parse_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                ) as parse_pool:
+                    for o, future in self._fixed_bundles(
+                        new_objects, download_pool, parse_pool
+                    ):
+                        key = o.get("Key")
                         last_modified = o.get("LastModified")
-                        if (
-                            prefix_state_date is None
-                            or last_modified > prefix_state_date
-                        ):
-                            data = self.s3_client.get_object(
-                                Bucket=self.s3_bucket_name, Key=o.get("Key")
-                            )
-                            content = data["Body"].read()
-                            fixed_bundle = self.fix_bundle(content)
+                        try:
+                            fixed_bundle, logs = future.result()
+                            self._log(logs)
                             if fixed_bundle:
                                 self.helper.log_info(
-                                    f"Sending STIX bundle from file: '{o.get("Key")}'"
+                                    f"Sending STIX bundle from file: '{key}'"
                                 )
                                 self.helper.send_stix2_bundle(
                                     bundle=fixed_bundle, work_id=work_id
@@ -548,25 +648,13 @@ class S3Connector:
                                 updated_files += 1
                             else:
                                 self.helper.log_info("No content to ingest")
-                    except Exception as ex:
-                        print(ex)
-                        continue
-                    if self.s3_delete_after_import and last_modified < cutoff:
-                        self.helper.log_info(
-                            "Deleting file "
-                            + o.get("Key")
-                            + "(2 days ago="
-                            + str(cutoff)
-                            + ", modified="
-                            + str(last_modified)
-                            + ")"
-                        )
-                        try:
-                            self.s3_client.delete_object(
-                                Bucket=self.s3_bucket_name, Key=o.get("Key")
+                        except Exception as ex:
+                            self.helper.connector_logger.error(
+                                "Unable to process file",
+                                {"key": key, "error": str(ex)},
                             )
-                        except:
                             continue
+                        self._delete_if_expired(o, cutoff)
                 message = (
                     f"Connector successfully processed S3 Prefix: '{prefix}' files, "
                     f"'{updated_files}' file(s) have been ingested"
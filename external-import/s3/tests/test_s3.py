@@ -0,0 +1,152 @@
+import datetime
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+import stix2
+from s3 import S3Connector
+
+VULNERABILITY = {
+    "type": "vulnerability",
+    "spec_version": "2.1",
+    "id": "vulnerability--2f5c1a4e-3b6e-4e7a-9c43-6a0f4b1e2a10",
+    "created": "2024-01-01T00:00:00.000Z",
+    "modified": "2024-01-01T00:00:00.000Z",
+    "name": "CVE-2024-0001",
+    "x_severity": 4,
+    "x_cvss_v3": 8.1,
+}
+MALWARE = {
+    "type": "malware",
+    "spec_version": "2.1",
+    "id": "malware--0c7b5b88-8ff7-4a4d-aa9d-feb398cd0061",
+    "created": "2024-01-01T00:00:00.000Z",
+    "modified": "2024-01-01T00:00:00.000Z",
+    "name": "Malware",
+    "is_family": True,
+}
+
+
+def make_bundle(*objects):
+    return json.dumps(
+        {
+            "type": "bundle",
+            "id": "bundle--2a25c3c8-5d8f-4b6f-9d35-5b1f6d0f3e2c",
+            "objects": list(objects),
+        }
+    ).encode()
+
+
+def make_relationship(source, target):
+    return {
+        "type": "relationship",
+        "spec_version": "2.1",
+        "id": "relationship--6f1e4c3a-0c1d-4b6e-8b0c-2b5d0e1f7a3b",
+        "created": "2024-01-01T00:00:00.000Z",
+        "modified": "2024-01-01T00:00:00.000Z",
+        "relationship_type": "related-to",
+        "source_ref": source["id"],
+        "target_ref": target["id"],
+    }
+
+
+def test_fix_bundle_maps_custom_properties():
+    fixed_bundle, logs = S3Connector._fix_bundle(
+        make_bundle(VULNERABILITY), "identity--author", stix2.TLP_AMBER["id"]
+    )
+
+    (vulnerability,) = json.loads(fixed_bundle)["objects"]
+    assert vulnerability["name"] == "CVE-2024-0001"
+    assert vulnerability["x_opencti_score"] == 80
+    assert vulnerability["x_opencti_cvss_base_score"] == 8.1
+    assert vulnerability["created_by_ref"] == "identity--author"
+    assert vulnerability["object_marking_refs"] == [stix2.TLP_AMBER["id"]]
+    assert logs == []
+
+
+def test_fix_bundle_returns_the_messages_to_log():
+    relationship = make_relationship(MALWARE, VULNERABILITY)
+
+    fixed_bundle, logs = S3Connector._fix_bundle(
+        make_bundle(dict(MALWARE, x_unknown=True), relationship)
+    )
+
+    assert [o["type"] for o in json.loads(fixed_bundle)["objects"]] == ["malware"]
+    assert [level for level, _ in logs] == ["error", "warning"]
+    assert "x_unknown" in logs[0][1]
+
+
+def test_fix_bundle_rewrites_relationship_refs():
+    relationship = make_relationship(MALWARE, VULNERABILITY)
+
+    fixed_bundle, _ = S3Connector._fix_bundle(
+        make_bundle(MALWARE, VULNERABILITY, relationship)
+    )
+
+    objects = {o["type"]: o for o in json.loads(fixed_bundle)["objects"]}
+    assert objects["vulnerability"]["id"] != VULNERABILITY["id"]
+    assert objects["relationship"]["target_ref"] == objects["vulnerability"]["id"]
+
+
+def test_fix_bundle_ignores_invalid_json():
+    assert S3Connector._fix_bundle(b"not json") == ([], [])
+
+
+def make_file(key, minutes):
+    return {
+        "Key": key,
+        "LastModified": datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        + datetime.timedelta(minutes=minutes),
+    }
+
+
+@pytest.fixture
+def connector():
+    files = {
+        "ACI_TI/c.json": make_bundle(MALWARE),
+        "ACI_TI/a.json": make_bundle(VULNERABILITY),
+        "ACI_TI/b.json": b"not json",
+    }
+    s3_client = MagicMock()
+    # Listed in two pages, not sorted by modification date
+    s3_client.list_objects_v2.side_effect = [
+        {
+            "Contents": [make_file("ACI_TI/c.json", 3), make_file("ACI_TI/a.json", 1)],
+            "IsTruncated": True,
+            "NextContinuationToken": "token",
+        },
+        {"Contents": [make_file("ACI_TI/b.json", 2)], "IsTruncated": False},
+    ]
+    s3_client.get_object.side_effect = lambda Bucket, Key: {
+        "Body": io.BytesIO(files[Key])
+    }
+
+    connector = S3Connector.__new__(S3Connector)
+    connector.helper = MagicMock()
+    connector.helper.get_state.return_value = {}
+    connector.s3_client = s3_client
+    connector.s3_bucket_name = "bucket"
+    connector.s3_bucket_prefixes = ["ACI_TI"]
+    connector.s3_marking = stix2.TLP_GREEN
+    connector.s3_delete_after_import = False
+    connector.s3_cutoff = 360
+    connector.s3_download_workers = 2
+    connector.s3_parse_workers = 1
+    connector.identity = None
+    return connector
+
+
+def test_process_sends_files_in_modification_order(connector):
+    connector.process()
+
+    assert connector.s3_client.list_objects_v2.call_count == 2
+    assert connector.s3_client.get_object.call_count == 3
+    sent = [
+        json.loads(c.kwargs["bundle"])["objects"][0]["type"]
+        for c in connector.helper.send_stix2_bundle.call_args_list
+    ]
+    assert sent == ["vulnerability", "malware"]
+    assert connector.helper.get_state.return_value == {
+        "ACI_TI": "2024-01-01 00:03:00+0000"
+    }
@@ -4,8 +4,9 @@
 # isort is removing the type ignore untyped import comment conflicting with mypy
 
 import datetime
-from concurrent.futures import ThreadPoolExecutor
-from functools import lru_cache, partial
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from threading import Lock
 from typing import TYPE_CHECKING, Any, Iterable, Optional
 from urllib.parse import urlencode
@@ -141,17 +142,28 @@ class _CVEAPI(CVEPort):
 
 
 class _CVEsAPI:  # pylint: disable=too-few-public-methods
+    """Fetch the CVEs from the API, with a single-flight cache.
+
+    Concurrent fetches of the same CVE wait for the same in-flight request, while
+    different CVEs are downloaded in parallel over the shared client session.
+    Failed fetches are not cached.
+    """
+
+    CACHE_MAXSIZE = 65536  # response as dict ~500Bytes => ~32MB
 
     def __init__(self, tsc_client: TenableSC, logger: "AppLogger", num_threads: int):
         self.logger = logger
         self.client = tsc_client
         self.num_threads = num_threads
+        # the lock only guards the cache, never a request
         self.lock = Lock()
+        self._cache: OrderedDict[str, Future[dict[str, Any]]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
 
     def _build_url(self, cve_id: str) -> str:
         return f"cve/{cve_id}"
 
-    @lru_cache(maxsize=65536)  # noqa: B019 # response as dict ~500Bytes => ~32MB
     def __fetch(self, cve_id: str) -> dict[str, Any]:
         """Fetch a CVE from the API."""
         try:
@@ -173,21 +185,55 @@ class _CVEsAPI:  # pylint: disable=too-few-public-methods
             ) from e
 
     def _fetch(self, cve_id: str) -> dict[str, Any]:
-        """Fetch a CVE from the API (thread safe)."""
+        """Fetch a CVE from the cache or from the API (thread safe)."""
         with self.lock:
-            self.logger.debug(f"Fetching CVE {cve_id}.")
-            return self.__fetch(cve_id)
+            future = self._cache.get(cve_id)
+            if future is not None:
+                self._hits += 1
+                self._cache.move_to_end(cve_id)
+                in_flight = False
+            else:
+                self._misses += 1
+                future = self._cache[cve_id] = Future()
+                in_flight = True
+                if len(self._cache) > self.CACHE_MAXSIZE:
+                    # waiting threads keep a reference on the evicted future
+                    self._cache.popitem(last=False)
+
+        if in_flight:
+            try:
+                future.set_result(self.__fetch(cve_id))
+            # DataRetrievalError are BaseException, the waiting threads must get them too
+            except BaseException as e:
+                with self.lock:
+                    if self._cache.get(cve_id) is future:
+                        del self._cache[cve_id]
+                future.set_exception(e)
+        return future.result()
 
     def _fetch_data_chunk(self, cve_ids: list[str]) -> Iterable[dict[str, Any]]:
         """Fetch a chunk of data from the API."""
-        # we must disable pylint which thinks we are calling the self.__fetch method
-        cache_stats = (
-            self.__fetch.cache_info()  # pylint: disable=no-value-for-parameter
+        self.logger.debug(
+            f"CVE Cache stats hits={self._hits}, misses={self._misses}, "
+            f"currsize={len(self._cache)}"
         )
-        self.logger.debug(f"CVE Cache stats {cache_stats}")
-
+        distinct_cve_ids = list(dict.fromkeys(cve_ids))
         with ThreadPoolExecutor(self.num_threads) as executor:
-            return list(executor.map(self._fetch, cve_ids))
+            raw_cves = dict(
+                zip(
+                    distinct_cve_ids,
+                    executor.map(self._fetch, distinct_cve_ids),
+                    strict=True,
+                )
+            )
+        return [raw_cves[cve_id] for cve_id in cve_ids]
+
+    def prefetch_cves(self, cve_ids: Iterable[str]) -> None:
+        """Fetch the CVEs in parallel to have them cached."""
+        cve_ids = list(dict.fromkeys(cve_ids))
+        if cve_ids:
+            self.logger.debug(f"Prefetching {len(cve_ids)} CVEs.")
+            self._fetch_data_chunk(cve_ids)
 
     def fetch_cves(self, cve_ids: list[str]) -> Iterable[_CVEAPI]:
         """Fetch and process the CVEs."""
@@ -210,6 +256,11 @@ class _FindingAPI(FindingPort):
     def plugin_name(self) -> str:
         return self._pydantic_model.plugin_name
 
+    @property
+    def cve_ids(self) -> list[str]:
+        """Return the ids of the CVEs of the finding, without fetching them."""
+        return self._pydantic_model.cve or []
+
     @property
     def cves(self) -> Optional[list[CVEPort]]:
         if self.__cves is None:
@@ -584,6 +635,11 @@ class _FindingsAPI:
         self.num_threads = num_threads
         self._cves_api = cves_api
 
+    @property
+    def cves_api(self) -> _CVEsAPI:
+        """Return the CVEs API used to fetch the CVEs of the findings."""
+        return self._cves_api
+
     def _fetch(
         self, offset: int, limit: int, filters: list[tuple[str, str, str]]
     ) -> dict[str, Any]:
@@ -715,6 +771,7 @@ class _AssetAPI(AssetPort):
         self._client = tsc_client
         self.since_datetime = since_datetime
         self._findings_api = findings_api
+        self._findings: Optional[list[_FindingAPI]] = None
 
     @property
     def id(self) -> str:
@@ -766,9 +823,18 @@ class _AssetAPI(AssetPort):
 
     @property
     def findings(self) -> Iterable[_FindingAPI]:
-        yield from self._findings_api.fetch_findings(
-            name=self.name, ip=self.ip_address, repository_id=self.repository_id
-        )
+        if self._findings is not None:
+            yield from self._findings
+        else:
+            yield from self._findings_api.fetch_findings(
+                name=self.name, ip=self.ip_address, repository_id=self.repository_id
+            )
+
+    def prefetch_findings(self) -> list[_FindingAPI]:
+        """Fetch and keep the findings of the asset."""
+        if self._findings is None:
+            self._findings = list(self.findings)
+        return self._findings
 
     @staticmethod
     def parse_response(raw_response: dict[str, Any]) -> dict[str, Any]:
@@ -947,17 +1013,32 @@ class _AssetsChunkAPI(AssetsChunkPort):
     @property
     def assets(self) -> Iterable[_AssetAPI]:
         raw_assets = self._fetch_data_chunk()
-        for raw_asset in raw_assets:
-            asset = _AssetAPI(
+        assets = [
+            _AssetAPI(
                 tsc_client=self.client,
                 logger=self.logger,
                 since_datetime=self.since_datetime,
                 findings_api=self._findings_api,
                 **raw_asset,
             )
-            # Manual filtering because no API filter
-            if asset.last_seen.timestamp() >= self.since_datetime.timestamp():
-                yield asset
+            for raw_asset in raw_assets
+        ]
+        # Manual filtering because no API filter
+        assets = [
+            asset
+            for asset in assets
+            if asset.last_seen.timestamp() >= self.since_datetime.timestamp()
+        ]
+        # Collect the distinct CVEs of the chunk findings to fetch them in parallel
+        # rather than finding by finding.
+        cve_ids = [
+            cve_id
+            for asset in assets
+            for finding in asset.prefetch_findings()
+            for cve_id in finding.cve_ids
+        ]
+        self._findings_api.cves_api.prefetch_cves(cve_ids)
+        yield from assets
 
 
 class AssetsAPI(AssetsPort):
@@ -1,9 +1,19 @@
 # isort:skip_file
 # pragma: no cover
-from tenable_security_center.adapters.tsc_api.v5_13_from_asset import _ScanResultsAPI
-
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock
 
+import pytest
+from requests import HTTPError
+from tenable_security_center.adapters.tsc_api.v5_13_from_asset import (
+    _CVEsAPI,
+    _ScanResultsAPI,
+)
+from tenable_security_center.ports.errors import CVERetrievalError
+
 
 def test_scan_results_api_get_scanned_assets_info_should_return_tuple_of_string():
     """Test that the method returns a tuple of strings.
@@ -34,3 +44,97 @@ def test_scan_results_api_get_scanned_assets_info_should_return_tuple_of_string(
     # The method should return a tuple of strings
     assert result[0] == "0.0.0.0"  # noqa: S101 # we use assert in unit test context
     assert result[1] == "1"  # noqa: S101
+
+
+class _FakeSession:
+    """Fake requests session counting the CVE requests and their overlap."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def get(self, url):
+        cve_id = url.rsplit("/", 1)[-1]
+        with self.lock:
+            self.calls[cve_id] += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        response = Mock()
+        response.json.return_value = {"primary_vuln_id": cve_id}
+        return response
+
+
+def _cves_api(session, num_threads=4):
+    tsc_client = Mock()
+    tsc_client._session = session
+    tsc_client._url = "https://tenable.example.com"
+    return _CVEsAPI(tsc_client=tsc_client, logger=Mock(), num_threads=num_threads)
+
+
+def test_cves_api_should_fetch_distinct_cves_in_parallel_and_once():
+    # Given
+    # A CVEs API over a fake session
+    session = _FakeSession()
+    api = _cves_api(session)
+    cve_ids = ["CVE-1", "CVE-2", "CVE-3", "CVE-4", "CVE-1", "CVE-2"]
+
+    # When
+    # We fetch the CVEs twice
+    first = api._fetch_data_chunk(cve_ids)
+    second = api._fetch_data_chunk(cve_ids)
+
+    # Then
+    # Each CVE is downloaded once, the distinct ones in parallel, in the requested order
+    assert session.calls == {  # noqa: S101
+        "CVE-1": 1,
+        "CVE-2": 1,
+        "CVE-3": 1,
+        "CVE-4": 1,
+    }
+    assert session.max_in_flight > 1  # noqa: S101
+    assert [cve["primary_vuln_id"] for cve in first] == cve_ids  # noqa: S101
+    assert second == first  # noqa: S101
+
+
+def test_cves_api_should_share_in_flight_fetches_between_threads():
+    # Given
+    # A CVEs API over a fake session
+    session = _FakeSession()
+    api = _cves_api(session)
+
+    # When
+    # Several chunks request the same CVEs concurrently
+    with ThreadPoolExecutor(8) as executor:
+        results = list(
+            executor.map(lambda _: api._fetch_data_chunk(["CVE-1", "CVE-2"]), range(8))
+        )
+
+    # Then
+    # Each CVE is downloaded once and every chunk gets it
+    assert session.calls == {"CVE-1": 1, "CVE-2": 1}  # noqa: S101
+    assert all(len(result) == 2 for result in results)  # noqa: S101
+
+
+def test_cves_api_should_not_cache_failed_fetches():
+    # Given
+    # A CVEs API over a session failing on the first request
+    session = _FakeSession()
+    api = _cves_api(session)
+    get = session.get
+    session.get = Mock(side_effect=[HTTPError("boom"), get("CVE-1")])
+
+    # When
+    # We fetch the CVE twice
+    with pytest.raises(CVERetrievalError):
+        api._fetch_data_chunk(["CVE-1"])
+    result = api._fetch_data_chunk(["CVE-1"])
+
+    # Then
+    # The second fetch retries the request
+    assert session.get.call_count == 2  # noqa: S101
+    assert result[0]["primary_vuln_id"] == "CVE-1"  # noqa: S101
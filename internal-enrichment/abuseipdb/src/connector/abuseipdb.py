@@ -12,6 +12,7 @@ from pycti import (
     StixSightingRelationship,
 )
 from src.connector.models import ConfigLoader
+from src.connector.response_cache import ResponseCache, cached_lookup
 
 
 class ConnectorAbuseIPDB:
@@ -26,6 +27,16 @@ class ConnectorAbuseIPDB:
             raise ValueError(
                 "The whitelist label could not be created. If your connector does not have the permission to create labels, please create it manually before launching"
             )
+        self.session = requests.Session()
+        self.response_cache = None
+        if self.config.abuseipdb.cache_ttl > 0:
+            self.response_cache = ResponseCache(
+                ttl=self.config.abuseipdb.cache_ttl,
+                negative_ttl=self.config.abuseipdb.cache_negative_ttl,
+                max_entries=self.config.abuseipdb.cache_max_entries,
+                path=self.config.abuseipdb.cache_path,
+                log=self.helper.connector_logger.info,
+            )
 
     @staticmethod
     def extract_abuse_ipdb_category(category_number):
@@ -55,6 +66,25 @@ class ConnectorAbuseIPDB:
         }
         return mapping.get(str(category_number), "unknown category")
 
+    @cached_lookup(
+        "ip", is_negative=lambda data: not data["isWhitelisted"] and not data["reports"]
+    )
+    def _check_ip(self, ip: str) -> dict:
+        url = "https://api.abuseipdb.com/api/v2/check"
+        headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Key": "%s" % self.config.abuseipdb.api_key.get_secret_value(),
+        }
+        params = {
+            "maxAgeInDays": 365,
+            "verbose": "True",
+            "ipAddress": ip,
+        }
+        r = self.session.get(url, headers=headers, params=params)
+        r.raise_for_status()
+        return r.json()["data"]
+
     def _process_message(self, data: Dict) -> str:
         opencti_entity = data["enrichment_entity"]
 
@@ -72,21 +102,7 @@ class ConnectorAbuseIPDB:
         stix_objects = data["stix_objects"]
         stix_entity = data["stix_entity"]
         # Extract IP from entity data
-        url = "https://api.abuseipdb.com/api/v2/check"
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/x-www-form-urlencoded",
-            "Key": "%s" % self.config.abuseipdb.api_key.get_secret_value(),
-        }
-        params = {
-            "maxAgeInDays": 365,
-            "verbose": "True",
-            "ipAddress": stix_entity["value"],
-        }
-        r = requests.get(url, headers=headers, params=params)
-        r.raise_for_status()
-        data = r.json()
-        data = data["data"]
+        data = self._check_ip(stix_entity["value"])
 
         if data["isWhitelisted"]:
             OpenCTIStix2.put_attribute_in_extension(
@@ -1,4 +1,4 @@
-from typing import Annotated, Literal
+from typing import Annotated, Literal, Optional
 
 from pydantic import (
     Field,
@@ -31,3 +31,19 @@ class _ConfigLoaderAbuseIPDB(ConfigBaseSettings):
         default="TLP:AMBER",
         description="Traffic Light Protocol (TLP) level to apply on objects imported into OpenCTI.",
     )
+    cache_ttl: int = Field(
+        default=0,
+        description="Number of seconds AbuseIPDB responses are cached for, 0 disables the cache.",
+    )
+    cache_negative_ttl: int = Field(
+        default=3600,
+        description="Number of seconds responses of IPs without any report are cached for, 0 to never cache them.",
+    )
+    cache_max_entries: int = Field(
+        default=1000,
+        description="Maximum number of responses kept in memory.",
+    )
+    cache_path: Optional[str] = Field(
+        default=None,
+        description="Path of a SQLite database used to keep cached responses across restarts.",
+    )
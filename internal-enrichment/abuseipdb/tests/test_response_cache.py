@@ -0,0 +1,38 @@
+from unittest.mock import MagicMock
+
+from src.connector.abuseipdb import ConnectorAbuseIPDB
+from src.connector.response_cache import ResponseCache, cache_key
+
+
+def make_connector(*responses):
+    connector = ConnectorAbuseIPDB.__new__(ConnectorAbuseIPDB)
+    connector.config = MagicMock()
+    connector.session = MagicMock()
+    connector.session.get.side_effect = [
+        MagicMock(json=MagicMock(return_value={"data": response}))
+        for response in responses
+    ]
+    # Negative responses are not kept, to tell them apart from the positive ones
+    connector.response_cache = ResponseCache(ttl=60, negative_ttl=0)
+    return connector
+
+
+def test_check_is_cached_by_ip():
+    data = {"ipAddress": "1.2.3.4", "isWhitelisted": False, "reports": [{}]}
+    connector = make_connector(data)
+
+    assert connector._check_ip("1.2.3.4") == data
+    assert connector._check_ip("1.2.3.4") == data
+
+    assert connector.session.get.call_count == 1
+    assert list(connector.response_cache._entries) == [cache_key("ip", "1.2.3.4")]
+
+
+def test_check_without_reports_is_negative():
+    data = {"ipAddress": "1.2.3.4", "isWhitelisted": False, "reports": []}
+    connector = make_connector(data, data)
+
+    connector._check_ip("1.2.3.4")
+    connector._check_ip("1.2.3.4")
+
+    assert connector.session.get.call_count == 2
@@ -22,6 +22,7 @@ from pycti import (
     StixCoreRelationship,
     get_config_variable,
 )
+from sandbox_scheduler import SandboxJobScheduler
 from stix2 import DomainName, IPv4Address
 
 
@@ -96,7 +97,15 @@ class CapeSandboxConnector:
             "CAPE_SANDBOX_PRIORITY", ["cape_sandbox", "priority"], config
         )
 
-    def _send_knowledge(self, observable, report):
+        # Analyses are polled in the background so they don't block other enrichments
+        self.scheduler = SandboxJobScheduler(
+            self.helper,
+            poll_job=self._poll_analysis,
+            process_job=self._process_analysis,
+            min_poll_interval=20,
+        )
+
+    def _send_knowledge(self, observable, report, work_id):
         bundle_objects = []
         final_observable = observable
 
@@ -566,7 +575,7 @@ class CapeSandboxConnector:
         # Serialize and send all bundles
         if bundle_objects:
             bundle = self.helper.stix2_create_bundle(bundle_objects)
-            bundles_sent = self.helper.send_stix2_bundle(bundle)
+            bundles_sent = self.helper.send_stix2_bundle(bundle, work_id=work_id)
             return f"Sent {len(bundles_sent)} stix bundle(s) for worker import"
         else:
             return "Nothing to attach"
@@ -612,27 +621,44 @@ class CapeSandboxConnector:
             task_id = response_dict["data"]["task_ids"][0][0]
         self.helper.log_info(f"Analysis {task_id} has started...")
 
-        # Wait until analysis is finished
-        status = None
-        while True:
-            # Get the task's status
-            response_dict = self._get_status(task_id)
-            status = response_dict["data"]
-            error = response_dict["error"]
-
-            if status == "reported":
-                break
-            elif error:
-                raise ValueError(f'Analysis {task_id} failed with status "{status}".')
+        # Only the observable ids are kept in the connector state, it is read
+        # again once the analysis is finished
+        return self.scheduler.submit(
+            task_id,
+            {
+                "observable_id": observable["id"],
+                "observable_type": observable["entity_type"],
+            },
+        )
 
-            self.helper.log_info(f'Analysis {task_id} has status "{status}"...')
-            time.sleep(20)
+    def _poll_analysis(self, task_id):
+        # Get the task's status, return the report once the analysis is finished
+        response_dict = self._get_status(task_id)
+        status = response_dict["data"]
+        error = response_dict["error"]
+
+        if status == "reported":
+            return self._get_report(task_id)
+        elif error:
+            raise ValueError(f'Analysis {task_id} failed with status "{status}".')
+
+        self.helper.log_info(f'Analysis {task_id} has status "{status}"...')
+        return None
+
+    def _read_observable(self, context):
+        # Read again the observable whose ids were persisted with the job
+        do_read = self.helper.api.stix2.get_reader(context["observable_type"])
+        observable = do_read(id=context["observable_id"], withFiles=True)
+        if observable is None:
+            raise ValueError(
+                f"Unable to read the observable {context['observable_id']}"
+            )
+        return observable
 
+    def _process_analysis(self, context, report, work_id):
         # Analysis is finished, process the report
-        response_dict = self._get_report(task_id)
-
-        self.helper.log_info(f"Analysis {task_id} finished, processing report...")
-        return self._send_knowledge(observable, response_dict)
+        self.helper.log_info("Analysis finished, processing report...")
+        return self._send_knowledge(self._read_observable(context), report, work_id)
 
     def _process_observable(self, observable):
         self.helper.log_info(
@@ -743,6 +769,7 @@ class CapeSandboxConnector:
 
     # Start the main loop
     def start(self):
+        self.scheduler.start()
         self.helper.listen(message_callback=self._process_message)
 
 
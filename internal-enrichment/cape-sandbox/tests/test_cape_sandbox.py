@@ -0,0 +1,51 @@
+from unittest import mock
+
+OBSERVABLE = {
+    "id": "observable-id",
+    "standard_id": "artifact--4d4a6f0f-5a6c-5e0a-9a0a-0f8b6a6f3c11",
+    "entity_type": "Artifact",
+    "observable_value": "sample.exe",
+    "importFiles": [{"id": "file-id", "name": "sample.exe"}],
+}
+REPORT = {"info": {"id": 7}}
+
+
+def test_analysis_is_polled_then_processed(connector, helper):
+    helper.api.fetch_opencti_file.return_value = b"content"
+    helper.api.stix2.get_reader.return_value.return_value = OBSERVABLE
+    connector._create_file = mock.Mock(return_value={"data": {"task_ids": [7]}})
+    connector._get_status = mock.Mock(
+        side_effect=[
+            {"data": "running", "error": None},
+            {"data": "reported", "error": None},
+        ]
+    )
+    connector._get_report = mock.Mock(return_value=REPORT)
+    connector._send_knowledge = mock.Mock(return_value="Sent 1 stix bundle(s)")
+
+    connector._trigger_sandbox(OBSERVABLE)
+
+    # Only the observable ids are persisted
+    assert helper.state["sandbox_jobs"]["7"]["context"] == {
+        "observable_id": "observable-id",
+        "observable_type": "Artifact",
+    }
+
+    job = connector.scheduler.jobs["7"]
+    connector.scheduler._poll("7", job)
+
+    connector._send_knowledge.assert_not_called()
+    assert "7" in connector.scheduler.jobs
+
+    connector.scheduler._poll("7", job)
+
+    helper.api.stix2.get_reader.assert_called_once_with("Artifact")
+    helper.api.stix2.get_reader.return_value.assert_called_once_with(
+        id="observable-id", withFiles=True
+    )
+    connector._get_report.assert_called_once_with("7")
+    connector._send_knowledge.assert_called_once_with(OBSERVABLE, REPORT, "work-id")
+    helper.api.work.to_processed.assert_called_once_with(
+        "work-id", "Sent 1 stix bundle(s)"
+    )
+    assert helper.state["sandbox_jobs"] == {}
@@ -2,13 +2,16 @@
 """CrowdSec client module."""
 
 import itertools
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from time import sleep
+from typing import Optional
 from urllib.parse import urljoin
 
 import requests
 from pycti import OpenCTIConnectorHelper
 
+from .response_cache import ResponseCache, cached_lookup
+
 
 class QuotaExceedException(Exception):
     pass
@@ -21,10 +24,13 @@ class CrowdSecClient:
     helper: OpenCTIConnectorHelper
     url: str
     api_key: str
+    response_cache: Optional[ResponseCache] = None
+    session: requests.Session = field(default_factory=requests.Session)
 
+    @cached_lookup("ip", is_negative=lambda data: data == {"reputation": "unknown"})
     def get_crowdsec_cti_for_ip(self, ip):
         for i in itertools.count(1, 1):
-            resp = requests.get(
+            resp = self.session.get(
                 urljoin(self.url, f"smoke/{ip}"),
                 headers={
                     "x-api-key": self.api_key,
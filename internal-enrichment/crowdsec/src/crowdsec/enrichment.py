@@ -18,6 +18,7 @@ from .helper import (
     handle_none_cti_value,
     handle_observable_description,
 )
+from .response_cache import ResponseCache
 
 
 class CrowdSecEnrichment:
@@ -108,10 +109,47 @@ class CrowdSecEnrichment:
             )
         else:
             self.api_base_url = f"{CTI_API_URL}{self.crowdsec_api_version}/"
+        cache_ttl = get_config_variable(
+            "CROWDSEC_CACHE_TTL",
+            ["crowdsec", "cache_ttl"],
+            self.config,
+            default=0,
+            isNumber=True,
+        )
+        response_cache = None
+        if cache_ttl > 0:
+            response_cache = ResponseCache(
+                ttl=cache_ttl,
+                negative_ttl=get_config_variable(
+                    "CROWDSEC_CACHE_NEGATIVE_TTL",
+                    ["crowdsec", "cache_negative_ttl"],
+                    self.config,
+                    default=3600,
+                    isNumber=True,
+                ),
+                max_entries=get_config_variable(
+                    "CROWDSEC_CACHE_MAX_ENTRIES",
+                    ["crowdsec", "cache_max_entries"],
+                    self.config,
+                    default=1000,
+                    isNumber=True,
+                ),
+                path=clean_config(
+                    get_config_variable(
+                        "CROWDSEC_CACHE_PATH",
+                        ["crowdsec", "cache_path"],
+                        self.config,
+                        default="",
+                    )
+                )
+                or None,
+                log=self.helper.log_info,
+            )
         self.client = CrowdSecClient(
             helper=self.helper,
             url=self.api_base_url,
             api_key=self.crowdsec_cti_key,
+            response_cache=response_cache,
         )
         self.builder = None
 
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""CrowdSec response cache unittest."""
+import unittest
+from unittest.mock import MagicMock
+
+from crowdsec.client import CrowdSecClient
+from crowdsec.response_cache import ResponseCache, cache_key
+
+
+def make_client(*responses):
+    session = MagicMock()
+    session.get.side_effect = [
+        MagicMock(status_code=status_code, json=MagicMock(return_value=data))
+        for status_code, data in responses
+    ]
+    # Negative responses are not kept, to tell them apart from the positive ones
+    return CrowdSecClient(
+        helper=MagicMock(),
+        url="https://cti.api.crowdsec.net/v2/",
+        api_key="api-key",
+        response_cache=ResponseCache(ttl=60, negative_ttl=0),
+        session=session,
+    )
+
+
+class CrowdSecResponseCacheTest(unittest.TestCase):
+    def test_cti_is_cached_by_ip(self):
+        client = make_client((200, {"ip": "1.2.3.4"}))
+
+        self.assertEqual(client.get_crowdsec_cti_for_ip("1.2.3.4"), {"ip": "1.2.3.4"})
+        self.assertEqual(client.get_crowdsec_cti_for_ip("1.2.3.4"), {"ip": "1.2.3.4"})
+
+        self.assertEqual(client.session.get.call_count, 1)
+        self.assertEqual(
+            list(client.response_cache._entries), [cache_key("ip", "1.2.3.4")]
+        )
+
+    def test_unknown_ip_is_negative(self):
+        client = make_client((404, None), (404, None))
+
+        self.assertEqual(
+            client.get_crowdsec_cti_for_ip("1.2.3.4"), {"reputation": "unknown"}
+        )
+        client.get_crowdsec_cti_for_ip("1.2.3.4")
+
+        self.assertEqual(client.session.get.call_count, 2)
@@ -1,6 +1,6 @@
 import os
 import re
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 import dnstwist
 from pycti import OpenCTIConnectorHelper, StixCoreRelationship
@@ -22,7 +22,12 @@ class DnsTwistConnector:
     def __init__(self):
         self.helper = OpenCTIConnectorHelper({})
         self.dictonary_path = "/dictionaries/"
-        self.total_threads = os.environ.get("CONNECTOR_DNS_TWIST_THREADS", "20")
+        # Maximum number of permutations resolved concurrently
+        self.total_threads = int(os.environ.get("CONNECTOR_DNS_TWIST_THREADS", "20"))
+        # Maximum number of concurrent WHOIS lookups
+        self.whois_threads = int(
+            os.environ.get("CONNECTOR_DNS_TWIST_WHOIS_THREADS", "10")
+        )
 
         update_existing_data = os.environ.get("CONNECTOR_UPDATE_EXISTING_DATA", "false")
         if update_existing_data.lower() in ["true", "false"]:
@@ -45,11 +50,158 @@ class DnsTwistConnector:
                 return "IPv6-Addr"
             return "ipv6-addr"
 
+    def _whois_lookup(self, whois, domain):
+        """Add the registrar and creation date of a registered permutation"""
+        try:
+            wreply = whois.whois(".".join(dnstwist.domain_tld(domain["domain"])[1:]))
+        except Exception as e:
+            self.helper.log_debug(f"WHOIS lookup failed for {domain['domain']}: {e}")
+            return
+        if wreply.get("creation_date"):
+            domain["whois_created"] = wreply.get("creation_date").strftime("%Y-%m-%d")
+        if wreply.get("registrar"):
+            domain["whois_registrar"] = wreply.get("registrar")
+
+    def _resolves_to(self, source_id, target_id, description):
+        return Relationship(
+            id=StixCoreRelationship.generate_id("resolves-to", source_id, target_id),
+            relationship_type="resolves-to",
+            source_ref=source_id,
+            target_ref=target_id,
+            description=description,
+        )
+
+    def _ip_object(self, value):
+        if self.detect_ip_version(value, True) == "IPv4-Addr":
+            return IPv4Address(type="ipv4-addr", value=value, allow_custom=True)
+        return IPv6Address(type="ipv6-addr", value=value, allow_custom=True)
+
+    def _permutation_objects(self, item):
+        """Convert a registered permutation and its DNS records to STIX objects"""
+        stix_objects = []
+
+        if item.get("whois_created") and item.get("whois_registrar"):
+            description = (
+                f"- **Registrar**: {item.get('whois_registrar')} \n"
+                + "\n"
+                + f"- **Created**: {item.get('whois_created')}"
+            )
+        else:
+            description = "No whois information available"
+
+        # The domain id only depends on its value, the description is completed below
+        domain_object = DomainName(
+            type="domain-name", value=item.get("domain"), allow_custom=True
+        )
+
+        ## Creating Name Server records
+
+        for ns_record in item.get("dns_ns") or []:
+            if ns_record != "!ServFail":
+                ns_object = DomainName(
+                    type="domain-name", value=ns_record, allow_custom=True
+                )
+                description = description + "\n" + f"- **NS_SERVER**: {ns_record}"
+                stix_objects.append(ns_object)
+                stix_objects.append(
+                    self._resolves_to(
+                        domain_object.get("id"),
+                        ns_object.get("id"),
+                        "dns_ns_related-to"
+                        + domain_object.get("id")
+                        + ns_object.get("id"),
+                    )
+                )
+
+        ## Creating A records and relationships
+
+        for a_record in item.get("dns_a") or []:
+            if a_record != "!ServFail":
+                a_object = self._ip_object(a_record)
+                description = description + "\n" + f"- **A_RECORD**: {a_record}"
+                stix_objects.append(a_object)
+                stix_objects.append(
+                    self._resolves_to(
+                        domain_object.get("id"),
+                        a_object.get("id"),
+                        "dns_a_related-to"
+                        + domain_object.get("id")
+                        + a_object.get("id"),
+                    )
+                )
+
+        ## Creating AAAA records and relationships
+
+        for aaaa_record in item.get("dns_aaaa") or []:
+            if aaaa_record != "!ServFail":
+                aaaa_object = self._ip_object(aaaa_record)
+                description = description + "\n" + f"- **AAAA_RECORD**: {aaaa_record}"
+                stix_objects.append(aaaa_object)
+                stix_objects.append(
+                    self._resolves_to(
+                        domain_object.get("id"),
+                        aaaa_object.get("id"),
+                        "dns_aaaa_related-to"
+                        + domain_object.get("id")
+                        + aaaa_object.get("id"),
+                    )
+                )
+
+        ## Creating MX records and relationships
+
+        for mx_record in item.get("dns_mx") or []:
+            if mx_record == "!ServFail" or mx_record == "":
+                continue
+            # if MX record is same as the domain name
+            if mx_record == domain_object.get("value"):
+                description = description + "\n" + f"- **MX_RECORDS**: {mx_record}"
+                continue
+            mx_object = DomainName(
+                type="domain-name", value=mx_record, allow_custom=True
+            )
+            description = description + "\n" + f"- **MX**: {mx_record}"
+            stix_objects.append(mx_object)
+            stix_objects.append(
+                self._resolves_to(
+                    domain_object.get("id"),
+                    mx_object.get("id"),
+                    "dns_mx_related-to"
+                    + domain_object.get("value")
+                    + mx_object.get("value"),
+                )
+            )
+
+        domain_object = DomainName(
+            type="domain-name",
+            value=item.get("domain"),
+            custom_properties={"x_opencti_description": description},
+            allow_custom=True,
+        )
+        stix_objects.append(domain_object)
+
+        # Link the permutation to the enriched domain
+        stix_objects.append(
+            Relationship(
+                id=StixCoreRelationship.generate_id(
+                    "related-to", self.entity_id, domain_object.id
+                ),
+                relationship_type="related-to",
+                source_ref=self.entity_id,
+                target_ref=domain_object.id,
+                description="related-to" + self.entity_id + domain_object.id,
+            )
+        )
+        stix_objects.append(
+            self._resolves_to(
+                self.entity_id, domain_object.get("id"), "dns_twist_related-to"
+            )
+        )
+        return stix_objects
+
     def dns_twist_enrichment(self, observable):
         """Enriching the domain name using DNS Twist"""
 
         tld_file = os.path.join(self.dictonary_path, "common_tlds.dict")
-        stix_objects = []
         self.registered = os.environ.get("CONNECTOR_FETCH_REGISTERED", None).lower()
 
         if self.registered == "true":
@@ -57,7 +209,7 @@ class DnsTwistConnector:
         else:
             self.registered = False
 
-        # DNS Twist API call
+        # DNS Twist API call, permutations are resolved by `total_threads` workers
         data = dnstwist.run(
             domain=observable.get("value"),
             registered=self.registered,
@@ -65,213 +217,44 @@ class DnsTwistConnector:
             m=True,
             threads=self.total_threads,
             tld=tld_file,
-            w=True,
         )
-
-        for item in data:
-            if item.get("domain") and item.get("domain") != observable.get("value"):
-                stix_objects = []
-                description = ""
-                if item.get("whois_created") and item.get("whois_registrar"):
-                    description = (
-                        f"- **Registrar**: {item.get('whois_registrar')} \n"
-                        + "\n"
-                        + f"- **Created**: {item.get('whois_created')}"
-                    )
-                else:
-                    description = "No whois information available"
-
-                domain_object = DomainName(
-                    type="domain-name",
-                    value=item.get("domain"),
-                    custom_properties={"x_opencti_description": description},
-                    allow_custom=True,
-                )
-
-                relation_object = Relationship(
-                    id=StixCoreRelationship.generate_id(
-                        "related-to", self.entity_id, domain_object.id
-                    ),
-                    relationship_type="related-to",
-                    source_ref=self.entity_id,
-                    target_ref=domain_object.id,
-                    description="related-to" + self.entity_id + domain_object.id,
-                )
-                stix_objects.append(domain_object)
-                stix_objects.append(relation_object)
-
-                ## Creating Name Server records
-
-                if item.get("dns_ns"):
-                    for ns_record in item.get("dns_ns"):
-                        if ns_record != "!ServFail":
-                            ns_object = DomainName(
-                                type="domain-name", value=ns_record, allow_custom=True
-                            )
-
-                            ns_relation_object = Relationship(
-                                id=StixCoreRelationship.generate_id(
-                                    "resolves-to",
-                                    domain_object.get("id"),
-                                    ns_object.get("id"),
-                                ),
-                                relationship_type="resolves-to",
-                                source_ref=domain_object.get("id"),
-                                target_ref=ns_object.get("id"),
-                                description="dns_ns_related-to"
-                                + domain_object.get("id")
-                                + ns_object.get("id"),
-                            )
-                            description = (
-                                description + "\n" + f"- **NS_SERVER**: {ns_record}"
-                            )
-                            stix_objects.append(ns_object)
-                            stix_objects.append(ns_relation_object)
-
-                ## Creating A records and relationships
-
-                if item.get("dns_a"):
-                    for a_record in item.get("dns_a"):
-                        if a_record != "!ServFail":
-                            if self.detect_ip_version(a_record, True) == "IPv4-Addr":
-                                a_object = IPv4Address(
-                                    type="ipv4-addr", value=a_record, allow_custom=True
-                                )
-                            else:
-                                a_object = IPv6Address(
-                                    type="ipv6-addr", value=a_record, allow_custom=True
-                                )
-
-                            a_relation_object = Relationship(
-                                id=StixCoreRelationship.generate_id(
-                                    "resolves-to",
-                                    domain_object.get("id"),
-                                    a_object.get("id"),
-                                ),
-                                relationship_type="resolves-to",
-                                source_ref=domain_object.get("id"),
-                                target_ref=a_object.get("id"),
-                                description="dns_a_related-to"
-                                + domain_object.get("id")
-                                + a_object.get("id"),
-                            )
-                            description = (
-                                description + "\n" + f"- **A_RECORD**: {a_record}"
-                            )
-                            stix_objects.append(a_object)
-                            stix_objects.append(a_relation_object)
-
-                ## Creating AAAA records and relationships
-
-                if item.get("dns_aaaa"):
-                    for aaaa_record in item.get("dns_aaaa"):
-                        if aaaa_record != "!ServFail":
-                            if self.detect_ip_version(aaaa_record, True) == "IPv4-Addr":
-                                aaaa_object = IPv4Address(
-                                    type="ipv4-addr",
-                                    value=aaaa_record,
-                                    allow_custom=True,
-                                )
-                            else:
-                                aaaa_object = IPv6Address(
-                                    type="ipv6-addr",
-                                    value=aaaa_record,
-                                    allow_custom=True,
-                                )
-
-                            aaaa_relation_object = Relationship(
-                                id=StixCoreRelationship.generate_id(
-                                    "resolves-to",
-                                    domain_object.get("id"),
-                                    aaaa_object.get("id"),
-                                ),
-                                relationship_type="resolves-to",
-                                source_ref=domain_object.get("id"),
-                                target_ref=aaaa_object.get("id"),
-                                description="dns_aaaa_related-to"
-                                + domain_object.get("id")
-                                + aaaa_object.get("id"),
-                            )
-                            description = (
-                                description + "\n" + f"- **AAAA_RECORD**: {aaaa_record}"
-                            )
-                            stix_objects.append(aaaa_object)
-                            stix_objects.append(aaaa_relation_object)
-
-                ## Creating MX records and relationships
-                if item.get("dns_mx"):
-                    for mx_record in item.get("dns_mx"):
-                        # if MX record is not same as the domain name
-                        if (
-                            mx_record != "!ServFail"
-                            and mx_record != domain_object.get("value")
-                            and mx_record != ""
-                        ):
-                            mx_object = DomainName(
-                                type="domain-name", value=mx_record, allow_custom=True
-                            )
-                            mx_relation_object = Relationship(
-                                id=StixCoreRelationship.generate_id(
-                                    "resolves-to",
-                                    domain_object.get("id"),
-                                    mx_object.get("id"),
-                                ),
-                                relationship_type="resolves-to",
-                                source_ref=domain_object.get("id"),
-                                target_ref=mx_object.get("id"),
-                                description="dns_mx_related-to"
-                                + domain_object.get("value")
-                                + mx_object.get("value"),
-                            )
-                            description = description + "\n" + f"- **MX**: {mx_record}"
-                            stix_objects.append(mx_object)
-                            stix_objects.append(mx_relation_object)
-
-                        # if MX record is same as the domain name
-
-                        elif (
-                            mx_record != "!ServFail"
-                            and mx_record == domain_object.get("value")
-                            and mx_record != ""
-                        ):
-                            description = (
-                                description + "\n" + f"- **MX_RECORDS**: {mx_record}"
-                            )
-                            stix_objects.append(mx_object)
-                            stix_objects.append(mx_relation_object)
-
-                # Updating the description of the domain object
-
-                domain_object = DomainName(
-                    type="domain-name",
-                    value=item.get("domain"),
-                    custom_properties={"x_opencti_description": description},
-                    allow_custom=True,
-                )
-
-                stix_objects.append(domain_object)
-                bundle = self.helper.stix2_create_bundle(stix_objects)
-                bundles_sent = self.helper.send_stix2_bundle(bundle)
-                self.helper.log_info(
-                    f"Sent {len(bundles_sent)} stix bundle(s) for worker import"
-                )
-
-                try:
-                    time.sleep(1)
-                    self.helper.api.stix_nested_ref_relationship.create(
-                        stix_id=StixCoreRelationship.generate_id(
-                            "resolves-to", self.entity_id, domain_object.get("id")
-                        ),
-                        fromId=self.entity_id,
-                        toId=domain_object.get("id"),
-                        relationship_type="resolves-to",
-                        description="dns_twist_related-to",
-                    )
-
-                except Exception as e:
-                    self.helper.log_error(f"Error: {e}")
-                    continue
-
+        permutations = [
+            item
+            for item in data
+            if item.get("domain") and item.get("domain") != observable.get("value")
+        ]
+
+        # WHOIS lookups of the registered permutations run concurrently
+        whois = dnstwist.Whois()
+        registered_permutations = [
+            item
+            for item in permutations
+            if any(key.startswith("dns_") for key in item.keys())
+        ]
+        with ThreadPoolExecutor(max_workers=self.whois_threads) as executor:
+            for item in registered_permutations:
+                executor.submit(self._whois_lookup, whois, item)
+
+        # Name servers and IP addresses shared by several permutations are sent once,
+        # keeping the first object unless a later one carries a description (e.g. a
+        # permutation which is also the name server of another permutation)
+        stix_objects = {}
+        for item in permutations:
+            for stix_object in self._permutation_objects(item):
+                existing = stix_objects.setdefault(stix_object["id"], stix_object)
+                if "x_opencti_description" in stix_object and (
+                    "x_opencti_description" not in existing
+                ):
+                    stix_objects[stix_object["id"]] = stix_object
+
+        if not stix_objects:
+            return "No permutation found"
+
+        bundle = self.helper.stix2_create_bundle(list(stix_objects.values()))
+        bundles_sent = self.helper.send_stix2_bundle(bundle)
+        self.helper.log_info(
+            f"Sent {len(bundles_sent)} stix bundle(s) for {len(permutations)} permutations"
+        )
         return "Success"
 
     def process_message(self, data):
@@ -21,6 +21,7 @@ from pycti import (
     Vulnerability,
     get_config_variable,
 )
+from response_cache import ResponseCache, cached_lookup
 
 
 class GreyNoiseConnector:
@@ -76,6 +77,37 @@ class GreyNoiseConnector:
             default=20,
         )
 
+        cache_ttl = get_config_variable(
+            "GREYNOISE_CACHE_TTL",
+            ["greynoise", "cache_ttl"],
+            config,
+            isNumber=True,
+            default=0,
+        )
+        self.response_cache = None
+        if cache_ttl > 0:
+            self.response_cache = ResponseCache(
+                ttl=cache_ttl,
+                negative_ttl=get_config_variable(
+                    "GREYNOISE_CACHE_NEGATIVE_TTL",
+                    ["greynoise", "cache_negative_ttl"],
+                    config,
+                    isNumber=True,
+                    default=3600,
+                ),
+                max_entries=get_config_variable(
+                    "GREYNOISE_CACHE_MAX_ENTRIES",
+                    ["greynoise", "cache_max_entries"],
+                    config,
+                    isNumber=True,
+                    default=1000,
+                ),
+                path=get_config_variable(
+                    "GREYNOISE_CACHE_PATH", ["greynoise", "cache_path"], config
+                ),
+                log=self.helper.log_info,
+            )
+
         # Define variables
         self._CONNECTOR_RUN_INTERVAL_SEC = 60 * 60
         self.tlp = None
@@ -826,6 +858,19 @@ class GreyNoiseConnector:
         stix2_bundle = self.helper.stix2_create_bundle(uniq_bundles_objects)
         return stix2_bundle
 
+    def _greynoise_session(self) -> GreyNoise:
+        return GreyNoise(
+            api_key=self.greynoise_key, integration_name="opencti-enricher-v3.1"
+        )
+
+    @cached_lookup("ipv4-addr", is_negative=lambda data: data.get("seen") is False)
+    def _get_ip_context(self, ip: str) -> dict:
+        return self._greynoise_session().ip(ip)
+
+    @cached_lookup("greynoise-tags-metadata")
+    def _get_tags_metadata(self) -> dict:
+        return self._greynoise_session().metadata()
+
     def _process_message(self, data: Dict) -> str:
         # Security to limit playbook triggers to something other than the scope initial
         scopes = self.helper.connect_scope.lower().replace(" ", "").split(",")
@@ -859,11 +904,7 @@ class GreyNoiseConnector:
             try:
                 # Get "IP Context" GreyNoise API Response
                 # https://docs.greynoise.io/reference/noisecontextip-1
-                session = GreyNoise(
-                    api_key=self.greynoise_key, integration_name="opencti-enricher-v3.1"
-                )
-
-                json_data = session.ip(opencti_entity_value)
+                json_data = self._get_ip_context(opencti_entity_value)
 
                 if (
                     "seen" in json_data
@@ -877,7 +918,7 @@ class GreyNoiseConnector:
                 # Get "Tag Metadata" Greynoise API Response
                 # https://docs.greynoise.io/reference/metadata-3
 
-                json_data_tags = session.metadata()
+                json_data_tags = self._get_tags_metadata()
 
                 # Generate a stix bundle
                 stix_bundle = self._generate_stix_bundle(
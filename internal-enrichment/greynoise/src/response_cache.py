@@ -0,0 +1,204 @@
+"""Cache of external API responses, keyed on the enriched observable."""
+
+import functools
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+def cache_key(observable_type: str, *args) -> str:
+    """Build the cache key of a lookup from the observable type and its arguments."""
+    return json.dumps([observable_type.lower(), *args], separators=(",", ":"))
+
+
+class ResponseCache:
+    """
+    LRU cache of API responses with a time to live.
+
+    Responses are stored as JSON, every hit returns a fresh copy of the response.
+    Negative responses (e.g. "not found") can be kept for a shorter time than the
+    positive ones. When `path` is set, responses are also written to a SQLite database
+    so that they survive a restart of the connector.
+
+    :param ttl: number of seconds a response is kept
+    :param negative_ttl: number of seconds a negative response is kept, defaults to `ttl`
+    :param max_entries: maximum number of responses kept in memory
+    :param path: path of the SQLite database, responses are only kept in memory if None
+    :param log: function called with the cache statistics every `log_interval` lookups
+    :param log_interval: number of lookups between two statistics logs
+    """
+
+    def __init__(
+        self,
+        ttl: int,
+        negative_ttl: Optional[int] = None,
+        max_entries: int = 1000,
+        path: Optional[str] = None,
+        log: Optional[Callable[[str], Any]] = None,
+        log_interval: int = 100,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.max_entries = max_entries
+        self.log = log
+        self.log_interval = log_interval
+
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE expires_at <= ?", (time.time(),)
+            )
+            self._db.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        """Return the hit and miss counters of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "entries": len(self._entries),
+        }
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read(self, key: str) -> Optional[str]:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is None and self._db is not None:
+            entry = self._db.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if entry is not None:
+                self._remember(key, *entry)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= now:
+            self._forget(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _forget(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Return whether a response is cached for `key` and the response itself."""
+        with self._lock:
+            value = self._read(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            lookups = self.hits + self.misses
+        if self.log is not None and lookups % self.log_interval == 0:
+            self.log(f"Response cache statistics: {self.stats()}")
+        if value is None:
+            return False, None
+        return True, json.loads(value)
+
+    def set(self, key: str, response: Any, negative: bool = False) -> None:
+        """Store the response of a lookup."""
+        ttl = self.negative_ttl if negative else self.ttl
+        if ttl <= 0:
+            return
+        value = json.dumps(response)
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, value, expires_at),
+                )
+                self._db.commit()
+
+    def invalidate(self, observable_type: str, *args) -> None:
+        """Drop the cached response of a lookup, e.g. once a new analysis is available."""
+        with self._lock:
+            self._forget(cache_key(observable_type, *args))
+
+    def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Any],
+        is_negative: Optional[Callable[[Any], bool]] = None,
+        is_error: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Return the cached response of `key` or fetch and store it.
+
+        Responses that are None, or for which `is_error` is true, are considered as
+        failures and never stored.
+        """
+        found, response = self.get(key)
+        if found:
+            return response
+        response = fetch()
+        if response is not None and not (is_error is not None and is_error(response)):
+            self.set(
+                key,
+                response,
+                negative=is_negative is not None and is_negative(response),
+            )
+        return response
+
+
+def cached_lookup(
+    observable_type: str,
+    is_negative: Optional[Callable[[Any], bool]] = None,
+    is_error: Optional[Callable[[Any], bool]] = None,
+):
+    """
+    Decorate a lookup method so that its responses are served by `self.response_cache`.
+
+    The arguments of the method, usually the observable value, are part of the cache
+    key. The method is called directly when `self.response_cache` is None.
+
+    :param observable_type: type of the observable looked up by the method
+    :param is_negative: function telling whether a response is negative
+    :param is_error: function telling whether a response is an error not to be stored
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, "response_cache", None)
+            if cache is None:
+                return method(self, *args, **kwargs)
+            return cache.get_or_fetch(
+                cache_key(observable_type, *args, *sorted(kwargs.items())),
+                lambda: method(self, *args, **kwargs),
+                is_negative,
+                is_error,
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,50 @@
+from unittest.mock import MagicMock
+
+from main import GreyNoiseConnector
+from response_cache import ResponseCache, cache_key
+
+
+def make_connector(*responses):
+    connector = GreyNoiseConnector.__new__(GreyNoiseConnector)
+    session = MagicMock()
+    session.ip.side_effect = list(responses)
+    session.metadata.return_value = {"metadata": []}
+    connector._greynoise_session = MagicMock(return_value=session)
+    # Negative responses are not kept, to tell them apart from the positive ones
+    connector.response_cache = ResponseCache(ttl=60, negative_ttl=0)
+    return connector, session
+
+
+def test_ip_context_is_cached_by_ip():
+    context = {"ip": "1.2.3.4", "seen": True}
+    connector, session = make_connector(context)
+
+    assert connector._get_ip_context("1.2.3.4") == context
+    assert connector._get_ip_context("1.2.3.4") == context
+
+    assert session.ip.call_count == 1
+    assert list(connector.response_cache._entries) == [
+        cache_key("ipv4-addr", "1.2.3.4")
+    ]
+
+
+def test_unseen_ip_is_negative():
+    context = {"ip": "1.2.3.4", "seen": False}
+    connector, session = make_connector(context, context)
+
+    connector._get_ip_context("1.2.3.4")
+    connector._get_ip_context("1.2.3.4")
+
+    assert session.ip.call_count == 2
+
+
+def test_tags_metadata_are_cached():
+    connector, session = make_connector()
+
+    connector._get_tags_metadata()
+    connector._get_tags_metadata()
+
+    assert session.metadata.call_count == 1
+    assert list(connector.response_cache._entries) == [
+        cache_key("greynoise-tags-metadata")
+    ]
@@ -21,6 +21,7 @@ from pycti import (
     StixCoreRelationship,
     get_config_variable,
 )
+from sandbox_scheduler import SandboxJobScheduler
 from stix2 import URL, DomainName, EmailAddress, IPv4Address
 from triage import Client
 
@@ -91,8 +92,16 @@ class HatchingTriageSandboxConnector:
             config,
         )
 
+        # Analyses are polled in the background so they don't block other enrichments
+        self.scheduler = SandboxJobScheduler(
+            self.helper,
+            poll_job=self._poll_analysis,
+            process_job=self._process_analysis,
+            min_poll_interval=10,
+        )
+
     def _process_overview_report(
-        self, observable, overview_dict, sample_id, entity_type
+        self, observable, overview_dict, sample_id, entity_type, work_id
     ):
 
         bundle_objects = []
@@ -450,13 +459,13 @@ class HatchingTriageSandboxConnector:
                     bundle_objects.append(relationship)
         # Serialize and send all bundles
         if bundle_objects:
-            return self._send_bundle(bundle_objects)
+            return self._send_bundle(bundle_objects, work_id)
         else:
             return "Nothing to attach"
 
-    def _send_bundle(self, bundle_objects):
+    def _send_bundle(self, bundle_objects, work_id):
         bundle = self.helper.stix2_create_bundle(bundle_objects)
-        bundles_sent = self.helper.send_stix2_bundle(bundle)
+        bundles_sent = self.helper.send_stix2_bundle(bundle, work_id=work_id)
         return f"Sent {len(bundles_sent)} stix bundle(s) for worker import"
 
     def _process_file(self, observable, entity_type):
@@ -491,11 +500,51 @@ class HatchingTriageSandboxConnector:
             if sample_id is None:
                 sample_id = self._submit_sample(url=observable_value)
 
+        context = {"sample_id": sample_id, "entity_type": entity_type}
+        if self.helper.playbook is not None:
+            # Playbooks expect the enrichment result within the current work
+            return self.scheduler.wait(sample_id, {**context, "observable": observable})
+        # Only the observable ids are kept in the connector state, it is read
+        # again once the analysis is finished
+        return self.scheduler.submit(
+            sample_id,
+            {
+                **context,
+                "observable_id": observable["id"],
+                "observable_type": observable["entity_type"],
+            },
+        )
+
+    def _poll_analysis(self, sample_id):
+        status = self.triage_client.sample_by_id(sample_id)["status"]
+        if status == "failed":
+            raise ValueError(f"Analysis {sample_id} failed.")
+        if status != "reported":
+            self.helper.log_info(f'Analysis {sample_id} has status "{status}".')
+            return None
+
+        self.helper.log_info(f"Analysis {sample_id} has finished.")
         # Get the Overview report
-        overview_dict = self.triage_client.overview_report(sample_id)
+        return self.triage_client.overview_report(sample_id)
+
+    def _read_observable(self, context):
+        # Read again the observable whose ids were persisted with the job
+        do_read = self.helper.api.stix2.get_reader(context["observable_type"])
+        observable = do_read(id=context["observable_id"], withFiles=True)
+        if observable is None:
+            raise ValueError(
+                f"Unable to read the observable {context['observable_id']}"
+            )
+        return observable
 
+    def _process_analysis(self, context, overview_dict, work_id):
+        observable = context.get("observable") or self._read_observable(context)
         return self._process_overview_report(
-            observable, overview_dict, sample_id, entity_type
+            observable,
+            overview_dict,
+            context["sample_id"],
+            context["entity_type"],
+            work_id,
         )
 
     def _search_for_analysis(self, search_query):
@@ -516,7 +565,6 @@ class HatchingTriageSandboxConnector:
                     self.helper.log_info(
                         f"Found existing analysis with id {sample_id} and status {existing_status}."
                     )
-                    self._wait_for_analysis(sample_id)
                 # Don't paginate, just get the first result
                 break
 
@@ -539,7 +587,6 @@ class HatchingTriageSandboxConnector:
         self.helper.log_info(
             f'Started new analysis {sample_id}, has status "{sample_status}".'
         )
-        self._wait_for_analysis(sample_id)
 
         return sample_id
 
@@ -570,31 +617,12 @@ class HatchingTriageSandboxConnector:
             return self._process_observable(observable, entity_type)
         else:
             if not data.get("event_type"):
-                self._send_bundle(stix_objects)
+                self._send_bundle(stix_objects, self.helper.work_id)
             else:
                 raise ValueError(
                     f"Failed to process observable, {observable['entity_type']} is not a supported entity type."
                 )
 
-    def _wait_for_analysis(self, sample_id):
-        """
-        Wait for an analysis to finish.
-
-        sample_id: a str representing the sample id
-        returns: none
-        """
-
-        for events in self.triage_client.sample_events(sample_id):
-            if events["status"] == "pending":
-                self.helper.log_info(
-                    f"Analysis {sample_id} has status \"{events['status']}\"."
-                )
-            elif events["status"] == "reported":
-                self.helper.log_info(f"Analysis {sample_id} has finished.")
-                break
-            elif events["status"] == "failed":
-                raise ValueError(f"Analysis {sample_id} failed.")
-
     def _get_sha256(self, contents):
         """
         Return sha256 of bytes.
@@ -612,6 +640,7 @@ class HatchingTriageSandboxConnector:
 
     # Start the main loop
     def start(self):
+        self.scheduler.start()
         self.helper.listen(message_callback=self._process_message)
 
 
@@ -0,0 +1,174 @@
+# coding: utf-8
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from pycti import OpenCTIConnectorHelper
+
+
+class SandboxJobScheduler:
+    """Keep track of in-flight sandbox jobs and poll them from a single thread.
+
+    Jobs are submitted by the enrichment callback, which returns immediately.
+    Every job is polled with an interval growing from `min_poll_interval` to
+    `max_poll_interval` seconds, and `process_job` is called as soon as its
+    report is available. Pending jobs are persisted in the connector state so
+    that they are resumed after a restart.
+
+    :param helper: connector helper
+    :param poll_job: function called with the task id, returning the report
+        once the analysis is finished, None while it is still running, and
+        raising a ValueError if the analysis failed
+    :param process_job: function called with the job context, the report and
+        the work id, converting the report to STIX and sending it
+    :param min_poll_interval: first interval between two polls of a job
+    :param max_poll_interval: maximum interval between two polls of a job
+    :param job_timeout: number of seconds after which a job is abandoned, even if
+        its polls keep failing (None to never abandon it)
+    """
+
+    STATE_KEY = "sandbox_jobs"
+
+    def __init__(
+        self,
+        helper: OpenCTIConnectorHelper,
+        poll_job: Callable[[str], Optional[Any]],
+        process_job: Callable[[Dict, Any, Optional[str]], str],
+        min_poll_interval: int = 10,
+        max_poll_interval: int = 300,
+        job_timeout: Optional[int] = 24 * 3600,
+    ):
+        self.helper = helper
+        self.poll_job = poll_job
+        self.process_job = process_job
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.job_timeout = job_timeout
+
+        self.jobs: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+        self.wake_up = threading.Event()
+
+    def start(self):
+        """Resume the jobs persisted in the connector state and start polling."""
+        state = self.helper.get_state() or {}
+        now = time.time()
+        for task_id, job in state.get(self.STATE_KEY, {}).items():
+            job["next_poll"] = now
+            job["interval"] = self.min_poll_interval
+            self.jobs[task_id] = job
+        if self.jobs:
+            self.helper.log_info(f"Resuming {len(self.jobs)} pending sandbox jobs...")
+        threading.Thread(target=self._poll_loop, daemon=True).start()
+
+    def submit(self, task_id, context: Dict) -> str:
+        """Register a submitted sandbox job, its report will be processed once ready.
+
+        :param task_id: identifier of the job in the sandbox
+        :param context: JSON serializable data needed to process the report
+        """
+        now = time.time()
+        with self.lock:
+            self.jobs[str(task_id)] = {
+                "context": context,
+                "submitted_at": now,
+                "next_poll": now + self.min_poll_interval,
+                "interval": self.min_poll_interval,
+            }
+            self._save_state()
+        self.wake_up.set()
+        return (
+            f"Analysis {task_id} submitted, its report will be processed once finished"
+        )
+
+    def wait(self, task_id, context: Dict) -> str:
+        """Poll a single job until it is finished and process it in the current work.
+
+        Used when the result must be sent within the enrichment callback (e.g. playbooks).
+        """
+        interval = self.min_poll_interval
+        submitted_at = time.time()
+        while True:
+            report = self.poll_job(str(task_id))
+            if report is not None:
+                return self.process_job(context, report, self.helper.work_id)
+            if self._is_expired(submitted_at):
+                raise ValueError(f"Analysis {task_id} timed out.")
+            time.sleep(interval)
+            interval = min(interval * 2, self.max_poll_interval)
+
+    def _is_expired(self, submitted_at: float) -> bool:
+        return (
+            self.job_timeout is not None
+            and time.time() - submitted_at > self.job_timeout
+        )
+
+    def _save_state(self):
+        state = self.helper.get_state() or {}
+        state[self.STATE_KEY] = {
+            task_id: {"context": job["context"], "submitted_at": job["submitted_at"]}
+            for task_id, job in self.jobs.items()
+        }
+        self.helper.set_state(state)
+
+    def _poll_loop(self):
+        while True:
+            with self.lock:
+                now = time.time()
+                due_jobs = [
+                    (task_id, job)
+                    for task_id, job in self.jobs.items()
+                    if job["next_poll"] <= now
+                ]
+                next_poll = min(
+                    (job["next_poll"] for job in self.jobs.values()),
+                    default=now + self.max_poll_interval,
+                )
+
+            for task_id, job in due_jobs:
+                self._poll(task_id, job)
+
+            if not due_jobs:
+                self.wake_up.wait(timeout=max(next_poll - time.time(), 1))
+                self.wake_up.clear()
+
+    def _poll(self, task_id: str, job: Dict):
+        try:
+            report = self.poll_job(task_id)
+            if report is None and self._is_expired(job["submitted_at"]):
+                raise ValueError(f"Analysis {task_id} timed out.")
+        except ValueError as e:
+            self.helper.log_error(f"Analysis {task_id} failed: {e}")
+            self._remove(task_id)
+            return
+        except Exception as e:
+            if self._is_expired(job["submitted_at"]):
+                self.helper.log_error(f"Analysis {task_id} timed out: {e}")
+                self._remove(task_id)
+                return
+            # Transient error (e.g. network), the job is polled again later
+            self.helper.log_warning(f"Unable to poll analysis {task_id}: {e}")
+            report = None
+
+        if report is None:
+            with self.lock:
+                job["interval"] = min(job["interval"] * 2, self.max_poll_interval)
+                job["next_poll"] = time.time() + job["interval"]
+            return
+
+        work_id = self.helper.api.work.initiate_work(
+            self.helper.connect_id, f"Sandbox analysis {task_id} report"
+        )
+        try:
+            message = self.process_job(job["context"], report, work_id)
+            self.helper.api.work.to_processed(work_id, message)
+        except Exception as e:
+            self.helper.log_error(f"Failed to process analysis {task_id}: {e}")
+            self.helper.api.work.to_processed(work_id, str(e), True)
+        self._remove(task_id)
+
+    def _remove(self, task_id: str):
+        with self.lock:
+            self.jobs.pop(task_id, None)
+            self._save_state()
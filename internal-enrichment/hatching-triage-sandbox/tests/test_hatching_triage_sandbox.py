@@ -0,0 +1,69 @@
+from unittest import mock
+
+OBSERVABLE = {
+    "id": "observable-id",
+    "entity_type": "Artifact",
+    "observable_value": "sample.exe",
+    "importFiles": [{"id": "file-id", "name": "sample.exe"}],
+}
+OVERVIEW = {"sample": {"id": "sample-id"}}
+
+
+def test_analysis_is_polled_then_processed(connector, helper):
+    helper.api.fetch_opencti_file.return_value = b"content"
+    helper.api.stix2.get_reader.return_value.return_value = OBSERVABLE
+    connector._submit_sample = mock.Mock(return_value="sample-id")
+    connector.triage_client.sample_by_id.side_effect = [
+        {"status": "running"},
+        {"status": "reported"},
+    ]
+    connector.triage_client.overview_report.return_value = OVERVIEW
+    connector._process_overview_report = mock.Mock(return_value="Nothing to attach")
+
+    connector._process_file(OBSERVABLE, "artifact")
+
+    # Only the observable ids are persisted
+    assert helper.state["sandbox_jobs"]["sample-id"]["context"] == {
+        "sample_id": "sample-id",
+        "entity_type": "artifact",
+        "observable_id": "observable-id",
+        "observable_type": "Artifact",
+    }
+
+    job = connector.scheduler.jobs["sample-id"]
+    connector.scheduler._poll("sample-id", job)
+
+    connector._process_overview_report.assert_not_called()
+    assert "sample-id" in connector.scheduler.jobs
+
+    connector.scheduler._poll("sample-id", job)
+
+    helper.api.stix2.get_reader.assert_called_once_with("Artifact")
+    helper.api.stix2.get_reader.return_value.assert_called_once_with(
+        id="observable-id", withFiles=True
+    )
+    connector._process_overview_report.assert_called_once_with(
+        OBSERVABLE, OVERVIEW, "sample-id", "artifact", "work-id"
+    )
+    helper.api.work.to_processed.assert_called_once_with("work-id", "Nothing to attach")
+    assert helper.state["sandbox_jobs"] == {}
+
+
+def test_playbook_analysis_is_processed_with_the_observable_in_memory(
+    connector, helper
+):
+    helper.playbook = {"playbook_id": "playbook"}
+    helper.work_id = "playbook-work-id"
+    connector._submit_sample = mock.Mock(return_value="sample-id")
+    connector.triage_client.sample_by_id.return_value = {"status": "reported"}
+    connector.triage_client.overview_report.return_value = OVERVIEW
+    connector._process_overview_report = mock.Mock(return_value="Nothing to attach")
+
+    with mock.patch("sandbox_scheduler.time.sleep"):
+        connector._process_file(OBSERVABLE, "url")
+
+    helper.api.stix2.get_reader.assert_not_called()
+    connector._process_overview_report.assert_called_once_with(
+        OBSERVABLE, OVERVIEW, "sample-id", "url", "playbook-work-id"
+    )
+    assert helper.state is None
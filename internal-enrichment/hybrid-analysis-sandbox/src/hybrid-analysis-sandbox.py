@@ -16,6 +16,7 @@ from pycti import (
     StixCoreRelationship,
     get_config_variable,
 )
+from sandbox_scheduler import SandboxJobScheduler
 from stix2 import DomainName, File, IPv4Address, IPv6Address
 
 
@@ -55,7 +56,17 @@ class HybridAnalysis:
         )["standard_id"]
         self._CONNECTOR_RUN_INTERVAL_SEC = 60 * 60
 
-    def _send_knowledge(self, stix_objects, stix_entity, opencti_entity, report):
+        # Analyses are polled in the background so they don't block other enrichments
+        self.scheduler = SandboxJobScheduler(
+            self.helper,
+            poll_job=self._poll_analysis,
+            process_job=self._process_analysis,
+            min_poll_interval=30,
+        )
+
+    def _send_knowledge(
+        self, stix_objects, stix_entity, opencti_entity, report, work_id
+    ):
         if opencti_entity["entity_type"] in ["StixFile", "Artifact"]:
             if report["md5"] is not None:
                 stix_entity["hashes"]["MD5"] = report["md5"]
@@ -265,7 +276,9 @@ class HybridAnalysis:
         stix_objects.append(malware_analysis)
         if len(stix_objects) > 0:
             serialized_bundle = self.helper.stix2_create_bundle(stix_objects)
-            bundles_sent = self.helper.send_stix2_bundle(serialized_bundle)
+            bundles_sent = self.helper.send_stix2_bundle(
+                serialized_bundle, work_id=work_id
+            )
             return (
                 "Sent " + str(len(bundles_sent)) + " stix bundle(s) for worker import"
             )
@@ -286,19 +299,53 @@ class HybridAnalysis:
         if r.status_code > 299:
             raise ValueError(r.text)
         result = r.json()
-        job_id = result["job_id"]
-        state = "IN_QUEUE"
         self.helper.log_info("Analysis in progress...")
-        while state == "IN_QUEUE" or state == "IN_PROGRESS":
-            r = requests.get(
-                self.api_url + "/report/" + job_id + "/state",
-                headers=self.headers,
-            )
-            if r.status_code > 299:
-                raise ValueError(r.text)
-            result = r.json()
-            state = result["state"]
-            time.sleep(30)
+        return self._schedule_analysis(
+            result["job_id"], stix_objects, stix_entity, opencti_entity
+        )
+
+    def _schedule_analysis(self, job_id, stix_objects, stix_entity, opencti_entity):
+        if self.helper.playbook is not None:
+            # Playbooks expect the enrichment result within the current work
+            context = {
+                "stix_objects": stix_objects,
+                "stix_entity": stix_entity,
+                "opencti_entity": opencti_entity,
+            }
+            return self.scheduler.wait(job_id, context)
+        # Only the ids are kept in the connector state, the bundle is rebuilt
+        # once the analysis is finished
+        return self.scheduler.submit(
+            job_id,
+            {
+                "entity_id": opencti_entity["id"],
+                "entity_type": opencti_entity["entity_type"],
+            },
+        )
+
+    def _load_enrichment_data(self, context):
+        if "entity_id" not in context:
+            return context
+        do_read = self.helper.api.stix2.get_reader(context["entity_type"])
+        opencti_entity = do_read(id=context["entity_id"], withFiles=True)
+        if opencti_entity is None:
+            raise ValueError("Unable to read the entity " + context["entity_id"])
+        data = self.helper.get_data_from_enrichment(
+            {}, opencti_entity["standard_id"], opencti_entity
+        )
+        return {**data, "opencti_entity": opencti_entity}
+
+    def _poll_analysis(self, job_id):
+        r = requests.get(
+            self.api_url + "/report/" + job_id + "/state",
+            headers=self.headers,
+        )
+        if r.status_code > 299:
+            raise ValueError(r.text)
+        result = r.json()
+        state = result["state"]
+        if state == "IN_QUEUE" or state == "IN_PROGRESS":
+            return None
         if state == "ERROR":
             raise ValueError(result["error"])
         r = requests.get(
@@ -307,9 +354,18 @@ class HybridAnalysis:
         )
         if r.status_code > 299:
             raise ValueError(r.text)
-        result = r.json()
+        return r.json()
+
+    def _process_analysis(self, context, report, work_id):
         self.helper.log_info("Analysis done, attaching knowledge...")
-        return self._send_knowledge(stix_objects, stix_entity, opencti_entity, result)
+        context = self._load_enrichment_data(context)
+        return self._send_knowledge(
+            context["stix_objects"],
+            context["stix_entity"],
+            context["opencti_entity"],
+            report,
+            work_id,
+        )
 
     def _trigger_sandbox(self, stix_objects, stix_entity, opencti_entity):
         self.helper.log_info("File not found in HA, triggering the sandbox...")
@@ -335,30 +391,10 @@ class HybridAnalysis:
         if r.status_code > 299:
             raise ValueError(r.text)
         result = r.json()
-        job_id = result["job_id"]
-        state = "IN_QUEUE"
         self.helper.log_info("Analysis in progress...")
-        while state == "IN_QUEUE" or state == "IN_PROGRESS":
-            r = requests.get(
-                self.api_url + "/report/" + job_id + "/state",
-                headers=self.headers,
-            )
-            if r.status_code > 299:
-                raise ValueError(r.text)
-            result = r.json()
-            state = result["state"]
-            time.sleep(30)
-        if state == "ERROR":
-            raise ValueError(result["error"])
-        r = requests.get(
-            self.api_url + "/report/" + job_id + "/summary",
-            headers=self.headers,
+        return self._schedule_analysis(
+            result["job_id"], stix_objects, stix_entity, opencti_entity
         )
-        if r.status_code > 299:
-            raise ValueError(r.text)
-        result = r.json()
-        self.helper.log_info("Analysis done, attaching knowledge...")
-        return self._send_knowledge(stix_objects, stix_entity, opencti_entity, result)
 
     def _process_observable(self, stix_objects, stix_entity, opencti_entity):
         self.helper.log_info(
@@ -396,7 +432,7 @@ class HybridAnalysis:
                 raise ValueError(r.text)
             report = r.json()
             return self._send_knowledge(
-                stix_objects, stix_entity, opencti_entity, report
+                stix_objects, stix_entity, opencti_entity, report, self.helper.work_id
             )
         # If URL
         if opencti_entity["entity_type"] in ["Url", "Domain-Name", "Hostname"]:
@@ -427,6 +463,7 @@ class HybridAnalysis:
 
     # Start the main loop
     def start(self):
+        self.scheduler.start()
         self.helper.listen(message_callback=self._process_message)
 
     def detect_ip_version(self, value):
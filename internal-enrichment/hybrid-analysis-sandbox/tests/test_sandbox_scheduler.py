@@ -0,0 +1,185 @@
+from unittest import mock
+
+import pytest
+from sandbox_scheduler import SandboxJobScheduler
+
+
+def make_helper():
+    """Connector helper keeping the connector state in memory."""
+    helper = mock.MagicMock()
+    helper.state = None
+    helper.get_state.side_effect = lambda: helper.state
+    helper.set_state.side_effect = lambda state: setattr(helper, "state", state)
+    helper.api.work.initiate_work.return_value = "work-id"
+    helper.work_id = "current-work-id"
+    return helper
+
+
+def make_scheduler(helper, poll_job=None, process_job=None, **kwargs):
+    return SandboxJobScheduler(
+        helper,
+        poll_job=poll_job or mock.Mock(return_value=None),
+        process_job=process_job or mock.Mock(return_value="processed"),
+        min_poll_interval=10,
+        max_poll_interval=40,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def helper():
+    return make_helper()
+
+
+@pytest.fixture(autouse=True)
+def no_thread():
+    with mock.patch("sandbox_scheduler.threading.Thread"):
+        yield
+
+
+def test_pending_jobs_round_trip_through_state(helper):
+    scheduler = make_scheduler(helper)
+    scheduler.start()
+    scheduler.submit(42, {"entity_id": "observable-id"})
+
+    assert helper.state == {
+        "sandbox_jobs": {
+            "42": {
+                "context": {"entity_id": "observable-id"},
+                "submitted_at": scheduler.jobs["42"]["submitted_at"],
+            }
+        }
+    }
+
+    # The connector restarts
+    resumed = make_scheduler(helper)
+    resumed.start()
+
+    assert list(resumed.jobs) == ["42"]
+    assert resumed.jobs["42"]["context"] == {"entity_id": "observable-id"}
+    assert resumed.jobs["42"]["interval"] == 10
+
+
+def test_poll_interval_doubles_up_to_maximum(helper):
+    scheduler = make_scheduler(helper)
+    scheduler.submit("task", {})
+    job = scheduler.jobs["task"]
+
+    intervals = []
+    for _ in range(4):
+        scheduler._poll("task", job)
+        intervals.append(job["interval"])
+
+    assert intervals == [20, 40, 40, 40]
+    assert "task" in scheduler.jobs
+
+
+def test_transient_poll_error_keeps_the_job(helper):
+    scheduler = make_scheduler(
+        helper, poll_job=mock.Mock(side_effect=ConnectionError("timeout"))
+    )
+    scheduler.submit("task", {})
+
+    scheduler._poll("task", scheduler.jobs["task"])
+
+    assert "task" in scheduler.jobs
+    helper.log_warning.assert_called_once()
+
+
+def test_failed_analysis_is_removed_from_state(helper):
+    scheduler = make_scheduler(
+        helper, poll_job=mock.Mock(side_effect=ValueError("analysis failed"))
+    )
+    scheduler.submit("task", {})
+
+    scheduler._poll("task", scheduler.jobs["task"])
+
+    assert scheduler.jobs == {}
+    assert helper.state == {"sandbox_jobs": {}}
+    helper.log_error.assert_called_once()
+
+
+def test_expired_job_is_abandoned(helper):
+    scheduler = make_scheduler(helper, job_timeout=60)
+    scheduler.submit("task", {})
+    job = scheduler.jobs["task"]
+    job["submitted_at"] -= 61
+
+    scheduler._poll("task", job)
+
+    assert scheduler.jobs == {}
+    assert "timed out" in helper.log_error.call_args.args[0]
+
+
+def test_expired_job_is_abandoned_when_polls_keep_failing(helper):
+    scheduler = make_scheduler(
+        helper,
+        poll_job=mock.Mock(side_effect=ConnectionError("unknown task")),
+        job_timeout=60,
+    )
+    scheduler.submit("task", {})
+    job = scheduler.jobs["task"]
+    job["submitted_at"] -= 61
+
+    scheduler._poll("task", job)
+
+    assert scheduler.jobs == {}
+    assert helper.state == {"sandbox_jobs": {}}
+    assert "timed out" in helper.log_error.call_args.args[0]
+
+
+def test_jobs_are_abandoned_after_a_day_by_default(helper):
+    scheduler = make_scheduler(
+        helper, poll_job=mock.Mock(side_effect=ConnectionError("unreachable"))
+    )
+    scheduler.submit("task", {})
+    job = scheduler.jobs["task"]
+
+    job["submitted_at"] -= 23 * 3600
+    scheduler._poll("task", job)
+    assert "task" in scheduler.jobs
+
+    job["submitted_at"] -= 2 * 3600
+    scheduler._poll("task", job)
+    assert scheduler.jobs == {}
+
+
+def test_finished_job_is_processed_in_its_own_work(helper):
+    process_job = mock.Mock(return_value="processed")
+    scheduler = make_scheduler(
+        helper, poll_job=mock.Mock(return_value={"score": 100}), process_job=process_job
+    )
+    scheduler.submit("task", {"entity_id": "observable-id"})
+
+    scheduler._poll("task", scheduler.jobs["task"])
+
+    process_job.assert_called_once_with(
+        {"entity_id": "observable-id"}, {"score": 100}, "work-id"
+    )
+    helper.api.work.to_processed.assert_called_once_with("work-id", "processed")
+    assert helper.state == {"sandbox_jobs": {}}
+
+
+def test_wait_polls_with_backoff_in_current_work(helper):
+    poll_job = mock.Mock(side_effect=[None, None, None, {"score": 100}])
+    process_job = mock.Mock(return_value="processed")
+    scheduler = make_scheduler(helper, poll_job=poll_job, process_job=process_job)
+
+    with mock.patch("sandbox_scheduler.time.sleep") as sleep:
+        assert scheduler.wait("task", {"stix_objects": []}) == "processed"
+
+    assert [call.args[0] for call in sleep.call_args_list] == [10, 20, 40]
+    process_job.assert_called_once_with(
+        {"stix_objects": []}, {"score": 100}, "current-work-id"
+    )
+    assert helper.state is None
+
+
+def test_wait_times_out(helper):
+    scheduler = make_scheduler(helper, job_timeout=15)
+
+    with mock.patch("sandbox_scheduler.time.sleep"), mock.patch(
+        "sandbox_scheduler.time.time", side_effect=[0, 10, 20]
+    ):
+        with pytest.raises(ValueError, match="timed out"):
+            scheduler.wait("task", {})
@@ -8,6 +8,7 @@ from typing import Dict
 import yaml
 from intezer_api import IntezerApi
 from pycti import OpenCTIConnectorHelper, get_config_variable
+from sandbox_scheduler import SandboxJobScheduler
 
 
 class IntezerSandboxConnector:
@@ -71,6 +72,14 @@ class IntezerSandboxConnector:
             config,
         )
 
+        # Analyses are polled in the background so they don't block other enrichments
+        self.scheduler = SandboxJobScheduler(
+            self.helper,
+            poll_job=self._poll_analysis,
+            process_job=self._process_analysis,
+            min_poll_interval=20,
+        )
+
     def _process_report(self, observable, report):
         self.helper.log_info(report)
 
@@ -127,26 +136,44 @@ class IntezerSandboxConnector:
             file_name=file_name, file_contents=file_contents
         )
 
-        # Wait for the analysis to finish
-        status = None
-        report = None
-        while True:
-            report = self.intezer_client.get_analysis_report(result_url)
-            status = report["status"]
+        # Only the observable ids are kept in the connector state, it is read
+        # again once the analysis is finished
+        return self.scheduler.submit(
+            result_url,
+            {
+                "observable_id": observable["id"],
+                "observable_type": observable["entity_type"],
+            },
+        )
 
-            if status == "succeeded":
-                break
-            elif status == "error" or status == "failed" or status == "expired":
-                raise ValueError(
-                    f"Intezer Sandbox failed to analyze {file_name}, status: {status}."
-                )
+    def _poll_analysis(self, result_url):
+        report = self.intezer_client.get_analysis_report(result_url)
+        status = report["status"]
 
-            self.helper.log_info(f"Analysis for {file_name} has status {status}...")
-            time.sleep(20)
+        if status == "succeeded":
+            return report
+        elif status == "error" or status == "failed" or status == "expired":
+            raise ValueError(
+                f"Intezer Sandbox failed to analyze {result_url}, status: {status}."
+            )
+
+        self.helper.log_info(f"Analysis {result_url} has status {status}...")
+        return None
+
+    def _read_observable(self, context):
+        # Read again the observable whose ids were persisted with the job
+        do_read = self.helper.api.stix2.get_reader(context["observable_type"])
+        observable = do_read(id=context["observable_id"], withFiles=True)
+        if observable is None:
+            raise ValueError(
+                f"Unable to read the observable {context['observable_id']}"
+            )
+        return observable
 
+    def _process_analysis(self, context, report, work_id):
         self.helper.log_info("Analysis succeeded, processing results...")
 
-        return self._process_report(observable, report)
+        return self._process_report(self._read_observable(context), report)
 
     def _process_observable(self, observable):
         self.helper.log_info(
@@ -177,6 +204,7 @@ class IntezerSandboxConnector:
 
     # Start the main loop
     def start(self):
+        self.scheduler.start()
         self.helper.listen(message_callback=self._process_message)
 
 
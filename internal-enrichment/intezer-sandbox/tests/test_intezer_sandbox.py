@@ -0,0 +1,45 @@
+from unittest import mock
+
+OBSERVABLE = {
+    "id": "observable-id",
+    "entity_type": "Artifact",
+    "observable_value": "sample.exe",
+    "importFiles": [{"id": "file-id", "name": "sample.exe"}],
+}
+RESULT_URL = "/analyses/analysis-id"
+REPORT = {"status": "succeeded", "result": {"verdict": "malicious"}}
+
+
+def test_analysis_is_polled_then_processed(connector, helper):
+    helper.api.fetch_opencti_file.return_value = b"content"
+    helper.api.stix2.get_reader.return_value.return_value = OBSERVABLE
+    connector.intezer_client.upload_file.return_value = RESULT_URL
+    connector.intezer_client.get_analysis_report.side_effect = [
+        {"status": "in_progress"},
+        REPORT,
+    ]
+    connector._process_report = mock.Mock(return_value="Nothing to attach")
+
+    connector._process_file(OBSERVABLE)
+
+    # Only the observable ids are persisted
+    assert helper.state["sandbox_jobs"][RESULT_URL]["context"] == {
+        "observable_id": "observable-id",
+        "observable_type": "Artifact",
+    }
+
+    job = connector.scheduler.jobs[RESULT_URL]
+    connector.scheduler._poll(RESULT_URL, job)
+
+    connector._process_report.assert_not_called()
+    assert RESULT_URL in connector.scheduler.jobs
+
+    connector.scheduler._poll(RESULT_URL, job)
+
+    helper.api.stix2.get_reader.assert_called_once_with("Artifact")
+    helper.api.stix2.get_reader.return_value.assert_called_once_with(
+        id="observable-id", withFiles=True
+    )
+    connector._process_report.assert_called_once_with(OBSERVABLE, REPORT)
+    helper.api.work.to_processed.assert_called_once_with("work-id", "Nothing to attach")
+    assert helper.state["sandbox_jobs"] == {}
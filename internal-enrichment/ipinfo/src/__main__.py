@@ -11,6 +11,7 @@ from pycti import (
     StixCoreRelationship,
 )
 from src import ConfigLoader
+from src.response_cache import ResponseCache, cached_lookup
 
 
 class IpInfoConnector:
@@ -23,6 +24,16 @@ class IpInfoConnector:
         self.token = self.config.ipinfo.token
         self.max_tlp = self.config.ipinfo.max_tlp
         self.use_asn_name = self.config.ipinfo.use_asn_name
+        self.session = requests.Session()
+        self.response_cache = None
+        if self.config.ipinfo.cache_ttl > 0:
+            self.response_cache = ResponseCache(
+                ttl=self.config.ipinfo.cache_ttl,
+                negative_ttl=self.config.ipinfo.cache_negative_ttl,
+                max_entries=self.config.ipinfo.cache_max_entries,
+                path=self.config.ipinfo.cache_path,
+                log=self.helper.connector_logger.info,
+            )
 
     def _generate_stix_bundle(
         self, stix_objects, stix_entity, country, city, loc, asn, privacy
@@ -126,33 +137,14 @@ class IpInfoConnector:
         stix_objects.append(observable_to_country)
         return self.helper.stix2_create_bundle(stix_objects)
 
-    def _process_message(self, data: Dict):
-        opencti_entity = data["enrichment_entity"]
-
-        # Extract TLP and validate
-        tlp = "TLP:CLEAR"
-        for marking_definition in opencti_entity["objectMarking"]:
-            if marking_definition["definition_type"] == "TLP":
-                tlp = marking_definition["definition"]
-
-        if not OpenCTIConnectorHelper.check_max_tlp(tlp, self.max_tlp):
-            raise ValueError(
-                "Do not send any data, TLP of the observable is greater than MAX TLP"
-            )
-
-        # Enrich the bundle with ip info
-        stix_entity = data["stix_entity"]
-        stix_objects = data["stix_objects"]
-        # Get the geo loc from the API
+    @cached_lookup("ip", is_negative=lambda json_data: "country" not in json_data)
+    def _get_ip_details(self, ip: str) -> dict:
         api_url = (
-            "https://ipinfo.io/"
-            + stix_entity["value"]
-            + "/json/?token="
-            + self.token.get_secret_value()
+            "https://ipinfo.io/" + ip + "/json/?token=" + self.token.get_secret_value()
         )
 
         try:
-            response = requests.request(
+            response = self.session.request(
                 "GET",
                 api_url,
                 headers={
@@ -186,6 +178,28 @@ class IpInfoConnector:
         except ValueError:
             raise ValueError("Invalid JSON in response.")
 
+        return json_data
+
+    def _process_message(self, data: Dict):
+        opencti_entity = data["enrichment_entity"]
+
+        # Extract TLP and validate
+        tlp = "TLP:CLEAR"
+        for marking_definition in opencti_entity["objectMarking"]:
+            if marking_definition["definition_type"] == "TLP":
+                tlp = marking_definition["definition"]
+
+        if not OpenCTIConnectorHelper.check_max_tlp(tlp, self.max_tlp):
+            raise ValueError(
+                "Do not send any data, TLP of the observable is greater than MAX TLP"
+            )
+
+        # Enrich the bundle with ip info
+        stix_entity = data["stix_entity"]
+        stix_objects = data["stix_objects"]
+        # Get the geo loc from the API
+        json_data = self._get_ip_details(stix_entity["value"])
+
         if "country" not in json_data:
             raise ValueError("Country not found, an error occurred")
         country = pycountry.countries.get(alpha_2=json_data["country"])
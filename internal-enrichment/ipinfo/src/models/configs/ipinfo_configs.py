@@ -1,4 +1,4 @@
-from typing import Annotated, Literal
+from typing import Annotated, Literal, Optional
 
 from pydantic import (
     Field,
@@ -28,3 +28,19 @@ class _ConfigLoaderIPInfo(ConfigBaseSettings):
         default=True,
         description="If enabled, uses the ASN name instead of the ASN number in enrichment results.",
     )
+    cache_ttl: int = Field(
+        default=0,
+        description="Number of seconds IPInfo responses are cached for, 0 disables the cache.",
+    )
+    cache_negative_ttl: int = Field(
+        default=3600,
+        description="Number of seconds responses without country (e.g. bogon IPs) are cached for, 0 to never cache them.",
+    )
+    cache_max_entries: int = Field(
+        default=1000,
+        description="Maximum number of responses kept in memory.",
+    )
+    cache_path: Optional[str] = Field(
+        default=None,
+        description="Path of a SQLite database used to keep cached responses across restarts.",
+    )
@@ -0,0 +1,37 @@
+from unittest.mock import MagicMock
+
+from src.__main__ import IpInfoConnector
+from src.response_cache import ResponseCache, cache_key
+
+
+def make_connector(*responses):
+    connector = IpInfoConnector.__new__(IpInfoConnector)
+    connector.token = MagicMock(get_secret_value=MagicMock(return_value="token"))
+    connector.session = MagicMock()
+    connector.session.request.side_effect = [
+        MagicMock(json=MagicMock(return_value=response)) for response in responses
+    ]
+    # Negative responses are not kept, to tell them apart from the positive ones
+    connector.response_cache = ResponseCache(ttl=60, negative_ttl=0)
+    return connector
+
+
+def test_ip_details_are_cached_by_ip():
+    details = {"ip": "8.8.8.8", "country": "US"}
+    connector = make_connector(details)
+
+    assert connector._get_ip_details("8.8.8.8") == details
+    assert connector._get_ip_details("8.8.8.8") == details
+
+    assert connector.session.request.call_count == 1
+    assert list(connector.response_cache._entries) == [cache_key("ip", "8.8.8.8")]
+
+
+def test_ip_details_without_country_are_negative():
+    details = {"ip": "10.0.0.1", "bogon": True}
+    connector = make_connector(details, details)
+
+    connector._get_ip_details("10.0.0.1")
+    connector._get_ip_details("10.0.0.1")
+
+    assert connector.session.request.call_count == 2
@@ -1,6 +1,6 @@
 import os
 import textwrap
-import time
+import threading
 from datetime import datetime
 from typing import Dict
 
@@ -16,6 +16,7 @@ from pycti import (
     StixCoreRelationship,
 )
 from ReversingLabs.SDK.ticloud import DynamicAnalysis, FileReputation, FileUpload
+from sandbox_scheduler import SandboxJobScheduler
 
 ZIP_MIME_TYPES = (
     "application/x-bzip",
@@ -43,6 +44,17 @@ class ReversingLabsSpectraIntelConnector(InternalEnrichmentConnector):
             name="ReversingLabs",
             description="www.reversinglabs.com",
         )
+        # Submissions and report processing share the connector attributes
+        self.processing_lock = threading.Lock()
+        # Analyses are polled in the background so they don't block other enrichments
+        self.scheduler = SandboxJobScheduler(
+            self.helper,
+            poll_job=self._poll_analysis_result,
+            process_job=self._process_analysis,
+            min_poll_interval=int(self.reversinglabs_poll_interval),
+            max_poll_interval=int(self.reversinglabs_poll_interval) * 2,
+            job_timeout=int(self.reversinglabs_poll_interval) * 5,
+        )
 
     def _get_config_variables(self):
 
@@ -603,11 +615,11 @@ class ReversingLabsSpectraIntelConnector(InternalEnrichmentConnector):
         rl_response["rl"]["is_archive"] = str(is_archive)
         return rl_response
 
-    def _fetch_analysis_result(self, stix_entity, opencti_entity, analysis_status):
-        self.stix_entity = stix_entity
-        self.opencti_entity = opencti_entity
-        self.analysis_status = analysis_status
-
+    def _get_analysis_task_id(self, analysis_status):
+        """
+        Build the id of the sandbox job from the submission status.
+        It holds everything needed to fetch the analysis result.
+        """
         try:
             sample_hash = analysis_status["rl"]["requested_hash"]
             is_archive = analysis_status["rl"]["is_archive"]
@@ -620,13 +632,12 @@ class ReversingLabsSpectraIntelConnector(InternalEnrichmentConnector):
             sample_type = "Url"
 
         self.helper.log_info(
-            f"{self.helper.connect_name}: Submission status {str(self.analysis_status)}"
+            f"{self.helper.connect_name}: Submission status {str(analysis_status)}"
         )
 
         if is_archive == "False":
             # Parse output for regular file
             analysis_id = analysis_status["rl"]["analysis_id"]
-            is_archive = False
         elif is_archive == "True":
             # Parse output for zip file
             try:
@@ -637,13 +648,20 @@ class ReversingLabsSpectraIntelConnector(InternalEnrichmentConnector):
                     f"{self.helper.connect_name}: ERROR: {str(analysis_error)}"
                 ) from err
             sample_hash = analysis_status["rl"]["files"][0]["sha1"]
-            is_archive = True
         else:
             # Parse output for url sample
             analysis_id = analysis_status["rl"]["analysis_id"]
-            is_archive = ""
 
-        # Start analysis on submitted file
+        # The url is kept last as it may contain the separator
+        return "|".join(
+            [sample_type, is_archive, str(analysis_id), sample_hash, sample_url]
+        )
+
+    def _poll_analysis_result(self, task_id):
+        sample_type, is_archive, analysis_id, sample_hash, sample_url = task_id.split(
+            "|", 4
+        )
+
         dynamic_analysis = DynamicAnalysis(
             host=self.reversinglabs_spectra_intelligence_url,
             username=self.reversinglabs_spectra_intelligence_username,
@@ -651,51 +669,67 @@ class ReversingLabsSpectraIntelConnector(InternalEnrichmentConnector):
             user_agent=self.reversinglabs_spectra_intelligence_user_agent,
         )
 
-        for retry in range(0, 5):
+        self.helper.log_info(
+            f"{self.helper.connect_name}: Check if report is ready on Reversinglabs Spectra Intelligence."
+        )
+
+        try:
+            if sample_type == "File":
+                analysis_result = dynamic_analysis.get_dynamic_analysis_results(
+                    sample_hash=sample_hash,
+                    is_archive=is_archive == "True",
+                    analysis_id=analysis_id,
+                )
+                sample_name = sample_hash
+            else:
+                analysis_result = dynamic_analysis.get_dynamic_analysis_results(
+                    # url=sample_url,
+                    url_sha1=sample_hash,
+                    analysis_id=analysis_id,
+                )
+                sample_name = sample_url
+        except Exception as err:
             self.helper.log_info(
-                f"{self.helper.connect_name}: Check if report is ready on Reversinglabs Spectra Intelligence."
+                f"{self.helper.connect_name}: Failed to fetch report status from ReversingLabs Spectra Intelligence. Error: {str(err)}"
             )
+            return None
 
-            if sample_type == "File":
-                try:
-                    analysis_result = dynamic_analysis.get_dynamic_analysis_results(
-                        sample_hash=sample_hash,
-                        is_archive=is_archive,
-                        analysis_id=analysis_id,
-                    )
+        rl_response = analysis_result.json()
+        rl_response["rl"]["sample_name"] = str(sample_name)
+        return rl_response
 
-                    rl_response = analysis_result.json()
-                    rl_response["rl"]["sample_name"] = str(sample_hash)
-                    return rl_response
+    def _load_enrichment_data(self, context):
+        """Rebuild the enrichment bundle of the entity whose ids were persisted."""
+        do_read = self.helper.api.stix2.get_reader(context["entity_type"])
+        opencti_entity = do_read(id=context["entity_id"], withFiles=True)
+        if opencti_entity is None:
+            raise ValueError(
+                f"{self.helper.connect_name}: Unable to read the entity {context['entity_id']}"
+            )
+        data = self.helper.get_data_from_enrichment(
+            {}, opencti_entity["standard_id"], opencti_entity
+        )
+        return data["stix_objects"], data["stix_entity"], opencti_entity
 
-                except Exception as err:
-                    self.helper.log_info(
-                        f"{self.helper.connect_name}: Failed to fetch report status from ReversingLabs Spectra Intelligence. Error: {str(err)}"
-                    )
-                    self.helper.log_info(
-                        f"{self.helper.connect_name}: Wait for {str(self.reversinglabs_poll_interval)} seconds and retry."
-                    )
-                    time.sleep(int(self.reversinglabs_poll_interval))
-            else:
-                try:
-                    analysis_result = dynamic_analysis.get_dynamic_analysis_results(
-                        # url=sample_url,
-                        url_sha1=sample_hash,
-                        analysis_id=analysis_id,
-                    )
+    def _process_analysis(self, context, analysis_result, work_id):
+        stix_objects, stix_entity, opencti_entity = self._load_enrichment_data(context)
 
-                    rl_response = analysis_result.json()
-                    rl_response["rl"]["sample_name"] = str(sample_url)
-                    return rl_response
+        with self.processing_lock:
+            # Generate Identity (Organization)
+            self._generate_stix_identity(stix_objects)
 
-                except Exception as err:
-                    self.helper.log_info(
-                        f"{self.helper.connect_name}: Failed to fetch report status from ReversingLabs Spectra Intelligence. Error: {str(err)}"
-                    )
-                    self.helper.log_info(
-                        f"{self.helper.connect_name}: Wait for {str(self.reversinglabs_poll_interval)} seconds and retry."
-                    )
-                    time.sleep(int(self.reversinglabs_poll_interval))
+            # Integrate analysis result with OpenCTI
+            self._process_analysis_result(
+                stix_objects, stix_entity, opencti_entity, analysis_result
+            )
+
+            # Create the bundle and send it to OpenCTI.
+            bundle = self._generate_stix_bundle(stix_objects, stix_entity)
+            bundles_sent = self.helper.send_stix2_bundle(bundle, work_id=work_id)
+
+        message = f"{self.helper.connect_name}: Number of stix bundles sent for workers: {str(len(bundles_sent))}"
+        self.helper.log_info(message)
+        return message
 
     def _process_analysis_result(
         self, stix_objects, stix_entity, opencti_entity, analysis_result
@@ -854,7 +888,10 @@ class ReversingLabsSpectraIntelConnector(InternalEnrichmentConnector):
                 self._process_dropped_files(results)
 
     def _process_message(self, data: Dict):
-        stix_objects = data["stix_objects"]
+        with self.processing_lock:
+            return self._submit_analysis(data)
+
+    def _submit_analysis(self, data: Dict):
         stix_entity = data["stix_entity"]
         opencti_entity = data["enrichment_entity"]
 
@@ -864,9 +901,6 @@ class ReversingLabsSpectraIntelConnector(InternalEnrichmentConnector):
         self._check_tlp_markings(opencti_entity)
         opencti_type = stix_entity["x_opencti_type"]
 
-        # Generate Identity (Organization)
-        self._generate_stix_identity(stix_objects)
-
         if opencti_type in FILE_SAMPLE:
             # Extract hash type and value from Entity {[md5], [sha1], [sha256]}
             hashes = opencti_entity.get("hashes")
@@ -886,24 +920,6 @@ class ReversingLabsSpectraIntelConnector(InternalEnrichmentConnector):
                 hash_type,
             )
 
-            analysis_result = self._fetch_analysis_result(
-                stix_entity,
-                opencti_entity,
-                analysis_status,
-            )
-
-            # Integrate analysis result with OpenCTI
-            self._process_analysis_result(
-                stix_objects, stix_entity, opencti_entity, analysis_result
-            )
-
-            # Create the bundle and send it to OpenCTI.
-            bundle = self._generate_stix_bundle(stix_objects, stix_entity)
-            bundles_sent = self.helper.send_stix2_bundle(bundle)
-            self.helper.log_info(
-                f"{self.helper.connect_name}: Number of stix bundles sent for workers: {str(len(bundles_sent))}"
-            )
-
         elif opencti_type == "Url":
             network_location = stix_entity["value"]
             network_type = stix_entity["type"]
@@ -916,31 +932,26 @@ class ReversingLabsSpectraIntelConnector(InternalEnrichmentConnector):
                 network_type,
             )
 
-            analysis_result = self._fetch_analysis_result(
-                stix_entity,
-                opencti_entity,
-                analysis_status,
-            )
-
-            # Integrate analysis result with OpenCTI
-            self._process_analysis_result(
-                stix_objects, stix_entity, opencti_entity, analysis_result
-            )
-
-            # Create the bundle and send it to OpenCTI.
-            bundle = self._generate_stix_bundle(stix_objects, stix_entity)
-            bundles_sent = self.helper.send_stix2_bundle(bundle)
-
-            self.helper.log_info(
-                f"{self.helper.connect_name}: Number of stix bundles sent for workers: {str(len(bundles_sent))}"
-            )
-
         else:
             self.helper.log_info(
                 f"{self.helper.connect_name}: Connector is not configured for data type: {opencti_type}"
             )
             return
 
+        # The analysis result is fetched and integrated in the background,
+        # only the ids are kept in the connector state
+        return self.scheduler.submit(
+            self._get_analysis_task_id(analysis_status),
+            {
+                "entity_id": opencti_entity["id"],
+                "entity_type": opencti_entity["entity_type"],
+            },
+        )
+
+    def start(self):
+        self.scheduler.start()
+        super().start()
+
 
 if __name__ == "__main__":
     connector = ReversingLabsSpectraIntelConnector()
@@ -0,0 +1,66 @@
+from unittest import mock
+
+import main
+
+ENTITY = {
+    "id": "entity-id",
+    "standard_id": "file--4d4a6f0f-5a6c-5e0a-9a0a-0f8b6a6f3c11",
+    "entity_type": "StixFile",
+}
+STIX_ENTITY = {"id": ENTITY["standard_id"], "type": "file"}
+SUBMISSION = {
+    "rl": {
+        "requested_hash": "a" * 40,
+        "is_archive": "False",
+        "analysis_id": "analysis-id",
+    }
+}
+TASK_ID = "File|False|analysis-id|" + "a" * 40 + "|"
+RESULT = {"rl": {"requested_hash": "a" * 40}}
+
+
+def test_analysis_is_polled_then_processed(connector, helper):
+    helper.api.stix2.get_reader.return_value.return_value = ENTITY
+    helper.get_data_from_enrichment.return_value = {
+        "stix_objects": [STIX_ENTITY],
+        "stix_entity": STIX_ENTITY,
+    }
+    helper.send_stix2_bundle.return_value = ["bundle"]
+    connector._generate_stix_identity = mock.Mock()
+    connector._process_analysis_result = mock.Mock()
+    connector._generate_stix_bundle = mock.Mock(return_value="bundle")
+
+    connector.scheduler.submit(
+        connector._get_analysis_task_id(SUBMISSION),
+        {"entity_id": ENTITY["id"], "entity_type": ENTITY["entity_type"]},
+    )
+
+    assert list(helper.state["sandbox_jobs"]) == [TASK_ID]
+
+    dynamic_analysis = mock.Mock()
+    dynamic_analysis.get_dynamic_analysis_results.side_effect = [
+        Exception("Report not ready"),
+        mock.Mock(json=mock.Mock(return_value=RESULT)),
+    ]
+    job = connector.scheduler.jobs[TASK_ID]
+    with mock.patch.object(main, "DynamicAnalysis", return_value=dynamic_analysis):
+        connector.scheduler._poll(TASK_ID, job)
+
+        connector._process_analysis_result.assert_not_called()
+        assert TASK_ID in connector.scheduler.jobs
+
+        connector.scheduler._poll(TASK_ID, job)
+
+    dynamic_analysis.get_dynamic_analysis_results.assert_called_with(
+        sample_hash="a" * 40, is_archive=False, analysis_id="analysis-id"
+    )
+    helper.api.stix2.get_reader.assert_called_once_with("StixFile")
+    helper.api.stix2.get_reader.return_value.assert_called_once_with(
+        id="entity-id", withFiles=True
+    )
+    connector._process_analysis_result.assert_called_once_with(
+        mock.ANY, STIX_ENTITY, ENTITY, {"rl": {**RESULT["rl"], "sample_name": "a" * 40}}
+    )
+    helper.send_stix2_bundle.assert_called_once_with("bundle", work_id="work-id")
+    helper.api.work.to_processed.assert_called_once()
+    assert helper.state["sandbox_jobs"] == {}
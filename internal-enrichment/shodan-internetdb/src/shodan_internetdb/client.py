@@ -1,5 +1,8 @@
+import json
+from typing import Optional
+
 import requests
-from pydantic.v1 import BaseModel, parse_raw_as
+from pydantic.v1 import BaseModel, parse_obj_as
 
 __all__ = [
     "ShodanInternetDbClient",
@@ -10,6 +13,7 @@ from shodan_internetdb.exceptions import (
     ShodanInternetDbApiError,
     ShodanInternetDbNotFoundError,
 )
+from shodan_internetdb.response_cache import ResponseCache, cached_lookup
 
 
 class ShodanResult(BaseModel):
@@ -26,20 +30,38 @@ class ShodanResult(BaseModel):
 class ShodanInternetDbClient:
     """Shodan InternetDB client"""
 
-    def __init__(self, verify: bool = True):
+    def __init__(
+        self, verify: bool = True, response_cache: Optional[ResponseCache] = None
+    ):
         """
         Constructor
         :param verify: Verify SSL connections
+        :param response_cache: Cache of the responses, disabled if None
         """
         self._base_url = "https://internetdb.shodan.io/"
         self._headers = {"Accept": "application/json"}
         self._session = requests.Session()
         self._verify = verify
+        self.response_cache = response_cache
 
     def query(self, ip: str) -> ShodanResult:
         """Process the IP and return the result
         :return: Query result
         """
+        data = self._fetch(ip)
+
+        if "ip" not in data:
+            raise ShodanInternetDbNotFoundError(
+                "[CONNECTOR] No information available, skipping observable (Shodan 404)"
+            )
+
+        return parse_obj_as(ShodanResult, data)
+
+    @cached_lookup("ipv4-addr", is_negative=lambda data: "ip" not in data)
+    def _fetch(self, ip: str) -> dict:
+        """Query the InternetDB API
+        :return: JSON response, not found responses included
+        """
         try:
             resp = self._session.get(
                 f"{self._base_url}{ip}",
@@ -51,12 +73,9 @@ class ShodanInternetDbClient:
                 "[CONNECTOR] Skipping observable (Shodan API error)"
             ) from e
 
-        # {'detail': 'No information available'}
         if resp.status_code == 404:
-            raise ShodanInternetDbNotFoundError(
-                "[CONNECTOR] No information available, skipping observable (Shodan 404)"
-            )
+            return {"detail": "No information available"}
 
         resp.raise_for_status()
 
-        return parse_raw_as(ShodanResult, resp.text)
+        return json.loads(resp.text)
@@ -69,3 +69,34 @@ class ConfigConnector:
             self.load,
             default=True,
         )
+
+        self.shodan_cache_ttl = get_config_variable(
+            "SHODAN_CACHE_TTL",
+            ["shodan", "cache_ttl"],
+            self.load,
+            isNumber=True,
+            default=0,
+        )
+
+        self.shodan_cache_negative_ttl = get_config_variable(
+            "SHODAN_CACHE_NEGATIVE_TTL",
+            ["shodan", "cache_negative_ttl"],
+            self.load,
+            isNumber=True,
+            default=3600,
+        )
+
+        self.shodan_cache_max_entries = get_config_variable(
+            "SHODAN_CACHE_MAX_ENTRIES",
+            ["shodan", "cache_max_entries"],
+            self.load,
+            isNumber=True,
+            default=1000,
+        )
+
+        self.shodan_cache_path = get_config_variable(
+            "SHODAN_CACHE_PATH",
+            ["shodan", "cache_path"],
+            self.load,
+            default=None,
+        )
@@ -13,6 +13,7 @@ from shodan_internetdb.exceptions import (
     ShodanInternetDbInvalidTlpLevelError,
     ShodanInternetDbNotFoundError,
 )
+from shodan_internetdb.response_cache import ResponseCache
 
 __all__ = [
     "ShodanInternetDBConnector",
@@ -26,7 +27,18 @@ class ShodanInternetDBConnector:
         """Constructor"""
         self.config = config
         self.helper = helper
-        self._client = ShodanInternetDbClient(verify=self.config.shodan_ssl_verify)
+        response_cache = None
+        if self.config.shodan_cache_ttl > 0:
+            response_cache = ResponseCache(
+                ttl=self.config.shodan_cache_ttl,
+                negative_ttl=self.config.shodan_cache_negative_ttl,
+                max_entries=self.config.shodan_cache_max_entries,
+                path=self.config.shodan_cache_path,
+                log=self.helper.connector_logger.info,
+            )
+        self._client = ShodanInternetDbClient(
+            verify=self.config.shodan_ssl_verify, response_cache=response_cache
+        )
         self.converter = ConverterToStix(self.helper)
 
     def extract_and_check_markings(self, observable: dict[str, Any]) -> None:
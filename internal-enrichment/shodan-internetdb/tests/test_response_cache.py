@@ -0,0 +1,38 @@
+import json
+from unittest.mock import MagicMock
+
+from shodan_internetdb.client import ShodanInternetDbClient
+from shodan_internetdb.response_cache import ResponseCache, cache_key
+
+
+def make_client(*responses):
+    # Negative responses are not kept, to tell them apart from the positive ones
+    client = ShodanInternetDbClient(
+        response_cache=ResponseCache(ttl=60, negative_ttl=0)
+    )
+    client._session = MagicMock()
+    client._session.get.side_effect = [
+        MagicMock(status_code=status_code, text=json.dumps(data))
+        for status_code, data in responses
+    ]
+    return client
+
+
+def test_fetch_is_cached_by_ip():
+    data = {"ip": "1.2.3.4", "ports": [80]}
+    client = make_client((200, data))
+
+    assert client._fetch("1.2.3.4") == data
+    assert client._fetch("1.2.3.4") == data
+
+    assert client._session.get.call_count == 1
+    assert list(client.response_cache._entries) == [cache_key("ipv4-addr", "1.2.3.4")]
+
+
+def test_not_found_is_negative():
+    client = make_client((404, None), (404, None))
+
+    assert client._fetch("1.2.3.4") == {"detail": "No information available"}
+    client._fetch("1.2.3.4")
+
+    assert client._session.get.call_count == 2
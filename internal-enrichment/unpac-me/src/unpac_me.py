@@ -1,5 +1,6 @@
 # coding: utf-8
 
+import datetime
 import os
 import sys
 import time
@@ -9,7 +10,8 @@ import magic
 import stix2
 import yaml
 from pycti import OpenCTIConnectorHelper, StixCoreRelationship, get_config_variable
-from unpac_me_api_client import UnpacMeApi, UnpacMeStatus
+from sandbox_scheduler import SandboxJobScheduler
+from unpac_me_api_client import UnpacMeApi, UnpacMeStatus, UnpacMeUpload
 
 
 class UnpacMeConnector:
@@ -73,7 +75,15 @@ class UnpacMeConnector:
             config,
         )
 
-    def _process_results(self, observable, results):
+        # Analyses are polled in the background so they don't block other enrichments
+        self.scheduler = SandboxJobScheduler(
+            self.helper,
+            poll_job=self._poll_analysis,
+            process_job=self._process_analysis,
+            min_poll_interval=20,
+        )
+
+    def _process_results(self, observable, results, work_id):
         bundle_objects = []
         unpack_id = results["id"]
 
@@ -159,7 +169,7 @@ class UnpacMeConnector:
         # Serialize and send all bundles
         if bundle_objects:
             bundle = self.helper.stix2_create_bundle(bundle_objects)
-            bundles_sent = self.helper.send_stix2_bundle(bundle)
+            bundles_sent = self.helper.send_stix2_bundle(bundle, work_id=work_id)
             return f"Sent {len(bundles_sent)} stix bundle(s) for worker import"
         else:
             return "Nothing to attach"
@@ -176,24 +186,45 @@ class UnpacMeConnector:
         # Submit sample for analysis
         upload = self.unpacme_client.upload(data=file_content, private=self.private)
 
-        # Wait for the analysis to finish
-        while True:
-            response = self.unpacme_client.status(upload=upload)
+        # Only the observable ids are kept in the connector state, it is read
+        # again once the analysis is finished
+        return self.scheduler.submit(
+            upload.id,
+            {
+                "observable_id": observable["id"],
+                "observable_type": observable["entity_type"],
+            },
+        )
 
-            if response == UnpacMeStatus.COMPLETE:
-                break
-            elif response == UnpacMeStatus.FAIL:
-                raise ValueError(f"UnpacMe failed to analyze {file_id}")
+    def _poll_analysis(self, upload_id):
+        upload = UnpacMeUpload(
+            upload_id, UnpacMeStatus.UNKNOWN, datetime.datetime.now(), None
+        )
+        response = self.unpacme_client.status(upload=upload)
 
-            time.sleep(20)
+        if response == UnpacMeStatus.FAIL:
+            raise ValueError(f"UnpacMe failed to analyze upload {upload_id}")
+        elif response != UnpacMeStatus.COMPLETE:
+            return None
 
         # Analysis is complete, get the results
         results = self.unpacme_client.results(upload=upload)
-        results = results.raw_json
+        return results.raw_json
+
+    def _read_observable(self, context):
+        # Read again the observable whose ids were persisted with the job
+        do_read = self.helper.api.stix2.get_reader(context["observable_type"])
+        observable = do_read(id=context["observable_id"], withFiles=True)
+        if observable is None:
+            raise ValueError(
+                f"Unable to read the observable {context['observable_id']}"
+            )
+        return observable
 
+    def _process_analysis(self, context, results, work_id):
         self.helper.log_info(f"Analysis complete, processing results: {results}...")
 
-        return self._process_results(observable, results)
+        return self._process_results(self._read_observable(context), results, work_id)
 
     def _process_observable(self, observable):
         self.helper.log_info(
@@ -225,6 +256,7 @@ class UnpacMeConnector:
 
     # Start the main loop
     def start(self):
+        self.scheduler.start()
         self.helper.listen(message_callback=self._process_message)
 
 
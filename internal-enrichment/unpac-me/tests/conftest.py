@@ -0,0 +1,34 @@
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+SRC_PATH = os.path.join(os.path.dirname(__file__), "..", "src")
+sys.path.append(SRC_PATH)
+
+import unpac_me  # noqa: E402
+
+
+def make_helper():
+    """Connector helper keeping the connector state in memory."""
+    helper = mock.MagicMock()
+    helper.state = None
+    helper.get_state.side_effect = lambda: helper.state
+    helper.set_state.side_effect = lambda state: setattr(helper, "state", state)
+    helper.api.work.initiate_work.return_value = "work-id"
+    helper.playbook = None
+    return helper
+
+
+@pytest.fixture
+def helper():
+    return make_helper()
+
+
+@pytest.fixture
+def connector(helper):
+    with mock.patch.object(
+        unpac_me, "OpenCTIConnectorHelper", return_value=helper
+    ), mock.patch.object(unpac_me, "UnpacMeApi"):
+        return unpac_me.UnpacMeConnector()
@@ -0,0 +1,47 @@
+from unittest import mock
+
+from unpac_me import UnpacMeStatus
+
+OBSERVABLE = {
+    "id": "observable-id",
+    "entity_type": "Artifact",
+    "observable_value": "sample.exe",
+    "importFiles": [{"id": "file-id", "name": "sample.exe"}],
+}
+RESULTS = {"id": "upload-id", "results": []}
+
+
+def test_analysis_is_polled_then_processed(connector, helper):
+    helper.api.fetch_opencti_file.return_value = b"content"
+    helper.api.stix2.get_reader.return_value.return_value = OBSERVABLE
+    connector.unpacme_client.upload.return_value.id = "upload-id"
+    connector.unpacme_client.status.side_effect = [
+        UnpacMeStatus.QUEUED,
+        UnpacMeStatus.COMPLETE,
+    ]
+    connector.unpacme_client.results.return_value.raw_json = RESULTS
+    connector._process_results = mock.Mock(return_value="Nothing to attach")
+
+    connector._process_file(OBSERVABLE)
+
+    # Only the observable ids are persisted
+    assert helper.state["sandbox_jobs"]["upload-id"]["context"] == {
+        "observable_id": "observable-id",
+        "observable_type": "Artifact",
+    }
+
+    job = connector.scheduler.jobs["upload-id"]
+    connector.scheduler._poll("upload-id", job)
+
+    connector._process_results.assert_not_called()
+    assert "upload-id" in connector.scheduler.jobs
+
+    connector.scheduler._poll("upload-id", job)
+
+    helper.api.stix2.get_reader.assert_called_once_with("Artifact")
+    helper.api.stix2.get_reader.return_value.assert_called_once_with(
+        id="observable-id", withFiles=True
+    )
+    connector._process_results.assert_called_once_with(OBSERVABLE, RESULTS, "work-id")
+    helper.api.work.to_processed.assert_called_once_with("work-id", "Nothing to attach")
+    assert helper.state["sandbox_jobs"] == {}
@@ -10,16 +10,30 @@ import requests
 from pycti import OpenCTIConnectorHelper
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
+from virustotal.response_cache import ResponseCache, cached_lookup
+
+
+def _is_not_found(response: dict) -> bool:
+    return response.get("error", {}).get("code") == "NotFoundError"
+
+
+def _is_error(response: dict) -> bool:
+    return "error" in response and not _is_not_found(response)
 
 
 class VirusTotalClient:
     """VirusTotal client."""
 
     def __init__(
-        self, helper: OpenCTIConnectorHelper, base_url: str, token: str
+        self,
+        helper: OpenCTIConnectorHelper,
+        base_url: str,
+        token: str,
+        response_cache: ResponseCache = None,
     ) -> None:
         """Initialize Virustotal client."""
         self.helper = helper
+        self.response_cache = response_cache
         # Drop the ending slash if present.
         self.url = base_url[:-1] if base_url[-1] == "/" else base_url
         self.helper.log_info(f"[VirusTotal] URL: {self.url}")
@@ -27,6 +41,14 @@ class VirusTotalClient:
             "x-apikey": token,
             "accept": "application/json",
         }
+        # Configure the adapter for the retry strategy.
+        retry_strategy = Retry(
+            total=3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["HEAD", "GET", "OPTIONS"],
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(max_retries=retry_strategy))
 
     def _query(self, url):
         """
@@ -47,18 +69,9 @@ class VirusTotalClient:
         JSON or None
             The result of the query, as JSON or None in case of failure.
         """
-        # Configure the adapter for the retry strategy.
-        retry_strategy = Retry(
-            total=3,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        http = requests.Session()
-        http.mount("https://", adapter)
         response = None
         try:
-            response = http.get(
+            response = self.session.get(
                 url, headers=self.headers | {"content-type": "application/json"}
             )
             response.raise_for_status()
@@ -143,6 +156,7 @@ class VirusTotalClient:
             self.helper.metric.inc("client_error_count")
             return None
 
+    @cached_lookup("file", is_negative=_is_not_found, is_error=_is_error)
     def get_file_info(self, hash256) -> dict:
         """
         Retrieve file information based on the given hash-256.
@@ -180,6 +194,7 @@ class VirusTotalClient:
         files = {"file": (artifact_name, artifact)}
         return self._post(url, files=files)["data"]["id"]
 
+    @cached_lookup("yara-ruleset", is_error=_is_error)
     def get_yara_ruleset(self, ruleset_id) -> dict:
         """
         Retrieve the YARA rules based on the given ruleset id.
@@ -197,6 +212,7 @@ class VirusTotalClient:
         url = f"{self.url}/yara_rulesets/{ruleset_id}"
         return self._query(url)
 
+    @cached_lookup("ip", is_negative=_is_not_found, is_error=_is_error)
     def get_ip_info(self, ip):
         """
         Retrieve IP report based on the given IP.
@@ -214,6 +230,7 @@ class VirusTotalClient:
         url = f"{self.url}/ip_addresses/{ip}"
         return self._query(url)
 
+    @cached_lookup("domain-name", is_negative=_is_not_found, is_error=_is_error)
     def get_domain_info(self, domain):
         """
         Retrieve Domain report based on the given Domain.
@@ -231,6 +248,7 @@ class VirusTotalClient:
         url = f"{self.url}/domains/{domain}"
         return self._query(url)
 
+    @cached_lookup("url", is_negative=_is_not_found, is_error=_is_error)
     def get_url_info(self, url):
         """
         Retrieve URL report based on the given URL.
@@ -327,6 +345,7 @@ class VirusTotalClient:
         """
         return base64.b64encode(contents.encode()).decode().replace("=", "")
 
+    @cached_lookup("url-relationship", is_negative=_is_not_found, is_error=_is_error)
     def get_url_related_objects(self, url, relationship):
         """
         Retrieve URL report based on the given URL.
@@ -1,4 +1,4 @@
-from typing import Annotated, Literal
+from typing import Annotated, Literal, Optional
 
 from pydantic import (
     Field,
@@ -137,6 +137,24 @@ class ConfigLoaderVirusTotal(ConfigBaseSettings):
         description="Whether or not to include the attributes info in Note.",
     )
 
+    # Response cache settings
+    cache_ttl: int = Field(
+        default=0,
+        description="Number of seconds VirusTotal responses are cached for, 0 disables the cache.",
+    )
+    cache_negative_ttl: int = Field(
+        default=3600,
+        description="Number of seconds 'not found' responses are cached for, 0 to never cache them.",
+    )
+    cache_max_entries: int = Field(
+        default=1000,
+        description="Maximum number of responses kept in memory.",
+    )
+    cache_path: Optional[str] = Field(
+        default=None,
+        description="Path of a SQLite database used to keep cached responses across restarts.",
+    )
+
     @model_validator(mode="before")
     def auto_build_configs(cls, values: dict):
         """
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""Response cache unittest."""
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from virustotal.client import VirusTotalClient
+from virustotal.response_cache import ResponseCache, cache_key, cached_lookup
+
+
+class FakeClient:
+    def __init__(self, response_cache):
+        self.response_cache = response_cache
+        self.calls = 0
+
+    @cached_lookup("ip", is_negative=lambda r: "error" in r)
+    def get_ip_info(self, ip):
+        self.calls += 1
+        if ip == "10.0.0.1":
+            return {"error": {"code": "NotFoundError"}}
+        if ip == "10.0.0.2":
+            return None
+        return {"data": {"id": ip}}
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def test_lookup_is_served_from_cache(self):
+        client = FakeClient(ResponseCache(ttl=60))
+        self.assertEqual(client.get_ip_info("8.8.8.8"), {"data": {"id": "8.8.8.8"}})
+        self.assertEqual(client.get_ip_info("8.8.8.8"), {"data": {"id": "8.8.8.8"}})
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(client.response_cache.stats()["hit_rate"], 0.5)
+
+    def test_hit_returns_a_copy(self):
+        client = FakeClient(ResponseCache(ttl=60))
+        client.get_ip_info("8.8.8.8")["data"]["id"] = "changed"
+        self.assertEqual(client.get_ip_info("8.8.8.8"), {"data": {"id": "8.8.8.8"}})
+
+    def test_disabled_cache(self):
+        client = FakeClient(None)
+        client.get_ip_info("8.8.8.8")
+        client.get_ip_info("8.8.8.8")
+        self.assertEqual(client.calls, 2)
+
+    def test_failures_are_not_cached(self):
+        client = FakeClient(ResponseCache(ttl=60))
+        client.get_ip_info("10.0.0.2")
+        client.get_ip_info("10.0.0.2")
+        self.assertEqual(client.calls, 2)
+
+    def test_negative_ttl(self):
+        client = FakeClient(ResponseCache(ttl=60, negative_ttl=10))
+        with patch("virustotal.response_cache.time.time", return_value=1000):
+            client.get_ip_info("10.0.0.1")
+            client.get_ip_info("8.8.8.8")
+        with patch("virustotal.response_cache.time.time", return_value=1030):
+            client.get_ip_info("10.0.0.1")
+            client.get_ip_info("8.8.8.8")
+        # Only the negative response expired
+        self.assertEqual(client.calls, 3)
+
+    def test_lru_bound(self):
+        client = FakeClient(ResponseCache(ttl=60, max_entries=2))
+        for ip in ["1.1.1.1", "2.2.2.2", "1.1.1.1", "3.3.3.3", "1.1.1.1", "2.2.2.2"]:
+            client.get_ip_info(ip)
+        # 2.2.2.2 was the least recently used entry when 3.3.3.3 was added
+        self.assertEqual(client.calls, 4)
+        self.assertEqual(client.response_cache.stats()["entries"], 2)
+
+    def test_invalidate(self):
+        client = FakeClient(ResponseCache(ttl=60))
+        client.get_ip_info("8.8.8.8")
+        client.response_cache.invalidate("ip", "8.8.8.8")
+        client.get_ip_info("8.8.8.8")
+        self.assertEqual(client.calls, 2)
+
+    def test_sqlite_backend_survives_restart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite")
+            FakeClient(ResponseCache(ttl=60, path=path)).get_ip_info("8.8.8.8")
+
+            client = FakeClient(ResponseCache(ttl=60, path=path))
+            self.assertEqual(client.get_ip_info("8.8.8.8"), {"data": {"id": "8.8.8.8"}})
+            self.assertEqual(client.calls, 0)
+
+
+class VirusTotalClientCacheTest(unittest.TestCase):
+    def make_client(self, *responses):
+        # Negative responses are not kept, to tell them apart from the positive ones
+        client = VirusTotalClient(
+            MagicMock(),
+            "https://www.virustotal.com/api/v3/",
+            "token",
+            response_cache=ResponseCache(ttl=60, negative_ttl=0),
+        )
+        client._query = MagicMock(side_effect=list(responses))
+        return client
+
+    def test_ip_info_is_cached_by_ip(self):
+        client = self.make_client({"data": {"id": "8.8.8.8"}})
+        client.get_ip_info("8.8.8.8")
+        client.get_ip_info("8.8.8.8")
+        self.assertEqual(client._query.call_count, 1)
+        self.assertEqual(
+            list(client.response_cache._entries), [cache_key("ip", "8.8.8.8")]
+        )
+
+    def test_not_found_is_negative_and_errors_are_not_stored(self):
+        not_found = {"error": {"code": "NotFoundError"}}
+        quota = {"error": {"code": "QuotaExceededError"}}
+        client = self.make_client(not_found, not_found, quota, quota)
+        for _ in range(4):
+            client.get_domain_info("example.com")
+        self.assertEqual(client._query.call_count, 4)
+        self.assertEqual(client.response_cache.stats()["entries"], 0)
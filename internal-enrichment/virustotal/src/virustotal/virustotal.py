@@ -8,6 +8,7 @@ from pycti import Identity, OpenCTIConnectorHelper
 from virustotal.builder import VirusTotalBuilder
 from virustotal.client import VirusTotalClient
 from virustotal.models.configs.config_loader import ConfigLoader
+from virustotal.response_cache import ResponseCache
 
 
 class VirusTotalConnector:
@@ -32,7 +33,18 @@ class VirusTotalConnector:
         self.max_tlp = self.config.virustotal.max_tlp
         self.replace_with_lower_score = self.config.virustotal.replace_with_lower_score
         token = self.config.virustotal.token.get_secret_value()
-        self.client = VirusTotalClient(self.helper, self._API_URL, token)
+        response_cache = None
+        if self.config.virustotal.cache_ttl > 0:
+            response_cache = ResponseCache(
+                ttl=self.config.virustotal.cache_ttl,
+                negative_ttl=self.config.virustotal.cache_negative_ttl,
+                max_entries=self.config.virustotal.cache_max_entries,
+                path=self.config.virustotal.cache_path,
+                log=self.helper.log_info,
+            )
+        self.client = VirusTotalClient(
+            self.helper, self._API_URL, token, response_cache=response_cache
+        )
 
         # Cache to store YARA rulesets.
         self.yara_cache = {}
@@ -135,6 +147,11 @@ class VirusTotalConnector:
                 analysis_id = self.client.upload_artifact(
                     opencti_entity["importFiles"][0]["name"], artifact
                 )
+                # The cached "not found" response is outdated by the upload
+                if self.client.response_cache is not None:
+                    self.client.response_cache.invalidate(
+                        "file", self.resolve_default_value(stix_entity)
+                    )
                 # Attempting to get the file info immediately queues the artifact for more immediate analysis
                 self.client.get_file_info(self.resolve_default_value(stix_entity))
             except Exception as err:
@@ -149,6 +166,10 @@ class VirusTotalConnector:
                 raise ValueError(
                     "[VirusTotal] Error waiting for VirusTotal to analyze artifact"
                 ) from err
+            if self.client.response_cache is not None:
+                self.client.response_cache.invalidate(
+                    "file", self.resolve_default_value(stix_entity)
+                )
             json_data = self.client.get_file_info(
                 self.resolve_default_value(stix_entity)
             )
@@ -358,6 +379,11 @@ class VirusTotalConnector:
                 raise ValueError(
                     "[VirusTotal] Error waiting for VirusTotal to analyze URL"
                 ) from err
+            # The cached "not found" response is outdated by the upload
+            if self.client.response_cache is not None:
+                self.client.response_cache.invalidate(
+                    "url", opencti_entity["observable_value"]
+                )
             json_data = self.client.get_url_info(opencti_entity["observable_value"])
             assert json_data
         if "error" in json_data:
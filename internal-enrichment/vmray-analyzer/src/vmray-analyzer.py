@@ -4,7 +4,6 @@ import ipaddress
 import json
 import os
 import sys
-import time
 from fnmatch import fnmatch
 from hashlib import sha256
 from io import BytesIO
@@ -19,6 +18,7 @@ from pycti import (
     StixCoreRelationship,
     get_config_variable,
 )
+from sandbox_scheduler import SandboxJobScheduler
 from vmray.rest_api import VMRayRESTAPI
 
 
@@ -91,6 +91,14 @@ class VmrayAnalyzerConnector:
         # Used for passing the external reference to the analysis report around
         self.external_reference = None
 
+        # Submissions are polled in the background so they don't block other enrichments
+        self.scheduler = SandboxJobScheduler(
+            self.helper,
+            poll_job=self._poll_submission,
+            process_job=self._process_submission,
+            min_poll_interval=5,
+        )
+
     def _process_observable(self, observable):
         # Build params for the submission
         params = {}
@@ -136,10 +144,6 @@ class VmrayAnalyzerConnector:
                     if existing_submission["submission_has_errors"]:
                         continue
                     submission_id = existing_submission.get("submission_id")
-                    # Wait for existing submission if not yet finished
-                    if not existing_submission["submission_finished"]:
-                        self._wait_for_submission(submission_id)
-
                     break
 
         # No existing analysis, force re-analysis
@@ -152,8 +156,42 @@ class VmrayAnalyzerConnector:
             submission_id = submit_dict.get("submissions")[0].get("submission_id")
             sample_id = submit_dict["samples"][0]["sample_id"]
 
-            # Wait for the analyses to finish
-            self._wait_for_submission(submission_id)
+        # Wait for the analyses to finish in the background, only the observable
+        # ids are kept in the connector state, it is read again once finished
+        return self.scheduler.submit(
+            submission_id,
+            {
+                "observable_id": observable["id"],
+                "observable_type": observable["entity_type"],
+                "sample_id": sample_id,
+            },
+        )
+
+    def _poll_submission(self, submission_id):
+        submission_data = self.vmray_analyzer_client.call(
+            "GET", f"/rest/submission/{submission_id}"
+        )
+        if not submission_data["submission_finished"]:
+            self.helper.log_info(f"Submission {submission_id} not yet finished.")
+            return None
+
+        self.helper.log_info(f"Submission {submission_id} finished.")
+        return submission_data
+
+    def _read_observable(self, context):
+        # Read again the observable whose ids were persisted with the job
+        do_read = self.helper.api.stix2.get_reader(context["observable_type"])
+        observable = do_read(id=context["observable_id"], withFiles=True)
+        if observable is None:
+            raise ValueError(
+                f"Unable to read the observable {context['observable_id']}"
+            )
+        return observable
+
+    def _process_submission(self, context, submission_data, work_id):
+        observable = self._read_observable(context)
+        sample_id = context["sample_id"]
+        submission_id = submission_data["submission_id"]
 
         # Get the sample report
         sample_dict = self.vmray_analyzer_client.call(
@@ -205,12 +243,13 @@ class VmrayAnalyzerConnector:
         analysis_ids = [analysis_dict["analysis_id"] for analysis_dict in analyses]
 
         # Process analyses list
-        return self._process_analyses(observable, analysis_ids)
+        return self._process_analyses(observable, analysis_ids, work_id)
 
-    def _process_analyses(self, observable, analysis_ids):
+    def _process_analyses(self, observable, analysis_ids, work_id):
         """
         observable: The dict containing the observable to enrich
         analysis_ids: A list containnig analysis ids
+        work_id: the id of the work the bundle is sent in
         returns: a str representing a message to return to OpenCTI
         """
 
@@ -375,7 +414,7 @@ class VmrayAnalyzerConnector:
         # Serialize and send bundles
         if bundle_objects:
             bundle = self.helper.stix2_create_bundle(bundle_objects)
-            bundles_sent = self.helper.send_stix2_bundle(bundle)
+            bundles_sent = self.helper.send_stix2_bundle(bundle, work_id=work_id)
             return f"Sent {len(bundles_sent)} stix bundle(s) for worker import"
         else:
             return "Nothing to attach"
@@ -394,29 +433,6 @@ class VmrayAnalyzerConnector:
             )
         return self._process_observable(observable)
 
-    def _wait_for_submission(self, submission_id, sleep_interval=1):
-        """
-        Wait for an analysis to finish.
-
-        submission_id: an int submission id to wait for
-        sleep_interval: seconds to sleep between subsequent requests
-        returns: none
-        """
-
-        while True:
-            submission_data = self.vmray_analyzer_client.call(
-                "GET", f"/rest/submission/{submission_id}"
-            )
-
-            if submission_data["submission_finished"]:
-                self.helper.log_info(f"Submission {submission_id} finished.")
-                break
-            else:
-                self.helper.log_info(
-                    f"Submission {submission_id} not yet finished, re-checking in {sleep_interval} seconds."
-                )
-                time.sleep(sleep_interval)
-
     def _get_sha256(self, contents):
         """
         Return sha256 of bytes.
@@ -430,6 +446,7 @@ class VmrayAnalyzerConnector:
 
     # Start the main loop
     def start(self):
+        self.scheduler.start()
         self.helper.listen(message_callback=self._process_message)
 
 
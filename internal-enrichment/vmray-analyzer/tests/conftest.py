@@ -0,0 +1,47 @@
+import importlib.util
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+SRC_PATH = os.path.join(os.path.dirname(__file__), "..", "src")
+sys.path.append(SRC_PATH)
+
+
+def load_module(name, file_name):
+    """Import a connector module whose file name is not a valid module name."""
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(SRC_PATH, file_name)
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+vmray_analyzer = load_module("vmray_analyzer", "vmray-analyzer.py")
+
+
+def make_helper():
+    """Connector helper keeping the connector state in memory."""
+    helper = mock.MagicMock()
+    helper.state = None
+    helper.get_state.side_effect = lambda: helper.state
+    helper.set_state.side_effect = lambda state: setattr(helper, "state", state)
+    helper.api.work.initiate_work.return_value = "work-id"
+    helper.playbook = None
+    return helper
+
+
+@pytest.fixture
+def helper():
+    return make_helper()
+
+
+@pytest.fixture
+def connector(helper, monkeypatch):
+    monkeypatch.setenv("VMRAY_ANALYZER_DEFAULT_TLP", "TLP:AMBER")
+    with mock.patch.object(
+        vmray_analyzer, "OpenCTIConnectorHelper", return_value=helper
+    ), mock.patch.object(vmray_analyzer, "VMRayRESTAPI"):
+        return vmray_analyzer.VmrayAnalyzerConnector()
@@ -0,0 +1,69 @@
+from unittest import mock
+
+OBSERVABLE = {
+    "id": "observable-id",
+    "entity_type": "Artifact",
+    "observable_value": "sample.exe",
+    "importFiles": [{"id": "file-id", "name": "sample.exe"}],
+}
+SAMPLE = {
+    "sample_webif_url": "https://vmray/sample/5",
+    "sample_classifications": [],
+    "sample_threat_names": [],
+    "sample_score": 80,
+}
+
+
+def make_vmray_api(submission_statuses):
+    """VMRay REST API answering the calls of a submission of sample 5."""
+    statuses = iter(submission_statuses)
+
+    def call(method, path, params=None, raw_data=False):
+        if path.startswith("/rest/sample/sha256/"):
+            return []
+        if path == "/rest/sample/submit":
+            return {
+                "submissions": [{"submission_id": 11}],
+                "samples": [{"sample_id": 5}],
+            }
+        if path == "/rest/submission/11":
+            return {"submission_id": 11, "submission_finished": next(statuses)}
+        if path == "/rest/sample/5":
+            return SAMPLE
+        if path == "/rest/analysis/submission/11":
+            return [{"analysis_id": 21}]
+        raise AssertionError(f"Unexpected call {method} {path}")
+
+    return mock.Mock(side_effect=call)
+
+
+def test_submission_is_polled_then_processed(connector, helper):
+    helper.api.fetch_opencti_file.return_value = b"content"
+    helper.api.stix2.get_reader.return_value.return_value = OBSERVABLE
+    connector.vmray_analyzer_client.call = make_vmray_api([False, True])
+    connector._process_analyses = mock.Mock(return_value="Nothing to attach")
+
+    connector._process_observable(OBSERVABLE)
+
+    # Only the observable ids are persisted
+    assert helper.state["sandbox_jobs"]["11"]["context"] == {
+        "observable_id": "observable-id",
+        "observable_type": "Artifact",
+        "sample_id": 5,
+    }
+
+    job = connector.scheduler.jobs["11"]
+    connector.scheduler._poll("11", job)
+
+    connector._process_analyses.assert_not_called()
+    assert "11" in connector.scheduler.jobs
+
+    connector.scheduler._poll("11", job)
+
+    helper.api.stix2.get_reader.assert_called_once_with("Artifact")
+    helper.api.stix2.get_reader.return_value.assert_called_once_with(
+        id="observable-id", withFiles=True
+    )
+    connector._process_analyses.assert_called_once_with(OBSERVABLE, [21], "work-id")
+    helper.api.work.to_processed.assert_called_once_with("work-id", "Nothing to attach")
+    assert helper.state["sandbox_jobs"] == {}
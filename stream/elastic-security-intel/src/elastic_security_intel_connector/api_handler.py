@@ -4,11 +4,16 @@ Elastic Security API Handler for threat intelligence and SIEM rules management
 
 import hashlib
 import json
+import threading
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 import requests
 from pycti import OpenCTIConnectorHelper, get_config_variable
+from requests.adapters import HTTPAdapter
+
+# Number of SIEM rules per page when listing the rules created by the connector
+SIEM_RULES_PAGE_SIZE = 100
 
 
 class ElasticApiHandlerError(Exception):
@@ -50,6 +55,30 @@ class ElasticApiHandler:
                 default="http://localhost:4000",
             ).rstrip("/")
 
+        # One session for all the Elasticsearch and Kibana calls, so that their
+        # connections are kept alive and reused instead of renegotiated each time
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.verify = self._get_verify_config()
+        adapter = HTTPAdapter(
+            pool_connections=2,  # Elasticsearch and Kibana
+            pool_maxsize=10,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Updates and deletes queued during the batch window, by opencti_doc_id.
+        # The observables of an indicator share its opencti_doc_id, so an update
+        # keeps the observables to recreate, by observable key.
+        self.batch_window = config.batch_window
+        self._pending_operations: Dict[str, tuple] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+
+        # SIEM rule ids by OpenCTI id, filled by load_siem_rule_ids()
+        self._siem_rule_ids: Dict[str, str] = {}
+
     def _get_verify_config(self):
         """Get SSL verification configuration"""
         if not self.verify_ssl:
@@ -84,6 +113,15 @@ class ElasticApiHandler:
         opencti_id = OpenCTIConnectorHelper.get_attribute_in_extension("id", data)
         return hashlib.sha256(opencti_id.encode()).hexdigest()
 
+    @staticmethod
+    def _observable_key(observable_data: dict) -> tuple:
+        """Generate a key identifying an observable among those of its indicator"""
+        return (
+            observable_data.get("type"),
+            observable_data.get("value"),
+            tuple(sorted((observable_data.get("hashes") or {}).items())),
+        )
+
     def _is_elastic_native_pattern(self, pattern_type: str) -> bool:
         """
         Check if the pattern type is native to Elastic
@@ -192,16 +230,16 @@ class ElasticApiHandler:
             kibana_url = self._get_kibana_url()
             url = f"{kibana_url}/api/detection_engine/rules"
 
-            response = requests.post(
+            response = self.session.post(
                 url,
-                headers=self.headers,  # Already includes kbn-xsrf header
                 json=rule,
-                verify=self._get_verify_config(),
                 timeout=30,
             )
 
             if response.status_code in [200, 201]:
                 result = response.json()
+                if result.get("id"):
+                    self._siem_rule_ids[opencti_id] = result["id"]
                 self.helper.connector_logger.info(
                     "Created SIEM rule from indicator",
                     {"rule_id": result.get("id"), "opencti_id": opencti_id},
@@ -257,11 +295,9 @@ class ElasticApiHandler:
             kibana_url = self._get_kibana_url()
             url = f"{kibana_url}/api/detection_engine/rules"
 
-            response = requests.put(
+            response = self.session.put(
                 url,
-                headers=self.headers,
                 json=rule_update,
-                verify=self._get_verify_config(),
                 timeout=30,
             )
 
@@ -272,6 +308,14 @@ class ElasticApiHandler:
                     {"rule_id": rule_id, "opencti_id": opencti_id},
                 )
                 return result
+            elif response.status_code == 404:
+                # The rule was deleted from Kibana, the indexed rule id is stale
+                self._siem_rule_ids.pop(opencti_id, None)
+                self.helper.connector_logger.info(
+                    "SIEM rule not found, creating it again",
+                    {"rule_id": rule_id, "opencti_id": opencti_id},
+                )
+                return self._create_siem_rule(indicator_data)
             else:
                 self.helper.connector_logger.warning(
                     f"Failed to update SIEM rule: {response.status_code}",
@@ -285,7 +329,7 @@ class ElasticApiHandler:
             )
             return None
 
-    def _delete_siem_rule(self, rule_id: str) -> bool:
+    def _delete_siem_rule(self, rule_id: str, opencti_id: Optional[str] = None) -> bool:
         """Delete a SIEM rule"""
         try:
             # For SIEM rules, we need to use Kibana URL, not Elasticsearch
@@ -293,15 +337,15 @@ class ElasticApiHandler:
             url = f"{kibana_url}/api/detection_engine/rules"
             params = {"id": rule_id}
 
-            response = requests.delete(
+            response = self.session.delete(
                 url,
-                headers=self.headers,
                 params=params,
-                verify=self._get_verify_config(),
                 timeout=30,
             )
 
             if response.status_code in [200, 404]:  # 404 is ok, already deleted
+                if opencti_id is not None:
+                    self._siem_rule_ids.pop(opencti_id, None)
                 self.helper.connector_logger.info(
                     "Deleted SIEM rule", {"rule_id": rule_id}
                 )
@@ -319,26 +363,77 @@ class ElasticApiHandler:
             )
             return False
 
+    def load_siem_rule_ids(self) -> None:
+        """
+        Index the SIEM rules created by the connector by their OpenCTI ID
+
+        The rules tagged "opencti" are swept once, page by page, so that updates
+        and deletes don't need a _find request per indicator.
+        """
+        url = f"{self._get_kibana_url()}/api/detection_engine/rules/_find"
+        params = {
+            "filter": 'alert.attributes.tags:"opencti"',
+            "per_page": SIEM_RULES_PAGE_SIZE,
+            "page": 1,
+        }
+        try:
+            while True:
+                response = self.session.get(url, params=params, timeout=30)
+                if response.status_code != 200:
+                    self.helper.connector_logger.warning(
+                        f"Failed to list SIEM rules: {response.status_code}",
+                        {"response": response.text[:500]},
+                    )
+                    return
+
+                result = response.json()
+                rules = result.get("data", [])
+                for rule in rules:
+                    opencti_id = (rule.get("meta") or {}).get("opencti_id")
+                    if opencti_id:
+                        self._siem_rule_ids[opencti_id] = rule["id"]
+
+                if not rules or params["page"] * params["per_page"] >= result.get(
+                    "total", 0
+                ):
+                    break
+                params["page"] += 1
+
+            self.helper.connector_logger.info(
+                "Loaded SIEM rules created by the connector",
+                {"rules_count": len(self._siem_rule_ids)},
+            )
+
+        except Exception as e:
+            self.helper.connector_logger.warning(
+                f"Error listing SIEM rules: {str(e)}",
+                {"rules_count": len(self._siem_rule_ids)},
+            )
+
     def _find_siem_rule_by_opencti_id(self, opencti_id: str) -> Optional[str]:
-        """Find SIEM rule by OpenCTI ID reference"""
+        """Find SIEM rule by OpenCTI ID, in the rule ids index first"""
+        rule_id = self._siem_rule_ids.get(opencti_id)
+        if rule_id is not None:
+            return rule_id
+
         try:
-            url = f"{self.elastic_url}/api/detection_engine/rules/_find"
+            url = f"{self._get_kibana_url()}/api/detection_engine/rules/_find"
             params = {
-                "filter": f'alert.attributes.references:"opencti-id:{opencti_id}"'
+                "filter": f'alert.attributes.references:"{self.opencti_url}/id/{opencti_id}"'
             }
 
-            response = requests.get(
+            response = self.session.get(
                 url,
-                headers=self.headers,
                 params=params,
-                verify=self._get_verify_config(),
                 timeout=30,
             )
 
             if response.status_code == 200:
                 result = response.json()
                 if result.get("data") and len(result["data"]) > 0:
-                    return result["data"][0]["id"]
+                    rule_id = result["data"][0]["id"]
+                    self._siem_rule_ids[opencti_id] = rule_id
+                    return rule_id
 
             return None
 
@@ -823,6 +918,9 @@ class ElasticApiHandler:
         pattern_type = indicator_data.get("pattern_type", "stix")
 
         try:
+            # Send the queued operations first, so they don't override this one
+            self.flush_pending_operations()
+
             # Handle pattern-based indicators as SIEM rules only if native Elastic pattern
             if "pattern" in indicator_data and self._is_elastic_native_pattern(
                 pattern_type
@@ -856,7 +954,7 @@ class ElasticApiHandler:
                 elif operation == "delete":
                     rule_id = self._find_siem_rule_by_opencti_id(opencti_id)
                     if rule_id:
-                        if self._delete_siem_rule(rule_id):
+                        if self._delete_siem_rule(rule_id, opencti_id):
                             self.helper.connector_logger.info(
                                 f"Deleted SIEM rule for {pattern_type} pattern",
                                 {"opencti_id": opencti_id},
@@ -902,11 +1000,9 @@ class ElasticApiHandler:
             # For data streams, use POST without specifying document ID
             # Data streams require POST with auto-generated IDs
             url = f"{self.elastic_url}/{self.index_name}/_doc"
-            response = requests.post(
+            response = self.session.post(
                 url,
-                headers=self.headers,
                 json=ecs_doc,
-                verify=self._get_verify_config(),
                 timeout=30,
             )
 
@@ -966,11 +1062,10 @@ class ElasticApiHandler:
 
             # Use _bulk API
             url = f"{self.elastic_url}/_bulk"
-            response = requests.post(
+            response = self.session.post(
                 url,
-                headers={**self.headers, "Content-Type": "application/x-ndjson"},
+                headers={"Content-Type": "application/x-ndjson"},
                 data=bulk_data,
-                verify=self._get_verify_config(),
                 timeout=60,  # Longer timeout for bulk operations
             )
 
@@ -1046,21 +1141,17 @@ class ElasticApiHandler:
             delete_query = {"query": {"term": {"opencti_doc_id": doc_id}}}
 
             delete_url = f"{self.elastic_url}/{self.index_name}/_delete_by_query"
-            requests.post(
+            self.session.post(
                 delete_url,
-                headers=self.headers,
                 json=delete_query,
-                verify=self._get_verify_config(),
                 timeout=30,
             )
 
             # Now create the new document (data streams are append-only)
             url = f"{self.elastic_url}/{self.index_name}/_doc"
-            response = requests.post(
+            response = self.session.post(
                 url,
-                headers=self.headers,
                 json=ecs_doc,
-                verify=self._get_verify_config(),
                 timeout=30,
             )
 
@@ -1099,11 +1190,9 @@ class ElasticApiHandler:
             delete_query = {"query": {"term": {"opencti_doc_id": doc_id}}}
 
             url = f"{self.elastic_url}/{self.index_name}/_delete_by_query"
-            response = requests.post(
+            response = self.session.post(
                 url,
-                headers=self.headers,
                 json=delete_query,
-                verify=self._get_verify_config(),
                 timeout=30,
             )
 
@@ -1126,6 +1215,117 @@ class ElasticApiHandler:
                 "Request failed while deleting indicator", {"error": str(e)}
             )
 
+    def queue_indicator_update(self, observable_data: dict) -> None:
+        """
+        Queue a threat indicator update, sent with the other operations of the batch window
+
+        :param observable_data: Observable data dictionary
+        """
+        self._queue_operation("update", observable_data)
+
+    def queue_indicator_delete(self, observable_data: dict) -> None:
+        """
+        Queue a threat indicator deletion, sent with the other operations of the batch window
+
+        :param observable_data: Observable data dictionary
+        """
+        self._queue_operation("delete", observable_data)
+
+    def _queue_operation(self, operation: str, observable_data: dict) -> None:
+        """Queue an operation, flushing the queue once the batch size is reached"""
+        doc_id = self._generate_doc_id(observable_data)
+        with self._pending_lock:
+            # Only the last operation of the window matters for a given document,
+            # but an update recreates all the observables queued for the document
+            pending_operation = self._pending_operations.pop(doc_id, None)
+            observables = {}
+            if operation == "update":
+                if pending_operation is not None and pending_operation[0] == "update":
+                    observables = pending_operation[1]
+                observables[self._observable_key(observable_data)] = observable_data
+            self._pending_operations[doc_id] = (operation, observables)
+            batch_full = len(self._pending_operations) >= self.config.batch_size
+            if not batch_full and self._flush_timer is None:
+                self._flush_timer = threading.Timer(
+                    self.batch_window, self._flush_on_timer
+                )
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+        if batch_full:
+            self.flush_pending_operations()
+
+    def _flush_on_timer(self) -> None:
+        """Flush the queued operations at the end of the batch window"""
+        try:
+            self.flush_pending_operations()
+        except ElasticApiHandlerError as e:
+            self.helper.connector_logger.error(
+                f"Batch operation failed: {e.msg}", e.metadata
+            )
+
+    def flush_pending_operations(self) -> Optional[dict]:
+        """
+        Send the queued updates and deletes to Elastic Security
+
+        Data streams are append-only: the previous documents of all the queued
+        indicators are removed with a single delete by query, then the updated
+        ones are created with a single _bulk request.
+
+        :return: Bulk creation statistics, None if nothing was queued
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                pending_operations = self._pending_operations
+                self._pending_operations = {}
+
+            if not pending_operations:
+                return None
+
+            try:
+                delete_query = {
+                    "query": {"terms": {"opencti_doc_id": list(pending_operations)}}
+                }
+                url = f"{self.elastic_url}/{self.index_name}/_delete_by_query"
+                response = self.session.post(
+                    url,
+                    json=delete_query,
+                    timeout=60,  # Longer timeout for bulk operations
+                )
+            except requests.exceptions.RequestException as e:
+                raise ElasticApiHandlerError(
+                    "Request failed during bulk delete operation", {"error": str(e)}
+                )
+
+            if response.status_code not in [200, 404]:  # 404 is ok, already deleted
+                raise ElasticApiHandlerError(
+                    f"Failed to bulk delete indicators: {response.status_code}",
+                    {"response": response.text[:500]},
+                )
+            deleted_count = (
+                response.json().get("deleted", 0) if response.status_code == 200 else 0
+            )
+            self.helper.connector_logger.debug(
+                "Bulk deleted previous indicators from Elastic",
+                {
+                    "queued_count": len(pending_operations),
+                    "deleted_count": deleted_count,
+                },
+            )
+
+            updated_data = [
+                observable_data
+                for operation, observables in pending_operations.values()
+                if operation == "update"
+                for observable_data in observables.values()
+            ]
+            if not updated_data:
+                return {"created": 0, "total": 0, "errors": [], "took": 0}
+            return self.bulk_create_indicators(updated_data)
+
     def test_connection(self) -> bool:
         """Test connection to Elastic Security"""
         try:
@@ -1141,9 +1341,7 @@ class ElasticApiHandler:
                 # For Elasticsearch, use cluster health
                 url = f"{self.elastic_url}/_cluster/health"
 
-            response = requests.get(
-                url, headers=self.headers, verify=self._get_verify_config(), timeout=10
-            )
+            response = self.session.get(url, timeout=10)
 
             # Accept various success codes
             if response.status_code in [200, 201, 401, 403]:
@@ -1416,19 +1614,15 @@ class ElasticApiHandler:
 
             # Check if template already exists
             check_url = f"{self.elastic_url}/_index_template/logs-ti_custom_opencti"
-            check_response = requests.get(
-                check_url, headers=self.headers, verify=self._get_verify_config()
-            )
+            check_response = self.session.get(check_url)
 
             template_exists = check_response.status_code == 200
 
             # Create or update the index template
             url = f"{self.elastic_url}/_index_template/logs-ti_custom_opencti"
-            response = requests.put(
+            response = self.session.put(
                 url,
-                headers=self.headers,
                 json=index_template,
-                verify=self._get_verify_config(),
             )
 
             if response.status_code in [200, 201]:
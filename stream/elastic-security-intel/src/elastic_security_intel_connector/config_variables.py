@@ -103,3 +103,11 @@ class ConfigConnector:
             isNumber=True,
             default=100,
         )
+        # Seconds during which updates and deletes are merged into bulk requests (0 to disable)
+        self.batch_window = get_config_variable(
+            "ELASTIC_SECURITY_BATCH_WINDOW",
+            ["elastic_security", "batch_window"],
+            self.load,
+            isNumber=True,
+            default=1,
+        )
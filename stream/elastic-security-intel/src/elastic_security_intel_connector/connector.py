@@ -48,6 +48,9 @@ class ElasticSecurityIntelConnector:
                 "Failed to setup index template - will continue with default mappings"
             )
 
+        # Index the SIEM rules already created by the connector
+        self.api.load_siem_rule_ids()
+
         # Initialize vocabulary for Elastic pattern types
         self._initialize_pattern_type_vocabulary()
 
@@ -186,6 +189,18 @@ class ElasticSecurityIntelConnector:
             batch = observables[i : i + batch_size]
 
             try:
+                if operation in ["update", "delete"] and self.api.batch_window > 0:
+                    # Merge with the other updates and deletes of the batch window
+                    for observable in batch:
+                        if operation == "update":
+                            self.api.queue_indicator_update(observable)
+                        else:
+                            self.api.queue_indicator_delete(observable)
+                    continue
+
+                # Send the queued operations first, so they don't override this one
+                self.api.flush_pending_operations()
+
                 if operation == "create" and len(batch) > 1:
                     # Use bulk operation for multiple creates
                     result = self.api.bulk_create_indicators(batch)
@@ -0,0 +1,142 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from pycti import STIX_EXT_OCTI
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from elastic_security_intel_connector.api_handler import (  # noqa: E402
+    ElasticApiHandler,
+)
+
+
+class ElasticServer:
+    """
+    Local Elasticsearch and Kibana stub recording the requests.
+    The responses queued in `responses` by (method, path) are answered first.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.responses = {}
+        self.siem_rules = []
+        self._rules_count = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode() if length else ""
+                status, payload = server.handle(
+                    self.command, url.path, parse_qs(url.query), body
+                )
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+
+    def handle(self, method, path, query, body):
+        with self._lock:
+            self.requests.append((method, path, query, body))
+            queued = self.responses.get((method, path))
+            if queued:
+                return queued.pop(0)
+        if path.endswith("/_delete_by_query"):
+            ids = json.loads(body)["query"]
+            ids = ids.get("terms", ids.get("term", {})).get("opencti_doc_id", [])
+            return 200, {"deleted": len(ids) if isinstance(ids, list) else 1}
+        if path == "/_bulk":
+            lines = [line for line in body.split("\n") if line]
+            items = [{"create": {"status": 201}} for _ in lines[::2]]
+            return 200, {"took": 1, "errors": False, "items": items}
+        if path.endswith("/_doc"):
+            return 201, {"_id": "doc", "result": "created"}
+        if path == "/api/detection_engine/rules/_find":
+            page = int(query["page"][0])
+            per_page = int(query["per_page"][0])
+            data = self.siem_rules[(page - 1) * per_page : page * per_page]
+            return 200, {"data": data, "total": len(self.siem_rules)}
+        if path == "/api/detection_engine/rules":
+            if method == "POST":
+                with self._lock:
+                    self._rules_count += 1
+                    return 200, {"id": f"rule-{self._rules_count}"}
+            return 200, {"id": query.get("id", [json.loads(body or "{}").get("id")])[0]}
+        return 404, {}
+
+    def calls(self, method=None, path=None):
+        """Return the recorded requests, filtered by method and path."""
+        return [
+            request
+            for request in self.requests
+            if (method is None or request[0] == method)
+            and (path is None or request[1] == path)
+        ]
+
+    def shutdown(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def elastic_server():
+    server = ElasticServer()
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def make_api(elastic_server):
+    def _make_api(batch_window=1, batch_size=100):
+        config = SimpleNamespace(
+            elastic_url=elastic_server.url,
+            elastic_kibana_url=elastic_server.url,
+            elastic_api_key="api-key",
+            elastic_verify_ssl=False,
+            elastic_ca_cert=None,
+            elastic_index_name="logs-ti_custom_opencti.indicator",
+            elastic_opencti_external_url="http://opencti",
+            batch_window=batch_window,
+            batch_size=batch_size,
+            load={},
+        )
+        return ElasticApiHandler(MagicMock(), config)
+
+    return _make_api
+
+
+def make_observable(index, value=None):
+    return {
+        "id": f"ipv4-addr--{index}",
+        "type": "ipv4-addr",
+        "value": value or f"10.0.0.{index}",
+        "extensions": {
+            STIX_EXT_OCTI: {"id": f"opencti-id-{index}"},
+        },
+    }
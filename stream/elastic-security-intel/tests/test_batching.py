@@ -0,0 +1,166 @@
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from elastic_security_intel_connector.connector import ElasticSecurityIntelConnector
+from pycti import STIX_EXT_OCTI, OpenCTIConnectorHelper
+
+from .conftest import make_observable
+
+INDEX = "/logs-ti_custom_opencti.indicator"
+
+
+def make_connector(api):
+    connector = ElasticSecurityIntelConnector.__new__(ElasticSecurityIntelConnector)
+    connector.api = api
+    connector.config = SimpleNamespace(batch_size=api.config.batch_size)
+    connector.helper = MagicMock()
+    return connector
+
+
+def deleted_doc_ids(request):
+    return json.loads(request[3])["query"]["terms"]["opencti_doc_id"]
+
+
+def bulk_values(request):
+    lines = [json.loads(line) for line in request[3].split("\n") if line]
+    return [doc["threat"]["indicator"]["ip"] for doc in lines[1::2]]
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_queued_updates_are_sent_with_one_delete_and_one_bulk(elastic_server, make_api):
+    api = make_api(batch_window=60)
+    for index in range(50):
+        api.queue_indicator_update(make_observable(index))
+
+    assert elastic_server.requests == []
+    result = api.flush_pending_operations()
+
+    assert result["created"] == 50
+    (delete_request,) = elastic_server.calls("POST", f"{INDEX}/_delete_by_query")
+    (bulk_request,) = elastic_server.calls("POST", "/_bulk")
+    assert len(elastic_server.requests) == 2
+    assert len(deleted_doc_ids(delete_request)) == 50
+    assert len(bulk_values(bulk_request)) == 50
+
+
+def test_only_the_last_operation_of_a_document_is_sent(elastic_server, make_api):
+    api = make_api(batch_window=60)
+    api.queue_indicator_update(make_observable(1))
+    api.queue_indicator_update(make_observable(1))
+    api.queue_indicator_update(make_observable(2))
+    api.queue_indicator_delete(make_observable(2))
+
+    api.flush_pending_operations()
+
+    (delete_request,) = elastic_server.calls("POST", f"{INDEX}/_delete_by_query")
+    (bulk_request,) = elastic_server.calls("POST", "/_bulk")
+    assert len(deleted_doc_ids(delete_request)) == 2
+    assert bulk_values(bulk_request) == [["10.0.0.1"]]
+
+
+def test_update_after_delete_only_recreates_the_new_observables(
+    elastic_server, make_api
+):
+    api = make_api(batch_window=60)
+    api.queue_indicator_update(make_observable(1, "10.0.0.1"))
+    api.queue_indicator_delete(make_observable(1, "10.0.0.1"))
+    api.queue_indicator_update(make_observable(1, "10.0.0.2"))
+
+    api.flush_pending_operations()
+
+    (bulk_request,) = elastic_server.calls("POST", "/_bulk")
+    assert bulk_values(bulk_request) == [["10.0.0.2"]]
+
+
+def test_all_the_observables_of_an_indicator_are_recreated(elastic_server, make_api):
+    connector = make_connector(make_api(batch_window=60))
+    connector.helper.get_attribute_in_extension = (
+        OpenCTIConnectorHelper.get_attribute_in_extension
+    )
+    indicator = {
+        "id": "indicator--1",
+        "type": "indicator",
+        "pattern_type": "stix",
+        "extensions": {
+            STIX_EXT_OCTI: {
+                "id": "opencti-id-1",
+                "observable_values": [
+                    {"type": "IPv4-Addr", "value": f"10.0.0.{index}"}
+                    for index in range(3)
+                ],
+            }
+        },
+    }
+    observables = connector._convert_indicator_to_observables(indicator)
+
+    connector._process_observable_batch(observables, "update")
+    connector.api.flush_pending_operations()
+
+    (delete_request,) = elastic_server.calls("POST", f"{INDEX}/_delete_by_query")
+    (bulk_request,) = elastic_server.calls("POST", "/_bulk")
+    assert len(deleted_doc_ids(delete_request)) == 1
+    assert sorted(bulk_values(bulk_request)) == [
+        ["10.0.0.0"],
+        ["10.0.0.1"],
+        ["10.0.0.2"],
+    ]
+
+
+def test_queued_operations_are_flushed_on_timer(elastic_server, make_api):
+    api = make_api(batch_window=0.1)
+    for index in range(3):
+        api.queue_indicator_update(make_observable(index))
+
+    assert wait_for(lambda: elastic_server.calls("POST", "/_bulk"))
+    assert len(elastic_server.calls("POST", f"{INDEX}/_delete_by_query")) == 1
+    assert len(bulk_values(elastic_server.calls("POST", "/_bulk")[0])) == 3
+    assert api._flush_timer is None
+
+
+def test_queued_operations_are_flushed_on_batch_size(elastic_server, make_api):
+    api = make_api(batch_window=60, batch_size=3)
+    for index in range(2):
+        api.queue_indicator_update(make_observable(index))
+    assert elastic_server.requests == []
+
+    api.queue_indicator_update(make_observable(2))
+
+    assert len(elastic_server.calls("POST", f"{INDEX}/_delete_by_query")) == 1
+    assert len(bulk_values(elastic_server.calls("POST", "/_bulk")[0])) == 3
+    assert api._pending_operations == {}
+    assert api._flush_timer is None
+
+
+def test_queued_operations_are_flushed_before_a_create(elastic_server, make_api):
+    connector = make_connector(make_api(batch_window=60))
+    connector._process_observable_batch(
+        [make_observable(1), make_observable(2)], "update"
+    )
+    assert elastic_server.requests == []
+
+    connector._process_observable_batch([make_observable(3)], "create")
+
+    assert [(method, path) for method, path, _, _ in elastic_server.requests] == [
+        ("POST", f"{INDEX}/_delete_by_query"),
+        ("POST", "/_bulk"),
+        ("POST", f"{INDEX}/_doc"),
+    ]
+
+
+def test_updates_are_sent_one_by_one_without_batch_window(elastic_server, make_api):
+    connector = make_connector(make_api(batch_window=0))
+
+    connector._process_observable_batch([make_observable(1)], "update")
+
+    assert [(method, path) for method, path, _, _ in elastic_server.requests] == [
+        ("POST", f"{INDEX}/_delete_by_query"),
+        ("POST", f"{INDEX}/_doc"),
+    ]
@@ -0,0 +1,97 @@
+from pycti import STIX_EXT_OCTI
+
+RULES = "/api/detection_engine/rules"
+FIND = "/api/detection_engine/rules/_find"
+
+
+def make_indicator(index, name="Indicator"):
+    return {
+        "id": f"indicator--{index}",
+        "type": "indicator",
+        "name": name,
+        "pattern": f"source.ip: 10.0.0.{index}",
+        "pattern_type": "kql",
+        "extensions": {STIX_EXT_OCTI: {"id": f"opencti-id-{index}"}},
+    }
+
+
+def test_rules_created_by_the_connector_are_loaded_page_by_page(
+    elastic_server, make_api
+):
+    elastic_server.siem_rules = [
+        {"id": f"rule-{index}", "meta": {"opencti_id": f"opencti-id-{index}"}}
+        for index in range(150)
+    ] + [{"id": "manual-rule", "meta": None}]
+    api = make_api()
+
+    api.load_siem_rule_ids()
+
+    assert [query["page"] for _, _, query, _ in elastic_server.calls("GET", FIND)] == [
+        ["1"],
+        ["2"],
+    ]
+    assert len(api._siem_rule_ids) == 150
+    assert api._siem_rule_ids["opencti-id-149"] == "rule-149"
+
+
+def test_loaded_rules_are_updated_without_find(elastic_server, make_api):
+    elastic_server.siem_rules = [
+        {"id": "rule-7", "meta": {"opencti_id": "opencti-id-7"}}
+    ]
+    api = make_api()
+    api.load_siem_rule_ids()
+    elastic_server.requests.clear()
+
+    assert api.process_indicator(make_indicator(7, "Updated"), "update")
+
+    assert elastic_server.calls("GET", FIND) == []
+    (update_request,) = elastic_server.calls("PUT", RULES)
+    assert '"id": "rule-7"' in update_request[3]
+
+
+def test_rules_created_by_the_connector_are_not_searched(elastic_server, make_api):
+    api = make_api()
+
+    for index in range(10):
+        assert api.process_indicator(make_indicator(index), "create")
+    for index in range(10):
+        assert api.process_indicator(make_indicator(index, "Updated"), "update")
+    for index in range(10):
+        assert api.process_indicator(make_indicator(index), "delete")
+
+    assert elastic_server.calls("GET", FIND) == []
+    assert len(elastic_server.calls("POST", RULES)) == 10
+    assert len(elastic_server.calls("PUT", RULES)) == 10
+    deleted_rules = [query["id"] for _, _, query, _ in elastic_server.calls("DELETE")]
+    assert deleted_rules == [[f"rule-{index + 1}"] for index in range(10)]
+    assert api._siem_rule_ids == {}
+
+
+def test_unknown_rule_is_searched_once(elastic_server, make_api):
+    elastic_server.responses[("GET", FIND)] = [(200, {"data": [{"id": "rule-x"}]})]
+    api = make_api()
+
+    api.process_indicator(make_indicator(1), "update")
+    api.process_indicator(make_indicator(1, "Updated"), "update")
+
+    (find_request,) = elastic_server.calls("GET", FIND)
+    assert find_request[2]["filter"] == [
+        'alert.attributes.references:"http://opencti/id/opencti-id-1"'
+    ]
+    assert len(elastic_server.calls("PUT", RULES)) == 2
+
+
+def test_rule_deleted_from_kibana_is_created_again(elastic_server, make_api):
+    api = make_api()
+    api.process_indicator(make_indicator(1), "create")
+    elastic_server.responses[("PUT", RULES)] = [(404, {"message": "Not found"})]
+
+    assert api.process_indicator(make_indicator(1, "Updated"), "update")
+
+    assert [
+        (method, path)
+        for method, path, _, _ in elastic_server.requests
+        if path.startswith(RULES)
+    ] == [("POST", RULES), ("PUT", RULES), ("POST", RULES)]
+    assert '"name": "OpenCTI: Updated"' in elastic_server.calls("POST", RULES)[1][3]
+    assert api._siem_rule_ids == {"opencti-id-1": "rule-2"}
@@ -52,7 +52,16 @@ class ConnectorClient:
         except HttpResponseError as err:
             raise ConnectorClientError(
                 message="[API] An error occurred during request",
-                metadata={"url_path": str(request), "error": str(err)},
+                metadata={
+                    "url_path": str(request),
+                    "error": str(err),
+                    "status_code": err.status_code,
+                    "retry_after": (
+                        err.response.headers.get("Retry-After")
+                        if err.response is not None
+                        else None
+                    ),
+                },
             ) from err
 
     def upload_stix_objects(
@@ -6,7 +6,7 @@ from base_connector.config import (
     StreamConnectorConfig,
 )
 from base_connector.enums import LogLevelType
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PositiveFloat, PositiveInt
 from pydantic_settings import SettingsConfigDict
 
 _FILE_PATH = os.path.dirname(os.path.abspath(__file__))
@@ -34,6 +34,8 @@ class _MicrosoftSentinelIntelConfig(BaseModel):
     extra_labels: ListFromString = Field(default=[])
     workspace_api_version: str = Field(default="2024-02-01-preview")
     management_api_version: str = Field(default="2025-03-01")
+    batch_size: PositiveInt = Field(default=100, le=100)
+    batch_timeout: PositiveFloat = Field(default=5.0)
 
 
 class ConnectorSettings(BaseConnectorSettings):
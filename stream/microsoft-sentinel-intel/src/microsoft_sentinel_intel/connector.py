@@ -1,17 +1,24 @@
 import json
 import sys
+import time
 import traceback
+from typing import Any, Callable
 
+from azure.core.exceptions import ServiceRequestError, ServiceResponseError
 from filigran_sseclient.sseclient import Event
 from microsoft_sentinel_intel.client import ConnectorClient
 from microsoft_sentinel_intel.config import ConnectorSettings
 from microsoft_sentinel_intel.errors import (
+    ConnectorClientError,
     ConnectorError,
     ConnectorWarning,
 )
 from microsoft_sentinel_intel.utils import is_stix_indicator
 from pycti import OpenCTIConnectorHelper
 
+# Maximum number of seconds to wait between two attempts of a failed request
+MAX_RETRY_DELAY = 60
+
 
 class Connector:
     def __init__(
@@ -23,6 +30,8 @@ class Connector:
         self.helper = helper
         self.config = config
         self.client = client
+        # STIX objects of the batch being processed, waiting to be uploaded
+        self._pending_objects: list[dict[str, Any]] = []
 
     def _prepare_stix_object(self, stix_object: dict) -> dict:
         if self.config.microsoft_sentinel_intel.delete_extensions:
@@ -35,21 +44,104 @@ class Connector:
 
         return stix_object
 
+    @staticmethod
+    def _is_transient_error(err: Exception) -> bool:
+        """Tell whether a failed request may succeed if sent again later."""
+        if isinstance(err, (ServiceRequestError, ServiceResponseError)):
+            return True
+        if isinstance(err, ConnectorClientError):
+            status_code = (err.metadata or {}).get("status_code")
+            return status_code in (408, 429) or (status_code or 0) >= 500
+        return False
+
+    def _send_with_retry(self, request: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Send a request to Sentinel until it succeeds.
+
+        Transient failures (throttling, server errors, connection errors) are retried
+        after the Retry-After delay or an exponential backoff, so that the batch is
+        never acknowledged while some of its objects are not sent.
+        Other errors are raised.
+        """
+        attempt = 0
+        while True:
+            try:
+                return request(*args, **kwargs)
+            except (
+                ConnectorClientError,
+                ServiceRequestError,
+                ServiceResponseError,
+            ) as err:
+                if not self._is_transient_error(err):
+                    raise
+                attempt += 1
+                metadata = getattr(err, "metadata", None) or {}
+                retry_after = metadata.get("retry_after") or min(
+                    2**attempt, MAX_RETRY_DELAY
+                )
+                self.helper.connector_logger.warning(
+                    message="[BATCH] Request to Sentinel failed, retrying later",
+                    meta={
+                        **metadata,
+                        "error": str(err),
+                        "retry_after": retry_after,
+                        "attempt": attempt,
+                    },
+                )
+                time.sleep(float(retry_after))
+
+    def _upload_stix_objects(self, stix_objects: list[dict[str, Any]]) -> None:
+        """
+        Upload STIX objects in a single call.
+
+        If Sentinel rejects the call, the objects are uploaded one by one so that
+        only the rejected objects are skipped.
+        """
+        try:
+            self._send_with_retry(
+                self.client.upload_stix_objects,
+                stix_objects=stix_objects,
+                source_system=self.config.microsoft_sentinel_intel.source_system,
+            )
+            self.helper.connector_logger.info(
+                message="[BATCH] STIX objects uploaded",
+                meta={"count": len(stix_objects)},
+            )
+        except ConnectorClientError as err:
+            if len(stix_objects) > 1:
+                for stix_object in stix_objects:
+                    self._upload_stix_objects([stix_object])
+                return
+            self.helper.connector_logger.error(
+                message="[BATCH] STIX object rejected by Sentinel, skipping...",
+                meta={**(err.metadata or {}), "stix_id": stix_objects[0]["id"]},
+            )
+
+    def _upload_pending_objects(self) -> None:
+        """Upload the pending STIX objects, `batch_size` objects per call."""
+        batch_size = self.config.microsoft_sentinel_intel.batch_size
+        while self._pending_objects:
+            self._upload_stix_objects(self._pending_objects[:batch_size])
+            del self._pending_objects[:batch_size]
+
     def _process_event(self, event_type: str, stix_object: dict) -> None:
         """
         This method can handle any type of event with the same logic (_prepare_stix_object)
 
         The API used (upload_stix_objects) to upload the stix objects to Sentinel can handle
           Indicators, AttackPatterns, Identity, ThreatActors and Relationships.
+        It accepts many objects per call, so created and updated objects are queued
+        and uploaded together at the end of the batch.
         """
         match event_type:
             case "create" | "update":
-                self.client.upload_stix_objects(
-                    stix_objects=[self._prepare_stix_object(stix_object)],
-                    source_system=self.config.microsoft_sentinel_intel.source_system,
-                )
+                self._pending_objects.append(self._prepare_stix_object(stix_object))
             case "delete":
-                self.client.delete_indicator_by_id(stix_object["id"])
+                # Upload pending objects first to keep the events order
+                self._upload_pending_objects()
+                self._send_with_retry(
+                    self.client.delete_indicator_by_id, stix_object["id"]
+                )
             case _:
                 raise ConnectorWarning(
                     message=f"Unsupported event type: {event_type}, Skipping..."
@@ -107,11 +199,29 @@ class Connector:
                 meta={"error": str(err)},
             )
 
+    def process_batch(self, batch_data: dict[str, Any]) -> None:
+        """
+        Process a batch of messages accumulated by the pycti batch callback wrapper.
+        The wrapper advances the stream checkpoint once this method returns, so every
+        object of the batch is uploaded (or deliberately skipped) before returning.
+        :param batch_data: Dictionary with the batched `events` and `batch_metadata`
+        """
+        for message in batch_data["events"]:
+            self.process_message(message)
+        self._upload_pending_objects()
+
     def run(self) -> None:
         """
         Run the main process in self.helper.listen() method
         The method continuously monitors messages from the platform
         The connector have the capability to listen a live stream from the platform.
         The helper provide an easy way to listen to the events.
+        Messages are accumulated and processed in batches of `batch_size` messages
+        or after `batch_timeout` seconds.
         """
-        self.helper.listen_stream(message_callback=self.process_message)
+        batch_callback = self.helper.create_batch_callback(
+            self.process_batch,
+            batch_size=self.config.microsoft_sentinel_intel.batch_size,
+            batch_timeout=self.config.microsoft_sentinel_intel.batch_timeout,
+        )
+        self.helper.listen_stream(message_callback=batch_callback)
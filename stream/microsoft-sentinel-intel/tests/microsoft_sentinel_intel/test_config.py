@@ -16,7 +16,7 @@ def test_config() -> None:
     assert config["connector"]["live_stream_id"] == "live-stream-id"
 
     microsoft_sentinel_intel = config["microsoft_sentinel_intel"]
-    assert len(microsoft_sentinel_intel) == 12
+    assert len(microsoft_sentinel_intel) == 14
     assert microsoft_sentinel_intel["client_id"] == "ChangeMe"
     assert microsoft_sentinel_intel["client_secret"] == "ChangeMe"
     assert microsoft_sentinel_intel["delete_extensions"] == True
@@ -29,3 +29,5 @@ def test_config() -> None:
     assert microsoft_sentinel_intel["workspace_api_version"] == "2024-02-01-preview"
     assert microsoft_sentinel_intel["workspace_id"] == "ChangeMe"
     assert microsoft_sentinel_intel["workspace_name"] == "ChangeMe"
+    assert microsoft_sentinel_intel["batch_size"] == 100
+    assert microsoft_sentinel_intel["batch_timeout"] == 5.0
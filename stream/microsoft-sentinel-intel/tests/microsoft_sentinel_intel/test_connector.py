@@ -5,6 +5,7 @@ import pytest
 from filigran_sseclient.sseclient import Event
 from microsoft_sentinel_intel import ConnectorClient
 from microsoft_sentinel_intel.config import ConnectorSettings
+from microsoft_sentinel_intel.errors import ConnectorClientError
 from pycti import OpenCTIConnectorHelper
 from pytest_mock import MockerFixture
 from src.microsoft_sentinel_intel import Connector
@@ -56,6 +57,7 @@ def test_handle_event_create(
     connector._handle_event(
         Event(event="create", data=json.dumps({"data": event_data_indicator}))
     )
+    connector._upload_pending_objects()
 
     event_data_indicator.pop("extensions")  # as delete_extensions is True
     event_data_indicator["labels"] = ["label"]  # labels in config
@@ -112,3 +114,173 @@ def test_handle_event_delete(
         "/providers/Microsoft.SecurityInsights/threatIntelligence/main"
         "/indicators/SentinelId?api-version=2025-03-01"
     )
+
+
+def make_batch(events: list[Event]) -> dict:
+    return {
+        "events": events,
+        "batch_metadata": {"batch_size": len(events), "trigger_reason": "test"},
+    }
+
+
+def make_create_event(event_data_indicator: dict, index: int) -> Event:
+    return Event(
+        event="create",
+        data=json.dumps({"data": {**event_data_indicator, "id": f"id-{index}"}}),
+        id=f"{index}-0",
+    )
+
+
+@pytest.mark.usefixtures("mock_microsoft_sentinel_intel_config")
+def test_run_uses_batch_callback(mocker: MockerFixture, connector: Connector) -> None:
+    mocked_create_batch_callback = mocker.patch.object(
+        connector.helper, "create_batch_callback"
+    )
+    mocked_listen_stream = mocker.patch.object(connector.helper, "listen_stream")
+
+    connector.run()
+
+    mocked_create_batch_callback.assert_called_once_with(
+        connector.process_batch, batch_size=100, batch_timeout=5.0
+    )
+    mocked_listen_stream.assert_called_once_with(
+        message_callback=mocked_create_batch_callback.return_value
+    )
+
+
+@pytest.mark.usefixtures("mock_microsoft_sentinel_intel_config")
+def test_process_batch_uploads_in_batches(
+    mocker: MockerFixture, connector: Connector, event_data_indicator: dict
+) -> None:
+    mocked_send_request = mocker.patch(
+        "microsoft_sentinel_intel.client.PipelineClient.send_request",
+        return_value=Mock(status_code=200),
+    )
+
+    connector.process_batch(
+        make_batch([make_create_event(event_data_indicator, i) for i in range(250)])
+    )
+
+    sizes = [
+        len(json.loads(call.kwargs["request"].body)["stixobjects"])
+        for call in mocked_send_request.call_args_list
+    ]
+    assert sizes == [100, 100, 50]  # batches of at most batch_size objects
+    assert not connector._pending_objects
+
+
+@pytest.mark.usefixtures("mock_microsoft_sentinel_intel_config")
+def test_process_batch_uploads_pending_objects_before_delete(
+    mocker: MockerFixture, connector: Connector, event_data_indicator: dict
+) -> None:
+    calls = []
+    mocker.patch.object(
+        connector.client,
+        "upload_stix_objects",
+        side_effect=lambda stix_objects, source_system: calls.append(
+            ("upload", [stix_object["id"] for stix_object in stix_objects])
+        ),
+    )
+    mocker.patch.object(
+        connector.client,
+        "delete_indicator_by_id",
+        side_effect=lambda indicator_id: calls.append(("delete", indicator_id)),
+    )
+
+    connector.process_batch(
+        make_batch(
+            [
+                make_create_event(event_data_indicator, 0),
+                Event(
+                    event="delete",
+                    data=json.dumps({"data": {**event_data_indicator, "id": "id-0"}}),
+                    id="1-0",
+                ),
+                make_create_event(event_data_indicator, 2),
+            ]
+        )
+    )
+
+    assert calls == [
+        ("upload", ["id-0"]),
+        ("delete", "id-0"),
+        ("upload", ["id-2"]),
+    ]
+
+
+@pytest.mark.usefixtures("mock_microsoft_sentinel_intel_config")
+def test_process_batch_retries_when_throttled(
+    mocker: MockerFixture, connector: Connector, event_data_indicator: dict
+) -> None:
+    mocked_sleep = mocker.patch("microsoft_sentinel_intel.connector.time.sleep")
+    mocked_upload = mocker.patch.object(
+        connector.client,
+        "upload_stix_objects",
+        side_effect=[
+            ConnectorClientError(
+                message="Throttled", metadata={"status_code": 429, "retry_after": "3"}
+            ),
+            Mock(status_code=200),
+        ],
+    )
+
+    connector.process_batch(make_batch([make_create_event(event_data_indicator, 0)]))
+
+    assert mocked_upload.call_count == 2
+    mocked_sleep.assert_called_once_with(3.0)
+
+
+@pytest.mark.usefixtures("mock_microsoft_sentinel_intel_config")
+def test_process_batch_retries_failed_upload_until_it_succeeds(
+    mocker: MockerFixture, connector: Connector, event_data_indicator: dict
+) -> None:
+    mocked_sleep = mocker.patch("microsoft_sentinel_intel.connector.time.sleep")
+    mocked_upload = mocker.patch.object(
+        connector.client,
+        "upload_stix_objects",
+        side_effect=[
+            ConnectorClientError(message="Error", metadata={"status_code": 500}),
+            ConnectorClientError(message="Error", metadata={"status_code": 502}),
+            Mock(status_code=200),
+        ],
+    )
+
+    connector.process_batch(
+        make_batch([make_create_event(event_data_indicator, i) for i in range(3)])
+    )
+
+    # The same objects are sent again, nothing is dropped
+    assert mocked_upload.call_count == 3
+    uploaded_ids = [
+        [stix_object["id"] for stix_object in call.kwargs["stix_objects"]]
+        for call in mocked_upload.call_args_list
+    ]
+    assert uploaded_ids == [["id-0", "id-1", "id-2"]] * 3
+    assert [call.args[0] for call in mocked_sleep.call_args_list] == [2.0, 4.0]
+    assert not connector._pending_objects
+
+
+@pytest.mark.usefixtures("mock_microsoft_sentinel_intel_config")
+def test_process_batch_skips_only_rejected_objects(
+    mocker: MockerFixture, connector: Connector, event_data_indicator: dict
+) -> None:
+    def upload_stix_objects(stix_objects: list[dict], source_system: str) -> Mock:
+        if any(stix_object["id"] == "id-1" for stix_object in stix_objects):
+            raise ConnectorClientError(
+                message="Bad request", metadata={"status_code": 400}
+            )
+        return Mock(status_code=200)
+
+    mocked_upload = mocker.patch.object(
+        connector.client, "upload_stix_objects", side_effect=upload_stix_objects
+    )
+
+    connector.process_batch(
+        make_batch([make_create_event(event_data_indicator, i) for i in range(3)])
+    )
+
+    uploaded_ids = [
+        [stix_object["id"] for stix_object in call.kwargs["stix_objects"]]
+        for call in mocked_upload.call_args_list
+    ]
+    assert uploaded_ids == [["id-0", "id-1", "id-2"], ["id-0"], ["id-1"], ["id-2"]]
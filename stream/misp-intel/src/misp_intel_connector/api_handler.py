@@ -230,18 +230,21 @@ class MispApiHandler:
             if "date" in event_data:
                 existing_event.date = event_data["date"]
 
-            # Clear existing attributes and objects to replace with new ones
-            # Note: We need to delete objects individually from MISP
-            for obj in existing_event.objects:
-                try:
-                    # Delete each object from MISP
-                    self.misp.delete_object(obj)
-                except:
-                    pass  # Object might already be deleted
-
-            # Now clear the lists
+            # Diff the existing attributes and objects against the new ones:
+            # only what disappeared is deleted, only what is new is sent
+            existing_attributes = {
+                self._attribute_key(attr): attr for attr in existing_event.attributes
+            }
+            existing_objects = {
+                self._object_key(obj): obj for obj in existing_event.objects
+            }
+
+            # Only the new and changed attributes and objects are sent to MISP,
+            # the ones left out of the update are kept as they are
             existing_event.attributes = []
             existing_event.objects = []
+            seen_attributes = set()
+            seen_objects = set()
 
             # Add new tags (keeping existing ones)
             if "Tag" in event_data:
@@ -250,23 +253,42 @@ class MispApiHandler:
                     if tag.name not in existing_tags:
                         existing_event.add_tag(tag)
 
-            # Add new attributes
-            if "Attribute" in event_data:
-                for attr_data in event_data["Attribute"]:
+            # Add new attributes, and update the changed ones
+            for attr_data in event_data.get("Attribute", []):
+                key = self._attribute_key(attr_data)
+                new_values = {
+                    "category": attr_data.get("category", "Other"),
+                    "to_ids": attr_data.get("to_ids", False),
+                    "comment": attr_data.get("comment", ""),
+                }
+                if key in existing_attributes:
+                    attr = existing_attributes.pop(key)
+                    current_values = {
+                        "category": attr.get("category"),
+                        "to_ids": bool(attr.get("to_ids")),
+                        "comment": attr.get("comment") or "",
+                    }
+                    if current_values != new_values:
+                        for name, value in new_values.items():
+                            setattr(attr, name, value)
+                        existing_event.attributes.append(attr)
+                elif key not in seen_attributes:
                     existing_event.add_attribute(
                         type=attr_data.get("type"),
                         value=attr_data.get("value"),
-                        category=attr_data.get("category", "Other"),
-                        to_ids=attr_data.get("to_ids", False),
-                        comment=attr_data.get("comment", ""),
                         distribution=attr_data.get(
                             "distribution", self.config.misp.distribution_level
                         ),
+                        **new_values,
                     )
+                seen_attributes.add(key)
 
             # Add new objects
-            if "Object" in event_data:
-                for obj_data in event_data["Object"]:
+            for obj_data in event_data.get("Object", []):
+                key = self._object_key(obj_data)
+                if key in existing_objects:
+                    existing_objects.pop(key)
+                elif key not in seen_objects:
                     misp_obj = MISPObject(name=obj_data.get("name"))
                     misp_obj.comment = obj_data.get("comment", "")
                     misp_obj.distribution = obj_data.get(
@@ -284,6 +306,19 @@ class MispApiHandler:
                         )
 
                     existing_event.add_object(misp_obj)
+                seen_objects.add(key)
+
+            # Delete the attributes and objects that disappeared
+            for attr in existing_attributes.values():
+                try:
+                    self.misp.delete_attribute(attr)
+                except:
+                    pass  # Attribute might already be deleted
+            for obj in existing_objects.values():
+                try:
+                    self.misp.delete_object(obj)
+                except:
+                    pass  # Object might already be deleted
 
             # Update the event in MISP
             response = self.misp.update_event(existing_event)
@@ -312,6 +347,30 @@ class MispApiHandler:
             )
             raise MispApiHandlerError(f"Event update failed: {str(e)}")
 
+    @staticmethod
+    def _attribute_key(attribute) -> tuple:
+        """
+        Get the key identifying an attribute in an event: its type and value
+
+        :param attribute: MISPAttribute or attribute data dictionary
+        :return: Attribute key
+        """
+        return str(attribute.get("type")), str(attribute.get("value"))
+
+    @classmethod
+    def _object_key(cls, misp_object) -> tuple:
+        """
+        Get the key identifying an object in an event: its name and attributes
+
+        :param misp_object: MISPObject or object data dictionary
+        :return: Object key
+        """
+        attributes = misp_object.get("Attribute", [])
+        return str(misp_object.get("name")), frozenset(
+            (attr.get("object_relation"), *cls._attribute_key(attr))
+            for attr in attributes
+        )
+
     def delete_event(self, event_uuid: str, hard: bool = False) -> bool:
         """
         Delete a MISP event
@@ -8,8 +8,9 @@ creating, updating, and deleting MISP events from OpenCTI containers
 
 import queue
 import threading
+import time
 import traceback
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from pycti import OpenCTIConnectorHelper
 
@@ -49,6 +50,12 @@ class MispIntelConnector:
         self.worker_thread = None
         self.stop_worker = threading.Event()
 
+        # Create/update events waiting for the end of their debounce window,
+        # by container ID. Bursts of updates on a container are merged into one
+        # resolution and one MISP write, based on the most recent event.
+        self.pending_events: Dict[str, Dict] = {}
+        self.pending_events_lock = threading.Lock()
+
         # Test connection on startup
         if not self.api.test_connection():
             self.helper.connector_logger.warning(
@@ -357,59 +364,154 @@ class MispIntelConnector:
             )
             return False
 
+    def _debounce_event(
+        self, event_type: str, container_data: Dict, container_id: str
+    ) -> None:
+        """
+        Add a create/update event to the pending events, merging it with the pending
+        event of the same container if any
+        :param event_type: Event type (create or update)
+        :param container_data: Container STIX data from stream
+        :param container_id: OpenCTI container ID
+        :return: None
+        """
+        with self.pending_events_lock:
+            pending_event = self.pending_events.get(container_id)
+            if pending_event is None:
+                self.pending_events[container_id] = {
+                    "event_type": event_type,
+                    "container_data": container_data,
+                    "due_time": time.monotonic() + self.config.misp.debounce_window,
+                    "count": 1,
+                }
+                return
+
+            # Keep the most recent data. An update also handles containers
+            # which don't exist yet in MISP, so it prevails over a create.
+            if event_type == "update":
+                pending_event["event_type"] = "update"
+            pending_event["container_data"] = container_data
+            pending_event["count"] += 1
+
+        self.helper.connector_logger.debug(
+            f"Merged {event_type} event with the pending event of the container",
+            {"container_id": container_id, "merged_events": pending_event["count"]},
+        )
+
+    def _pop_due_events(self, flush: bool = False) -> List[tuple]:
+        """
+        Remove the pending events whose debounce window is over
+        :param flush: Whether to remove all the pending events
+        :return: List of (container ID, pending event) tuples
+        """
+        now = time.monotonic()
+        with self.pending_events_lock:
+            due_container_ids = [
+                container_id
+                for container_id, pending_event in self.pending_events.items()
+                if flush or pending_event["due_time"] <= now
+            ]
+            return [
+                (container_id, self.pending_events.pop(container_id))
+                for container_id in due_container_ids
+            ]
+
+    def _get_queue_timeout(self) -> float:
+        """
+        Get how long to wait for a queue item, up to the end of the next debounce window
+        :return: Timeout in seconds
+        """
+        with self.pending_events_lock:
+            if not self.pending_events:
+                return 1
+            next_due_time = min(
+                pending_event["due_time"]
+                for pending_event in self.pending_events.values()
+            )
+        return min(1, max(0, next_due_time - time.monotonic()))
+
+    def _discard_pending_event(self, container_id: str) -> None:
+        """
+        Discard the pending event of a container, e.g. when the container is deleted
+        :param container_id: OpenCTI container ID
+        :return: None
+        """
+        with self.pending_events_lock:
+            pending_event = self.pending_events.pop(container_id, None)
+        if pending_event is not None:
+            for _ in range(pending_event["count"]):
+                self.work_queue.task_done()
+
+    def _process_pending_event(self, container_id: str, pending_event: Dict) -> None:
+        """
+        Create or update the MISP event of a container
+        :param container_id: OpenCTI container ID
+        :param pending_event: Pending event of the container
+        :return: None
+        """
+        event_type = pending_event["event_type"]
+        container_data = pending_event["container_data"]
+        try:
+            self.helper.connector_logger.info(
+                f"Worker processing {event_type} for container {container_id}",
+                {"merged_events": pending_event["count"]},
+            )
+
+            # Process the event based on type
+            if event_type == "create":
+                self._create_misp_event(container_data)
+
+            elif event_type == "update":
+                # Use container_id directly as MISP UUID (since we set it during creation)
+                misp_event_uuid = container_id
+
+                # Check if the event exists in MISP
+                existing_event = self.api.get_event_by_uuid(misp_event_uuid)
+                if existing_event:
+                    self._update_misp_event(container_data, misp_event_uuid)
+                else:
+                    # If no existing event, create a new one
+                    self.helper.connector_logger.info(
+                        f"No existing MISP event found for {container_id}, creating new event"
+                    )
+                    self._create_misp_event(container_data)
+
+        except Exception as e:
+            self.helper.connector_logger.error(
+                f"Worker thread error: {str(e)}",
+                {"trace": traceback.format_exc()},
+            )
+            # Continue processing even if one item fails
+
+        finally:
+            # Mark the merged tasks as done
+            for _ in range(pending_event["count"]):
+                self.work_queue.task_done()
+
     def _worker_process_queue(self) -> None:
         """
         Worker thread that processes items from the queue.
         This runs in a separate thread to avoid stream timeouts.
+        Events are processed at the end of their container debounce window.
         """
         self.helper.connector_logger.info("Worker thread started")
 
         while not self.stop_worker.is_set():
+            # Get item from queue with timeout to check stop signal
             try:
-                # Get item from queue with timeout to check stop signal
-                try:
-                    event_type, container_data, container_id = self.work_queue.get(
-                        timeout=1
-                    )
-                except queue.Empty:
-                    continue
-
-                self.helper.connector_logger.info(
-                    f"Worker processing {event_type} for container {container_id}"
+                event_type, container_data, container_id = self.work_queue.get(
+                    timeout=self._get_queue_timeout()
                 )
+                self._debounce_event(event_type, container_data, container_id)
+            except queue.Empty:
+                pass
 
-                # Process the event based on type
-                if event_type == "create":
-                    self._create_misp_event(container_data)
+            for container_id, pending_event in self._pop_due_events():
+                self._process_pending_event(container_id, pending_event)
 
-                elif event_type == "update":
-                    # Use container_id directly as MISP UUID (since we set it during creation)
-                    misp_event_uuid = container_id
-
-                    # Check if the event exists in MISP
-                    existing_event = self.api.get_event_by_uuid(misp_event_uuid)
-                    if existing_event:
-                        self._update_misp_event(container_data, misp_event_uuid)
-                    else:
-                        # If no existing event, create a new one
-                        self.helper.connector_logger.info(
-                            f"No existing MISP event found for {container_id}, creating new event"
-                        )
-                        self._create_misp_event(container_data)
-
-                # Mark task as done
-                self.work_queue.task_done()
-
-            except Exception as e:
-                self.helper.connector_logger.error(
-                    f"Worker thread error: {str(e)}",
-                    {"trace": traceback.format_exc()},
-                )
-                # Continue processing even if one item fails
-                try:
-                    self.work_queue.task_done()
-                except:
-                    pass
+        # Don't leave the pending events behind
+        for container_id, pending_event in self._pop_due_events(flush=True):
+            self._process_pending_event(container_id, pending_event)
 
         self.helper.connector_logger.info("Worker thread stopped")
 
@@ -490,6 +592,9 @@ class MispIntelConnector:
                     {"container_id": container_id},
                 )
 
+                # Drop the pending create/update, so it doesn't recreate the event
+                self._discard_pending_event(container_id)
+
                 # Delete the MISP event using container_id as UUID
                 self._delete_misp_event(container_id)
             else:
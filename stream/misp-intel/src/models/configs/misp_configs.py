@@ -64,6 +64,16 @@ class _ConfigLoaderMisp(ConfigBaseSettings):
         description="Automatically publish events when updated.",
     )
 
+    debounce_window: int = Field(
+        default=5,
+        ge=0,
+        alias="MISP_DEBOUNCE_WINDOW",
+        description=(
+            "Seconds during which the create and update events of a container "
+            "are merged into one MISP write (0 to disable)."
+        ),
+    )
+
     # Tagging configuration
     tag_opencti: bool = Field(
         default=True,
@@ -0,0 +1,200 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from misp_intel_connector.api_handler import MispApiHandler
+from pymisp import MISPEvent, MISPObject
+
+EVENT_UUID = "5d2f0c3c-1b0a-4a4e-9e0e-6f2a1c0d9a11"
+
+
+class FakePyMISP:
+    """PyMISP stub storing one event and recording the calls."""
+
+    def __init__(self, event):
+        self.event = event
+        self.calls = []
+        self.updated_event = None
+
+    def get_event(self, event_uuid, pythonify=False):
+        self.calls.append("get_event")
+        event = MISPEvent()
+        event.from_dict(**self.event.to_dict())
+        return event
+
+    def update_event(self, event):
+        self.calls.append("update_event")
+        self.updated_event = event
+        return {"Event": {"id": "1", "uuid": EVENT_UUID}}
+
+    def delete_attribute(self, attribute):
+        self.calls.append("delete_attribute")
+
+    def delete_object(self, misp_object):
+        self.calls.append("delete_object")
+
+
+def attribute_data(index, **values):
+    return {
+        "type": "ip-dst",
+        "value": f"10.0.{index // 256}.{index % 256}",
+        "category": "Network activity",
+        "to_ids": True,
+        "comment": "",
+        **values,
+    }
+
+
+def object_data(*attributes):
+    return {
+        "name": "file",
+        "Attribute": [
+            {"object_relation": relation, "type": attr_type, "value": value}
+            for relation, attr_type, value in attributes
+        ],
+    }
+
+
+def make_event(attributes, objects=()):
+    event = MISPEvent()
+    event.uuid = EVENT_UUID
+    event.info = "Report"
+    event.distribution = 0
+    event.threat_level_id = 4
+    event.analysis = 2
+    for attr in attributes:
+        event.add_attribute(**attr)
+    for obj in objects:
+        misp_obj = MISPObject(name=obj["name"])
+        for obj_attr in obj["Attribute"]:
+            misp_obj.add_attribute(
+                object_relation=obj_attr["object_relation"],
+                simple_value=obj_attr["value"],
+                type=obj_attr["type"],
+            )
+        event.add_object(misp_obj)
+    return event
+
+
+@pytest.fixture
+def make_handler():
+    def _make_handler(event):
+        handler = MispApiHandler.__new__(MispApiHandler)
+        handler.helper = MagicMock()
+        handler.config = SimpleNamespace(
+            misp=SimpleNamespace(distribution_level=0, owner_org=None)
+        )
+        handler.misp = FakePyMISP(event)
+        return handler
+
+    return _make_handler
+
+
+def test_changing_one_attribute_of_a_large_event_sends_only_this_attribute(
+    make_handler,
+):
+    attributes = [attribute_data(index) for index in range(1000)]
+    handler = make_handler(make_event(attributes))
+    attributes[500] = attribute_data(500, comment="Updated")
+
+    result = handler.update_event(
+        EVENT_UUID, {"info": "Report", "Attribute": attributes}
+    )
+
+    assert result == {"id": "1", "uuid": EVENT_UUID}
+    assert handler.misp.calls == ["get_event", "update_event"]
+    (sent_attribute,) = handler.misp.updated_event.attributes
+    assert sent_attribute.value == attributes[500]["value"]
+    assert sent_attribute.comment == "Updated"
+    assert handler.misp.updated_event.objects == []
+
+
+def test_unchanged_event_sends_no_attribute_nor_object(make_handler):
+    attributes = [attribute_data(index) for index in range(10)]
+    objects = [object_data(("filename", "filename", "a.exe"), ("md5", "md5", "a" * 32))]
+    handler = make_handler(make_event(attributes, objects))
+
+    handler.update_event(
+        EVENT_UUID, {"info": "Report", "Attribute": attributes, "Object": objects}
+    )
+
+    assert handler.misp.calls == ["get_event", "update_event"]
+    assert handler.misp.updated_event.attributes == []
+    assert handler.misp.updated_event.objects == []
+
+
+@pytest.mark.parametrize(
+    "changed_values",
+    [
+        {"category": "Payload delivery"},
+        {"to_ids": False},
+        {"comment": "Updated"},
+    ],
+)
+def test_attribute_changes_are_detected(make_handler, changed_values):
+    attributes = [attribute_data(index) for index in range(3)]
+    handler = make_handler(make_event(attributes))
+    attributes[1] = attribute_data(1, **changed_values)
+
+    handler.update_event(EVENT_UUID, {"Attribute": attributes})
+
+    (sent_attribute,) = handler.misp.updated_event.attributes
+    assert sent_attribute.value == attributes[1]["value"]
+    for name, value in changed_values.items():
+        assert sent_attribute.get(name) == value
+
+
+def test_removed_attributes_and_objects_are_deleted(make_handler):
+    attributes = [attribute_data(index) for index in range(3)]
+    objects = [object_data(("filename", "filename", "a.exe"))]
+    handler = make_handler(make_event(attributes, objects))
+
+    handler.update_event(EVENT_UUID, {"Attribute": attributes[:2], "Object": []})
+
+    assert sorted(handler.misp.calls) == [
+        "delete_attribute",
+        "delete_object",
+        "get_event",
+        "update_event",
+    ]
+    assert handler.misp.updated_event.attributes == []
+
+
+def test_new_attributes_and_objects_are_added(make_handler):
+    handler = make_handler(make_event([attribute_data(0)]))
+    objects = [object_data(("filename", "filename", "a.exe"))]
+
+    handler.update_event(
+        EVENT_UUID,
+        {"Attribute": [attribute_data(0), attribute_data(1)], "Object": objects},
+    )
+
+    (sent_attribute,) = handler.misp.updated_event.attributes
+    assert sent_attribute.value == attribute_data(1)["value"]
+    (sent_object,) = handler.misp.updated_event.objects
+    assert sent_object.name == "file"
+    assert "delete_attribute" not in handler.misp.calls
+
+
+def test_object_key_ignores_the_attributes_order():
+    first = object_data(("filename", "filename", "a.exe"), ("md5", "md5", "a" * 32))
+    second = object_data(("md5", "md5", "a" * 32), ("filename", "filename", "a.exe"))
+    third = object_data(("filename", "filename", "b.exe"), ("md5", "md5", "a" * 32))
+    misp_object = make_event([], [second]).objects[0]
+
+    assert MispApiHandler._object_key(first) == MispApiHandler._object_key(second)
+    assert MispApiHandler._object_key(first) == MispApiHandler._object_key(misp_object)
+    assert MispApiHandler._object_key(first) != MispApiHandler._object_key(third)
+
+
+def test_reordered_object_attributes_are_not_resent(make_handler):
+    objects = [object_data(("filename", "filename", "a.exe"), ("md5", "md5", "a" * 32))]
+    handler = make_handler(make_event([], objects))
+    reordered = [
+        object_data(("md5", "md5", "a" * 32), ("filename", "filename", "a.exe"))
+    ]
+
+    handler.update_event(EVENT_UUID, {"Object": reordered})
+
+    assert handler.misp.calls == ["get_event", "update_event"]
+    assert handler.misp.updated_event.objects == []
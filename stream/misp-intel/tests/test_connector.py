@@ -0,0 +1,152 @@
+import json
+import queue
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from misp_intel_connector.connector import MispIntelConnector
+from pycti import STIX_EXT_OCTI, OpenCTIConnectorHelper
+
+CONTAINER_ID = "report--8c7a5a3e-1f6f-4b6a-9d8e-0a2b3c4d5e6f"
+
+
+def make_report(name="Report"):
+    return {
+        "id": CONTAINER_ID,
+        "type": "report",
+        "name": name,
+        "extensions": {STIX_EXT_OCTI: {"id": CONTAINER_ID}},
+    }
+
+
+def make_message(event_type, data):
+    return SimpleNamespace(id="1-0", event=event_type, data=json.dumps({"data": data}))
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def make_connector():
+    connectors = []
+
+    def _make_connector(debounce_window):
+        connector = MispIntelConnector.__new__(MispIntelConnector)
+        connector.config = SimpleNamespace(
+            misp=SimpleNamespace(
+                url="http://misp", debounce_window=debounce_window, hard_delete=False
+            )
+        )
+        connector.helper = MagicMock()
+        connector.helper.get_attribute_in_extension = (
+            OpenCTIConnectorHelper.get_attribute_in_extension
+        )
+        connector.helper.api.stix2.get_stix_bundle_or_object_from_entity_id.return_value = {
+            "objects": [make_report()]
+        }
+        connector.api = MagicMock()
+        connector.work_queue = queue.Queue(maxsize=100)
+        connector.stop_worker = threading.Event()
+        connector.pending_events = {}
+        connector.pending_events_lock = threading.Lock()
+        connector.worker_thread = None
+        connectors.append(connector)
+        return connector
+
+    with patch(
+        "misp_intel_connector.connector.convert_stix_bundle_to_misp_event",
+        side_effect=lambda bundle, *args, **kwargs: {"info": "Report"},
+    ):
+        yield _make_connector
+
+    for connector in connectors:
+        connector.stop_worker.set()
+        if connector.worker_thread:
+            connector.worker_thread.join(timeout=5)
+
+
+def start_worker(connector):
+    connector.worker_thread = threading.Thread(
+        target=connector._worker_process_queue, daemon=True
+    )
+    connector.worker_thread.start()
+
+
+def test_queued_updates_are_merged_into_one_misp_write(make_connector):
+    connector = make_connector(debounce_window=0.1)
+    for index in range(50):
+        connector._process_message(make_message("update", make_report(f"v{index}")))
+
+    start_worker(connector)
+    connector.work_queue.join()
+
+    fetch = connector.helper.api.stix2.get_stix_bundle_or_object_from_entity_id
+    assert fetch.call_count == 1
+    connector.api.get_event_by_uuid.assert_called_once_with(CONTAINER_ID)
+    connector.api.update_event.assert_called_once()
+    connector.api.create_event.assert_not_called()
+    assert connector.pending_events == {}
+
+
+def test_merged_events_keep_the_most_recent_data(make_connector):
+    connector = make_connector(debounce_window=0.1)
+    connector._process_message(make_message("create", make_report("First")))
+    connector._process_message(make_message("update", make_report("Last")))
+
+    with patch.object(connector, "_update_misp_event") as update_misp_event:
+        start_worker(connector)
+        connector.work_queue.join()
+
+    update_misp_event.assert_called_once_with(make_report("Last"), CONTAINER_ID)
+
+
+def test_every_merged_item_is_marked_as_done(make_connector):
+    connector = make_connector(debounce_window=0.1)
+    connector.work_queue.task_done = MagicMock(wraps=connector.work_queue.task_done)
+    for index in range(5):
+        connector._process_message(make_message("update", make_report(f"v{index}")))
+
+    start_worker(connector)
+    connector.work_queue.join()
+
+    assert connector.work_queue.task_done.call_count == 5
+    assert connector.work_queue.unfinished_tasks == 0
+
+
+def test_failed_merged_items_are_marked_as_done(make_connector):
+    connector = make_connector(debounce_window=0.1)
+    connector.api.get_event_by_uuid.side_effect = Exception("MISP unavailable")
+    for index in range(3):
+        connector._process_message(make_message("update", make_report(f"v{index}")))
+
+    start_worker(connector)
+    connector.work_queue.join()
+
+    assert connector.work_queue.unfinished_tasks == 0
+
+
+def test_delete_discards_the_pending_event(make_connector):
+    connector = make_connector(debounce_window=60)
+    connector.helper.api.stix_domain_object.read.return_value = None
+    for index in range(3):
+        connector._process_message(make_message("update", make_report(f"v{index}")))
+    start_worker(connector)
+    assert wait_for(
+        lambda: connector.pending_events.get(CONTAINER_ID, {}).get("count") == 3
+    )
+
+    connector._process_message(make_message("delete", make_report()))
+    connector.work_queue.join()
+    connector.stop_worker.set()
+    connector.worker_thread.join(timeout=5)
+
+    assert connector.pending_events == {}
+    connector.api.delete_event.assert_called_once_with(CONTAINER_ID, hard=False)
+    connector.api.update_event.assert_not_called()
+    connector.api.create_event.assert_not_called()
@@ -13,6 +13,9 @@ import yaml
 from pycti import OpenCTIConnectorHelper, get_config_variable
 from stix_shifter.stix_translation import stix_translation
 
+# Number of reference set entries per page when loading the collections
+SET_ENTRIES_PAGE_SIZE = 1000
+
 
 def fix_loggers() -> None:
     logging.getLogger(
@@ -58,8 +61,17 @@ class QRadarConnector:
         )
         self.headers = {"SEC": self.qradar_token}
 
+        # Shared session, to reuse the connections to QRadar
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.verify = self.qradar_ssl_verify
+
+        # Entry IDs of the OpenCTI objects, by (collection set ID, OpenCTI ID)
+        self.set_entries = {}
+
         try:
             self._initialize_reference_sets()
+            self._initialize_set_entries()
         except Exception as ex:
             self.helper.connector_logger.error(
                 "Unable to initialize collection sets, shutting down { "
@@ -127,9 +139,7 @@ class QRadarConnector:
         }
 
         # Initialize OpenCTI collection sets
-        r = requests.get(
-            url=self.base_url_sets, headers=self.headers, verify=self.qradar_ssl_verify
-        )
+        r = self.session.get(url=self.base_url_sets)
         r.raise_for_status()
         data = r.json()
         for key in self.collection_sets.keys():
@@ -139,21 +149,75 @@ class QRadarConnector:
                     self.collection_sets[key]["qradar_id"] = collection_set["id"]
                     already_exist = True
             if not already_exist:
-                r = requests.post(
+                r = self.session.post(
                     url=self.base_url_sets,
                     json={
                         "name": self.collection_sets[key]["name"],
                         "entry_type": self.collection_sets[key]["type"],
                     },
-                    headers=self.headers,
-                    verify=self.qradar_ssl_verify,
                 )
                 r.raise_for_status()
                 result = r.json()
                 self.collection_sets[key]["qradar_id"] = result["id"]
 
+    def _initialize_set_entries(self):
+        """
+        Load the entry IDs of the OpenCTI objects of each collection set
+        :return:
+        """
+        for collection_set in self.collection_sets.values():
+            collection_set_id = collection_set["qradar_id"]
+            start = 0
+            try:
+                while True:
+                    r = self.session.get(
+                        url=self.base_url_set_entries,
+                        params={
+                            "filter": "collection_id=" + str(collection_set_id),
+                            "fields": "id,notes",
+                        },
+                        headers={
+                            "Range": "items="
+                            + str(start)
+                            + "-"
+                            + str(start + SET_ENTRIES_PAGE_SIZE - 1)
+                        },
+                    )
+                    r.raise_for_status()
+                    entries = r.json()
+                    for entry in entries:
+                        if entry.get("notes"):
+                            self.set_entries.setdefault(
+                                (collection_set_id, entry["notes"]), entry["id"]
+                            )
+                    if len(entries) < SET_ENTRIES_PAGE_SIZE:
+                        break
+                    start += SET_ENTRIES_PAGE_SIZE
+            except Exception as ex:
+                # The entries left out of the index are searched when needed
+                self.helper.connector_logger.warning(
+                    "Unable to load the entries of collection set { "
+                    + collection_set["name"]
+                    + " }, continuing with a partial index { "
+                    + str(ex)
+                    + " }"
+                )
+        self.helper.connector_logger.info(
+            "Loaded reference set entries { " + str(len(self.set_entries)) + " }"
+        )
+
+    def _resolve_entry_id(self, collection_set_id, internal_id):
+        entry_id = self.set_entries.get((collection_set_id, internal_id))
+        if entry_id is None:
+            # Not created by this connector since its start, search it
+            resolved_object = self._search_object(collection_set_id, internal_id)
+            if resolved_object is not None:
+                entry_id = resolved_object["id"]
+                self.set_entries[(collection_set_id, internal_id)] = entry_id
+        return entry_id
+
     def _search_object(self, collection_set_id, internal_id):
-        r = requests.get(
+        r = self.session.get(
             url=self.base_url_set_entries,
             params={
                 "filter": "collection_id="
@@ -162,8 +226,6 @@ class QRadarConnector:
                 + internal_id
                 + '"'
             },
-            headers=self.headers,
-            verify=self.qradar_ssl_verify,
         )
         r.raise_for_status()
         result = r.json()
@@ -172,6 +234,30 @@ class QRadarConnector:
         else:
             return None
 
+    def _send_entry_request(self, method, collection_set_id, internal_id, **kwargs):
+        """
+        Send a request on the reference set entry of an OpenCTI object
+        :return: The response, or None if the entry does not exist
+        """
+        indexed = (collection_set_id, internal_id) in self.set_entries
+        entry_id = self._resolve_entry_id(collection_set_id, internal_id)
+        if entry_id is None:
+            return None
+        r = self.session.request(
+            method, url=self.base_url_set_entries + "/" + str(entry_id), **kwargs
+        )
+        if r.status_code == 404 and indexed:
+            # Entry removed from QRadar since it was indexed, search it again
+            self.set_entries.pop((collection_set_id, internal_id), None)
+            entry_id = self._resolve_entry_id(collection_set_id, internal_id)
+            if entry_id is None:
+                return None
+            r = self.session.request(
+                method, url=self.base_url_set_entries + "/" + str(entry_id), **kwargs
+            )
+        r.raise_for_status()
+        return r
+
     def _create_object(self, collection_set_id, data):
         internal_id = OpenCTIConnectorHelper.get_attribute_in_extension("id", data)
         try:
@@ -188,13 +274,14 @@ class QRadarConnector:
                 "source": source,
                 "value": data["value"],
             }
-            r = requests.post(
+            r = self.session.post(
                 url=self.base_url_set_entries,
                 json=body,
-                headers=self.headers,
-                verify=self.qradar_ssl_verify,
             )
             r.raise_for_status()
+            self.set_entries.setdefault(
+                (collection_set_id, internal_id), r.json()["id"]
+            )
         except Exception as ex:
             self.helper.connector_logger.error(
                 "[Creating] Failed processing data { " + str(ex) + " }"
@@ -203,28 +290,20 @@ class QRadarConnector:
     def _update_object(self, collection_set_id, data):
         internal_id = OpenCTIConnectorHelper.get_attribute_in_extension("id", data)
         try:
-            resolved_object = self._search_object(collection_set_id, internal_id)
-            if resolved_object is not None:
-                external_references = OpenCTIConnectorHelper.get_attribute_in_extension(
-                    "external_references", data
-                )
-                if external_references is not None and len(external_references) > 0:
-                    source = "OpenCTI - " + external_references[0]["source_name"]
-                else:
-                    source = "OpenCTI"
-                body = {
-                    "collection_id": collection_set_id,
-                    "notes": internal_id,
-                    "source": source,
-                    "value": data["value"],
-                }
-                r = requests.post(
-                    url=self.base_url_set_entries + "/" + str(resolved_object["id"]),
-                    json=body,
-                    headers=self.headers,
-                    verify=self.qradar_ssl_verify,
-                )
-                r.raise_for_status()
+            external_references = OpenCTIConnectorHelper.get_attribute_in_extension(
+                "external_references", data
+            )
+            if external_references is not None and len(external_references) > 0:
+                source = "OpenCTI - " + external_references[0]["source_name"]
+            else:
+                source = "OpenCTI"
+            body = {
+                "collection_id": collection_set_id,
+                "notes": internal_id,
+                "source": source,
+                "value": data["value"],
+            }
+            self._send_entry_request("POST", collection_set_id, internal_id, json=body)
         except Exception as ex:
             self.helper.connector_logger.error(
                 "[Updating] Failed processing data { " + str(ex) + " }"
@@ -233,14 +312,8 @@ class QRadarConnector:
     def _delete_object(self, collection_set_id, data):
         internal_id = OpenCTIConnectorHelper.get_attribute_in_extension("id", data)
         try:
-            resolved_object = self._search_object(collection_set_id, internal_id)
-            if resolved_object is not None:
-                r = requests.delete(
-                    url=self.base_url_set_entries + "/" + str(resolved_object["id"]),
-                    headers=self.headers,
-                    verify=self.qradar_ssl_verify,
-                )
-                r.raise_for_status()
+            self._send_entry_request("DELETE", collection_set_id, internal_id)
+            self.set_entries.pop((collection_set_id, internal_id), None)
         except Exception as ex:
             self.helper.connector_logger.error(
                 "[Deleting] Failed processing data { " + str(ex) + " }"
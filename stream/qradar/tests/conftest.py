@@ -0,0 +1,152 @@
+import json
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from qradar import QRadarConnector  # noqa: E402
+
+SETS_PATH = "/api/reference_data_collections/sets"
+SET_ENTRIES_PATH = "/api/reference_data_collections/set_entries"
+
+
+class QRadarServer:
+    """
+    Local QRadar reference data API stub recording the requests.
+    The collection sets whose ID is in `failing_collection_ids` fail to be listed.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.collection_sets = []
+        self.entries = {}
+        self.failing_collection_ids = set()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                with server._lock:
+                    server.requests.append((self.command, url.path))
+                    status, payload = server.handle(
+                        self.command,
+                        url.path,
+                        parse_qs(url.query),
+                        self.headers.get("Range"),
+                        body,
+                    )
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_DELETE = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+
+    def new_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def add_entry(self, collection_id, notes, value="10.0.0.1"):
+        entry_id = self.new_id()
+        self.entries[entry_id] = {
+            "id": entry_id,
+            "collection_id": collection_id,
+            "notes": notes,
+            "value": value,
+        }
+        return entry_id
+
+    def handle(self, method, path, query, range_header, body):
+        if path == SETS_PATH:
+            if method == "POST":
+                collection_set = {"id": self.new_id(), "name": body["name"]}
+                self.collection_sets.append(collection_set)
+                return 201, collection_set
+            return 200, self.collection_sets
+        if path == SET_ENTRIES_PATH:
+            if method == "POST":
+                return 201, {"id": self.add_entry(body["collection_id"], body["notes"])}
+            match = re.fullmatch(
+                r'collection_id=(\d+)(?: and notes="(.*)")?', query["filter"][0]
+            )
+            collection_id, notes = int(match.group(1)), match.group(2)
+            if collection_id in self.failing_collection_ids:
+                return 500, {"message": "Internal error"}
+            entries = [
+                entry
+                for entry in self.entries.values()
+                if entry["collection_id"] == collection_id
+                and (notes is None or entry["notes"] == notes)
+            ]
+            if range_header:
+                first, last = map(int, range_header[len("items=") :].split("-"))
+                entries = entries[first : last + 1]
+            return 200, entries
+        entry_id = int(path[len(SET_ENTRIES_PATH) + 1 :])
+        if entry_id not in self.entries:
+            return 404, {"message": "Entry not found"}
+        if method == "DELETE":
+            return 202, self.entries.pop(entry_id)
+        self.entries[entry_id].update(body)
+        return 200, self.entries[entry_id]
+
+    def calls(self):
+        """Return the recorded requests and forget them."""
+        with self._lock:
+            calls, self.requests = self.requests, []
+        return calls
+
+    def shutdown(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def qradar_server():
+    server = QRadarServer()
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def make_connector(qradar_server):
+    def _make_connector():
+        connector = QRadarConnector.__new__(QRadarConnector)
+        connector.helper = MagicMock()
+        connector.qradar_reference_name = "OpenCTI"
+        connector.base_url_sets = qradar_server.url + SETS_PATH
+        connector.base_url_set_entries = qradar_server.url + SET_ENTRIES_PATH
+        connector.session = requests.Session()
+        connector.set_entries = {}
+        connector._initialize_reference_sets()
+        connector._initialize_set_entries()
+        return connector
+
+    return _make_connector
@@ -0,0 +1,153 @@
+import json
+from types import SimpleNamespace
+
+import qradar
+from pycti import STIX_EXT_OCTI
+
+from .conftest import SET_ENTRIES_PATH
+
+IPV4_SET_NAME = "OpenCTI - IPv4 Addresses"
+
+
+def make_message(event, index, value="10.0.0.1"):
+    data = {
+        "id": f"ipv4-addr--{index}",
+        "type": "ipv4-addr",
+        "value": value,
+        "extensions": {STIX_EXT_OCTI: {"id": f"opencti-id-{index}"}},
+    }
+    return SimpleNamespace(event=event, data=json.dumps({"data": data}))
+
+
+def add_ipv4_set(qradar_server):
+    collection_set_id = qradar_server.new_id()
+    qradar_server.collection_sets.append(
+        {"id": collection_set_id, "name": IPV4_SET_NAME}
+    )
+    return collection_set_id
+
+
+def test_update_and_delete_send_one_request(qradar_server, make_connector):
+    collection_set_id = add_ipv4_set(qradar_server)
+    entry_id = qradar_server.add_entry(collection_set_id, "opencti-id-1")
+    connector = make_connector()
+    qradar_server.calls()
+
+    connector._process_message(make_message("update", 1, "10.0.0.2"))
+    assert qradar_server.calls() == [("POST", f"{SET_ENTRIES_PATH}/{entry_id}")]
+    assert qradar_server.entries[entry_id]["value"] == "10.0.0.2"
+
+    connector._process_message(make_message("delete", 1))
+    assert qradar_server.calls() == [("DELETE", f"{SET_ENTRIES_PATH}/{entry_id}")]
+    assert connector.set_entries == {}
+
+
+def test_created_entries_are_indexed(qradar_server, make_connector):
+    connector = make_connector()
+    qradar_server.calls()
+
+    connector._process_message(make_message("create", 1))
+    connector._process_message(make_message("update", 1, "10.0.0.2"))
+
+    (entry_id,) = qradar_server.entries
+    assert qradar_server.calls() == [
+        ("POST", SET_ENTRIES_PATH),
+        ("POST", f"{SET_ENTRIES_PATH}/{entry_id}"),
+    ]
+
+
+def test_set_entries_are_loaded_page_by_page(
+    qradar_server, make_connector, monkeypatch
+):
+    monkeypatch.setattr(qradar, "SET_ENTRIES_PAGE_SIZE", 2)
+    collection_set_id = add_ipv4_set(qradar_server)
+    entry_ids = [
+        qradar_server.add_entry(collection_set_id, f"opencti-id-{index}")
+        for index in range(5)
+    ]
+
+    connector = make_connector()
+
+    assert connector.set_entries == {
+        (collection_set_id, f"opencti-id-{index}"): entry_id
+        for index, entry_id in enumerate(entry_ids)
+    }
+
+
+def test_entries_out_of_the_index_are_searched(qradar_server, make_connector):
+    connector = make_connector()
+    collection_set_id = connector.collection_sets["ipv4-addr"]["qradar_id"]
+    entry_id = qradar_server.add_entry(collection_set_id, "opencti-id-1")
+    qradar_server.calls()
+
+    connector._process_message(make_message("update", 1, "10.0.0.2"))
+
+    assert qradar_server.calls() == [
+        ("GET", SET_ENTRIES_PATH),
+        ("POST", f"{SET_ENTRIES_PATH}/{entry_id}"),
+    ]
+    assert connector.set_entries[(collection_set_id, "opencti-id-1")] == entry_id
+
+
+def test_update_of_a_stale_entry_searches_it_again(qradar_server, make_connector):
+    collection_set_id = add_ipv4_set(qradar_server)
+    stale_entry_id = qradar_server.add_entry(collection_set_id, "opencti-id-1")
+    connector = make_connector()
+    # The entry is recreated in QRadar behind the connector's back
+    del qradar_server.entries[stale_entry_id]
+    entry_id = qradar_server.add_entry(collection_set_id, "opencti-id-1")
+    qradar_server.calls()
+
+    connector._process_message(make_message("update", 1, "10.0.0.2"))
+
+    assert qradar_server.calls() == [
+        ("POST", f"{SET_ENTRIES_PATH}/{stale_entry_id}"),
+        ("GET", SET_ENTRIES_PATH),
+        ("POST", f"{SET_ENTRIES_PATH}/{entry_id}"),
+    ]
+    assert qradar_server.entries[entry_id]["value"] == "10.0.0.2"
+    assert connector.set_entries[(collection_set_id, "opencti-id-1")] == entry_id
+    connector.helper.connector_logger.error.assert_not_called()
+
+
+def test_delete_of_a_removed_entry_searches_it_again(qradar_server, make_connector):
+    collection_set_id = add_ipv4_set(qradar_server)
+    entry_id = qradar_server.add_entry(collection_set_id, "opencti-id-1")
+    connector = make_connector()
+    del qradar_server.entries[entry_id]
+    qradar_server.calls()
+
+    connector._process_message(make_message("delete", 1))
+
+    assert qradar_server.calls() == [
+        ("DELETE", f"{SET_ENTRIES_PATH}/{entry_id}"),
+        ("GET", SET_ENTRIES_PATH),
+    ]
+    assert connector.set_entries == {}
+    connector.helper.connector_logger.error.assert_not_called()
+
+
+def test_failed_set_entries_loading_keeps_a_partial_index(
+    qradar_server, make_connector
+):
+    collection_set_id = add_ipv4_set(qradar_server)
+    entry_id = qradar_server.add_entry(collection_set_id, "opencti-id-1")
+    qradar_server.failing_collection_ids.add(collection_set_id)
+
+    connector = make_connector()
+
+    connector.helper.connector_logger.warning.assert_called_once()
+    assert connector.set_entries == {}
+    assert all(
+        collection_set["qradar_id"] is not None
+        for collection_set in connector.collection_sets.values()
+    )
+
+    # The entries left out of the index are still found
+    qradar_server.failing_collection_ids.clear()
+    qradar_server.calls()
+    connector._process_message(make_message("delete", 1))
+    assert qradar_server.calls() == [
+        ("GET", SET_ENTRIES_PATH),
+        ("DELETE", f"{SET_ENTRIES_PATH}/{entry_id}"),
+    ]
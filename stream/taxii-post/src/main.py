@@ -10,6 +10,9 @@ import requests
 import yaml
 from pycti import OpenCTIConnectorHelper, get_config_variable
 
+# Maximum number of seconds to wait between two attempts of a failed post
+MAX_RETRY_DELAY = 60
+
 
 def parse_version(version) -> Tuple[int, int, int]:
     """
@@ -71,80 +74,128 @@ class TaxiiPostConnector:
         self.taxii_stix_version = get_config_variable(
             "TAXII_STIX_VERSION", ["taxii", "stix_version"], config
         )
+        self.taxii_batch_size = get_config_variable(
+            "TAXII_BATCH_SIZE", ["taxii", "batch_size"], config, True, 100
+        )
+        self.taxii_batch_timeout = get_config_variable(
+            "TAXII_BATCH_TIMEOUT", ["taxii", "batch_timeout"], config, True, 5
+        )
 
-    def _process_message(self, msg):
-        try:
-            data = json.loads(msg.data)["data"]
-        except:
-            raise ValueError("Cannot process the message")
-        self.helper.log_info("Processing the object " + data["id"])
-        url = (
+        self.url = (
             self.taxii_url
             + "/root/collections/"
             + self.taxii_collection_id
             + "/objects/"
         )
-        headers = {
-            "Content-Type": media_type_by_version(self.taxii_stix_version),
-            "Accept": media_type_by_version(self.taxii_version),
+        # Attributes removed from the objects before posting them
+        self.stripped_keys = {"object_marking_refs", "created_by_ref"}
+        if self.taxii_stix_version != "2.1":
+            self.stripped_keys |= {
+                "extensions",
+                "spec_version",
+                "revoked",
+                "confidence",
+                "lang",
+                "pattern_type",
+                "pattern_version",
+                "is_family",
+            }
+
+        # Shared session, to reuse the connections to the TAXII server
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "Content-Type": media_type_by_version(self.taxii_stix_version),
+                "Accept": media_type_by_version(self.taxii_version),
+            }
+        )
+        if self.taxii_token is not None:
+            self.session.headers["Authorization"] = "Bearer " + self.taxii_token
+        else:
+            self.session.auth = (self.taxii_login, self.taxii_password)
+        self.session.verify = self.taxii_ssl_verify
+
+    def _prepare_object(self, data):
+        data_object = {
+            key: value for key, value in data.items() if key not in self.stripped_keys
         }
-        try:
-            data_object = data
+        if self.taxii_stix_version == "2.1":
             data_object["spec_version"] = self.taxii_stix_version
-            if "object_marking_refs" in data_object:
-                del data_object["object_marking_refs"]
-            if "created_by_ref" in data_object:
-                del data_object["created_by_ref"]
-            if self.taxii_stix_version != "2.1":
-                del data_object["extensions"]
-                if "spec_version" in data_object:
-                    del data_object["spec_version"]
-                if "revoked" in data_object:
-                    del data_object["revoked"]
-                if "confidence" in data_object:
-                    del data_object["confidence"]
-                if "lang" in data_object:
-                    del data_object["lang"]
-                if "pattern_type" in data_object:
-                    del data_object["pattern_type"]
-                if "pattern_version" in data_object:
-                    del data_object["pattern_version"]
-                if "is_family" in data_object:
-                    del data_object["is_family"]
-            bundle = {
-                "type": "bundle",
-                "spec_version": self.taxii_stix_version,
-                "id": "bundle--" + str(uuid.uuid4()),
-                "objects": [data_object],
-            }
-            if self.taxii_token is not None:
-                self.helper.log_info("Posting to TAXII URL (using token): " + url)
-                self.helper.log_info(str(bundle))
-                headers["Authorization"] = "Bearer " + self.taxii_token
-                response = requests.post(
-                    url,
-                    headers=headers,
-                    json=bundle,
-                    verify=self.taxii_ssl_verify,
+        return data_object
+
+    def _post_objects(self, objects):
+        bundle = {
+            "type": "bundle",
+            "spec_version": self.taxii_stix_version,
+            "id": "bundle--" + str(uuid.uuid4()),
+            "objects": objects,
+        }
+        self.helper.log_info(
+            "Posting " + str(len(objects)) + " objects to TAXII URL: " + self.url
+        )
+        response = self.session.post(self.url, json=bundle)
+        response.raise_for_status()
+        self.helper.log_info("TAXII Response: " + str(response.content))
+
+    def _post_with_retry(self, objects):
+        """
+        Post the objects until the TAXII server accepts them.
+        If the server rejects the envelope, the objects are posted one by one
+        so that only the rejected objects are skipped.
+        """
+        attempt = 0
+        while True:
+            try:
+                self._post_objects(objects)
+                return
+            except requests.RequestException as e:
+                status_code = getattr(e.response, "status_code", None)
+                rejected = (
+                    status_code is not None
+                    and 400 <= status_code < 500
+                    and status_code not in (408, 429)
                 )
-                response.raise_for_status()
-            else:
-                self.helper.log_info("Posting to TAXII URL (using basic auth): " + url)
-                self.helper.log_info(str(bundle))
-                response = requests.post(
-                    url,
-                    headers=headers,
-                    auth=(self.taxii_login, self.taxii_password),
-                    json=bundle,
-                    verify=self.taxii_ssl_verify,
+                if rejected:
+                    if len(objects) > 1:
+                        for data_object in objects:
+                            self._post_with_retry([data_object])
+                    else:
+                        self.helper.log_error(
+                            "Object " + objects[0]["id"] + " rejected: " + str(e)
+                        )
+                    return
+                attempt += 1
+                delay = min(2**attempt, MAX_RETRY_DELAY)
+                self.helper.log_error(
+                    str(e) + ", retrying in " + str(delay) + " seconds"
                 )
-                response.raise_for_status()
-            self.helper.log_info("TAXII Response: " + str(response.content))
-        except Exception as e:
-            self.helper.log_error(str(e))
+                time.sleep(delay)
+
+    def _process_batch(self, batch_data):
+        """
+        Post the objects of a batch of stream messages, up to `taxii_batch_size`
+        objects per envelope. The batch callback wrapper of the helper only moves
+        the stream state forward once this method returns.
+        """
+        objects = []
+        for msg in batch_data["events"]:
+            try:
+                data = json.loads(msg.data)["data"]
+            except:
+                self.helper.log_error("Cannot process the message " + str(msg.id))
+                continue
+            self.helper.log_info("Processing the object " + data["id"])
+            objects.append(self._prepare_object(data))
+        for index in range(0, len(objects), self.taxii_batch_size):
+            self._post_with_retry(objects[index : index + self.taxii_batch_size])
 
     def start(self):
-        self.helper.listen_stream(self._process_message)
+        batch_callback = self.helper.create_batch_callback(
+            self._process_batch,
+            batch_size=self.taxii_batch_size,
+            batch_timeout=self.taxii_batch_timeout,
+        )
+        self.helper.listen_stream(batch_callback)
 
 
 if __name__ == "__main__":
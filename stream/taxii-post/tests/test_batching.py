@@ -0,0 +1,168 @@
+import json
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+import requests
+from src.main import TaxiiPostConnector
+
+
+@pytest.fixture
+def taxii_server():
+    """
+    Local TAXII server stub recording the posted envelopes.
+    The status codes queued in `statuses` are answered first, then 202.
+    """
+    envelopes = []
+    statuses = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            envelopes.append(json.loads(body))
+            self.send_response(statuses.pop(0) if statuses else 202)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", envelopes, statuses
+    server.shutdown()
+
+
+def make_connector(monkeypatch, url, batch_size, stix_version="2.1"):
+    monkeypatch.setenv("TAXII_URL", url)
+    monkeypatch.setenv("TAXII_COLLECTION_ID", "collection")
+    monkeypatch.setenv("TAXII_TOKEN", "token")
+    monkeypatch.setenv("TAXII_VERSION", "2.1")
+    monkeypatch.setenv("TAXII_STIX_VERSION", stix_version)
+    monkeypatch.setenv("TAXII_BATCH_SIZE", str(batch_size))
+    with mock.patch("src.main.OpenCTIConnectorHelper"):
+        connector = TaxiiPostConnector()
+    return connector
+
+
+def make_message(index):
+    data = {
+        "id": f"indicator--{index}",
+        "type": "indicator",
+        "spec_version": "2.1",
+        "created_by_ref": "identity--1",
+        "object_marking_refs": ["marking-definition--1"],
+        "pattern_type": "stix",
+        "extensions": {},
+    }
+    return mock.Mock(data=json.dumps({"data": data}), id=f"{index}-0")
+
+
+def make_batch(count):
+    return {
+        "events": [make_message(index) for index in range(count)],
+        "batch_metadata": {"batch_size": count, "trigger_reason": "test"},
+    }
+
+
+def posted_ids(envelopes):
+    return [[obj["id"] for obj in envelope["objects"]] for envelope in envelopes]
+
+
+def test_start_listens_with_batch_callback(monkeypatch, taxii_server):
+    url, _, _ = taxii_server
+    connector = make_connector(monkeypatch, url, batch_size=10)
+
+    connector.start()
+
+    connector.helper.create_batch_callback.assert_called_once_with(
+        connector._process_batch, batch_size=10, batch_timeout=5
+    )
+    connector.helper.listen_stream.assert_called_once_with(
+        connector.helper.create_batch_callback.return_value
+    )
+
+
+@pytest.mark.parametrize("count, batch_size", [(25, 10), (30, 10), (3, 100)])
+def test_objects_are_posted_in_envelopes_of_batch_size(
+    monkeypatch, taxii_server, count, batch_size
+):
+    url, envelopes, _ = taxii_server
+    connector = make_connector(monkeypatch, url, batch_size)
+
+    connector._process_batch(make_batch(count))
+
+    assert len(envelopes) == math.ceil(count / batch_size)
+    assert sum(posted_ids(envelopes), []) == [
+        f"indicator--{index}" for index in range(count)
+    ]
+
+
+def test_failed_post_is_retried_before_next_envelope(monkeypatch, taxii_server):
+    url, envelopes, statuses = taxii_server
+    statuses.extend([503, 500])
+    connector = make_connector(monkeypatch, url, batch_size=2)
+
+    with mock.patch("src.main.time.sleep") as mocked_sleep:
+        connector._process_batch(make_batch(3))
+
+    # The failed envelope is posted again until accepted, then the next one
+    assert posted_ids(envelopes) == [
+        ["indicator--0", "indicator--1"],
+        ["indicator--0", "indicator--1"],
+        ["indicator--0", "indicator--1"],
+        ["indicator--2"],
+    ]
+    assert [call.args[0] for call in mocked_sleep.call_args_list] == [2, 4]
+
+
+def test_connection_error_is_retried(monkeypatch):
+    connector = make_connector(monkeypatch, "http://127.0.0.1:1", batch_size=10)
+    connector._post_objects = mock.Mock(
+        side_effect=[requests.ConnectionError("refused"), None]
+    )
+
+    with mock.patch("src.main.time.sleep"):
+        connector._process_batch(make_batch(1))
+
+    assert connector._post_objects.call_count == 2
+    connector.helper.log_error.assert_called_once()
+
+
+def test_rejected_envelope_only_skips_rejected_objects(monkeypatch, taxii_server):
+    url, envelopes, statuses = taxii_server
+    # The envelope is rejected, then the second object alone
+    statuses.extend([400, 202, 400, 202])
+    connector = make_connector(monkeypatch, url, batch_size=10)
+
+    connector._process_batch(make_batch(3))
+
+    assert posted_ids(envelopes) == [
+        ["indicator--0", "indicator--1", "indicator--2"],
+        ["indicator--0"],
+        ["indicator--1"],
+        ["indicator--2"],
+    ]
+    connector.helper.log_error.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "stix_version, expected_keys",
+    [
+        ("2.1", {"id", "type", "spec_version", "pattern_type", "extensions"}),
+        ("2.0", {"id", "type"}),
+    ],
+)
+def test_attributes_are_stripped_by_stix_version(
+    monkeypatch, taxii_server, stix_version, expected_keys
+):
+    url, envelopes, _ = taxii_server
+    connector = make_connector(monkeypatch, url, 10, stix_version=stix_version)
+
+    connector._process_batch(make_batch(1))
+
+    assert set(envelopes[0]["objects"][0]) == expected_keys
@@ -35,6 +35,8 @@ if __name__ == "__main__":
             zscaler_password=vars["zscaler_password"],
             zscaler_api_key=vars["zscaler_api_key"],
             zscaler_blacklist_name=vars["zscaler_blacklist_name"],
+            zscaler_batch_size=vars["zscaler_batch_size"],
+            zscaler_flush_interval=vars["zscaler_flush_interval"],
         )
 
         connector.authenticate_with_zscaler()
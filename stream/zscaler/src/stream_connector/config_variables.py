@@ -55,6 +55,20 @@ def load_config_variables(helper, config):
         config,
         default="BLACK_LIST_DYNDNS",
     )
+    zscaler_batch_size = get_config_variable(
+        "ZSCALER_BATCH_SIZE",
+        ["zscaler", "batch_size"],
+        config,
+        isNumber=True,
+        default=100,
+    )
+    zscaler_flush_interval = get_config_variable(
+        "ZSCALER_FLUSH_INTERVAL",
+        ["zscaler", "flush_interval"],
+        config,
+        isNumber=True,
+        default=30,
+    )
 
     return {
         "opencti_url": opencti_url,
@@ -72,4 +86,6 @@ def load_config_variables(helper, config):
         "zscaler_password": zscaler_password,
         "zscaler_api_key": zscaler_api_key,
         "zscaler_blacklist_name": zscaler_blacklist_name,  # Parameter for the blacklist name
+        "zscaler_batch_size": zscaler_batch_size,
+        "zscaler_flush_interval": zscaler_flush_interval,
     }
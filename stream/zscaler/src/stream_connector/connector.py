@@ -1,5 +1,6 @@
 import json
 import re
+import threading
 import time
 
 import requests
@@ -29,6 +30,8 @@ class ZscalerConnector:
         zscaler_password,
         zscaler_api_key,
         zscaler_blacklist_name,
+        zscaler_batch_size=100,
+        zscaler_flush_interval=30,
     ):
         self.helper = helper
         self.helper.connector_logger.info("Initializing Zscaler connector...")
@@ -54,6 +57,18 @@ class ZscalerConnector:
         self.rate_limit = 400  # Limit to 400 requests per hour
         self.retry_delay = 65  # Retry delay in seconds
 
+        # Local mirror of the blacklist, loaded once and updated on each flush
+        self.batch_size = int(zscaler_batch_size)
+        self.flush_interval = int(zscaler_flush_interval)
+        self.blocked_domains = None
+        self.configured_name = None
+        self.pending_additions = set()
+        self.pending_removals = set()
+        # Domains of the flush in progress, not reflected in the mirror yet
+        self.in_flight_domains = set()
+        self.pending_lock = threading.Lock()
+        self.flush_event = threading.Event()
+
     def authenticate_with_zscaler(self):
         """Authenticate with Zscaler and obtain a session token."""
         self.helper.connector_logger.info("Authenticating with Zscaler...")
@@ -158,35 +173,8 @@ class ZscalerConnector:
         self.helper.connector_logger.error(f"Invalid domain provided: {pattern}")
         return None
 
-    def get_domain_classification_in_zscaler(self, domain):
-        """Retrieve the classification of a domain in Zscaler via the urlLookup API."""
-        session_cookie = self.get_zscaler_session_cookie()
-
-        headers = {
-            "Content-Type": "application/json",
-            "Cookie": f"JSESSIONID={session_cookie}",
-        }
-
-        lookup_url = "https://zsapi.zscalertwo.net/api/v1/urlLookup"
-        payload = json.dumps([domain])
-
-        response = self.handle_rate_limit(
-            requests.post, lookup_url, headers=headers, data=payload
-        )
-
-        msg = f"=== Checking domain {domain} ==="
-        self.helper.connector_logger.debug(msg)
-        if response and response.status_code == 200:
-            lookup_data = response.json()
-            if isinstance(lookup_data, list) and len(lookup_data) > 0:
-                return lookup_data[0].get("urlClassifications", [])
-        self.helper.connector_logger.error(
-            f"Failed to lookup domain {domain} in Zscaler."
-        )
-        return None
-
     def get_zscaler_blocked_domains(self):
-        """Retrieve the list of blocked domains in the specified Zscaler blacklist."""
+        """Retrieve the list of blocked domains in the specified Zscaler blacklist, None on failure."""
 
         session_cookie = self.get_zscaler_session_cookie()
         headers = {
@@ -205,7 +193,7 @@ class ZscalerConnector:
 
         msg = f"Failed to retrieve blocked domains: {code} - {text}"
         self.helper.connector_logger.error(msg)
-        return []
+        return None
 
     def get_current_configured_name(self):
         session_cookie = self.get_zscaler_session_cookie()
@@ -219,37 +207,99 @@ class ZscalerConnector:
             return response.json().get("configuredName")
         return None
 
+    def load_blocked_domains(self):
+        """Load the local mirror of the blacklist and its configured name from Zscaler.
+
+        If the blacklist cannot be retrieved, the previous mirror is kept.
+        """
+        domains = self.get_zscaler_blocked_domains()
+        configured_name = self.get_current_configured_name()
+        with self.pending_lock:
+            if configured_name is not None:
+                self.configured_name = configured_name
+            if domains is None:
+                if self.blocked_domains is None:
+                    self.blocked_domains = set()
+                self.helper.connector_logger.warning(
+                    f"Keeping the previous mirror of {len(self.blocked_domains)} domains."
+                )
+                return
+            self.blocked_domains = set(domains)
+        self.helper.connector_logger.info(
+            f"Loaded {len(domains)} domains from the Zscaler blacklist."
+        )
+
     def check_and_send_to_zscaler(self, data, event_type):
-        """Verify if a domain is already blocked and its classification before sending to Zscaler."""
+        """Queue a domain addition or removal if it changes the mirrored blacklist."""
         domain = self.is_valid_domain(data["pattern"])
-        if domain:
-            classification = self.get_domain_classification_in_zscaler(domain)
-            if classification:
-                msg = f"Classification found for {domain}: {classification}"
-                self.helper.connector_logger.info(msg)
-
-            blocked_domains = self.get_zscaler_blocked_domains()
-
-            if domain in blocked_domains:
-                msg = f"The domain {domain} is already in the Blacklist."
-                self.helper.connector_logger.info(msg)
-            else:
-                msg = f"Sending domain {domain} to Zscaler..."
-                self.helper.connector_logger.info(msg)
-                self.send_to_zscaler(domain, event_type)
-        else:
+        if not domain:
             msg = f"Invalid domain pattern: {data['pattern']}"
             self.helper.connector_logger.error(msg)
+            return
+
+        if self.blocked_domains is None:
+            self.load_blocked_domains()
+
+        with self.pending_lock:
+            # The mirror is outdated for a domain being flushed, always queue its latest event
+            in_flight = domain in self.in_flight_domains
+            if event_type == "create":
+                self.pending_removals.discard(domain)
+                if domain in self.blocked_domains and not in_flight:
+                    msg = f"The domain {domain} is already in the Blacklist."
+                    self.helper.connector_logger.info(msg)
+                    return
+                self.pending_additions.add(domain)
+            elif event_type == "delete":
+                self.pending_additions.discard(domain)
+                if domain not in self.blocked_domains and not in_flight:
+                    msg = f"The domain {domain} is not in the Blacklist."
+                    self.helper.connector_logger.info(msg)
+                    return
+                self.pending_removals.add(domain)
+            else:
+                msg = "Unsupported event type."
+                self.helper.connector_logger.error(msg)
+                return
+            pending_count = len(self.pending_additions) + len(self.pending_removals)
+
+        msg = f"Queued {event_type} of domain {domain} for Zscaler."
+        self.helper.connector_logger.info(msg)
+        if pending_count >= self.batch_size:
+            self.flush_event.set()
 
-    def send_to_zscaler(self, domain, event_type):
-        """Send creation or deletion events to Zscaler."""
+    def log_domains_classification(self, domains):
+        """Log the Zscaler classification of the given domains, 100 per urlLookup call."""
         session_cookie = self.get_zscaler_session_cookie()
         headers = {
             "Content-Type": "application/json",
             "Cookie": f"JSESSIONID={session_cookie}",
         }
+        lookup_url = "https://zsapi.zscalertwo.net/api/v1/urlLookup"
 
-        real_configured_name = self.get_current_configured_name()
+        for i in range(0, len(domains), 100):
+            chunk = domains[i : i + 100]
+            response = self.handle_rate_limit(
+                requests.post, lookup_url, headers=headers, data=json.dumps(chunk)
+            )
+            if not (response and response.status_code == 200):
+                self.helper.connector_logger.error(
+                    f"Failed to lookup {len(chunk)} domains in Zscaler."
+                )
+                continue
+            for lookup in response.json():
+                classification = lookup.get("urlClassifications", [])
+                if classification:
+                    msg = f"Classification found for {lookup.get('url')}: {classification}"
+                    self.helper.connector_logger.info(msg)
+
+    def send_to_zscaler(self, domains, event_type):
+        """Send a batch of creation or deletion events to Zscaler, return True on success."""
+        session_cookie = self.get_zscaler_session_cookie()
+        headers = {
+            "Content-Type": "application/json",
+            "Cookie": f"JSESSIONID={session_cookie}",
+        }
 
         if event_type == "create":
             base_url = f"https://zsapi.zscalertwo.net/api/v1/urlCategories/{self.zscaler_blacklist_name}?action=ADD_TO_LIST"
@@ -258,11 +308,11 @@ class ZscalerConnector:
         else:
             msg = "Unsupported event type."
             self.helper.connector_logger.error(msg)
-            return
+            return False
 
         payload = {
-            "configuredName": real_configured_name,
-            "urls": [domain],
+            "configuredName": self.configured_name,
+            "urls": domains,
         }
 
         response = self.handle_rate_limit(
@@ -270,12 +320,96 @@ class ZscalerConnector:
         )
 
         if response and response.status_code == 200:
-            msg = f"Successfully sent {event_type} for {domain}."
+            msg = f"Successfully sent {event_type} for {len(domains)} domains."
             self.helper.connector_logger.info(msg)
+            return True
+        msg = f"Failed to send {event_type} event: {response.text if response else 'No response'}"
+        self.helper.connector_logger.error(msg)
+        return False
+
+    def flush_pending_changes(self):
+        """Send pending additions and removals in batches, then activate the changes once."""
+        with self.pending_lock:
+            additions = sorted(self.pending_additions)
+            removals = sorted(self.pending_removals)
+            self.pending_additions.clear()
+            self.pending_removals.clear()
+            self.in_flight_domains.update(additions, removals)
+
+        if not additions and not removals:
+            return
+
+        if additions:
+            try:
+                self.log_domains_classification(additions)
+            except Exception as e:
+                self.helper.connector_logger.error(
+                    f"Failed to lookup the classification of {len(additions)} domains: {e}"
+                )
+
+        chunks = [
+            (event_type, domains[i : i + self.batch_size])
+            for event_type, domains in (("create", additions), ("delete", removals))
+            for i in range(0, len(domains), self.batch_size)
+        ]
+        changed = False
+        failed = False
+        for index, (event_type, chunk) in enumerate(chunks):
+            try:
+                sent = self.send_to_zscaler(chunk, event_type)
+            except Exception as e:
+                self.helper.connector_logger.error(
+                    f"Failed to send {event_type} of {len(chunk)} domains: {e}"
+                )
+                # Keep the failed and unsent batches for the next flush
+                with self.pending_lock:
+                    for unsent_event_type, unsent_chunk in chunks[index:]:
+                        self.requeue_pending_changes(unsent_chunk, unsent_event_type)
+                        self.in_flight_domains.difference_update(unsent_chunk)
+                failed = True
+                break
+            with self.pending_lock:
+                if sent:
+                    if event_type == "create":
+                        self.blocked_domains.update(chunk)
+                    else:
+                        self.blocked_domains.difference_update(chunk)
+                else:
+                    self.requeue_pending_changes(chunk, event_type)
+                self.in_flight_domains.difference_update(chunk)
+            if sent:
+                changed = True
+            else:
+                failed = True
+
+        if changed:
             self.activate_zscaler_changes()
+        if failed:
+            # The remote blacklist may have partially changed, resync the mirror
+            self.load_blocked_domains()
+
+    def requeue_pending_changes(self, domains, event_type):
+        """Queue again the domains of a failed batch, must be called with pending_lock held.
+
+        A domain queued for the opposite change in the meantime is not requeued, as the
+        latest event wins.
+        """
+        if event_type == "create":
+            self.pending_additions.update(set(domains) - self.pending_removals)
         else:
-            msg = f"Failed to send {event_type} event: {response.text if response else 'No response'}"
-            self.helper.connector_logger.error(msg)
+            self.pending_removals.update(set(domains) - self.pending_additions)
+
+    def _flush_loop(self):
+        """Flush pending changes every flush interval, or as soon as a batch is full."""
+        while True:
+            self.flush_event.wait(timeout=self.flush_interval)
+            self.flush_event.clear()
+            try:
+                self.flush_pending_changes()
+            except Exception as e:
+                self.helper.connector_logger.error(
+                    f"Failed to flush changes to Zscaler: {e}"
+                )
 
     @retry(
         stop=stop_after_attempt(5),
@@ -345,9 +479,6 @@ class ZscalerConnector:
             elif msg.event == "delete":
                 self.check_and_send_to_zscaler(structured_data, "delete")
 
-            # Always trigger activation after processing an event
-            self.activate_zscaler_changes()
-
         else:
             msg = "Ignoring non-STIX indicator."
             self.helper.connector_logger.info(msg)
@@ -357,4 +488,6 @@ class ZscalerConnector:
 
         msg = "Starting connector and listening for OpenCTI event..."
         self.helper.connector_logger.info(msg)
+        self.load_blocked_domains()
+        threading.Thread(target=self._flush_loop, daemon=True).start()
         self.helper.listen_stream(self._process_message)
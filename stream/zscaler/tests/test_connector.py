@@ -0,0 +1,179 @@
+from unittest import mock
+
+import pytest
+from stream_connector.connector import ZscalerConnector
+
+
+def make_pattern(domain):
+    return {"pattern": f"[domain-name:value = '{domain}']"}
+
+
+@pytest.fixture
+def connector():
+    with mock.patch("stream_connector.connector.OpenCTIApiClient"):
+        connector = ZscalerConnector(
+            config_path=None,
+            helper=mock.MagicMock(),
+            opencti_url="http://localhost:8080",
+            opencti_token="token",
+            ssl_verify=False,
+            zscaler_username="username",
+            zscaler_password="password",
+            zscaler_api_key="api-key",
+            zscaler_blacklist_name="blacklist",
+            zscaler_batch_size=2,
+        )
+    connector.get_zscaler_blocked_domains = mock.Mock(return_value=["blocked.com"])
+    connector.get_current_configured_name = mock.Mock(return_value="Blacklist")
+    connector.log_domains_classification = mock.Mock()
+    connector.activate_zscaler_changes = mock.Mock(return_value=True)
+    connector.send_to_zscaler = mock.Mock(return_value=True)
+    connector.load_blocked_domains()
+    return connector
+
+
+def test_flush_sends_batches_and_updates_mirror(connector):
+    for domain in ("a.com", "b.com", "c.com"):
+        connector.check_and_send_to_zscaler(make_pattern(domain), "create")
+    connector.check_and_send_to_zscaler(make_pattern("blocked.com"), "delete")
+
+    connector.flush_pending_changes()
+
+    assert connector.send_to_zscaler.call_args_list == [
+        mock.call(["a.com", "b.com"], "create"),
+        mock.call(["c.com"], "create"),
+        mock.call(["blocked.com"], "delete"),
+    ]
+    connector.activate_zscaler_changes.assert_called_once()
+    assert connector.blocked_domains == {"a.com", "b.com", "c.com"}
+    assert not connector.pending_additions and not connector.pending_removals
+
+
+def test_failed_batch_is_requeued(connector):
+    connector.send_to_zscaler.side_effect = [False, True]
+    # Blacklist returned by the resync following the failure
+    connector.get_zscaler_blocked_domains.return_value = ["blocked.com", "c.com"]
+    for domain in ("a.com", "b.com", "c.com"):
+        connector.check_and_send_to_zscaler(make_pattern(domain), "create")
+
+    connector.flush_pending_changes()
+
+    assert connector.pending_additions == {"a.com", "b.com"}
+    assert connector.blocked_domains == {"blocked.com", "c.com"}
+
+    connector.send_to_zscaler.side_effect = None
+    connector.flush_pending_changes()
+
+    assert connector.send_to_zscaler.call_args_list[-1] == mock.call(
+        ["a.com", "b.com"], "create"
+    )
+    assert connector.blocked_domains == {"blocked.com", "a.com", "b.com", "c.com"}
+    assert not connector.pending_additions
+
+
+def test_failed_batch_does_not_override_newer_event(connector):
+    connector.check_and_send_to_zscaler(make_pattern("a.com"), "create")
+
+    def send_to_zscaler(domains, event_type):
+        # The indicator is deleted while its creation is being sent
+        connector.check_and_send_to_zscaler(make_pattern("a.com"), "delete")
+        return False
+
+    connector.send_to_zscaler.side_effect = send_to_zscaler
+    connector.flush_pending_changes()
+
+    assert connector.pending_additions == set()
+    assert connector.pending_removals == {"a.com"}
+    assert connector.in_flight_domains == set()
+
+
+def test_delete_during_creation_is_sent_next(connector):
+    connector.check_and_send_to_zscaler(make_pattern("a.com"), "create")
+
+    def send_to_zscaler(domains, event_type):
+        # The indicator is deleted while its creation is being sent
+        connector.check_and_send_to_zscaler(make_pattern("a.com"), "delete")
+        return True
+
+    connector.send_to_zscaler.side_effect = send_to_zscaler
+    connector.flush_pending_changes()
+
+    assert connector.blocked_domains == {"blocked.com", "a.com"}
+    assert connector.pending_removals == {"a.com"}
+
+    connector.send_to_zscaler.side_effect = None
+    connector.flush_pending_changes()
+
+    assert connector.send_to_zscaler.call_args_list[-1] == mock.call(
+        ["a.com"], "delete"
+    )
+    assert connector.blocked_domains == {"blocked.com"}
+
+
+def test_create_during_deletion_is_sent_next(connector):
+    connector.check_and_send_to_zscaler(make_pattern("blocked.com"), "delete")
+
+    def send_to_zscaler(domains, event_type):
+        # The indicator is created again while its deletion is being sent
+        connector.check_and_send_to_zscaler(make_pattern("blocked.com"), "create")
+        return True
+
+    connector.send_to_zscaler.side_effect = send_to_zscaler
+    connector.flush_pending_changes()
+
+    assert connector.blocked_domains == set()
+    assert connector.pending_additions == {"blocked.com"}
+
+    connector.send_to_zscaler.side_effect = None
+    connector.flush_pending_changes()
+
+    assert connector.send_to_zscaler.call_args_list[-1] == mock.call(
+        ["blocked.com"], "create"
+    )
+    assert connector.blocked_domains == {"blocked.com"}
+
+
+def test_batches_are_requeued_when_sending_raises(connector):
+    connector.send_to_zscaler.side_effect = [True, ConnectionError("Unreachable")]
+    for domain in ("a.com", "b.com", "c.com", "d.com", "e.com"):
+        connector.check_and_send_to_zscaler(make_pattern(domain), "create")
+    connector.check_and_send_to_zscaler(make_pattern("blocked.com"), "delete")
+
+    connector.flush_pending_changes()
+
+    assert connector.send_to_zscaler.call_count == 2
+    assert connector.pending_additions == {"c.com", "d.com", "e.com"}
+    assert connector.pending_removals == {"blocked.com"}
+    assert connector.in_flight_domains == set()
+    connector.activate_zscaler_changes.assert_called_once()
+
+
+def test_failed_classification_lookup_does_not_drop_changes(connector):
+    connector.log_domains_classification.side_effect = ConnectionError("Unreachable")
+    connector.check_and_send_to_zscaler(make_pattern("a.com"), "create")
+
+    connector.flush_pending_changes()
+
+    connector.send_to_zscaler.assert_called_once_with(["a.com"], "create")
+    assert connector.blocked_domains == {"blocked.com", "a.com"}
+
+
+def test_failed_resync_keeps_previous_mirror(connector):
+    connector.send_to_zscaler.return_value = False
+    connector.get_zscaler_blocked_domains.return_value = None
+    connector.check_and_send_to_zscaler(make_pattern("a.com"), "create")
+
+    connector.flush_pending_changes()
+
+    connector.get_zscaler_blocked_domains.assert_called()
+    assert connector.blocked_domains == {"blocked.com"}
+    assert connector.configured_name == "Blacklist"
+    assert connector.pending_additions == {"a.com"}
+
+
+def test_successful_resync_replaces_mirror(connector):
+    connector.get_zscaler_blocked_domains.return_value = ["other.com"]
+
+    connector.load_blocked_domains()
+
+    assert connector.blocked_domains == {"other.com"}